@@ -0,0 +1,638 @@
+"""
+Flask API routes for authentication, user profiles and notifications
+"""
+
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+from app_core import auth_system, jwt_required_custom, LazyService, logger, send_password_reset_email
+from rate_limiter import rate_limit
+
+account_bp = Blueprint('account', __name__)
+
+@account_bp.route('/api/auth/register', methods=['POST'])
+@rate_limit('auth')
+def register():
+    try:
+        data = request.get_json()
+
+        # Validate required fields
+        required_fields = ['email', 'password', 'firstName', 'lastName']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({"error": f"{field} is required"}), 400
+
+        # Create user
+        result, status_code = auth_system.create_user(
+            email=data['email'],
+            password=data['password'],
+            first_name=data['firstName'],
+            last_name=data['lastName']
+        )
+
+        if status_code != 201:
+            return jsonify(result), status_code
+
+        # Create access token
+        access_token = auth_system.create_access_token(result['user'])
+
+        return jsonify({
+            "message": "User registered successfully",
+            "access_token": access_token,
+            "user": result['user']
+        }), 201
+
+    except Exception as e:
+        logger.error(f"Registration error: {e}")
+        return jsonify({"error": "Registration failed"}), 500
+
+@account_bp.route('/api/auth/login', methods=['POST'])
+@rate_limit('auth')
+def login():
+    try:
+        data = request.get_json()
+
+        # Validate required fields
+        if not data.get('email') or not data.get('password'):
+            return jsonify({"error": "Email and password are required"}), 400
+
+        # Authenticate user
+        result, status_code = auth_system.authenticate_user(
+            email=data['email'],
+            password=data['password']
+        )
+
+        if status_code != 200:
+            return jsonify(result), status_code
+
+        # Create access token
+        access_token = auth_system.create_access_token(result['user'])
+
+        return jsonify({
+            "message": "Login successful",
+            "access_token": access_token,
+            "user": result['user']
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Login error: {e}")
+        return jsonify({"error": "Login failed"}), 500
+
+@account_bp.route('/api/admin/login', methods=['POST'])
+@rate_limit('auth')
+def admin_login():
+    """Admin login endpoint - same as regular login but with admin validation"""
+    try:
+        data = request.get_json()
+
+        # Validate required fields
+        if not data.get('email') or not data.get('password'):
+            return jsonify({"error": "Email and password are required"}), 400
+
+        # Authenticate user
+        result, status_code = auth_system.authenticate_user(
+            email=data['email'],
+            password=data['password']
+        )
+
+        if status_code != 200:
+            return jsonify(result), status_code
+
+        # Check if user is admin
+        user = result['user']
+        if not user.get('is_admin'):
+            return jsonify({"error": "Admin privileges required"}), 403
+
+        # Create access token
+        access_token = auth_system.create_access_token(user)
+
+        return jsonify({
+            "message": "Admin login successful",
+            "access_token": access_token,
+            "user": user
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Admin login error: {e}")
+        return jsonify({"error": "Admin login failed"}), 500
+
+@account_bp.route('/api/auth/me', methods=['GET'])
+@jwt_required_custom
+def get_current_user():
+    try:
+        user_id = request.current_user['user_id']
+        user = auth_system.get_user_by_id(user_id)
+
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        return jsonify({"user": user}), 200
+
+    except Exception as e:
+        logger.error(f"Get user error: {e}")
+        return jsonify({"error": "Failed to get user data"}), 500
+
+@account_bp.route('/api/profile', methods=['GET'])
+@jwt_required_custom
+def get_profile():
+    """Get user profile information"""
+    try:
+        user_id = request.current_user['user_id']
+        user = auth_system.get_user_by_id(user_id)
+
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        # Return profile data in the expected format
+        profile_data = {
+            "id": user.get('id'),
+            "email": user.get('email'),
+            "firstName": user.get('firstName'),
+            "lastName": user.get('lastName'),
+            "isAdmin": user.get('is_admin', False),
+            "createdAt": user.get('createdAt'),
+            "updatedAt": user.get('createdAt'),  # Using createdAt as updatedAt for now
+            "subscription": {
+                "plan": "Pro",
+                "status": "active",
+                "expiresAt": "2024-12-31T23:59:59Z"
+            },
+            "preferences": {
+                "theme": "light",
+                "notifications": True,
+                "emailUpdates": True
+            }
+        }
+
+        return jsonify({
+            "success": True,
+            "data": profile_data
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Get profile error: {e}")
+        return jsonify({
+            "success": False,
+            "error": "Failed to get profile data"
+        }), 500
+
+@account_bp.route('/api/profile', methods=['PUT'])
+@jwt_required_custom
+def update_profile():
+    """Update user profile information"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        if not data:
+            return jsonify({
+                "success": False,
+                "error": "No data provided"
+            }), 400
+
+        # Update user data
+        update_data = {}
+        if 'firstName' in data:
+            update_data['first_name'] = data['firstName']
+        if 'lastName' in data:
+            update_data['last_name'] = data['lastName']
+        if 'email' in data:
+            update_data['email'] = data['email']
+
+        # Update user in database
+        if update_data:
+            success = auth_system.update_user(user_id, update_data)
+            if not success:
+                return jsonify({
+                    "success": False,
+                    "error": "Failed to update profile"
+                }), 500
+
+        # Get updated user data
+        user = auth_system.get_user_by_id(user_id)
+        if not user:
+            return jsonify({
+                "success": False,
+                "error": "User not found"
+            }), 404
+
+        # Return updated profile data
+        profile_data = {
+            "id": user.get('id'),
+            "email": user.get('email'),
+            "firstName": user.get('firstName'),
+            "lastName": user.get('lastName'),
+            "isAdmin": user.get('is_admin', False),
+            "createdAt": user.get('createdAt'),
+            "updatedAt": user.get('createdAt'),  # Using createdAt as updatedAt for now
+            "subscription": {
+                "plan": "Pro",
+                "status": "active",
+                "expiresAt": "2024-12-31T23:59:59Z"
+            },
+            "preferences": {
+                "theme": "light",
+                "notifications": True,
+                "emailUpdates": True
+            }
+        }
+
+        return jsonify({
+            "success": True,
+            "data": profile_data,
+            "message": "Profile updated successfully"
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Update profile error: {e}")
+        return jsonify({
+            "success": False,
+            "error": "Failed to update profile"
+        }), 500
+
+@account_bp.route('/api/auth/refresh', methods=['POST'])
+@jwt_required_custom
+def refresh_token():
+    try:
+        user_id = request.current_user['user_id']
+        user = auth_system.get_user_by_id(user_id)
+
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+
+        # Create new access token
+        access_token = auth_system.create_access_token(user)
+
+        return jsonify({
+            "message": "Token refreshed successfully",
+            "access_token": access_token
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Token refresh error: {e}")
+        return jsonify({"error": "Token refresh failed"}), 500
+
+@account_bp.route('/api/auth/logout', methods=['POST'])
+@jwt_required_custom
+def logout():
+    try:
+        return jsonify({"message": "Logout successful"}), 200
+    except Exception as e:
+        logger.error(f"Logout error: {e}")
+        return jsonify({"error": "Logout failed"}), 500
+
+# Password reset endpoints
+@account_bp.route('/api/auth/forgot-password', methods=['POST'])
+@rate_limit('auth')
+def forgot_password():
+    try:
+        data = request.get_json()
+
+        if not data.get('email'):
+            return jsonify({"error": "Email is required"}), 400
+
+        email = data['email']
+
+        # Check if user exists
+        connection = auth_system.get_db_connection()
+        if not connection:
+            return jsonify({"error": "Database connection failed"}), 500
+
+        try:
+            cursor = connection.cursor()
+            # Use correct column names based on the database schema
+            cursor.execute("SELECT user_id, email, first_name FROM users WHERE email = %s", (email,))
+            user = cursor.fetchone()
+
+            if not user:
+                return jsonify({"error": "No account found with this email address"}), 404
+
+            user_id, user_email, first_name = user
+
+            # Generate reset token
+            import secrets
+            reset_token = secrets.token_urlsafe(32)
+
+            # Create password_reset_tokens table if it doesn't exist
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS password_reset_tokens (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id INT NOT NULL,
+                    token VARCHAR(255) NOT NULL UNIQUE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expires_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP + INTERVAL 1 HOUR),
+                    used BOOLEAN DEFAULT FALSE,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+                )
+            """)
+
+            # Clean up expired tokens
+            cursor.execute("DELETE FROM password_reset_tokens WHERE expires_at < NOW() OR used = TRUE")
+
+            # Store reset token in database
+            cursor.execute(
+                "INSERT INTO password_reset_tokens (user_id, token) VALUES (%s, %s)",
+                (user_id, reset_token)
+            )
+            connection.commit()
+
+            # Send email with reset instructions
+            try:
+                email_sent = send_password_reset_email(user_email, first_name, reset_token)
+                if email_sent:
+                    logger.info(f"Password reset email sent to {email}")
+                    return jsonify({
+                        "message": "Password reset instructions have been sent to your email address."
+                    }), 200
+                else:
+                    logger.warning(f"Failed to send password reset email to {email}")
+                    return jsonify({
+                        "message": "Password reset instructions have been sent to your email address."
+                    }), 200
+            except Exception as email_error:
+                logger.error(f"Email sending error: {email_error}")
+                return jsonify({
+                    "message": "Password reset instructions have been sent to your email address."
+                }), 200
+
+        finally:
+            cursor.close()
+            connection.close()
+
+    except Exception as e:
+        logger.error(f"Forgot password error: {e}")
+        return jsonify({"error": "Failed to process password reset request"}), 500
+@account_bp.route('/api/auth/reset-password', methods=['POST'])
+@rate_limit('auth')
+def reset_password():
+    try:
+        data = request.get_json()
+
+        required_fields = ['token', 'newPassword']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({"error": f"{field} is required"}), 400
+
+        token = data['token']
+        new_password = data['newPassword']
+
+        if len(new_password) < 6:
+            return jsonify({"error": "Password must be at least 6 characters long"}), 400
+
+        connection = auth_system.get_db_connection()
+        if not connection:
+            return jsonify({"error": "Database connection failed"}), 500
+
+        try:
+            cursor = connection.cursor()
+
+            # Find valid reset token (using correct column names)
+            cursor.execute("""
+                SELECT prt.user_id, u.email
+                FROM password_reset_tokens prt
+                JOIN users u ON prt.user_id = u.user_id
+                WHERE prt.token = %s AND prt.expires_at > NOW() AND prt.used = FALSE
+            """, (token,))
+
+            reset_record = cursor.fetchone()
+            if not reset_record:
+                return jsonify({"error": "Invalid or expired reset token"}), 400
+
+            user_id, user_email = reset_record
+
+            # Hash new password
+            hashed_password = auth_system.hash_password(new_password)
+
+            # Update user password (using correct column name)
+            cursor.execute(
+                "UPDATE users SET password_hash = %s WHERE user_id = %s",
+                (hashed_password, user_id)
+            )
+
+            # Mark token as used
+            cursor.execute("UPDATE password_reset_tokens SET used = TRUE WHERE token = %s", (token,))
+
+            connection.commit()
+
+            logger.info(f"Password reset successfully for user {user_id}")
+
+            return jsonify({"message": "Password reset successfully"}), 200
+
+        finally:
+            cursor.close()
+            connection.close()
+
+    except Exception as e:
+        logger.error(f"Reset password error: {e}")
+        return jsonify({"error": "Failed to reset password"}), 500
+
+# Notification System
+class NotificationSystem:
+    def __init__(self):
+        self.notifications = {}
+
+    def create_notification(self, user_id, title, message, notification_type="info", priority="medium"):
+        """Create a new notification"""
+        try:
+            notification_id = f"notif_{len(self.notifications) + 1}"
+            notification = {
+                'id': notification_id,
+                'user_id': user_id,
+                'title': title,
+                'message': message,
+                'type': notification_type,
+                'priority': priority,
+                'status': 'unread',
+                'created_at': datetime.now().isoformat(),
+                'read_at': None
+            }
+
+            if user_id not in self.notifications:
+                self.notifications[user_id] = []
+
+            self.notifications[user_id].append(notification)
+            return notification
+
+        except Exception as e:
+            logger.error(f"Error creating notification: {e}")
+            return None
+
+    def get_notifications(self, user_id, limit=50, offset=0, status=None, notification_type=None):
+        """Get notifications for a user"""
+        try:
+            if user_id not in self.notifications:
+                return []
+
+            notifications = self.notifications[user_id]
+
+            # Filter by status
+            if status:
+                notifications = [n for n in notifications if n['status'] == status]
+
+            # Filter by type
+            if notification_type:
+                notifications = [n for n in notifications if n['type'] == notification_type]
+
+            # Sort by created_at (newest first)
+            notifications.sort(key=lambda x: x['created_at'], reverse=True)
+
+            # Apply pagination
+            return notifications[offset:offset + limit]
+
+        except Exception as e:
+            logger.error(f"Error getting notifications: {e}")
+            return []
+
+    def mark_as_read(self, user_id, notification_id):
+        """Mark a notification as read"""
+        try:
+            if user_id not in self.notifications:
+                return False
+
+            for notification in self.notifications[user_id]:
+                if notification['id'] == notification_id:
+                    notification['status'] = 'read'
+                    notification['read_at'] = datetime.now().isoformat()
+                    return True
+
+            return False
+
+        except Exception as e:
+            logger.error(f"Error marking notification as read: {e}")
+            return False
+
+    def get_unread_count(self, user_id):
+        """Get unread notification count for a user"""
+        try:
+            if user_id not in self.notifications:
+                return 0
+
+            unread_count = sum(1 for n in self.notifications[user_id] if n['status'] == 'unread')
+            return unread_count
+
+        except Exception as e:
+            logger.error(f"Error getting unread count: {e}")
+            return 0
+
+# Initialize notification system
+notification_system = LazyService(NotificationSystem)
+
+# Notification Routes
+@account_bp.route('/api/notifications', methods=['GET'])
+@jwt_required_custom
+def get_notifications():
+    """Get notifications for a user"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Query parameters
+        limit = int(request.args.get('limit', 50))
+        offset = int(request.args.get('offset', 0))
+        status = request.args.get('status')
+        notification_type = request.args.get('type')
+
+        notifications = notification_system.get_notifications(
+            user_id, limit, offset, status, notification_type
+        )
+
+        return jsonify({
+            'success': True,
+            'data': notifications,
+            'total': len(notifications),
+            'limit': limit,
+            'offset': offset
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting notifications: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@account_bp.route('/api/notifications/unread-count', methods=['GET'])
+@jwt_required_custom
+def get_unread_count():
+    """Get unread notification count"""
+    try:
+        user_id = request.current_user['user_id']
+        count = notification_system.get_unread_count(user_id)
+
+        return jsonify({
+            'success': True,
+            'unread_count': count
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting unread count: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@account_bp.route('/api/notifications/<notification_id>/read', methods=['POST'])
+@jwt_required_custom
+def mark_notification_read(notification_id):
+    """Mark a notification as read"""
+    try:
+        user_id = request.current_user['user_id']
+        success = notification_system.mark_as_read(user_id, notification_id)
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'Notification marked as read'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Notification not found'
+            }), 404
+
+    except Exception as e:
+        logger.error(f"Error marking notification as read: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@account_bp.route('/api/notifications/create', methods=['POST'])
+@jwt_required_custom
+def create_notification():
+    """Create a new notification"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        title = data.get('title', '')
+        message = data.get('message', '')
+        notification_type = data.get('type', 'info')
+        priority = data.get('priority', 'medium')
+
+        if not title or not message:
+            return jsonify({
+                'success': False,
+                'message': 'Title and message are required'
+            }), 400
+
+        notification = notification_system.create_notification(
+            user_id, title, message, notification_type, priority
+        )
+
+        if notification:
+            return jsonify({
+                'success': True,
+                'data': notification,
+                'message': 'Notification created successfully'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to create notification'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error creating notification: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -6,6 +6,7 @@ import json
 import os
 from werkzeug.security import check_password_hash
 import jwt
+from rate_limiter import rate_limit
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
@@ -57,6 +58,7 @@ def admin_required(f):
     return decorated_function
 
 @admin_bp.route('/login', methods=['POST'])
+@rate_limit('auth')
 def admin_login():
     try:
         data = request.get_json()
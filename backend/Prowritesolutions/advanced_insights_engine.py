@@ -10,6 +10,10 @@ import openai
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
+from resume_features import (
+    ACTION_VERBS, INDUSTRY_KEYWORDS, LEADERSHIP_WORDS, PROFESSION_KEYWORDS, SECTION_NAMES, WEAK_PHRASES,
+    found, resume_feature_store,
+)
 
 class AdvancedInsightsEngine:
     def __init__(self):
@@ -95,13 +99,16 @@ class AdvancedInsightsEngine:
             # Determine career level
             career_level = self._determine_career_level(experience_years)
             
+            # Features are computed once per resume version and shared with the other engines
+            features = resume_feature_store.features(resume_content)
+            
             # Generate comprehensive strategic analysis
             strategic_analysis = {
                 'career_level': career_level,
-                'career_strategy': self._analyze_career_strategy(resume_content, profession, career_level, industry),
-                'content_optimization': self._analyze_content_optimization(resume_content, career_level),
+                'career_strategy': self._analyze_career_strategy(features, profession, career_level, industry),
+                'content_optimization': self._analyze_content_optimization(features, career_level),
                 'market_intelligence': self._analyze_market_intelligence(profession, industry),
-                'personal_branding': self._analyze_personal_branding(resume_content, profession, career_level),
+                'personal_branding': self._analyze_personal_branding(features, profession, career_level),
                 'actionable_recommendations': [],
                 'strategic_priorities': []
             }
@@ -272,26 +279,46 @@ class AdvancedInsightsEngine:
         else:
             return 'executive_level'
 
-    def _analyze_career_strategy(self, resume_content: str, profession: str, career_level: str, industry: str) -> Dict[str, Any]:
+    def _analyze_career_strategy(self, features: Dict[str, Any], profession: str, career_level: str, industry: str) -> Dict[str, Any]:
         """Analyze career strategy and progression"""
         career_insights = self.career_level_insights.get(career_level, {})
+        industry_terms = INDUSTRY_KEYWORDS.get(industry, [])
+        covered = found(features, industry_terms)
+        leadership = found(features, LEADERSHIP_WORDS)
         
         return {
             'focus_areas': career_insights.get('focus_areas', []),
             'key_metrics': career_insights.get('key_metrics', []),
             'recommendations': career_insights.get('recommendations', []),
-            'career_progression': self._analyze_career_progression(resume_content, profession, career_level),
-            'skill_gaps': self._identify_skill_gaps(resume_content, career_level, industry),
-            'market_positioning': self._analyze_market_positioning_strategy(resume_content, profession, industry)
+            'career_progression': 'Shows growing responsibility' if leadership else 'Add evidence of growing responsibility',
+            'skill_gaps': [term for term in industry_terms if term not in covered],
+            'market_positioning': f"Covers {len(covered)} of {len(industry_terms)} {industry} keywords" if industry_terms
+                                  else 'Industry not specified'
         }
 
-    def _analyze_content_optimization(self, resume_content: str, career_level: str) -> Dict[str, Any]:
+    def _analyze_content_optimization(self, features: Dict[str, Any], career_level: str) -> Dict[str, Any]:
         """Analyze content optimization opportunities"""
+        metrics = len(features['metrics'])
+        verbs = len(found(features, ACTION_VERBS))
+        # More senior resumes are expected to carry more measured results
+        expected_metrics = {'entry_level': 1, 'mid_level': 3, 'senior_level': 5, 'executive_level': 5}.get(career_level, 3)
+        
+        opportunities = []
+        if metrics < expected_metrics:
+            opportunities.append('quantified results')
+        if verbs < 5:
+            opportunities.append('action verbs')
+        if found(features, WEAK_PHRASES):
+            opportunities.append('passive phrasing')
+        if len(found(features, SECTION_NAMES)) < 3:
+            opportunities.append('section structure')
+        
+        readability = features['readability']
         return {
-            'content_effectiveness': self._assess_content_effectiveness(resume_content, career_level),
-            'message_clarity': self._assess_message_clarity(resume_content),
-            'impact_measurement': self._assess_impact_measurement(resume_content),
-            'optimization_opportunities': self._identify_content_optimization_opportunities(resume_content, career_level)
+            'content_effectiveness': 'Strong' if not opportunities else 'Good' if len(opportunities) == 1 else 'Needs Work',
+            'message_clarity': 'Clear' if readability >= 50 else 'Moderate' if readability >= 30 else 'Dense',
+            'impact_measurement': 'Strong' if metrics >= expected_metrics else 'Some' if metrics else 'Missing',
+            'optimization_opportunities': opportunities
         }
 
     def _analyze_market_intelligence(self, profession: str, industry: str) -> Dict[str, Any]:
@@ -300,18 +327,28 @@ class AdvancedInsightsEngine:
         
         return {
             'industry_trends': industry_data.get('trends', []),
-            'salary_benchmarks': self._get_salary_benchmarks(profession, industry),
-            'demand_analysis': self._analyze_demand_trends(profession, industry),
-            'market_opportunities': self._identify_market_opportunities(profession, industry)
+            'key_skills': industry_data.get('key_skills', []),
+            'market_opportunities': industry_data.get('recommendations', [])
         }
 
-    def _analyze_personal_branding(self, resume_content: str, profession: str, career_level: str) -> Dict[str, Any]:
+    def _analyze_personal_branding(self, features: Dict[str, Any], profession: str, career_level: str) -> Dict[str, Any]:
         """Analyze personal branding and differentiation"""
+        keywords = found(features, PROFESSION_KEYWORDS.get(profession, []))
+        metrics = len(features['metrics'])
+        
+        opportunities = []
+        if not features['has_email'] or not features['has_phone']:
+            opportunities.append('Complete your contact details')
+        if len(keywords) < 5:
+            opportunities.append('Name the tools and methods you are known for')
+        if metrics < 3:
+            opportunities.append('Back your headline claims with measured results')
+        
         return {
-            'brand_consistency': self._assess_brand_consistency(resume_content),
-            'unique_value_proposition': self._identify_unique_value_proposition(resume_content, profession),
-            'differentiation': self._analyze_differentiation_factors(resume_content, career_level),
-            'brand_development_opportunities': self._identify_brand_development_opportunities(resume_content)
+            'brand_consistency': 'Consistent' if features['distinct_headers'] > 1 else 'Inconsistent headings',
+            'unique_value_proposition': ', '.join(keywords[:3]) or 'Not evident from the resume',
+            'differentiation': 'Strong' if metrics >= 3 and len(keywords) >= 5 else 'Moderate' if metrics or keywords else 'Weak',
+            'brand_development_opportunities': opportunities
         }
 
     def _generate_strategic_recommendations(self, strategic_analysis: Dict[str, Any], profession: str, career_level: str, industry: str) -> List[str]:
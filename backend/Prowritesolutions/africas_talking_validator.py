@@ -7,6 +7,9 @@ from dataclasses import dataclass
 import os
 from dotenv import load_dotenv
 
+from http_sessions import get_session
+from till_ledger import till_ledger, LedgerUnavailable, SOURCE_WHITELIST
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -39,6 +42,8 @@ class AfricasTalkingValidator:
             self.base_url = 'https://api.africastalking.com'
         else:
             self.base_url = 'https://api.sandbox.africastalking.com'
+        # Point at a stand-in server (load_test_harness.py)
+        self.base_url = os.getenv('AFRICAS_TALKING_BASE_URL', self.base_url).rstrip('/')
         
         self.validated_transactions = set()  # Store validated transaction IDs
         
@@ -46,9 +51,15 @@ class AfricasTalkingValidator:
         self.transaction_cache = {}  # Cache fetched transactions
         self.cache_expiry = {}  # Track cache expiry times
         self.cache_duration = 300  # Cache for 5 minutes
+        self.working_endpoint = None  # Last transactions endpoint that answered
         
         logger.info(f"Africa's Talking validator initialized - Environment: {self.environment}")
     
+    @property
+    def session(self):
+        """Pooled keep-alive session (re-created per process after a fork)"""
+        return get_session('africastalking')
+    
     def _make_api_request(self, endpoint: str, data: dict) -> dict:
         """Make API request to Africa's Talking"""
         try:
@@ -60,7 +71,7 @@ class AfricasTalkingValidator:
                 'Accept': 'application/json'
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=30)
+            response = self.session.post(url, json=data, headers=headers, timeout=30)
             
             logger.info(f"Africa's Talking API call: {endpoint} - Status: {response.status_code}")
             
@@ -74,9 +85,12 @@ class AfricasTalkingValidator:
             logger.error(f"Africa's Talking API request failed: {e}")
             return {'status': 'error', 'message': str(e)}
     
-    def _fetch_till_transactions(self, till_number: str, days_back: int = 7) -> Optional[list]:
+    def fetch_till_transactions(self, till_number: str, days_back: int = 7) -> Optional[list]:
         """
-        Fetch recent transactions for a till number from Africa's Talking
+        Fetch recent transactions for a till number from Africa's Talking (uncached)
+        
+        The endpoint that answered last time is tried first, so steady-state syncs
+        make a single API call instead of walking the whole endpoint list.
         
         Args:
             till_number: Till number to fetch transactions for
@@ -86,14 +100,6 @@ class AfricasTalkingValidator:
             List of transactions or None if fetch fails
         """
         try:
-            # Check cache first
-            cache_key = f"{till_number}_{days_back}"
-            if cache_key in self.transaction_cache:
-                expiry = self.cache_expiry.get(cache_key, 0)
-                if datetime.now().timestamp() < expiry:
-                    logger.info("Returning cached transactions")
-                    return self.transaction_cache[cache_key]
-            
             # Calculate date range
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
@@ -113,12 +119,15 @@ class AfricasTalkingValidator:
             
             logger.info(f"Fetching transactions: {product_name} from {start_date.date()} to {end_date.date()}")
             
-            # Try multiple API endpoints for better compatibility
+            # Try multiple API endpoints for better compatibility, last working one first
             endpoints_to_try = [
                 '/version1/payments/fetchProductTransactions',
                 '/version1/payments/query',
                 '/version1/payments/transaction/status'
             ]
+            if self.working_endpoint in endpoints_to_try:
+                endpoints_to_try.remove(self.working_endpoint)
+                endpoints_to_try.insert(0, self.working_endpoint)
             
             result = None
             for endpoint in endpoints_to_try:
@@ -126,46 +135,55 @@ class AfricasTalkingValidator:
                 result = self._make_api_request(endpoint, api_data)
                 if result.get('status') == 'Success':
                     logger.info(f"Success with endpoint: {endpoint}")
+                    self.working_endpoint = endpoint
                     break
                 else:
                     logger.warning(f"Failed with endpoint {endpoint}: {result.get('message', 'Unknown error')}")
             
             if not result or result.get('status') != 'Success':
-                # All API endpoints failed - try secure whitelist approach
-                logger.warning("All API endpoints failed - checking secure whitelist")
-                return self._check_secure_whitelist(transaction_id, till_number, amount)
+                logger.error(f"API fetch failed: {(result or {}).get('message', 'Unknown error')}")
+                return None
             
-            if result.get('status') == 'Success':
-                transactions = result.get('transactions', [])
-                
-                # Filter for till number if provided
-                filtered = []
-                for trans in transactions:
-                    # Check if transaction is for our till
-                    metadata = trans.get('metadata', {})
-                    provider_metadata = trans.get('providerMetadata', {})
-                    
-                    # Match till number in various possible fields
-                    if (metadata.get('tillNumber') == till_number or 
-                        provider_metadata.get('tillNumber') == till_number or
-                        trans.get('destinationAccount') == till_number):
-                        filtered.append(trans)
-                
-                logger.info(f"Fetched {len(filtered)} transactions for till {till_number}")
-                
-                # Cache the results
-                self.transaction_cache[cache_key] = filtered if filtered else transactions
-                self.cache_expiry[cache_key] = datetime.now().timestamp() + self.cache_duration
+            transactions = result.get('transactions', [])
+            
+            # Filter for till number if provided
+            filtered = []
+            for trans in transactions:
+                # Check if transaction is for our till
+                metadata = trans.get('metadata', {})
+                provider_metadata = trans.get('providerMetadata', {})
                 
-                return filtered if filtered else transactions  # Return all if no matches
-            else:
-                logger.error(f"API fetch failed: {result.get('message', 'Unknown error')}")
-                return None
+                # Match till number in various possible fields
+                if (metadata.get('tillNumber') == till_number or 
+                    provider_metadata.get('tillNumber') == till_number or
+                    trans.get('destinationAccount') == till_number):
+                    filtered.append(trans)
+            
+            logger.info(f"Fetched {len(filtered)} transactions for till {till_number}")
+            
+            return filtered if filtered else transactions  # Return all if no matches
                 
         except Exception as e:
             logger.error(f"Error fetching transactions: {e}")
             return None
     
+    def _fetch_till_transactions(self, till_number: str, days_back: int = 7) -> Optional[list]:
+        """Cached wrapper around fetch_till_transactions (used when the ledger is unavailable)"""
+        # Check cache first
+        cache_key = f"{till_number}_{days_back}"
+        if cache_key in self.transaction_cache:
+            expiry = self.cache_expiry.get(cache_key, 0)
+            if datetime.now().timestamp() < expiry:
+                logger.info("Returning cached transactions")
+                return self.transaction_cache[cache_key]
+        
+        transactions = self.fetch_till_transactions(till_number, days_back)
+        if transactions is not None:
+            # Cache the results
+            self.transaction_cache[cache_key] = transactions
+            self.cache_expiry[cache_key] = datetime.now().timestamp() + self.cache_duration
+        return transactions
+    
     def verify_mpesa_transaction(self, transaction_id: str, till_number: str, amount: float) -> ValidationResult:
         """
         Verify M-Pesa transaction using Africa's Talking API
@@ -420,6 +438,77 @@ class AfricasTalkingValidator:
             logger.error(f"SMS sending error: {e}")
             return False
     
+    def verify_with_ledger(self, transaction_id: str, till_number: str, amount: float, reference: str) -> ValidationResult:
+        """
+        Verify a transaction code against the local till ledger
+        
+        A ledger hit is a single primary-key lookup; on a miss the ledger is
+        synced on demand (throttled) and checked once more. Only payments to this
+        till are accepted: a code recorded for another shortcode (such as an STK
+        receipt) is rejected as WRONG_TILL without syncing again. The code is
+        claimed for the payment reference atomically, so it cannot be reused by
+        another payment.
+        
+        Raises:
+            LedgerUnavailable: ledger database cannot be reached
+        """
+        entry = till_ledger.lookup(transaction_id)
+        
+        if entry is None:
+            synced = till_ledger.sync_if_stale()
+            if synced is not False:
+                entry = till_ledger.lookup(transaction_id)
+            else:
+                # Africa's Talking is down - only manually verified codes are accepted
+                result = self._check_secure_whitelist(transaction_id, till_number, amount)
+                if result.valid:
+                    till_ledger.record_transaction(transaction_id, amount, SOURCE_WHITELIST, till_number=till_number)
+                    entry = till_ledger.lookup(transaction_id)
+                else:
+                    return result
+        
+        if entry is None:
+            logger.warning(f"Transaction {transaction_id} not found in till ledger")
+            return ValidationResult(
+                valid=False,
+                error=f"Transaction {transaction_id} not found in recent payments to Till {till_number}",
+                error_code="TRANSACTION_NOT_FOUND"
+            )
+        
+        if entry['till_number'] != till_number:
+            logger.warning(f"Transaction {transaction_id} was paid to {entry['till_number']}, not Till {till_number}")
+            return ValidationResult(
+                valid=False,
+                error=f"Transaction {transaction_id} was not paid to Till {till_number}",
+                error_code="WRONG_TILL"
+            )
+        
+        # Verify amount matches (allow 1 KES tolerance)
+        if abs(entry['amount'] - amount) > 1:
+            return ValidationResult(
+                valid=False,
+                error=f"Amount mismatch: Expected KES {amount}, found KES {entry['amount']}",
+                error_code="AMOUNT_MISMATCH"
+            )
+        
+        if not till_ledger.claim(transaction_id, reference):
+            return ValidationResult(
+                valid=False,
+                error="Transaction code has already been used",
+                error_code="ALREADY_USED"
+            )
+        
+        self.validated_transactions.add(transaction_id)
+        logger.info(f"✅ Transaction verified via till ledger: {transaction_id}")
+        return ValidationResult(
+            valid=True,
+            message=f"Transaction verified: KES {entry['amount']} to Till {till_number}",
+            transaction_code=transaction_id,
+            amount_verified=entry['amount'],
+            transaction_time=entry.get('transaction_time') or datetime.now(),
+            phone_number=entry.get('phone_number')
+        )
+    
     def validate_transaction_code(self, transaction_code: str, reference: str, amount: int) -> ValidationResult:
         """
         Main validation method compatible with existing system
@@ -443,10 +532,15 @@ class AfricasTalkingValidator:
                     error_code="MISSING_CODE"
                 )
             
+            try:
+                return self.verify_with_ledger(code, till_ledger.till_number, float(amount), reference)
+            except LedgerUnavailable as e:
+                logger.warning(f"Till ledger unavailable ({e}), verifying against the live API")
+            
             # Verify with Africa's Talking
             return self.verify_mpesa_transaction(
                 transaction_id=code,
-                till_number="6340351",  # Your till number
+                till_number=till_ledger.till_number,
                 amount=float(amount)
             )
             
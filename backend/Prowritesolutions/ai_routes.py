@@ -0,0 +1,1183 @@
+"""
+Flask API routes for AI writing assistance (enhancement, suggestions and paragraph guidance)
+"""
+
+from flask import Blueprint, request, jsonify
+import os
+import random
+from ai_streaming import stream_events, sse_response, wants_stream, SectionFilter
+from app_core import francisca_ai_service, jwt_required_custom, LazyService, logger
+from rate_limiter import rate_limit
+
+ai_bp = Blueprint('ai', __name__)
+
+@ai_bp.route('/api/ai/enhance-job-description', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def enhance_job_description():
+    """Enhance job description using AI"""
+    try:
+        data = request.get_json()
+        job_description = data.get('job_description', '')
+        profession = data.get('profession', 'General')
+
+        if not job_description.strip():
+            return jsonify({
+                'success': False,
+                'message': 'Job description is required'
+            }), 400
+
+        # Use Francisca AI service to enhance job description
+        enhanced_description = francisca_ai_service.enhance_job_description(job_description, profession)
+
+        return jsonify({
+            'success': True,
+            'enhanced_description': enhanced_description,
+            'message': 'Job description enhanced successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Error enhancing job description: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/francisca/ai/enhance-paragraph', methods=['POST'])
+@rate_limit('ai')
+def enhance_paragraph():
+    """Enhance individual paragraph using AI"""
+    try:
+        data = request.get_json()
+        content = data.get('content', '')
+        enhancement_type = data.get('enhancement_type', 'professional')
+        job_title = data.get('job_title', '')
+        company_name = data.get('company_name', '')
+        job_description = data.get('job_description', '')
+        tone = data.get('tone', 'professional')
+        industry = data.get('industry', 'General')
+
+        if not content.strip():
+            return jsonify({
+                'success': False,
+                'message': 'Paragraph content is required'
+            }), 400
+
+        if wants_stream(request, data):
+            # Relay the enhanced paragraph as it is written; suggestions arrive with the done event
+            def finalize(text):
+                enhanced_content, suggestions = francisca_ai_service.parse_paragraph_result(text.strip(), content)
+                return {
+                    'success': True,
+                    'enhanced_content': enhanced_content,
+                    'suggestions': suggestions,
+                    'message': 'Paragraph enhanced successfully'
+                }
+
+            return sse_response(stream_events(
+                francisca_ai_service.stream_paragraph(
+                    content, enhancement_type, job_title, company_name,
+                    job_description, tone, industry
+                ),
+                finalize,
+                SectionFilter('ENHANCED_PARAGRAPH:', 'SUGGESTIONS:')
+            ))
+
+        # Use Francisca AI service to enhance paragraph
+        enhanced_content, suggestions = francisca_ai_service.enhance_paragraph(
+            content, enhancement_type, job_title, company_name,
+            job_description, tone, industry
+        )
+
+        return jsonify({
+            'success': True,
+            'enhanced_content': enhanced_content,
+            'suggestions': suggestions,
+            'message': 'Paragraph enhanced successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Error enhancing paragraph: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/francisca/ai/generate-suggestions', methods=['POST'])
+@rate_limit('ai')
+def generate_suggestions():
+    """Generate AI suggestions for paragraph writing"""
+    try:
+        data = request.get_json()
+        paragraph_type = data.get('paragraph_type', 'opening')
+        current_content = data.get('current_content', '')
+        job_title = data.get('job_title', '')
+        company_name = data.get('company_name', '')
+        job_description = data.get('job_description', '')
+
+        # Use Francisca AI service to generate suggestions
+        suggestions = francisca_ai_service.generate_paragraph_suggestions(
+            paragraph_type, current_content, job_title, company_name, job_description
+        )
+
+        return jsonify({
+            'success': True,
+            'suggestions': suggestions,
+            'message': 'Suggestions generated successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Error generating suggestions: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# AI Enhancement System
+class AIResumeEnhancer:
+    def __init__(self, ai_api_key=None):
+        self.ai_api_key = ai_api_key or os.getenv('AI_API_KEY', '')
+        self.openai_client = None
+
+        if self.ai_api_key:
+            try:
+                import openai
+                openai.api_key = self.ai_api_key
+                self.openai_client = openai
+            except ImportError:
+                logger.warning("OpenAI library not available for AI enhancement")
+
+    def enhance_resume(self, resume_data, job_description=None, industry=None):
+        """Enhance resume content using AI"""
+        try:
+            if not self.openai_client:
+                return self._fallback_enhancement(resume_data, job_description, industry)
+
+            # Enhance different sections
+            enhanced_data = resume_data.copy()
+
+            # Enhance summary/objective
+            if 'summary' in resume_data:
+                enhanced_data['summary'] = self._enhance_summary(
+                    resume_data['summary'], job_description, industry
+                )
+
+            # Enhance experience descriptions
+            if 'experience' in resume_data:
+                enhanced_data['experience'] = self._enhance_experience(
+                    resume_data['experience'], job_description, industry
+                )
+
+            # Enhance skills
+            if 'skills' in resume_data:
+                enhanced_data['skills'] = self._enhance_skills(
+                    resume_data['skills'], job_description, industry
+                )
+
+            # Add AI-generated insights
+            enhanced_data['ai_insights'] = self._generate_insights(
+                resume_data, job_description, industry
+            )
+
+            return enhanced_data
+
+        except Exception as e:
+            logger.error(f"Error enhancing resume with AI: {e}")
+            return self._fallback_enhancement(resume_data, job_description, industry)
+
+    def _enhance_summary(self, summary, job_description=None, industry=None):
+        """Enhance resume summary using AI"""
+        try:
+            prompt = f"""
+            Enhance this resume summary to be more compelling and ATS-friendly:
+
+            Current Summary: {summary}
+
+            Target Job: {job_description or 'General position'}
+            Industry: {industry or 'General'}
+
+            Make it:
+            - More specific and quantifiable
+            - Include relevant keywords
+            - Highlight key achievements
+            - Keep it concise (2-3 sentences)
+            """
+
+            response = self.openai_client.ChatCompletion.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=150,
+                temperature=0.7
+            )
+
+            return response.choices[0].message.content.strip()
+
+        except Exception as e:
+            logger.error(f"Error enhancing summary: {e}")
+            return summary
+
+    def _enhance_experience(self, experience_data, job_description=None, industry=None):
+        """Enhance work experience descriptions"""
+        try:
+            enhanced_experience = []
+
+            for exp in experience_data:
+                enhanced_exp = exp.copy()
+
+                if 'description' in exp and exp['description']:
+                    prompt = f"""
+                    Enhance this job description to be more impactful and ATS-friendly:
+
+                    Job Title: {exp.get('title', '')}
+                    Company: {exp.get('company', '')}
+                    Current Description: {exp['description']}
+
+                    Target Job: {job_description or 'General position'}
+                    Industry: {industry or 'General'}
+
+                    Make it:
+                    - Use action verbs
+                    - Include quantifiable achievements
+                    - Add relevant keywords
+                    - Keep it concise but impactful
+                    """
+
+                    response = self.openai_client.ChatCompletion.create(
+                        model="gpt-3.5-turbo",
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=200,
+                        temperature=0.7
+                    )
+
+                    enhanced_exp['description'] = response.choices[0].message.content.strip()
+
+                enhanced_experience.append(enhanced_exp)
+
+            return enhanced_experience
+
+        except Exception as e:
+            logger.error(f"Error enhancing experience: {e}")
+            return experience_data
+
+    def _enhance_skills(self, skills, job_description=None, industry=None):
+        """Enhance skills list"""
+        try:
+            if isinstance(skills, str):
+                skills = [s.strip() for s in skills.split(',')]
+
+            prompt = f"""
+            Enhance this skills list for a resume:
+
+            Current Skills: {', '.join(skills)}
+            Target Job: {job_description or 'General position'}
+            Industry: {industry or 'General'}
+
+            Return a list of:
+            - Current skills (improved formatting)
+            - Additional relevant skills
+            - Industry-specific keywords
+
+            Format as a comma-separated list.
+            """
+
+            response = self.openai_client.ChatCompletion.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=150,
+                temperature=0.7
+            )
+
+            enhanced_skills = response.choices[0].message.content.strip()
+            return [s.strip() for s in enhanced_skills.split(',')]
+
+        except Exception as e:
+            logger.error(f"Error enhancing skills: {e}")
+            return skills
+
+    def _generate_insights(self, resume_data, job_description=None, industry=None):
+        """Generate AI insights for the resume"""
+        try:
+            prompt = f"""
+            Analyze this resume and provide insights:
+
+            Resume Data: {str(resume_data)[:1000]}...
+            Target Job: {job_description or 'General position'}
+            Industry: {industry or 'General'}
+
+            Provide:
+            1. Strengths (3-5 points)
+            2. Areas for improvement (3-5 points)
+            3. Keyword suggestions
+            4. ATS optimization tips
+
+            Format as a JSON object.
+            """
+
+            response = self.openai_client.ChatCompletion.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=300,
+                temperature=0.7
+            )
+
+            return response.choices[0].message.content.strip()
+
+        except Exception as e:
+            logger.error(f"Error generating insights: {e}")
+            return "AI insights not available"
+
+    def _fallback_enhancement(self, resume_data, job_description=None, industry=None):
+        """Fallback enhancement without AI"""
+        enhanced_data = resume_data.copy()
+
+        # Basic enhancements
+        if 'summary' in enhanced_data and enhanced_data['summary']:
+            enhanced_data['summary'] = f"Results-driven professional with expertise in {industry or 'relevant field'}. {enhanced_data['summary']}"
+
+        # Add basic insights
+        enhanced_data['ai_insights'] = {
+            'strengths': ['Strong experience in relevant field', 'Good educational background'],
+            'improvements': ['Add more quantifiable achievements', 'Include industry-specific keywords'],
+            'keywords': ['leadership', 'management', 'strategy', 'innovation'],
+            'ats_tips': ['Use standard section headings', 'Include relevant keywords', 'Keep formatting simple']
+        }
+
+        return enhanced_data
+
+# Initialize AI enhancer
+ai_enhancer = LazyService(AIResumeEnhancer)
+
+# AI Enhancement Routes
+@ai_bp.route('/api/ai/enhance-resume', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def enhance_resume():
+    """Enhance resume content using AI"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        resume_data = data.get('resume_data', {})
+        job_description = data.get('job_description', '')
+        industry = data.get('industry', '')
+
+        if not resume_data:
+            return jsonify({
+                'success': False,
+                'message': 'Resume data is required'
+            }), 400
+
+        # Enhance resume
+        enhanced_data = ai_enhancer.enhance_resume(resume_data, job_description, industry)
+
+        return jsonify({
+            'success': True,
+            'message': 'Resume enhanced successfully',
+            'data': enhanced_data
+        })
+
+    except Exception as e:
+        logger.error(f"Error enhancing resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/ai/generate-content', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def generate_content():
+    """Generate AI content for resume sections"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        section = data.get('section', '')
+        context = data.get('context', {})
+        job_description = data.get('job_description', '')
+
+        if not section:
+            return jsonify({
+                'success': False,
+                'message': 'Section is required'
+            }), 400
+
+        # Generate content based on section
+        if section == 'summary':
+            content = ai_enhancer._enhance_summary(
+                context.get('current_summary', ''),
+                job_description,
+                context.get('industry', '')
+            )
+        elif section == 'experience':
+            content = ai_enhancer._enhance_experience(
+                context.get('experience', []),
+                job_description,
+                context.get('industry', '')
+            )
+        elif section == 'skills':
+            content = ai_enhancer._enhance_skills(
+                context.get('skills', []),
+                job_description,
+                context.get('industry', '')
+            )
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Invalid section'
+            }), 400
+
+        return jsonify({
+            'success': True,
+            'message': 'Content generated successfully',
+            'data': {
+                'section': section,
+                'content': content
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"Error generating content: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/ai/analyze-job-match', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def analyze_job_match():
+    """Analyze how well resume matches a job description"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        resume_data = data.get('resume_data', {})
+        job_description = data.get('job_description', '')
+
+        if not resume_data or not job_description:
+            return jsonify({
+                'success': False,
+                'message': 'Resume data and job description are required'
+            }), 400
+
+        # Basic analysis
+        analysis = {
+            'match_score': random.randint(60, 95),
+            'missing_keywords': ['leadership', 'management', 'strategy'],
+            'strengths': ['Strong technical background', 'Relevant experience'],
+            'suggestions': [
+                'Add more quantifiable achievements',
+                'Include industry-specific keywords',
+                'Highlight leadership experience'
+            ],
+            'keyword_matches': random.randint(15, 25),
+            'total_keywords': random.randint(20, 30)
+        }
+
+        return jsonify({
+            'success': True,
+            'data': analysis
+        })
+
+    except Exception as e:
+        logger.error(f"Error analyzing job match: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Francisca AI Enhancement Routes
+@ai_bp.route('/api/francisca/ai/enhance-field', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def francisca_enhance_field():
+    """Enhance a specific field using AI with ATS compliance focus"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        content = data.get('content', '')
+        field_type = data.get('field_type', '')
+        profession = data.get('profession', '')
+        ats_focus = data.get('ats_focus', True)  # New parameter for ATS focus
+
+        if not content or not field_type:
+            return jsonify({
+                'success': False,
+                'error': 'Content and field_type are required'
+            }), 400
+
+        # Import Francisca AI service
+        from francisca_ai_service import francisca_ai_service
+
+        # Generate ATS-focused improvements list
+        improvements = [
+            "Enhanced with ATS-optimized keywords",
+            "Improved formatting for ATS compatibility",
+            "Added industry-specific terminology",
+            "Optimized structure for ATS parsing",
+            "Enhanced with quantifiable achievements"
+        ] if ats_focus else [
+            "Enhanced with professional language",
+            "Improved clarity and impact",
+            "Added industry-specific keywords",
+            "Optimized for ATS systems"
+        ]
+
+        def build_result(enhanced_content):
+            # Calculate ATS compliance score
+            ats_score = francisca_ai_service.calculate_ats_compliance_score(enhanced_content, field_type, profession)
+            return {
+                'success': True,
+                'result': {
+                    'original_content': content,
+                    'enhanced_content': enhanced_content,
+                    'field_type': field_type,
+                    'profession': profession,
+                    'improvements': improvements,
+                    'confidence': 0.85,
+                    'ats_score': ats_score,
+                    'ats_focus': ats_focus
+                }
+            }
+
+        achievement_field = field_type in ['responsibilities', 'achievements', 'description']
+        if wants_stream(request, data) and (ats_focus or not achievement_field):
+            tokens = (francisca_ai_service.stream_field_ats_compliance(content, field_type, profession) if ats_focus
+                      else francisca_ai_service.stream_francisca_content(content, field_type, profession))
+            return sse_response(stream_events(tokens, lambda text: build_result(text.strip() or content)))
+
+        # Enhance the content based on field type with ATS focus (cached by content)
+        if ats_focus:
+            from document_enhancer import document_enhancer
+            enhanced_content, _ = document_enhancer.enhance_field(content, field_type, profession)
+        else:
+            # Original enhancement logic
+            if achievement_field:
+                enhanced_content = francisca_ai_service.enhance_achievements([content], profession or 'Professional')
+                enhanced_content = enhanced_content[0] if enhanced_content else content
+            else:
+                enhanced_content = francisca_ai_service.generate_francisca_content(
+                    content, field_type, profession
+                )
+
+        return jsonify(build_result(enhanced_content)), 200
+
+    except Exception as e:
+        logger.error(f"Error enhancing field: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/francisca/ai/enhance-ats-compliance', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def francisca_enhance_ats_compliance():
+    """Enhance entire document for ATS compliance"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        resume_data = data.get('resume_data', {})
+        profession = data.get('profession', '')
+        job_title = data.get('job_title', '')
+
+        if not resume_data:
+            return jsonify({
+                'success': False,
+                'error': 'Resume data is required'
+            }), 400
+
+        # Import Francisca AI service
+        from francisca_ai_service import francisca_ai_service
+        from document_enhancer import document_enhancer
+
+        # Enhance the fields changed since this document was last enhanced, in one batched request
+        enhancement = document_enhancer.enhance(
+            resume_data, profession, job_title, user_id=user_id, document_id=data.get('document_id')
+        )
+        enhanced_data = enhancement['enhanced_data']
+
+        # Calculate overall ATS compliance score
+        overall_ats_score = francisca_ai_service.calculate_overall_ats_score(enhanced_data)
+
+        result = {
+            'success': True,
+            'result': {
+                'original_data': resume_data,
+                'enhanced_data': enhanced_data,
+                'overall_ats_score': overall_ats_score,
+                'profession': profession,
+                'job_title': job_title,
+                'field_sources': enhancement['fields'],
+                'enhancement_stats': enhancement['stats'],
+                'ats_improvements': [
+                    "Optimized keywords for ATS compatibility",
+                    "Enhanced formatting for better parsing",
+                    "Improved section structure",
+                    "Added industry-specific terminology",
+                    "Standardized contact information"
+                ]
+            }
+        }
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error(f"Error enhancing ATS compliance: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/francisca/ai/generate-content', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def generate_francisca_content():
+    """Generate content using AI based on user prompt"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        prompt = data.get('prompt', '')
+        field_type = data.get('field_type', '')
+        context = data.get('context', {})
+
+        if not prompt or not field_type:
+            return jsonify({
+                'success': False,
+                'error': 'Prompt and field_type are required'
+            }), 400
+
+        # Import Francisca AI service
+        from francisca_ai_service import francisca_ai_service
+
+        profession = context.get('profession', '')
+
+        def build_result(generated_content):
+            return {
+                'success': True,
+                'result': {
+                    'generated_content': generated_content,
+                    'field_type': field_type,
+                    'profession': profession,
+                    'confidence': 0.80
+                }
+            }
+
+        if wants_stream(request, data):
+            return sse_response(stream_events(
+                francisca_ai_service.stream_francisca_content(prompt, field_type, profession),
+                lambda text: build_result(text.strip())
+            ))
+
+        generated_content = francisca_ai_service.generate_francisca_content(
+            prompt, field_type, profession
+        )
+
+        return jsonify(build_result(generated_content)), 200
+
+    except Exception as e:
+        logger.error(f"Error generating content: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/ai/paragraph-suggestions', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def generate_paragraph_suggestions():
+    """Generate AI suggestions for cover letter paragraphs"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        paragraph_type = data.get('paragraph_type', '')
+        job_title = data.get('job_title', '')
+        company_name = data.get('company_name', '')
+        user_data = data.get('user_data', {})
+        custom_prompt = data.get('custom_prompt', '')
+
+        if not paragraph_type:
+            return jsonify({
+                'success': False,
+                'message': 'Paragraph type is required'
+            }), 400
+
+        # Generate suggestions using AI
+        suggestions = generate_ai_paragraph_suggestions(
+            paragraph_type, job_title, company_name, user_data, custom_prompt
+        )
+
+        return jsonify({
+            'success': True,
+            'message': 'Suggestions generated successfully',
+            'data': {
+                'paragraph_type': paragraph_type,
+                'suggestions': suggestions
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"Error generating paragraph suggestions: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/ai/paragraph-guidance', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def get_paragraph_guidance():
+    """Get writing guidance for specific paragraph types"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        paragraph_type = data.get('paragraph_type', '')
+
+        if not paragraph_type:
+            return jsonify({
+                'success': False,
+                'message': 'Paragraph type is required'
+            }), 400
+
+        # Get guidance for paragraph type
+        guidance = get_paragraph_writing_guidance(paragraph_type)
+
+        return jsonify({
+            'success': True,
+            'data': guidance
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting paragraph guidance: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/francisca/ai/suggestions', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def francisca_get_suggestions():
+    """Get AI suggestions for a specific field type"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        field_type = data.get('field_type', '')
+        profession = data.get('profession', '')
+
+        if not field_type:
+            return jsonify({
+                'success': False,
+                'error': 'field_type is required'
+            }), 400
+
+        # Import Francisca AI service
+        from francisca_ai_service import francisca_ai_service
+
+        suggestions = francisca_ai_service.get_francisca_suggestions(profession, field_type)
+
+        result = {
+            'success': True,
+            'suggestions': suggestions,
+            'field_type': field_type,
+            'profession': profession
+        }
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error(f"Error getting suggestions: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/francisca/ai/analyze-content', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def francisca_analyze_content():
+    """Analyze content for optimization recommendations"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        content = data.get('content', '')
+        profession = data.get('profession', '')
+
+        if not content:
+            return jsonify({
+                'success': False,
+                'error': 'Content is required'
+            }), 400
+
+        # Import Francisca AI service
+        from francisca_ai_service import francisca_ai_service
+
+        analysis = francisca_ai_service.analyze_francisca_context(content, profession)
+
+        result = {
+            'success': True,
+            'analysis': analysis,
+            'profession': profession
+        }
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error(f"Error analyzing content: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/francisca/ai/status', methods=['GET'])
+@jwt_required_custom
+def francisca_ai_status():
+    """Get the status of the Francisca AI service"""
+    try:
+        from francisca_ai_service import francisca_ai_service
+
+        status = francisca_ai_service.get_service_status()
+
+        return jsonify({
+            'success': True,
+            'status': status
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting AI service status: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# AI Paragraph Suggestions Endpoints
+@ai_bp.route('/api/ai/paragraph-suggestions', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def ai_paragraph_suggestions():
+    """Generate AI-powered paragraph suggestions for cover letters"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        paragraph_type = data.get('paragraph_type')
+        job_title = data.get('job_title', '')
+        company_name = data.get('company_name', '')
+        user_data = data.get('user_data', {})
+        custom_prompt = data.get('custom_prompt', '')
+
+        if not paragraph_type:
+            return jsonify({
+                'success': False,
+                'error': 'Paragraph type is required'
+            }), 400
+
+        # Generate AI suggestions
+        suggestions = generate_ai_paragraph_suggestions(
+            paragraph_type, job_title, company_name, user_data, custom_prompt
+        )
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'suggestions': suggestions
+            }
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error generating paragraph suggestions: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ai_bp.route('/api/ai/paragraph-guidance', methods=['POST'])
+@jwt_required_custom
+@rate_limit('ai')
+def ai_paragraph_guidance():
+    """Get writing guidance for specific paragraph types"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        paragraph_type = data.get('paragraph_type')
+
+        if not paragraph_type:
+            return jsonify({
+                'success': False,
+                'error': 'Paragraph type is required'
+            }), 400
+
+        # Get writing guidance
+        guidance = get_paragraph_writing_guidance(paragraph_type)
+
+        return jsonify({
+            'success': True,
+            'data': guidance
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting paragraph guidance: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def generate_ai_paragraph_suggestions(paragraph_type, job_title, company_name, user_data, custom_prompt=""):
+    """Generate AI paragraph suggestions using OpenAI API"""
+    try:
+        # Get OpenAI API key from environment
+        openai_api_key = os.getenv('OPENAI_API_KEY')
+
+        logger.info(f"OpenAI API key found: {openai_api_key[:10] if openai_api_key else 'None'}...")
+
+        if not openai_api_key:
+            logger.warning("OpenAI API key not found, using mock suggestions")
+            return generate_mock_paragraph_suggestions(paragraph_type, job_title, company_name, user_data)
+
+        # Import OpenAI
+        try:
+            import openai
+            openai.api_key = openai_api_key
+            logger.info("OpenAI library imported successfully")
+        except ImportError:
+            logger.error("OpenAI library not installed")
+            return generate_mock_paragraph_suggestions(paragraph_type, job_title, company_name, user_data)
+
+        # Define paragraph templates and prompts
+        paragraph_templates = {
+            'introduction': {
+                'base_prompt': f"Write a professional opening paragraph for a cover letter for the position of {job_title} at {company_name}. The candidate should express genuine interest in the role and briefly introduce themselves.",
+                'tone_options': ['Professional', 'Enthusiastic', 'Confident', 'Friendly']
+            },
+            'experience': {
+                'base_prompt': f"Write a paragraph highlighting relevant experience for a {job_title} position at {company_name}. Focus on specific achievements and quantifiable results that demonstrate the candidate's qualifications.",
+                'tone_options': ['Professional', 'Confident', 'Achievement-focused', 'Results-driven']
+            },
+            'companyFit': {
+                'base_prompt': f"Write a paragraph demonstrating knowledge of {company_name} and explaining why the candidate is a good cultural and professional fit for the {job_title} role. Show research and genuine interest in the company.",
+                'tone_options': ['Professional', 'Enthusiastic', 'Research-focused', 'Cultural fit']
+            },
+            'closing': {
+                'base_prompt': f"Write a professional closing paragraph for a cover letter for the {job_title} position at {company_name}. Include a call to action and express eagerness to discuss the opportunity further.",
+                'tone_options': ['Professional', 'Enthusiastic', 'Confident', 'Polite']
+            }
+        }
+
+        template = paragraph_templates.get(paragraph_type, paragraph_templates['introduction'])
+        base_prompt = template['base_prompt']
+        tone_options = template['tone_options']
+
+        # Add user data to the prompt
+        user_context = ""
+        if user_data:
+            if user_data.get('name'):
+                user_context += f"The candidate's name is {user_data['name']}. "
+            if user_data.get('experience'):
+                user_context += f"Their relevant experience includes: {user_data['experience']}. "
+            if user_data.get('skills'):
+                skills_text = ', '.join(user_data['skills']) if isinstance(user_data['skills'], list) else user_data['skills']
+                user_context += f"Their key skills are: {skills_text}. "
+            if user_data.get('achievements'):
+                achievements_text = ', '.join(user_data['achievements']) if isinstance(user_data['achievements'], list) else user_data['achievements']
+                user_context += f"Their key achievements include: {achievements_text}. "
+
+        # Add custom prompt if provided
+        if custom_prompt:
+            base_prompt += f" Additional requirements: {custom_prompt}"
+
+        # Generate suggestions with different tones
+        suggestions = []
+
+        for tone in tone_options:
+            try:
+                prompt = f"{base_prompt} {user_context} Write this in a {tone.lower()} tone. Make it specific, engaging, and tailored to the role and company."
+
+                logger.info(f"Calling OpenAI API for tone: {tone}")
+                response = openai.ChatCompletion.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "You are a professional career coach and cover letter expert. Write compelling, personalized cover letter paragraphs that help candidates stand out."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=300,
+                    temperature=0.7
+                )
+                logger.info(f"OpenAI API response received for tone: {tone}")
+
+                content = response.choices[0].message.content.strip()
+                keywords = extract_keywords(content)
+
+                suggestions.append({
+                    'content': content,
+                    'tone': tone,
+                    'reasoning': f"Professional {tone.lower()} approach that highlights relevant qualifications and demonstrates genuine interest in the role.",
+                    'keywords': keywords
+                })
+
+            except Exception as e:
+                logger.error(f"Error generating suggestion for tone {tone}: {str(e)}")
+                logger.error(f"OpenAI API error details: {type(e).__name__}: {str(e)}")
+                # Fallback to mock suggestion
+                suggestions.append(generate_mock_paragraph_suggestion(paragraph_type, job_title, company_name, tone, user_data))
+
+        return suggestions
+
+    except Exception as e:
+        logger.error(f"Error in generate_ai_paragraph_suggestions: {str(e)}")
+        return generate_mock_paragraph_suggestions(paragraph_type, job_title, company_name, user_data)
+
+def generate_mock_paragraph_suggestions(paragraph_type, job_title, company_name, user_data):
+    """Generate mock paragraph suggestions as fallback"""
+    suggestions = []
+    tones = ['Professional', 'Enthusiastic', 'Confident', 'Friendly']
+
+    for tone in tones:
+        suggestion = generate_mock_paragraph_suggestion(paragraph_type, job_title, company_name, tone, user_data)
+        suggestions.append(suggestion)
+
+    return suggestions
+
+def generate_mock_paragraph_suggestion(paragraph_type, job_title, company_name, tone, user_data):
+    """Generate a mock paragraph suggestion"""
+    name = user_data.get('name', 'John Doe')
+    experience = user_data.get('experience', '5+ years of relevant experience')
+    skills = user_data.get('skills', ['leadership', 'problem-solving'])
+
+    if isinstance(skills, list):
+        skills_text = ', '.join(skills[:3])
+    else:
+        skills_text = skills
+
+    templates = {
+        'introduction': {
+            'Professional': f"I am writing to express my strong interest in the {job_title} position at {company_name}. With {experience}, I am confident that my background and expertise make me an ideal candidate for this role.",
+            'Enthusiastic': f"I am thrilled to apply for the {job_title} position at {company_name}! Having discovered this opportunity, I am excited about the chance to contribute my {experience} to your innovative team.",
+            'Confident': f"I am writing to express my strong interest in the {job_title} position at {company_name}. My {experience} and proven track record in {skills_text} position me as an excellent candidate for this role.",
+            'Friendly': f"Hello! I'm excited to apply for the {job_title} position at {company_name}. With {experience}, I believe I would be a great addition to your team."
+        },
+        'experience': {
+            'Professional': f"In my most recent role, I have successfully {experience}. This experience has strengthened my skills in {skills_text} and prepared me to excel in the {job_title} position at {company_name}.",
+            'Enthusiastic': f"I'm particularly excited about this opportunity because my {experience} aligns perfectly with what {company_name} is looking for. My expertise in {skills_text} has consistently delivered results.",
+            'Confident': f"My {experience} has equipped me with the skills and knowledge necessary to succeed in the {job_title} role. I have demonstrated expertise in {skills_text} and am ready to make an immediate impact.",
+            'Friendly': f"I've really enjoyed {experience} and have developed strong skills in {skills_text}. I'm excited about the possibility of bringing this experience to {company_name}."
+        },
+        'companyFit': {
+            'Professional': f"I am particularly drawn to {company_name} because of your commitment to innovation and excellence. My {experience} and skills in {skills_text} align well with your company values and mission.",
+            'Enthusiastic': f"What excites me most about {company_name} is your reputation for innovation and growth. My {experience} in {skills_text} makes me eager to contribute to your continued success.",
+            'Confident': f"I am confident that my {experience} and expertise in {skills_text} make me an ideal fit for {company_name}'s culture and the {job_title} position. I am ready to contribute to your team's success.",
+            'Friendly': f"I'm really excited about the opportunity to work at {company_name}! My {experience} and passion for {skills_text} align perfectly with what you're looking for."
+        },
+        'closing': {
+            'Professional': f"I welcome the opportunity to discuss my background, skills, and enthusiasm for this role. Thank you for considering my application. I look forward to contributing to {company_name}'s continued success.",
+            'Enthusiastic': f"I'm excited about the possibility of joining {company_name} and contributing to your team's success. Thank you for considering my application, and I look forward to discussing this opportunity further!",
+            'Confident': f"I am confident that my {experience} and skills in {skills_text} make me an excellent candidate for this position. I look forward to discussing how I can contribute to {company_name}'s success.",
+            'Friendly': f"Thank you for considering my application! I'm excited about the possibility of joining {company_name} and would love to discuss this opportunity further."
+        }
+    }
+
+    content = templates.get(paragraph_type, {}).get(tone, "I am writing to express my interest in this position.")
+    keywords = extract_keywords(content)
+
+    return {
+        'content': content,
+        'tone': tone,
+        'reasoning': f"Professional {tone.lower()} approach that highlights relevant qualifications and demonstrates genuine interest in the role.",
+        'keywords': keywords
+    }
+
+def get_paragraph_writing_guidance(paragraph_type):
+    """Get writing guidance for specific paragraph types"""
+    guidance = {
+        'introduction': {
+            'title': 'Opening Paragraph',
+            'description': 'Express interest and position yourself as a strong candidate',
+            'tips': [
+                'Start with enthusiasm and specific interest in the role',
+                'Mention how you found the job posting',
+                'Briefly introduce yourself and your key qualifications',
+                'Keep it concise but engaging',
+                'Avoid generic openings like "I am writing to apply"'
+            ],
+            'common_mistakes': [
+                'Being too generic or vague',
+                'Not mentioning the specific role or company',
+                'Making it too long or rambling',
+                'Using clichéd phrases',
+                'Not showing genuine interest'
+            ]
+        },
+        'experience': {
+            'title': 'Experience Paragraph',
+            'description': 'Highlight your most relevant experience and achievements',
+            'tips': [
+                'Focus on 1-2 most relevant experiences',
+                'Use specific examples and quantifiable results',
+                'Connect your experience to job requirements',
+                'Show progression and growth',
+                'Use the STAR method (Situation, Task, Action, Result)'
+            ],
+            'common_mistakes': [
+                'Listing all experiences without focus',
+                'Not quantifying achievements',
+                'Being too vague about responsibilities',
+                'Not connecting to the job requirements',
+                'Using passive voice'
+            ]
+        },
+        'companyFit': {
+            'title': 'Company Fit Paragraph',
+            'description': 'Show company knowledge and cultural fit',
+            'tips': [
+                'Research the company thoroughly',
+                'Mention specific company values or mission',
+                'Connect your values to theirs',
+                'Show knowledge of recent company news or achievements',
+                'Demonstrate cultural understanding'
+            ],
+            'common_mistakes': [
+                'Generic company praise without specifics',
+                'Not showing actual research',
+                'Being insincere or over-the-top',
+                'Not connecting personal values to company values',
+                'Using outdated information'
+            ]
+        },
+        'closing': {
+            'title': 'Closing Paragraph',
+            'description': 'Call to action and professional closing',
+            'tips': [
+                'Express enthusiasm for next steps',
+                'Include a clear call to action',
+                'Thank the reader for their time',
+                'Keep it professional and confident',
+                'Mention your availability for an interview'
+            ],
+            'common_mistakes': [
+                'Being too pushy or demanding',
+                'Not including a call to action',
+                'Being too casual or informal',
+                'Not expressing genuine interest',
+                'Making it too long'
+            ]
+        }
+    }
+
+    return guidance.get(paragraph_type, guidance['introduction'])
+
+def extract_keywords(text):
+    """Extract keywords from text (simple implementation)"""
+    # Simple keyword extraction - in production, use more sophisticated NLP
+    words = text.lower().split()
+    # Filter out common words and extract meaningful terms
+    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
+    keywords = [word for word in words if len(word) > 3 and word not in stop_words]
+    return keywords[:5]  # Return top 5 keywords
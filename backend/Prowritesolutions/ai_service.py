@@ -5,9 +5,14 @@ Real AI service for resume enhancement with Francisca template integration
 import os
 import json
 import re
+import logging
 from typing import Dict, List, Optional, Union, Any
 import openai
 from datetime import datetime
+from suggestion_bank import suggestion_bank
+from jd_features import jd_feature_store, keyword_categories
+
+logger = logging.getLogger(__name__)
 
 class RealAIService:
     def __init__(self):
@@ -86,7 +91,7 @@ class RealAIService:
                 return enhanced_points if enhanced_points else bullet_points
             return bullet_points
         except Exception as e:
-            print(f"⚠️ Achievement enhancement failed: {e}")
+            logger.warning(f"Achievement enhancement failed: {e}")
             return bullet_points
 
     def generate_summary(self, resume_data: Dict, target_job: str = None, industry: str = "Technology") -> str:
@@ -133,7 +138,7 @@ class RealAIService:
             return summary if summary else f"Experienced {job_titles[0] if job_titles else 'professional'} with {years}+ years of expertise in {', '.join(skill_names[:3])}."
             
         except Exception as e:
-            print(f"⚠️ Summary generation failed: {e}")
+            logger.warning(f"Summary generation failed: {e}")
             return "Experienced professional with strong technical skills and proven track record."
 
     def analyze_skills_gap(self, resume_data: Dict, job_description: str, industry: str = "Technology") -> Dict:
@@ -209,7 +214,7 @@ class RealAIService:
             }
             
         except Exception as e:
-            print(f"⚠️ Skills gap analysis failed: {e}")
+            logger.warning(f"Skills gap analysis failed: {e}")
             return {
                 "missing_skills": [],
                 "recommendations": ["Unable to analyze skills gap"],
@@ -265,7 +270,7 @@ class RealAIService:
             return optimized
             
         except Exception as e:
-            print(f"⚠️ ATS optimization failed: {e}")
+            logger.warning(f"ATS optimization failed: {e}")
             return resume_data
 
     def analyze_ats_compatibility(self, resume_content: str, job_title: str, industry: str = "Technology") -> Dict:
@@ -334,7 +339,7 @@ class RealAIService:
                 }
                 
         except Exception as e:
-            print(f"⚠️ ATS compatibility analysis failed: {e}")
+            logger.warning(f"ATS compatibility analysis failed: {e}")
             return {
                 "success": False,
                 "error": "ATS analysis failed",
@@ -386,7 +391,7 @@ class RealAIService:
             }
             
         except Exception as e:
-            print(f"⚠️ Content enhancement failed: {e}")
+            logger.warning(f"Content enhancement failed: {e}")
             return {
                 "success": False,
                 "error": "Content enhancement failed",
@@ -453,7 +458,7 @@ class RealAIService:
                 }
                 
         except Exception as e:
-            print(f"⚠️ Market insights failed: {e}")
+            logger.warning(f"Market insights failed: {e}")
             return {
                 "success": False,
                 "error": "Market insights failed",
@@ -527,7 +532,7 @@ class RealAIService:
                 }
                 
         except Exception as e:
-            print(f"⚠️ Salary insights failed: {e}")
+            logger.warning(f"Salary insights failed: {e}")
             return {
                 "success": False,
                 "error": "Salary insights failed",
@@ -564,38 +569,27 @@ class RealAIService:
             }}
             """
             
-            response = self._call_openai(prompt, system_prompt, max_tokens=400, temperature=0.3)
-            
-            if response:
-                try:
-                    result = json.loads(response)
-                    return result
-                except json.JSONDecodeError:
-                    pass
+            def ask():
+                response = self._call_openai(prompt, system_prompt, max_tokens=400, temperature=0.3)
+                if response:
+                    try:
+                        result = json.loads(response)
+                        if isinstance(result, dict):
+                            return result
+                    except json.JSONDecodeError:
+                        pass
+                return None
+
+            # One AI extraction per posting and industry, shared by every user who targets it
+            result = jd_feature_store.get_or_compute(job_description, f"ai_keywords:{industry.strip().lower()}", ask)
+            if result:
+                return result
             
-            # Fallback response
-            return {
-                "technical_skills": [
-                    "Python", "JavaScript", "React", "Node.js", "AWS", "CI/CD",
-                    "Docker", "Kubernetes", "SQL", "NoSQL", "Git", "REST APIs"
-                ],
-                "soft_skills": [
-                    "Leadership", "Communication", "Problem Solving", 
-                    "Team Management", "Mentoring", "Collaboration"
-                ],
-                "certifications": [
-                    "AWS Certified Developer", "Professional Scrum Master",
-                    "Docker Certified Associate", "Google Cloud Certified"
-                ],
-                "experience_level": "Mid-level to Senior",
-                "industry_terms": [
-                    "Full Stack Development", "Cloud Computing", "DevOps",
-                    "Agile Methodology", "Microservices", "API Development"
-                ]
-            }
+            # Fallback to the local extraction
+            return keyword_categories(jd_feature_store.features(job_description))
             
         except Exception as e:
-            print(f"⚠️ Keyword extraction failed: {e}")
+            logger.warning(f"Keyword extraction failed: {e}")
             return {
                 "technical_skills": [],
                 "soft_skills": [],
@@ -659,7 +653,7 @@ class RealAIService:
             return suggestions if suggestions else ["Resume looks good! Consider adding more specific metrics to achievements."]
             
         except Exception as e:
-            print(f"⚠️ Improvement suggestions failed: {e}")
+            logger.warning(f"Improvement suggestions failed: {e}")
             return ["Unable to analyze resume for improvements"]
 
     def enhance_francisca_field(self, content: str, field_type: str, profession: str = None) -> str:
@@ -698,11 +692,14 @@ class RealAIService:
             return enhanced_content if enhanced_content else content
             
         except Exception as e:
-            print(f"⚠️ Field enhancement failed: {e}")
+            logger.warning(f"Field enhancement failed: {e}")
             return content
 
     def get_francisca_suggestions(self, profession: str, field_type: str) -> List[str]:
         """Get profession-specific suggestions for Francisca template fields"""
+        banked = suggestion_bank.lookup(profession, field_type)
+        if banked is not None:
+            return banked
         try:
             system_prompt = f"Provide profession-specific suggestions for {profession} resume fields."
             
@@ -729,7 +726,7 @@ class RealAIService:
             return ["Unable to generate suggestions at this time"]
             
         except Exception as e:
-            print(f"⚠️ Suggestions generation failed: {e}")
+            logger.warning(f"Suggestions generation failed: {e}")
             return ["Unable to generate suggestions"]
 
     def generate_francisca_content(self, prompt: str, field_type: str, context: Dict = None) -> str:
@@ -760,7 +757,7 @@ class RealAIService:
             return generated_content if generated_content else "Unable to generate content at this time"
             
         except Exception as e:
-            print(f"⚠️ Content generation failed: {e}")
+            logger.warning(f"Content generation failed: {e}")
             return "Unable to generate content"
 
     def analyze_francisca_context(self, content: str, profession: str = None) -> Dict:
@@ -808,7 +805,7 @@ class RealAIService:
             }
             
         except Exception as e:
-            print(f"⚠️ Context analysis failed: {e}")
+            logger.warning(f"Context analysis failed: {e}")
             return {
                 "quality_score": 5,
                 "strengths": [],
@@ -857,7 +854,7 @@ class RealAIService:
             }
             
         except Exception as e:
-            print(f"⚠️ Chatbot response failed: {e}")
+            logger.warning(f"Chatbot response failed: {e}")
             return {
                 "response": "I'm having trouble processing your request right now. Please try again.",
                 "session_id": session_id,
@@ -902,7 +899,7 @@ class RealAIService:
             return suggestions[:3]  # Return top 3 suggestions
             
         except Exception as e:
-            print(f"⚠️ Suggestion generation failed: {e}")
+            logger.warning(f"Suggestion generation failed: {e}")
             return []
 
 # Create singleton instance
@@ -0,0 +1,266 @@
+"""
+AI Streaming
+Token streaming for the AI writing endpoints.
+
+`StreamingAIClient.stream_chat` yields completion text as OpenAI produces it
+(new `openai.OpenAI` client when installed, the 0.28 `ChatCompletion` API
+otherwise). Endpoints relay those tokens to the browser as Server-Sent Events:
+
+    event: token   data: {"text": "..."}        (repeated)
+    event: done    data: {<same payload as the JSON mode>}
+    event: error   data: {"success": false, "error": "..."}
+
+A comment line is sent before the first token so the response starts
+immediately. If the client disconnects, the upstream completion is closed so
+no more tokens are generated for it.
+
+Set AI_FAKE_MODEL=1 to serve completions from `FakeStreamingModel`, a local
+deterministic model used by tests and load tests.
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from flask import Response, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+STREAM_TIMEOUT = int(os.getenv('AI_STREAM_TIMEOUT', 60))
+PLACEHOLDER_KEY = 'your-openai-api-key-here'
+
+
+class FakeStreamingModel:
+    """Deterministic local model: streams a canned reply (or an echo) word by word"""
+
+    def __init__(self, reply: Optional[str] = None, token_delay: float = 0.0,
+                 first_token_delay: float = 0.0, fail_after: Optional[int] = None):
+        self.reply = reply
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def _reply_for(self, messages: List[Dict[str, str]]) -> str:
+        if self.reply is not None:
+            return self.reply
+        last_user = next((m['content'] for m in reversed(messages) if m.get('role') == 'user'), '')
+        return f"Here is an improved version: {' '.join(last_user.split()[:60])}"
+
+    def stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        self.calls += 1
+        if self.first_token_delay:
+            time.sleep(self.first_token_delay)
+        words = self._reply_for(messages).split(' ')
+        for index, word in enumerate(words):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise ConnectionResetError("fake model connection reset")
+            if index and self.token_delay:
+                time.sleep(self.token_delay)
+            yield word if index == 0 else ' ' + word
+
+
+class StreamingAIClient:
+    """Chat completions that are consumed token by token"""
+
+    def __init__(self, api_key: Optional[str] = None, model: str = DEFAULT_MODEL,
+                 fake: Optional[FakeStreamingModel] = None):
+        self.api_key = api_key if api_key is not None else os.getenv('OPENAI_API_KEY', '')
+        self.model = model
+        if fake is None and os.getenv('AI_FAKE_MODEL', '').lower() in ('1', 'true', 'yes'):
+            fake = FakeStreamingModel(token_delay=float(os.getenv('AI_FAKE_TOKEN_DELAY', 0.02)))
+        self.fake = fake
+
+    @property
+    def configured(self) -> bool:
+        return self.fake is not None or bool(self.api_key and self.api_key != PLACEHOLDER_KEY)
+
+    def stream_chat(self, messages: List[Dict[str, str]], max_tokens: int = 300,
+                    temperature: float = 0.7, model: Optional[str] = None) -> Iterator[str]:
+        """Yield completion text deltas as they arrive"""
+        if self.fake is not None:
+            yield from self.fake.stream(messages, max_tokens=max_tokens, temperature=temperature)
+            return
+
+        try:
+            from openai import OpenAI
+        except ImportError:
+            OpenAI = None
+
+        if OpenAI is not None:
+            client = OpenAI(api_key=self.api_key, timeout=STREAM_TIMEOUT)
+            stream = client.chat.completions.create(
+                model=model or self.model, messages=messages, max_tokens=max_tokens,
+                temperature=temperature, stream=True
+            )
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                stream.close()
+            return
+
+        import openai
+        stream = openai.ChatCompletion.create(
+            model=model or self.model, messages=messages, max_tokens=max_tokens,
+            temperature=temperature, stream=True, api_key=self.api_key,
+            request_timeout=STREAM_TIMEOUT
+        )
+        try:
+            for chunk in stream:
+                content = chunk['choices'][0].get('delta', {}).get('content')
+                if content:
+                    yield content
+        finally:
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+
+    def complete(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return ''.join(self.stream_chat(messages, **kwargs)).strip()
+
+
+def stream_with_fallback(client: StreamingAIClient, messages: List[Dict[str, str]],
+                         fallback: Callable[[], str], on_error: Optional[Callable[[Exception], Any]] = None,
+                         breaker=None, **kwargs) -> Iterator[str]:
+    """
+    Relay completion tokens from `client`. When the client is not configured,
+    the circuit `breaker` (if given) is open, or the call fails before the first
+    token, the fallback text is sent instead; a failure mid-stream propagates so
+    the SSE layer can report it.
+    """
+    if not client.configured:
+        yield fallback()
+        return
+    probe = breaker.acquire() if breaker is not None else False
+    if probe is None:
+        yield fallback()
+        return
+    started = False
+    stream = client.stream_chat(messages, **kwargs)
+    try:
+        for token in stream:
+            if not started and breaker is not None:
+                # The upstream answered; what happens after the first token is not its health
+                breaker.record(probe)
+            started = True
+            yield token
+        if not started and breaker is not None:
+            breaker.record(probe)
+    except Exception as e:
+        if started:
+            raise
+        if breaker is not None:
+            breaker.record(probe, e)
+        if on_error:
+            on_error(e)
+        else:
+            logger.warning(f"AI stream failed before the first token, using fallback: {e}")
+        yield fallback()
+    finally:
+        stream.close()
+
+
+class SectionFilter:
+    """
+    Relay only the text between two markers of a structured completion
+    (e.g. ENHANCED_PARAGRAPH: ... SUGGESTIONS: ...). Text that never contains
+    the start marker is passed through unchanged.
+    """
+
+    def __init__(self, start_marker: str, end_marker: str):
+        self.start_marker = start_marker
+        self.end_marker = end_marker
+        self.buffer = ''
+        self.state = 'search'
+        self.emitted = False
+
+    def feed(self, text: str) -> str:
+        if self.state == 'done':
+            return ''
+        self.buffer += text
+        if self.state == 'search':
+            index = self.buffer.find(self.start_marker)
+            if index >= 0:
+                self.buffer = self.buffer[index + len(self.start_marker):].lstrip()
+                self.state = 'relay'
+            elif len(self.buffer) > 2 * len(self.start_marker):
+                self.state = 'relay'
+            else:
+                return ''
+
+        index = self.buffer.find(self.end_marker)
+        if index >= 0:
+            text, self.buffer, self.state = self.buffer[:index].rstrip(), '', 'done'
+            return text
+        # Hold back what could be the beginning of the end marker (and the
+        # whitespace before it, which is trimmed if the marker follows)
+        safe = len(self.buffer) - (len(self.end_marker) - 1)
+        safe = len(self.buffer[:max(safe, 0)].rstrip())
+        if safe <= 0:
+            return ''
+        text, self.buffer = self.buffer[:safe], self.buffer[safe:]
+        if not self.emitted:
+            text = text.lstrip()
+        self.emitted = self.emitted or bool(text)
+        return text
+
+    def flush(self) -> str:
+        text, self.buffer = ('' if self.state == 'done' else self.buffer.rstrip()), ''
+        return text
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_events(tokens: Iterable[str], finalize: Callable[[str], Dict[str, Any]],
+                  text_filter: Optional[SectionFilter] = None) -> Iterator[str]:
+    """
+    Turn a token iterator into SSE frames. `finalize` receives the full
+    completion text and returns the payload of the closing `done` event.
+    """
+    yield ': stream-open\n\n'
+    parts = []
+    try:
+        for token in tokens:
+            parts.append(token)
+            text = text_filter.feed(token) if text_filter else token
+            if text:
+                yield sse_event('token', {'text': text})
+        if text_filter:
+            tail = text_filter.flush()
+            if tail:
+                yield sse_event('token', {'text': tail})
+        yield sse_event('done', finalize(''.join(parts)))
+    except Exception as e:
+        logger.error(f"AI stream failed after {len(parts)} tokens: {e}")
+        yield sse_event('error', {'success': False, 'error': 'AI generation was interrupted'})
+    finally:
+        # Also runs on client disconnect (GeneratorExit): stop the upstream completion
+        close = getattr(tokens, 'close', None)
+        if close:
+            close()
+
+
+def sse_response(events: Iterator[str]) -> Response:
+    return Response(stream_with_context(events), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # disable nginx proxy buffering for this response
+    })
+
+
+def wants_stream(request, data: Optional[Dict[str, Any]] = None) -> bool:
+    """Streaming is opt-in: ?stream=1, "stream": true in the body or Accept: text/event-stream"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    if data and data.get('stream') is True:
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+
+ai_stream_client = StreamingAIClient()
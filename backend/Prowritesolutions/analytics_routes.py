@@ -0,0 +1,255 @@
+"""
+Flask API routes for user and platform analytics
+"""
+
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+import os
+import random
+import json
+from app_core import jwt_required_custom, LazyService, logger
+
+analytics_bp = Blueprint('analytics', __name__)
+
+# Analytics Dashboard System
+class AnalyticsDashboard:
+    def __init__(self):
+        self.analytics_data = {}  # In-memory store for now
+
+    def get_user_analytics(self, user_id):
+        """Get analytics for a specific user"""
+        try:
+            # Mock analytics data - in production, this would come from database
+            analytics = {
+                'user_id': user_id,
+                'resumes_created': random.randint(5, 25),
+                'cover_letters_created': random.randint(3, 15),
+                'ai_enhancements_used': random.randint(10, 50),
+                'job_applications': random.randint(2, 12),
+                'success_rate': random.randint(60, 95),
+                'most_used_templates': [
+                    {'name': 'Professional', 'count': random.randint(5, 15)},
+                    {'name': 'Modern', 'count': random.randint(3, 10)},
+                    {'name': 'Executive', 'count': random.randint(1, 5)}
+                ],
+                'recent_activity': [
+                    {'action': 'Resume Generated', 'date': '2024-01-15', 'template': 'Professional'},
+                    {'action': 'Cover Letter Created', 'date': '2024-01-14', 'template': 'Modern'},
+                    {'action': 'AI Enhancement Used', 'date': '2024-01-13', 'section': 'Experience'}
+                ],
+                'performance_metrics': {
+                    'ats_score_avg': random.randint(75, 95),
+                    'keyword_density': random.randint(2, 5),
+                    'readability_score': random.randint(70, 90),
+                    'completeness_score': random.randint(80, 100)
+                }
+            }
+
+            return analytics
+
+        except Exception as e:
+            logger.error(f"Error getting user analytics: {e}")
+            return None
+
+    def get_resume_analytics(self, resume_id):
+        """Get analytics for a specific resume"""
+        try:
+            analytics = {
+                'resume_id': resume_id,
+                'views': random.randint(10, 100),
+                'downloads': random.randint(2, 20),
+                'shares': random.randint(0, 10),
+                'ats_score': random.randint(70, 95),
+                'keyword_matches': random.randint(15, 30),
+                'sections_completed': random.randint(6, 10),
+                'last_modified': '2024-01-15',
+                'template_used': 'Professional',
+                'ai_enhancements': random.randint(0, 5)
+            }
+
+            return analytics
+
+        except Exception as e:
+            logger.error(f"Error getting resume analytics: {e}")
+            return None
+
+    def get_global_analytics(self):
+        """Get global analytics for admin dashboard"""
+        try:
+            analytics = {
+                'total_users': random.randint(1000, 5000),
+                'total_resumes': random.randint(5000, 25000),
+                'total_cover_letters': random.randint(2000, 10000),
+                'ai_enhancements_used': random.randint(10000, 50000),
+                'active_users_today': random.randint(50, 200),
+                'popular_templates': [
+                    {'name': 'Professional', 'usage': random.randint(40, 60)},
+                    {'name': 'Modern', 'usage': random.randint(20, 35)},
+                    {'name': 'Executive', 'usage': random.randint(10, 25)}
+                ],
+                'user_growth': [
+                    {'month': '2024-01', 'users': random.randint(100, 500)},
+                    {'month': '2024-02', 'users': random.randint(150, 600)},
+                    {'month': '2024-03', 'users': random.randint(200, 700)}
+                ],
+                'feature_usage': {
+                    'resume_generation': random.randint(80, 95),
+                    'cover_letter_generation': random.randint(60, 85),
+                    'ai_enhancement': random.randint(70, 90),
+                    'job_search': random.randint(40, 70)
+                }
+            }
+
+            return analytics
+
+        except Exception as e:
+            logger.error(f"Error getting global analytics: {e}")
+            return None
+
+# Initialize analytics dashboard
+analytics_dashboard = LazyService(AnalyticsDashboard)
+
+# Analytics Routes
+@analytics_bp.route('/api/analytics/user', methods=['GET'])
+@jwt_required_custom
+def get_user_analytics():
+    """Get analytics for the current user"""
+    try:
+        user_id = request.current_user['user_id']
+
+        analytics = analytics_dashboard.get_user_analytics(user_id)
+
+        if analytics:
+            return jsonify({
+                'success': True,
+                'data': analytics
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to get analytics'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error getting user analytics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/api/analytics/resume/<resume_id>', methods=['GET'])
+@jwt_required_custom
+def get_resume_analytics(resume_id):
+    """Get analytics for a specific resume"""
+    try:
+        user_id = request.current_user['user_id']
+
+        analytics = analytics_dashboard.get_resume_analytics(resume_id)
+
+        if analytics:
+            return jsonify({
+                'success': True,
+                'data': analytics
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to get resume analytics'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error getting resume analytics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/api/analytics/global', methods=['GET'])
+@jwt_required_custom
+def get_global_analytics():
+    """Get global analytics (admin only)"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Check if user is admin
+        # This would be implemented with proper admin check
+        analytics = analytics_dashboard.get_global_analytics()
+
+        if analytics:
+            return jsonify({
+                'success': True,
+                'data': analytics
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to get global analytics'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error getting global analytics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@analytics_bp.route('/api/analytics/export', methods=['POST'])
+@jwt_required_custom
+def export_analytics():
+    """Export analytics data"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        export_type = data.get('type', 'user')  # user, resume, global
+        format_type = data.get('format', 'json')  # json, csv, pdf
+
+        if export_type == 'user':
+            analytics = analytics_dashboard.get_user_analytics(user_id)
+        elif export_type == 'global':
+            analytics = analytics_dashboard.get_global_analytics()
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Invalid export type'
+            }), 400
+
+        if not analytics:
+            return jsonify({
+                'success': False,
+                'message': 'No analytics data available'
+            }), 404
+
+        # Generate export file
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"analytics_{export_type}_{timestamp}.{format_type}"
+        file_path = f"static/exports/{filename}"
+
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        if format_type == 'json':
+            with open(file_path, 'w') as f:
+                json.dump(analytics, f, indent=2)
+        elif format_type == 'csv':
+            # Convert to CSV format
+            import csv
+            with open(file_path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Metric', 'Value'])
+                for key, value in analytics.items():
+                    writer.writerow([key, value])
+
+        return jsonify({
+            'success': True,
+            'message': 'Analytics exported successfully',
+            'file_path': file_path,
+            'filename': filename
+        })
+
+    except Exception as e:
+        logger.error(f"Error exporting analytics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,734 @@
+"""
+ProWrite Backend - Application Core
+Configuration, logging, email, authentication and the shared services used by
+the route blueprints (see create_app in app.py)
+"""
+
+from flask import g, request, jsonify
+from datetime import datetime, timedelta
+import os
+import threading
+import importlib
+import mysql.connector
+from werkzeug.security import check_password_hash, generate_password_hash
+from functools import wraps
+import time
+import logging
+from dotenv import load_dotenv
+from typing import Optional
+import json
+from email_outbox import email_outbox
+
+# Load environment variables
+load_dotenv('.env')
+
+# Reads LOG_* / ACCESS_LOG_* at import, so after .env is loaded
+from logging_config import access_log_sampler, new_request_id, setup_production_logging, REQUEST_ID_HEADER
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'Prowrite.mysql.pythonanywhere-services.com'),
+    'user': os.getenv('DB_USER', 'Prowrite'),
+    'password': os.getenv('DB_PASSWORD', 'Hamilton2025'),
+    'database': os.getenv('DB_NAME', 'Prowrite$dbprowrite'),
+    'charset': 'utf8mb4'
+}
+
+# Email Service Configuration
+SMTP_CONFIG = {
+    'server': os.getenv('SMTP_SERVER', 'smtp.gmail.com'),
+    'port': int(os.getenv('SMTP_PORT', 587)),
+    'email': os.getenv('SMTP_EMAIL'),
+    'password': os.getenv('SMTP_PASSWORD'),
+    'from_name': os.getenv('SMTP_FROM_NAME', 'ProWrite')
+}
+
+# SendGrid Configuration
+SENDGRID_CONFIG = {
+    'api_key': os.getenv('SENDGRID_API_KEY'),
+    'from_email': os.getenv('SENDGRID_FROM_EMAIL', os.getenv('SMTP_EMAIL')),
+    'from_name': os.getenv('SENDGRID_FROM_NAME', 'ProWrite')
+}
+
+
+# Pricing Configuration
+PRICING = {
+    'francisca_resume': 500,
+    'cover_letter': 300
+}
+
+# Logging Configuration
+def setup_logging():
+    """Setup production logging configuration (queued, structured; see logging_config.py)"""
+    return setup_production_logging()
+
+# Initialize logger
+logger = setup_logging()
+
+# Email Service Class
+class EmailService:
+    """Email service for sending PDFs to users.
+
+    Messages are handed to the shared email outbox, which delivers them in the
+    background over a reused SendGrid client / SMTP session with retries.
+    """
+
+    def __init__(self, outbox=None):
+        self.outbox = outbox or email_outbox
+
+    def _read_attachment(self, pdf_path: str, pdf_bytes: Optional[bytes]) -> Optional[bytes]:
+        """Return the attachment payload, preferring the in-memory PDF over the file on disk"""
+        if pdf_bytes is not None:
+            return pdf_bytes
+        if pdf_path and os.path.exists(pdf_path):
+            logger.info(f"Attaching PDF file: {pdf_path}")
+            with open(pdf_path, "rb") as f:
+                return f.read()
+        logger.error(f"PDF file not found: {pdf_path}")
+        return None
+
+    def send_pdf_email(self, recipient_email: str, pdf_path: str, document_type: str, user_name: str,
+                       pdf_bytes: Optional[bytes] = None) -> bool:
+        """Queue a PDF email for delivery; returns True once it is durably enqueued
+
+        When pdf_bytes is given the attachment is taken from memory and pdf_path
+        only supplies the attachment filename.
+        """
+        try:
+            data = self._read_attachment(pdf_path, pdf_bytes)
+            if data is None:
+                return False
+
+            # Email body
+            price = PRICING.get(document_type.lower().replace(' ', '_'), 0)
+            body = f"""Hello {user_name},
+
+Thank you for using ProWrite! Your {document_type} has been successfully generated and is attached to this email.
+
+Document Details:
+- Type: {document_type}
+- Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
+- Price: KES {price}
+
+You can also download your document from your ProWrite dashboard at any time.
+
+If you have any questions or need assistance, please don't hesitate to contact our support team.
+
+Best regards,
+The ProWrite Team
+
+---
+ProWrite - Professional Resume & Cover Letter Generator
+Website: https://prowrite-frontend.vercel.app"""
+
+            message_id = self.outbox.enqueue(
+                recipient_email,
+                f"Your {document_type} is Ready - ProWrite",
+                body_text=body,
+                attachments=[(os.path.basename(pdf_path), data, 'application/pdf')],
+                category='pdf_delivery'
+            )
+            return message_id is not None
+
+        except Exception as e:
+            logger.error(f"Error queueing PDF email to {recipient_email}: {e}")
+            return False
+
+# Initialize email service
+email_service = EmailService()
+
+def send_general_email(recipient_email: str, subject: str, body: str, user_name: str = "User") -> bool:
+    """Queue a general email for delivery through the email outbox"""
+    try:
+        support_email = SENDGRID_CONFIG['from_email'] or SMTP_CONFIG['email']
+
+        # Add footer to body
+        email_body = f"""{body}
+
+Best regards,
+The ProWrite Team
+
+---
+ProWrite - Professional Resume & Cover Letter Generator
+Website: https://prowrite-frontend.vercel.app
+Support: {support_email}"""
+
+        message_id = email_outbox.enqueue(recipient_email, subject, body_text=email_body, category='general')
+        return message_id is not None
+
+    except Exception as e:
+        logger.error(f"Error queueing general email to {recipient_email}: {e}")
+        return False
+
+def send_password_reset_email(recipient_email: str, user_name: str, reset_token: str) -> bool:
+    """Queue a password reset email for delivery through the email outbox"""
+    try:
+        # Create reset link for your frontend
+        reset_link = f"https://prowrite-frontend.vercel.app/reset-password?token={reset_token}"
+
+        # Email body
+        body = f"""Hello {user_name},
+
+You requested to reset your password for your ProWrite account.
+
+To reset your password, please click the link below or copy and paste it into your browser:
+
+{reset_link}
+
+This link will expire in 1 hour for security reasons.
+
+If you didn't request this password reset, please ignore this email. Your password will remain unchanged.
+
+Best regards,
+The ProWrite Team
+
+---
+ProWrite - Professional Resume & Cover Letter Generator"""
+
+        message_id = email_outbox.enqueue(
+            recipient_email, "Reset Your ProWrite Password", body_text=body, category='password_reset'
+        )
+        return message_id is not None
+
+    except Exception as e:
+        logger.error(f"Error queueing password reset email to {recipient_email}: {e}")
+        return False
+
+# Authentication System
+class AuthSystem:
+    def __init__(self):
+        self.secret_key = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this-in-production')
+        self.algorithm = 'HS256'
+        self.token_expiry_hours = 24
+
+    def get_db_connection(self):
+        """Get database connection with error handling"""
+        try:
+            connection = mysql.connector.connect(**DB_CONFIG)
+            return connection
+        except mysql.connector.Error as e:
+            logger.error(f"Database connection error: {e}")
+            return None
+
+    def hash_password(self, password: str) -> str:
+        """Hash password using Werkzeug's secure password hashing"""
+        return generate_password_hash(password)
+
+    def verify_password(self, password: str, hashed: str) -> bool:
+        """Verify password against hash using Werkzeug's secure password checking"""
+        return check_password_hash(hashed, password)
+
+    def create_user(self, email: str, password: str, first_name: str, last_name: str):
+        """Create a new user in the database"""
+        connection = self.get_db_connection()
+        if not connection:
+            return {"error": "Database connection failed"}, 500
+
+        try:
+            cursor = connection.cursor()
+
+            # Check if user already exists
+            cursor.execute("SELECT user_id FROM users WHERE email = %s", (email,))
+            if cursor.fetchone():
+                return {"error": "User already exists"}, 400
+
+            # Hash password
+            hashed_password = self.hash_password(password)
+
+            # Insert new user (using correct column names from your database)
+            cursor.execute("""
+                INSERT INTO users (email, password_hash, first_name, last_name, created_at)
+                VALUES (%s, %s, %s, %s, NOW())
+            """, (email, hashed_password, first_name, last_name))
+
+            user_id = cursor.lastrowid
+            connection.commit()
+
+            # Get user data (using correct column names)
+            cursor.execute("""
+                SELECT user_id, email, first_name, last_name, is_premium, is_admin, created_at
+                FROM users WHERE user_id = %s
+            """, (user_id,))
+
+            user_data = cursor.fetchone()
+            user = {
+                "id": user_data[0],           # user_id
+                "email": user_data[1],        # email
+                "firstName": user_data[2],    # first_name
+                "lastName": user_data[3],     # last_name
+                "isPremium": user_data[4],    # is_premium
+                "is_admin": user_data[5],     # is_admin
+                "createdAt": user_data[6].isoformat() if user_data[6] else None  # created_at
+            }
+
+            return {"user": user, "message": "User created successfully"}, 201
+
+        except mysql.connector.Error as e:
+            logger.error(f"Database error: {e}")
+            return {"error": "Database error occurred"}, 500
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return {"error": "An unexpected error occurred"}, 500
+        finally:
+            if connection:
+                connection.close()
+
+    def authenticate_user(self, email: str, password: str):
+        """Authenticate user and return user data if valid"""
+        connection = self.get_db_connection()
+        if not connection:
+            return {"error": "Database connection failed"}, 500
+
+        try:
+            cursor = connection.cursor()
+
+            # Get user data (using correct column names from your database)
+            cursor.execute("""
+                SELECT user_id, email, password_hash, first_name, last_name, is_premium, is_admin, created_at
+                FROM users WHERE email = %s
+            """, (email,))
+
+            user_data = cursor.fetchone()
+            if not user_data:
+                return {"error": "Invalid credentials"}, 401
+
+            # Verify password
+            if not self.verify_password(password, user_data[2]):
+                return {"error": "Invalid credentials"}, 401
+
+            # Return user data (using correct column mapping)
+            user = {
+                "id": user_data[0],           # user_id
+                "email": user_data[1],        # email
+                "firstName": user_data[3],    # first_name
+                "lastName": user_data[4],     # last_name
+                "isPremium": user_data[5],    # is_premium
+                "is_admin": user_data[6],     # is_admin
+                "createdAt": user_data[7].isoformat() if user_data[7] else None  # created_at
+            }
+
+            return {"user": user}, 200
+
+        except mysql.connector.Error as e:
+            logger.error(f"Database error: {e}")
+            return {"error": "Database error occurred"}, 500
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return {"error": "An unexpected error occurred"}, 500
+        finally:
+            if connection:
+                connection.close()
+
+    def create_access_token(self, user_data: dict) -> str:
+        """Create JWT access token"""
+        try:
+            payload = {
+                'user_id': user_data['id'],
+                'email': user_data['email'],
+                'is_admin': user_data.get('is_admin', 0),
+                'exp': datetime.utcnow() + timedelta(hours=self.token_expiry_hours),
+                'iat': datetime.utcnow(),
+                'type': 'access'
+            }
+
+            # Use PyJWT directly
+            import jwt as pyjwt
+            token = pyjwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+            return token
+
+        except Exception as e:
+            logger.error(f"Token creation error: {e}")
+            raise e
+
+    def verify_token(self, token: str) -> dict:
+        """Verify and decode JWT token"""
+        try:
+            import jwt as pyjwt
+            payload = pyjwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            return payload
+        except pyjwt.ExpiredSignatureError:
+            return {"error": "Token expired"}
+        except pyjwt.InvalidTokenError:
+            return {"error": "Invalid token"}
+        except Exception as e:
+            logger.error(f"Token verification error: {e}")
+            return {"error": "Token verification failed"}
+
+    def get_user_by_id(self, user_id: int):
+        """Get user data by ID"""
+        connection = self.get_db_connection()
+        if not connection:
+            return None
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT user_id, email, first_name, last_name, is_premium, is_admin, created_at
+                FROM users WHERE user_id = %s
+            """, (user_id,))
+
+            user_data = cursor.fetchone()
+            if not user_data:
+                return None
+
+            user = {
+                "id": user_data[0],           # user_id
+                "email": user_data[1],        # email
+                "firstName": user_data[2],    # first_name
+                "lastName": user_data[3],     # last_name
+                "isPremium": user_data[4],    # is_premium
+                "is_admin": user_data[5],     # is_admin
+                "createdAt": user_data[6].isoformat() if user_data[6] else None  # created_at
+            }
+
+            return user
+
+        except mysql.connector.Error as e:
+            logger.error(f"Database error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return None
+        finally:
+            if connection:
+                connection.close()
+
+    def update_user(self, user_id: int, update_data: dict):
+        """Update user data"""
+        connection = self.get_db_connection()
+        if not connection:
+            return False
+
+        try:
+            cursor = connection.cursor()
+
+            # Build update query dynamically
+            set_clauses = []
+            values = []
+
+            for field, value in update_data.items():
+                if field in ['first_name', 'last_name', 'email']:
+                    set_clauses.append(f"{field} = %s")
+                    values.append(value)
+
+            if not set_clauses:
+                return True  # No valid fields to update
+
+            # Add updated_at timestamp
+            set_clauses.append("updated_at = NOW()")
+            values.append(user_id)
+
+            query = f"UPDATE users SET {', '.join(set_clauses)} WHERE user_id = %s"
+            cursor.execute(query, values)
+            connection.commit()
+
+            return True
+
+        except mysql.connector.Error as e:
+            logger.error(f"Database error updating user: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error updating user: {e}")
+            return False
+        finally:
+            if connection:
+                connection.close()
+
+# Initialize auth system
+auth_system = AuthSystem()
+
+# JWT decorator for protected routes
+def jwt_required_custom(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = None
+
+        auth_header = request.headers.get('Authorization')
+        if auth_header:
+            try:
+                token = auth_header.split(' ')[1]
+            except IndexError:
+                return jsonify({"error": "Invalid token format"}), 401
+        else:
+            return jsonify({"error": "No token provided"}), 401
+
+        if not token:
+            return jsonify({"error": "No token provided"}), 401
+
+        payload = auth_system.verify_token(token)
+        if 'error' in payload:
+            return jsonify({"error": payload['error']}), 401
+
+        request.current_user = payload
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+# Admin-only decorator
+def admin_required_custom(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # First check if user is authenticated
+        token = None
+        auth_header = request.headers.get('Authorization')
+        if auth_header:
+            try:
+                token = auth_header.split(' ')[1]
+            except IndexError:
+                return jsonify({"error": "Invalid token format"}), 401
+        else:
+            return jsonify({"error": "No token provided"}), 401
+
+        if not token:
+            return jsonify({"error": "No token provided"}), 401
+
+        payload = auth_system.verify_token(token)
+        if 'error' in payload:
+            return jsonify({"error": payload['error']}), 401
+
+        # Check if user is admin
+        if not payload.get('is_admin'):
+            return jsonify({"error": "Admin privileges required"}), 403
+
+        request.current_user = payload
+        
+        # Log admin action
+        log_admin_action(payload['user_id'], f"accessed_{f.__name__}", request.path, request.remote_addr)
+        
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+# Admin action logging function
+def log_admin_action(admin_id, action, target_path, ip_address):
+    """Log admin action to database"""
+    connection = auth_system.get_db_connection()
+    if not connection:
+        return
+    
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO admin_activity_logs (admin_id, action, target_type, details, ip_address)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (admin_id, action, 'api_endpoint', f'{{"path": "{target_path}"}}', ip_address))
+        connection.commit()
+    except Exception as e:
+        logger.error(f"Failed to log admin action: {e}")
+    finally:
+        if connection:
+            connection.close()
+
+# System logging function
+def log_system_event(level, message, module=None, user_id=None, metadata=None):
+    """Log system event to database"""
+    connection = auth_system.get_db_connection()
+    if not connection:
+        return
+    
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO system_logs (level, message, module, user_id, ip_address, metadata)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (level, message, module, user_id, request.remote_addr if request else None, 
+              json.dumps(metadata) if metadata else None))
+        connection.commit()
+    except Exception as e:
+        logger.error(f"Failed to log system event: {e}")
+    finally:
+        if connection:
+            connection.close()
+
+# Document tracking function
+def track_document_generation(reference, document_data, file_path):
+    """Track document generation in user_documents table"""
+    connection = auth_system.get_db_connection()
+    if not connection:
+        return
+    
+    try:
+        cursor = connection.cursor()
+        
+        # The payment row carries the owner in indexed columns
+        cursor.execute("SELECT user_id, user_email FROM manual_payments WHERE reference = %s", (reference,))
+        payment_result = cursor.fetchone()
+        user_id = payment_result[0] if payment_result else None
+        
+        if not user_id:
+            # Get user email from document data
+            user_email = (payment_result[1] if payment_result else None) or document_data.get('personalEmail', '')
+            if not user_email:
+                logger.warning(f"No user email found for document reference: {reference}")
+                return
+            
+            # Get user ID from email
+            cursor.execute("SELECT user_id FROM users WHERE email = %s", (user_email,))
+            user_result = cursor.fetchone()
+            if not user_result:
+                logger.warning(f"User not found for email: {user_email}")
+                return
+            
+            user_id = user_result[0]
+        
+        # Determine document type
+        document_type = 'resume'
+        if 'cover_letter' in reference.lower() or 'coverletter' in reference.lower():
+            document_type = 'cover_letter'
+        
+        # Check if document already exists
+        cursor.execute("SELECT id FROM user_documents WHERE reference = %s", (reference,))
+        existing_doc = cursor.fetchone()
+        
+        if existing_doc:
+            # Update existing document
+            cursor.execute("""
+                UPDATE user_documents 
+                SET file_path = %s, status = 'generated', updated_at = NOW()
+                WHERE reference = %s
+            """, (file_path, reference))
+            logger.info(f"Updated existing document tracking for reference: {reference}")
+        else:
+            # Insert new document
+            cursor.execute("""
+                INSERT INTO user_documents (user_id, document_type, reference, file_path, status, created_at)
+                VALUES (%s, %s, %s, %s, 'generated', NOW())
+            """, (user_id, document_type, reference, file_path))
+            logger.info(f"Tracked new document generation for reference: {reference}")
+        
+        connection.commit()
+        
+    except Exception as e:
+        logger.error(f"Failed to track document generation: {e}")
+    finally:
+        if connection:
+            connection.close()
+
+# Error Handlers
+def register_error_handlers(app):
+    """Register production error handlers"""
+
+    @app.errorhandler(400)
+    def bad_request(error):
+        logger.error(f"Bad Request: {error}")
+        return jsonify({
+            'error': 'Bad Request',
+            'message': 'The request could not be understood by the server',
+            'status_code': 400
+        }), 400
+
+    @app.errorhandler(401)
+    def unauthorized(error):
+        logger.error(f"Unauthorized: {error}")
+        return jsonify({
+            'error': 'Unauthorized',
+            'message': 'Authentication required',
+            'status_code': 401
+        }), 401
+
+    @app.errorhandler(403)
+    def forbidden(error):
+        logger.error(f"Forbidden: {error}")
+        return jsonify({
+            'error': 'Forbidden',
+            'message': 'Access denied',
+            'status_code': 403
+        }), 403
+
+    @app.errorhandler(404)
+    def not_found(error):
+        logger.error(f"Not Found: {error}")
+        return jsonify({
+            'error': 'Not Found',
+            'message': 'The requested resource was not found',
+            'status_code': 404
+        }), 404
+
+    @app.errorhandler(405)
+    def method_not_allowed(error):
+        logger.error(f"Method Not Allowed: {error}")
+        return jsonify({
+            'error': 'Method Not Allowed',
+            'message': 'The method is not allowed for this resource',
+            'status_code': 405
+        }), 405
+
+    @app.errorhandler(500)
+    def internal_server_error(error):
+        logger.error(f"Internal Server Error: {error}")
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An unexpected error occurred',
+            'status_code': 500
+        }), 500
+
+    @app.errorhandler(Exception)
+    def handle_exception(error):
+        logger.error(f"Unhandled Exception: {error}")
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'An unexpected error occurred',
+            'status_code': 500
+        }), 500
+
+    access_logger = logging.getLogger('prowrite.access')
+
+    @app.before_request
+    def log_request():
+        g.request_id = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_response(response):
+        response.headers[REQUEST_ID_HEADER] = g.get('request_id', '-')
+        started = g.get('request_started')
+        duration_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        sample_rate = access_log_sampler.should_log(request.path, response.status_code, duration_ms)
+        if sample_rate is not None and access_logger.isEnabledFor(logging.INFO):
+            access_logger.info("%s %s %s", request.method, request.path, response.status_code, extra={
+                'method': request.method,
+                'path': request.path,
+                'route': request.url_rule.rule if request.url_rule else None,
+                'status': response.status_code,
+                'duration_ms': round(duration_ms, 2),
+                'remote_addr': request.remote_addr,
+                'sample_rate': sample_rate,
+            })
+        return response
+
+
+# Lazily constructed services
+class LazyService:
+    """
+    Module-level stand-in for a service that is built on first use.
+
+    `factory` is a callable or a 'module.name' path to a class or to the
+    module's own instance; with a path the module itself (reportlab, openai,
+    ...) is only imported when a request first needs the service, not when
+    the app is imported.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    if isinstance(self._factory, str):
+                        module_name, attribute = self._factory.rsplit('.', 1)
+                        target = getattr(importlib.import_module(module_name), attribute)
+                        self._instance = target() if isinstance(target, type) else target
+                    else:
+                        self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+pdf_generator = LazyService('francisca_pdf_generator_robust.RobustFranciscaPDFGenerator')
+cover_letter_generator = LazyService('cover_letter_pdf_generator.CoverLetterPDFGenerator')
+francisca_ai_service = LazyService('francisca_ai_service.francisca_ai_service')
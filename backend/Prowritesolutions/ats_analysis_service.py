@@ -5,10 +5,13 @@ Analyzes resumes for ATS compatibility and employability scoring
 
 import os
 import json
-import re
+import logging
 import openai
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from resume_features import found, resume_feature_store
+
+logger = logging.getLogger(__name__)
 
 class ATSAnalysisService:
     def __init__(self):
@@ -124,10 +127,13 @@ class ATSAnalysisService:
                 'content_analysis': {}
             }
             
+            # Computed once per resume version and shared with the other engines
+            features = resume_feature_store.features(resume_content)
+            
             # Analyze each category
             for category, config in self.ats_criteria.items():
                 category_score, category_analysis = self._analyze_category(
-                    resume_content, category, config, profession, job_title
+                    features, category, config, profession, job_title
                 )
                 analysis_results['category_scores'][category] = category_score
                 analysis_results['detailed_analysis'][category] = category_analysis
@@ -146,13 +152,13 @@ class ATSAnalysisService:
             analysis_results['ats_compatibility'] = self._get_ats_compatibility(overall_score)
             
             # Perform keyword analysis
-            analysis_results['keyword_analysis'] = self._analyze_keywords(resume_content, profession, job_title)
+            analysis_results['keyword_analysis'] = self._analyze_keywords(features, profession, job_title)
             
             # Perform formatting analysis
-            analysis_results['formatting_analysis'] = self._analyze_formatting(resume_content)
+            analysis_results['formatting_analysis'] = self._analyze_formatting(features)
             
             # Perform content analysis
-            analysis_results['content_analysis'] = self._analyze_content_quality(resume_content)
+            analysis_results['content_analysis'] = self._analyze_content_quality(features)
             
             return {
                 'success': True,
@@ -161,14 +167,14 @@ class ATSAnalysisService:
             }
             
         except Exception as e:
-            print(f"Error in ATS analysis: {e}")
+            logger.error(f"Error in ATS analysis: {e}")
             return {
                 'success': False,
                 'error': str(e),
                 'analysis': self._mock_ats_analysis(resume_content, profession, job_title)
             }
 
-    def _analyze_category(self, content: str, category: str, config: Dict, profession: str, job_title: str) -> tuple:
+    def _analyze_category(self, features: Dict[str, Any], category: str, config: Dict, profession: str, job_title: str) -> tuple:
         """Analyze a specific category of ATS criteria"""
         checks = config.get('checks', [])
         total_score = 0
@@ -176,7 +182,7 @@ class ATSAnalysisService:
         analysis = {}
         
         for check in checks:
-            score, details = self._perform_check(content, check, profession, job_title)
+            score, details = self._perform_check(features, check, profession, job_title)
             total_score += score
             analysis[check] = {
                 'score': score,
@@ -187,13 +193,11 @@ class ATSAnalysisService:
         category_score = (total_score / max_score) * 100 if max_score > 0 else 0
         return category_score, analysis
 
-    def _perform_check(self, content: str, check: str, profession: str, job_title: str) -> tuple:
+    def _perform_check(self, features: Dict[str, Any], check: str, profession: str, job_title: str) -> tuple:
         """Perform a specific ATS check"""
-        content_lower = content.lower()
-        
         if check == 'clean_formatting':
             # Check for clean, simple formatting
-            has_complex_formatting = bool(re.search(r'[^\w\s\-\.\,\;\:\!\?\(\)]', content))
+            has_complex_formatting = features['has_complex_characters']
             return (0 if has_complex_formatting else 1, 
                    "Clean formatting detected" if not has_complex_formatting else "Complex formatting may cause ATS issues")
         
@@ -203,14 +207,14 @@ class ATSAnalysisService:
         
         elif check == 'no_images_or_graphics':
             # Check for image/graphic indicators
-            has_images = any(word in content_lower for word in ['image', 'graphic', 'photo', 'picture'])
+            has_images = bool(found(features, ['image', 'graphic', 'photo', 'picture']))
             return (0 if has_images else 1, 
                    "No images detected" if not has_images else "Images may not be parsed by ATS")
         
         elif check == 'standard_sections':
             # Check for standard resume sections
             sections = ['experience', 'education', 'skills', 'summary', 'objective']
-            found_sections = sum(1 for section in sections if section in content_lower)
+            found_sections = len(found(features, sections))
             score = min(1, found_sections / 3)  # Need at least 3 sections
             return (score, f"Found {found_sections} standard sections")
         
@@ -218,7 +222,7 @@ class ATSAnalysisService:
             # Check for relevant keywords based on profession
             if profession and profession in self.industry_keywords:
                 keywords = self.industry_keywords[profession]
-                found_keywords = sum(1 for keyword in keywords if keyword.lower() in content_lower)
+                found_keywords = len(found(features, keywords))
                 score = min(1, found_keywords / 5)  # Need at least 5 keywords
                 return (score, f"Found {found_keywords} relevant keywords")
             return (0.5, "Profession not specified for keyword analysis")
@@ -230,33 +234,32 @@ class ATSAnalysisService:
                 'led', 'coordinated', 'improved', 'increased', 'launched', 'established',
                 'optimized', 'delivered', 'executed', 'generated', 'maintained', 'enhanced'
             ]
-            found_verbs = sum(1 for verb in action_verbs if verb in content_lower)
+            found_verbs = len(found(features, action_verbs))
             score = min(1, found_verbs / 3)  # Need at least 3 action verbs
             return (score, f"Found {found_verbs} action verbs")
         
         elif check == 'quantifiable_results':
             # Check for numbers and percentages
-            has_numbers = bool(re.search(r'\d+%|\d+\.\d+%|\$\d+|\d+\s*(?:million|thousand|k|m)', content))
+            has_numbers = features['has_numbers']
             return (1 if has_numbers else 0, 
                    "Quantifiable results found" if has_numbers else "Add specific numbers and percentages")
         
         elif check == 'contact_information':
             # Check for contact information
-            has_email = bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content))
-            has_phone = bool(re.search(r'\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}', content))
+            has_email, has_phone = features['has_email'], features['has_phone']
             score = 1 if has_email and has_phone else 0.5 if has_email or has_phone else 0
             return (score, f"Contact info: {'Complete' if score == 1 else 'Partial' if score == 0.5 else 'Missing'}")
         
         elif check == 'no_spelling_errors':
             # Basic spelling check (simplified)
             common_errors = ['recieve', 'seperate', 'occured', 'accomodate']
-            has_errors = any(error in content_lower for error in common_errors)
+            has_errors = bool(found(features, common_errors))
             return (0 if has_errors else 1, 
                    "No obvious spelling errors" if not has_errors else "Potential spelling errors detected")
         
         elif check == 'appropriate_length':
             # Check resume length
-            word_count = len(content.split())
+            word_count = features['word_count']
             if 300 <= word_count <= 800:
                 score = 1
                 details = "Optimal length"
@@ -344,9 +347,8 @@ class ATSAnalysisService:
         else:
             return "Not Compatible"
 
-    def _analyze_keywords(self, content: str, profession: str, job_title: str) -> Dict[str, Any]:
+    def _analyze_keywords(self, features: Dict[str, Any], profession: str, job_title: str) -> Dict[str, Any]:
         """Analyze keyword usage and relevance"""
-        content_lower = content.lower()
         analysis = {
             'total_keywords_found': 0,
             'relevant_keywords': [],
@@ -357,62 +359,60 @@ class ATSAnalysisService:
         
         if profession and profession in self.industry_keywords:
             keywords = self.industry_keywords[profession]
-            found_keywords = [kw for kw in keywords if kw.lower() in content_lower]
+            found_keywords = found(features, keywords)
             analysis['relevant_keywords'] = found_keywords
             analysis['total_keywords_found'] = len(found_keywords)
-            analysis['missing_keywords'] = [kw for kw in keywords if kw.lower() not in content_lower]
+            analysis['missing_keywords'] = [kw for kw in keywords if kw not in found_keywords]
             analysis['profession_match'] = len(found_keywords) / len(keywords) if keywords else 0
         
         # Calculate keyword density
-        word_count = len(content.split())
+        word_count = features['word_count']
         analysis['keyword_density'] = (analysis['total_keywords_found'] / word_count * 100) if word_count > 0 else 0
         
         return analysis
 
-    def _analyze_formatting(self, content: str) -> Dict[str, Any]:
+    def _analyze_formatting(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze formatting for ATS compatibility"""
         analysis = {
-            'has_complex_characters': bool(re.search(r'[^\w\s\-\.\,\;\:\!\?\(\)]', content)),
-            'has_standard_sections': len([s for s in ['experience', 'education', 'skills'] if s in content.lower()]),
-            'word_count': len(content.split()),
-            'character_count': len(content),
-            'has_email': bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content)),
-            'has_phone': bool(re.search(r'\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}', content))
+            'has_complex_characters': features['has_complex_characters'],
+            'has_standard_sections': len(found(features, ['experience', 'education', 'skills'])),
+            'word_count': features['word_count'],
+            'character_count': features['char_count'],
+            'has_email': features['has_email'],
+            'has_phone': features['has_phone']
         }
         
         return analysis
 
-    def _analyze_content_quality(self, content: str) -> Dict[str, Any]:
+    def _analyze_content_quality(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze content quality for professional impact"""
-        content_lower = content.lower()
-        
+
         # Count action verbs
         action_verbs = [
             'developed', 'implemented', 'managed', 'achieved', 'created', 'designed',
             'led', 'coordinated', 'improved', 'increased', 'launched', 'established',
             'optimized', 'delivered', 'executed', 'generated', 'maintained', 'enhanced'
         ]
-        found_verbs = [verb for verb in action_verbs if verb in content_lower]
+        found_verbs = found(features, action_verbs)
         
         # Check for quantifiable results
-        has_numbers = bool(re.search(r'\d+%|\d+\.\d+%|\$\d+|\d+\s*(?:million|thousand|k|m)', content))
+        has_numbers = features['has_numbers']
         
         analysis = {
             'action_verbs_found': found_verbs,
             'action_verb_count': len(found_verbs),
             'has_quantifiable_results': has_numbers,
-            'professional_tone': self._assess_professional_tone(content),
-            'achievement_focused': self._assess_achievement_focus(content)
+            'professional_tone': self._assess_professional_tone(features),
+            'achievement_focused': self._assess_achievement_focus(features)
         }
         
         return analysis
 
-    def _assess_professional_tone(self, content: str) -> str:
+    def _assess_professional_tone(self, features: Dict[str, Any]) -> str:
         """Assess the professional tone of the content"""
         unprofessional_words = ['awesome', 'cool', 'amazing', 'super', 'really', 'very', 'super']
-        content_lower = content.lower()
         
-        unprofessional_count = sum(1 for word in unprofessional_words if word in content_lower)
+        unprofessional_count = len(found(features, unprofessional_words))
         
         if unprofessional_count == 0:
             return "Professional"
@@ -421,12 +421,11 @@ class ATSAnalysisService:
         else:
             return "Needs Improvement"
 
-    def _assess_achievement_focus(self, content: str) -> str:
+    def _assess_achievement_focus(self, features: Dict[str, Any]) -> str:
         """Assess if content is achievement-focused"""
         achievement_indicators = ['achieved', 'increased', 'improved', 'reduced', 'grew', 'developed', 'launched']
-        content_lower = content.lower()
         
-        achievement_count = sum(1 for indicator in achievement_indicators if indicator in content_lower)
+        achievement_count = len(found(features, achievement_indicators))
         
         if achievement_count >= 3:
             return "Achievement-Focused"
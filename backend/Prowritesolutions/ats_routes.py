@@ -0,0 +1,743 @@
+"""
+Flask API routes for ATS analysis of Francisca resumes
+"""
+
+from flask import Blueprint, request, jsonify
+from typing import Any, Dict, List
+import re
+from app_core import jwt_required_custom, logger
+from resume_features import (
+    ACHIEVEMENT_WORDS, ACTION_VERBS, EDUCATION_WORDS, EXPERIENCE_WORDS, OPTIMIZATION_KEYWORDS,
+    PROFESSION_KEYWORDS, SEO_TERMS, UNPROFESSIONAL_WORDS, found, resume_feature_store,
+)
+
+ats_bp = Blueprint('ats', __name__)
+
+# Enhanced ATS Analysis Endpoints
+@ats_bp.route('/api/francisca/ats-analysis', methods=['POST'])
+@jwt_required_custom
+def francisca_ats_analysis():
+    """Perform ATS analysis on resume content"""
+    try:
+        data = request.get_json()
+        resume_content = data.get('resume_content', '')
+        profession = data.get('profession', '')
+        job_title = data.get('job_title', '')
+
+        if not resume_content:
+            return jsonify({
+                'success': False,
+                'error': 'Resume content is required'
+            }), 400
+
+        # Import ATS analysis service
+        from ats_analysis_service import ATSAnalysisService
+
+        # Initialize service
+        ats_service = ATSAnalysisService()
+
+        # Perform analysis
+        analysis_result = ats_service.analyze_resume_ats(
+            resume_content,
+            profession,
+            job_title
+        )
+
+        return jsonify({
+            'success': True,
+            'result': {
+                'analysis': analysis_result
+            }
+        }), 200
+
+    except Exception as e:
+        logger.error(f"ATS Analysis error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ats_bp.route('/api/francisca/test-ats-analysis', methods=['POST'])
+def test_ats_analysis():
+    """Test ATS analysis without authentication"""
+    try:
+        data = request.get_json()
+        resume_content = data.get('resume_content', '')
+        profession = data.get('profession', '')
+        job_title = data.get('job_title', '')
+
+        if not resume_content:
+            return jsonify({
+                'success': False,
+                'error': 'Resume content is required'
+            }), 400
+
+        # Perform real analysis
+        real_result = perform_real_ats_analysis(resume_content, profession, job_title)
+
+        return jsonify({
+            'success': True,
+            'result': real_result
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Test ATS Analysis error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@ats_bp.route('/api/francisca/enhanced-ats-analysis', methods=['POST'])
+@jwt_required_custom
+def francisca_enhanced_ats_analysis():
+    """Perform enhanced ATS analysis with real-world performance metrics"""
+    try:
+        data = request.get_json()
+        resume_content = data.get('resume_content', '')
+        profession = data.get('profession', '')
+        job_title = data.get('job_title', '')
+        analysis_mode = data.get('analysis_mode', 'post-download')
+
+        if not resume_content:
+            return jsonify({
+                'success': False,
+                'error': 'Resume content is required'
+            }), 400
+
+        # Import ATS analysis service
+        from ats_analysis_service import ATSAnalysisService
+
+        # Initialize service
+        ats_service = ATSAnalysisService()
+
+        # Perform enhanced analysis
+        analysis_result = ats_service.analyze_resume_ats(
+            resume_content,
+            profession,
+            job_title
+        )
+
+        # Extract the analysis data from the service response
+        if analysis_result.get('success') and analysis_result.get('analysis'):
+            enhanced_result = analysis_result['analysis']
+        else:
+            # If analysis failed, perform real analysis
+            enhanced_result = perform_real_ats_analysis(resume_content, profession, job_title)
+
+        return jsonify({
+            'success': True,
+            'result': enhanced_result
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Enhanced ATS Analysis error: {str(e)}")
+        # Perform real analysis on error
+        real_result = perform_real_ats_analysis(resume_content, profession, job_title)
+        return jsonify({
+            'success': True,
+            'result': real_result
+        }), 200
+
+def perform_real_ats_analysis(resume_content: str, profession: str, job_title: str) -> Dict[str, Any]:
+    """Perform real advanced ATS analysis on resume content"""
+    # Computed once per resume version (usually on save) and shared with the other engines
+    features = resume_feature_store.features(resume_content)
+
+    # 1. KEYWORD ANALYSIS
+    keyword_analysis = analyze_keywords(features, profession, job_title)
+
+    # 2. CONTENT QUALITY ANALYSIS
+    content_quality = analyze_content_quality(features)
+
+    # 3. FORMATTING ANALYSIS
+    formatting_analysis = analyze_formatting(features)
+
+    # 4. STRUCTURE ANALYSIS
+    structure_analysis = analyze_structure(features)
+
+    # 5. COMPLETENESS ANALYSIS
+    completeness_analysis = analyze_completeness(features)
+
+    # 6. OPTIMIZATION ANALYSIS
+    optimization_analysis = analyze_optimization(features, profession)
+
+    # Calculate category scores
+    category_scores = {
+        'keywords': keyword_analysis['score'],
+        'content_quality': content_quality['score'],
+        'formatting': formatting_analysis['score'],
+        'structure': structure_analysis['score'],
+        'completeness': completeness_analysis['score'],
+        'optimization': optimization_analysis['score']
+    }
+
+    # Calculate overall score
+    overall_score = calculate_overall_score(category_scores)
+
+    # Generate recommendations
+    recommendations = generate_recommendations(category_scores, {
+        'keywords': keyword_analysis,
+        'content_quality': content_quality,
+        'formatting': formatting_analysis,
+        'structure': structure_analysis,
+        'completeness': completeness_analysis,
+        'optimization': optimization_analysis
+    })
+
+    # Calculate real-world performance metrics
+    real_world_performance = calculate_real_world_performance(overall_score, keyword_analysis, content_quality)
+
+    return {
+        'overall_score': overall_score,
+        'ats_compatibility': get_ats_compatibility(overall_score),
+        'employability_rating': get_employability_rating(overall_score),
+        'category_scores': category_scores,
+        'detailed_analysis': {
+            'keywords': {
+                'found_keywords': keyword_analysis['found_keywords'],
+                'missing_keywords': keyword_analysis['missing_keywords'],
+                'keyword_density': keyword_analysis['density'],
+                'profession_match': keyword_analysis['profession_match'],
+                'industry_relevance': keyword_analysis['industry_relevance']
+            },
+            'content_quality': {
+                'action_verbs': content_quality['action_verbs'],
+                'quantifiable_results': content_quality['has_quantifiable_results'],
+                'professional_tone': content_quality['professional_tone'],
+                'achievement_focus': content_quality['achievement_focus'],
+                'impact_statements': content_quality['impact_statements']
+            },
+            'formatting': {
+                'ats_friendly': formatting_analysis['ats_friendly'],
+                'standard_sections': formatting_analysis['standard_sections'],
+                'word_count': formatting_analysis['word_count'],
+                'readability_score': formatting_analysis['readability_score'],
+                'contact_info_complete': formatting_analysis['contact_info_complete']
+            },
+            'structure': {
+                'logical_flow': structure_analysis['logical_flow'],
+                'section_headers': structure_analysis['section_headers'],
+                'bullet_points': structure_analysis['bullet_points'],
+                'consistent_formatting': structure_analysis['consistent_formatting']
+            },
+            'completeness': {
+                'required_sections': completeness_analysis['required_sections'],
+                'missing_sections': completeness_analysis['missing_sections'],
+                'experience_coverage': completeness_analysis['experience_coverage'],
+                'education_coverage': completeness_analysis['education_coverage']
+            },
+            'optimization': {
+                'seo_score': optimization_analysis['seo_score'],
+                'industry_keywords': optimization_analysis['industry_keywords'],
+                'trending_skills': optimization_analysis['trending_skills'],
+                'modern_formatting': optimization_analysis['modern_formatting']
+            }
+        },
+        'recommendations': recommendations,
+        'market_insights': get_market_insights(profession),
+        'real_world_performance': real_world_performance
+    }
+
+def analyze_keywords(features: Dict[str, Any], profession: str, job_title: str) -> Dict[str, Any]:
+    """Analyze keywords and industry relevance"""
+    word_count = features['word_count']
+
+    # Get relevant keywords based on profession
+    relevant_keywords = PROFESSION_KEYWORDS.get(profession, PROFESSION_KEYWORDS['software_engineer'])
+
+    # Find keywords in content
+    found_keywords = found(features, relevant_keywords)
+    missing_keywords = [kw for kw in relevant_keywords if kw not in found_keywords]
+
+    # Calculate metrics
+    profession_match = len(found_keywords) / len(relevant_keywords) if relevant_keywords else 0
+    keyword_density = (len(found_keywords) / word_count * 100) if word_count > 0 else 0
+
+    # Industry relevance score
+    industry_relevance = min(100, profession_match * 100 + keyword_density * 10)
+
+    # Overall keyword score
+    keyword_score = min(100, (profession_match * 60) + (keyword_density * 2) + (len(found_keywords) * 2))
+
+    return {
+        'score': keyword_score,
+        'found_keywords': found_keywords[:15],  # Limit to top 15
+        'missing_keywords': missing_keywords[:10],  # Limit to top 10
+        'density': round(keyword_density, 2),
+        'profession_match': round(profession_match, 3),
+        'industry_relevance': round(industry_relevance, 1)
+    }
+
+def analyze_content_quality(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze content quality and professional impact"""
+    # Action verbs analysis
+    found_verbs = found(features, ACTION_VERBS)
+
+    # Quantifiable results analysis
+    has_quantifiable_results = features['has_numbers']
+
+    # Professional tone analysis
+    unprofessional_count = len(found(features, UNPROFESSIONAL_WORDS))
+
+    if unprofessional_count == 0:
+        professional_tone = 'Professional'
+    elif unprofessional_count <= 2:
+        professional_tone = 'Mostly Professional'
+    else:
+        professional_tone = 'Needs Improvement'
+
+    # Achievement focus analysis
+    achievement_count = len(found(features, ACHIEVEMENT_WORDS))
+
+    if achievement_count >= 5:
+        achievement_focus = 'Achievement-Focused'
+    elif achievement_count >= 2:
+        achievement_focus = 'Some Achievements'
+    else:
+        achievement_focus = 'Needs More Achievements'
+
+    # Impact statements (bullet points with numbers or percentages)
+    impact_statements = features['impact_statements']
+
+    # Calculate content quality score
+    verb_score = min(100, len(found_verbs) * 10)
+    quantifiable_score = 20 if has_quantifiable_results else 0
+    tone_score = 20 if professional_tone == 'Professional' else 10 if professional_tone == 'Mostly Professional' else 0
+    achievement_score = min(30, achievement_count * 5)
+    impact_score = min(20, impact_statements * 5)
+
+    content_score = verb_score + quantifiable_score + tone_score + achievement_score + impact_score
+
+    return {
+        'score': min(100, content_score),
+        'action_verbs': found_verbs[:10],
+        'has_quantifiable_results': has_quantifiable_results,
+        'professional_tone': professional_tone,
+        'achievement_focus': achievement_focus,
+        'impact_statements': impact_statements
+    }
+
+def analyze_formatting(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze formatting for ATS compatibility"""
+    # Check for ATS-friendly formatting
+    ats_friendly = not features['has_complex_characters']
+
+    # Check for standard sections
+    standard_sections = ['experience', 'education', 'skills', 'summary', 'objective', 'work history', 'employment']
+    found_sections = found(features, standard_sections)
+
+    # Word count and readability (simplified Flesch reading ease)
+    word_count = features['word_count']
+    readability_score = features['readability']
+
+    # Contact information check
+    has_email = features['has_email']
+    has_phone = features['has_phone']
+    contact_info_complete = has_email and has_phone
+
+    # Calculate formatting score
+    ats_score = 30 if ats_friendly else 0
+    sections_score = min(30, len(found_sections) * 7.5)
+    length_score = 20 if 300 <= word_count <= 800 else 10 if 200 <= word_count <= 1000 else 0
+    contact_score = 20 if contact_info_complete else 10 if has_email or has_phone else 0
+
+    formatting_score = ats_score + sections_score + length_score + contact_score
+
+    return {
+        'score': min(100, formatting_score),
+        'ats_friendly': ats_friendly,
+        'standard_sections': len(found_sections),
+        'word_count': word_count,
+        'readability_score': round(readability_score, 1),
+        'contact_info_complete': contact_info_complete
+    }
+
+def analyze_structure(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze resume structure and organization"""
+    # Section headers and bullet points
+    section_headers = features['section_headers']
+    bullet_points = features['bullet_lines']
+
+    # Logical flow analysis (simplified): experience should come before education
+    positions = features['section_positions']
+    logical_flow = True
+    if 'experience' in positions and 'education' in positions:
+        logical_flow = positions['experience'] < positions['education']
+
+    # Consistent formatting analysis
+    consistent_formatting = features['distinct_headers'] > 1
+
+    # Calculate structure score
+    headers_score = min(40, len(section_headers) * 8)
+    bullets_score = min(30, min(bullet_points, 20) * 1.5)
+    flow_score = 20 if logical_flow else 10
+    consistency_score = 10 if consistent_formatting else 0
+
+    structure_score = headers_score + bullets_score + flow_score + consistency_score
+
+    return {
+        'score': min(100, structure_score),
+        'logical_flow': logical_flow,
+        'section_headers': section_headers[:8],
+        'bullet_points': bullet_points,
+        'consistent_formatting': consistent_formatting
+    }
+
+def analyze_completeness(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze resume completeness"""
+    # Required sections
+    required_sections = ['experience', 'education', 'skills']
+    found_sections = found(features, required_sections)
+    missing_sections = [section for section in required_sections if section not in found_sections]
+
+    # Experience and education coverage analysis
+    experience_coverage = len(found(features, EXPERIENCE_WORDS)) / len(EXPERIENCE_WORDS) * 100
+    education_coverage = len(found(features, EDUCATION_WORDS)) / len(EDUCATION_WORDS) * 100
+
+    # Calculate completeness score
+    sections_score = (len(found_sections) / len(required_sections)) * 50
+    experience_score = min(25, experience_coverage * 0.25)
+    education_score = min(25, education_coverage * 0.25)
+
+    completeness_score = sections_score + experience_score + education_score
+
+    return {
+        'score': min(100, completeness_score),
+        'required_sections': found_sections,
+        'missing_sections': missing_sections,
+        'experience_coverage': round(experience_coverage, 1),
+        'education_coverage': round(education_coverage, 1)
+    }
+
+def analyze_optimization(features: Dict[str, Any], profession: str) -> Dict[str, Any]:
+    """Analyze resume optimization"""
+    # SEO score (keyword density and relevance)
+    seo_hits = sum(features['terms'].get(term, 0) for term in SEO_TERMS)
+    keyword_density = seo_hits / max(features['word_count'], 1) * 100
+    seo_score = min(100, keyword_density * 10)
+
+    # Industry keywords
+    found_industry_keywords = found(features, OPTIMIZATION_KEYWORDS)
+
+    # Trending skills
+    trending_skills = ['AI/ML', 'Cloud Computing', 'DevOps', 'Microservices', 'Machine Learning', 'Data Science']
+
+    # Modern formatting check
+    modern_formatting = not features['has_complex_characters']
+
+    # Calculate optimization score
+    seo_score_final = min(40, seo_score)
+    industry_score = min(30, len(found_industry_keywords) * 10)
+    modern_score = 30 if modern_formatting else 0
+
+    optimization_score = seo_score_final + industry_score + modern_score
+
+    return {
+        'score': min(100, optimization_score),
+        'seo_score': round(seo_score, 1),
+        'industry_keywords': found_industry_keywords,
+        'trending_skills': trending_skills,
+        'modern_formatting': modern_formatting
+    }
+
+def calculate_overall_score(category_scores: Dict[str, float]) -> float:
+    """Calculate overall ATS score"""
+    weights = {
+        'keywords': 0.25,
+        'content_quality': 0.20,
+        'formatting': 0.15,
+        'structure': 0.15,
+        'completeness': 0.15,
+        'optimization': 0.10
+    }
+
+    total_score = sum(category_scores[category] * weight for category, weight in weights.items())
+    return round(total_score, 1)
+
+def generate_recommendations(category_scores: Dict[str, float], detailed_analysis: Dict) -> Dict[str, List[str]]:
+    """Generate improvement recommendations"""
+    recommendations = {'critical': [], 'important': [], 'optional': []}
+
+    # Critical recommendations (scores below 60)
+    for category, score in category_scores.items():
+        if score < 60:
+            if category == 'keywords':
+                recommendations['critical'].append("Add more industry-specific keywords and technical terms")
+            elif category == 'content_quality':
+                recommendations['critical'].append("Include more quantifiable achievements and action verbs")
+            elif category == 'formatting':
+                recommendations['critical'].append("Simplify formatting and remove complex characters")
+            elif category == 'structure':
+                recommendations['critical'].append("Improve section organization and bullet point usage")
+            elif category == 'completeness':
+                recommendations['critical'].append("Add missing required sections")
+
+    # Important recommendations (scores 60-80)
+    for category, score in category_scores.items():
+        if 60 <= score < 80:
+            if category == 'keywords':
+                recommendations['important'].append("Optimize keyword density for better ATS performance")
+            elif category == 'content_quality':
+                recommendations['important'].append("Strengthen impact statements with specific metrics")
+            elif category == 'formatting':
+                recommendations['important'].append("Ensure consistent formatting throughout")
+            elif category == 'structure':
+                recommendations['important'].append("Improve logical flow and section headers")
+
+    # Optional recommendations
+    recommendations['optional'] = [
+        "Consider adding a professional summary section",
+        "Include relevant certifications or training",
+        "Add quantifiable results to all achievements",
+        "Use more action verbs in descriptions"
+    ]
+
+    return recommendations
+
+def calculate_real_world_performance(overall_score: float, keyword_analysis: Dict, content_quality: Dict) -> Dict[str, float]:
+    """Calculate real-world performance metrics"""
+    # Interview rate based on overall score
+    interview_rate = min(95, overall_score * 0.8 + 20)
+
+    # ATS pass rate
+    ats_pass_rate = overall_score
+
+    # Recruiter scan time (in seconds)
+    scan_time = max(3, 15 - (overall_score / 10))
+
+    # Keyword match percentage
+    keyword_match = keyword_analysis['profession_match'] * 100
+
+    return {
+        'estimated_interview_rate': round(interview_rate, 1),
+        'ats_pass_rate': round(ats_pass_rate, 1),
+        'recruiter_scan_time': round(scan_time, 1),
+        'keyword_match_percentage': round(keyword_match, 1)
+    }
+
+def get_ats_compatibility(score: float) -> str:
+    """Get ATS compatibility rating"""
+    if score >= 85:
+        return "Highly Compatible"
+    elif score >= 70:
+        return "Compatible"
+    elif score >= 55:
+        return "Moderately Compatible"
+    elif score >= 40:
+        return "Low Compatibility"
+    else:
+        return "Not Compatible"
+
+def get_employability_rating(score: float) -> str:
+    """Get employability rating"""
+    if score >= 90:
+        return "Excellent - High chance of passing ATS screening"
+    elif score >= 80:
+        return "Very Good - Strong ATS compatibility"
+    elif score >= 70:
+        return "Good - Likely to pass most ATS systems"
+    elif score >= 60:
+        return "Fair - May need some improvements"
+    elif score >= 50:
+        return "Poor - Significant improvements needed"
+    else:
+        return "Very Poor - Unlikely to pass ATS screening"
+
+def get_market_insights(profession: str) -> Dict[str, Any]:
+    """Get market insights based on profession"""
+    insights = {
+        'software_engineer': {
+            'industry_trends': [
+                'Remote work is becoming standard',
+                'AI and machine learning skills are in high demand',
+                'Cloud computing expertise is essential',
+                'DevOps and automation skills are critical'
+            ],
+            'salary_impact': 'Above average',
+            'competition_level': 'High',
+            'hiring_timeline': '2-4 weeks'
+        },
+        'data_scientist': {
+            'industry_trends': [
+                'Big data and analytics are growing rapidly',
+                'Machine learning expertise is highly valued',
+                'Python and R skills are essential',
+                'Business acumen is increasingly important'
+            ],
+            'salary_impact': 'Very high',
+            'competition_level': 'Very high',
+            'hiring_timeline': '3-6 weeks'
+        },
+        'marketing_manager': {
+            'industry_trends': [
+                'Digital marketing is dominating',
+                'Data-driven marketing is essential',
+                'Social media expertise is critical',
+                'Automation tools are becoming standard'
+            ],
+            'salary_impact': 'Above average',
+            'competition_level': 'High',
+            'hiring_timeline': '2-3 weeks'
+        }
+    }
+
+    return insights.get(profession, insights['software_engineer'])
+
+def enhance_ats_analysis(base_analysis, profession, job_title, analysis_mode):
+    """Enhance ATS analysis with real-world performance metrics"""
+
+    # Calculate real-world performance metrics
+    overall_score = base_analysis.get('overall_score', 0)
+
+    # Estimate interview rate based on ATS score and industry factors
+    base_interview_rate = min(95, overall_score * 0.8)
+    industry_multiplier = get_industry_multiplier(profession)
+    estimated_interview_rate = min(95, base_interview_rate * industry_multiplier)
+
+    # Calculate ATS pass rate
+    ats_pass_rate = overall_score
+
+    # Estimate recruiter scan time (in seconds)
+    word_count = base_analysis.get('formatting_analysis', {}).get('word_count', 0)
+    if word_count < 300:
+        scan_time = 4.2
+    elif word_count < 500:
+        scan_time = 6.2
+    elif word_count < 700:
+        scan_time = 8.5
+    else:
+        scan_time = 10.8
+
+    # Calculate keyword match percentage
+    keyword_analysis = base_analysis.get('keyword_analysis', {})
+    keyword_match_percentage = keyword_analysis.get('profession_match', 0) * 100
+
+    # Generate market insights
+    market_insights = generate_market_insights(profession, job_title)
+
+    # Generate trending skills
+    trending_skills = get_trending_skills(profession)
+
+    # Enhanced result structure
+    enhanced_result = {
+        'overall_score': overall_score,
+        'ats_compatibility': base_analysis.get('ats_compatibility', 'Unknown'),
+        'employability_rating': base_analysis.get('employability_rating', 'Unknown'),
+        'category_scores': base_analysis.get('category_scores', {}),
+        'detailed_analysis': {
+            'keywords': {
+                'found_keywords': keyword_analysis.get('relevant_keywords', []),
+                'missing_keywords': keyword_analysis.get('missing_keywords', []),
+                'keyword_density': keyword_analysis.get('keyword_density', 0),
+                'profession_match': keyword_analysis.get('profession_match', 0),
+                'industry_relevance': min(100, keyword_analysis.get('profession_match', 0) * 1.2)
+            },
+            'content_quality': {
+                'action_verbs': base_analysis.get('content_analysis', {}).get('action_verbs_found', []),
+                'quantifiable_results': base_analysis.get('content_analysis', {}).get('has_quantifiable_results', False),
+                'professional_tone': base_analysis.get('content_analysis', {}).get('professional_tone', 'Unknown'),
+                'achievement_focus': base_analysis.get('content_analysis', {}).get('achievement_focused', 'Unknown'),
+                'impact_statements': count_impact_statements(base_analysis.get('content_analysis', {}).get('action_verbs_found', []))
+            },
+            'formatting': {
+                'ats_friendly': not base_analysis.get('formatting_analysis', {}).get('has_complex_characters', True),
+                'standard_sections': base_analysis.get('formatting_analysis', {}).get('has_standard_sections', 0),
+                'word_count': word_count,
+                'readability_score': calculate_readability_score(word_count, base_analysis.get('content_analysis', {})),
+                'contact_info_complete': base_analysis.get('formatting_analysis', {}).get('has_email', False) and
+                                       base_analysis.get('formatting_analysis', {}).get('has_phone', False)
+            },
+            'structure': {
+                'logical_flow': overall_score > 70,
+                'section_headers': ['Experience', 'Education', 'Skills'],
+                'bullet_points': estimate_bullet_points(base_analysis),
+                'consistent_formatting': overall_score > 60
+            },
+            'completeness': {
+                'required_sections': ['Experience', 'Education', 'Skills'],
+                'missing_sections': [],
+                'experience_coverage': min(100, overall_score * 0.9),
+                'education_coverage': min(100, overall_score * 0.95)
+            },
+            'optimization': {
+                'seo_score': min(100, overall_score * 0.8),
+                'industry_keywords': keyword_analysis.get('relevant_keywords', []),
+                'trending_skills': trending_skills,
+                'modern_formatting': overall_score > 75
+            }
+        },
+        'recommendations': {
+            'critical': base_analysis.get('recommendations', [])[:2],
+            'important': base_analysis.get('recommendations', [])[2:5],
+            'optional': base_analysis.get('recommendations', [])[5:]
+        },
+        'market_insights': market_insights,
+        'real_world_performance': {
+            'estimated_interview_rate': estimated_interview_rate,
+            'ats_pass_rate': ats_pass_rate,
+            'recruiter_scan_time': scan_time,
+            'keyword_match_percentage': keyword_match_percentage
+        }
+    }
+
+    return enhanced_result
+
+def get_industry_multiplier(profession):
+    """Get industry-specific multiplier for interview rate calculation"""
+    multipliers = {
+        'Software Engineer': 1.2,
+        'Marketing Manager': 1.1,
+        'Sales Professional': 1.15,
+        'Healthcare Professional': 1.05,
+        'Finance Professional': 1.1,
+        'Data Scientist': 1.25,
+        'Product Manager': 1.2,
+        'Designer': 1.1
+    }
+    return multipliers.get(profession, 1.0)
+
+def generate_market_insights(profession, job_title):
+    """Generate market insights based on profession and job title"""
+    insights = {
+        'industry_trends': [
+            'Remote work opportunities increasing',
+            'AI and automation integration',
+            'Focus on sustainability and ESG',
+            'Skills-based hiring approach'
+        ],
+        'salary_impact': 'Above average' if profession in ['Software Engineer', 'Data Scientist'] else 'Average',
+        'competition_level': 'High' if profession in ['Software Engineer', 'Marketing Manager'] else 'Medium',
+        'hiring_timeline': '2-4 weeks' if profession in ['Software Engineer', 'Data Scientist'] else '3-6 weeks'
+    }
+    return insights
+
+def get_trending_skills(profession):
+    """Get trending skills for the profession"""
+    skill_sets = {
+        'Software Engineer': ['AI/ML', 'Cloud Computing', 'DevOps', 'Microservices', 'React/Vue'],
+        'Marketing Manager': ['Digital Marketing', 'Data Analytics', 'SEO/SEM', 'Social Media', 'Content Strategy'],
+        'Sales Professional': ['CRM Systems', 'Sales Analytics', 'Lead Generation', 'Customer Success', 'Negotiation'],
+        'Healthcare Professional': ['Telemedicine', 'Electronic Health Records', 'Patient Care Technology', 'Medical AI', 'Healthcare Analytics'],
+        'Finance Professional': ['Financial Modeling', 'Risk Management', 'Blockchain', 'Fintech', 'Data Analysis']
+    }
+    return skill_sets.get(profession, ['Leadership', 'Communication', 'Problem Solving', 'Project Management', 'Analytics'])
+
+def count_impact_statements(action_verbs):
+    """Count impact statements based on action verbs"""
+    return min(len(action_verbs), 10)
+
+def calculate_readability_score(word_count, content_analysis):
+    """Calculate readability score based on content analysis"""
+    base_score = 70
+    if content_analysis.get('has_quantifiable_results', False):
+        base_score += 10
+    if content_analysis.get('professional_tone', '') == 'Professional':
+        base_score += 10
+    if word_count > 300 and word_count < 700:
+        base_score += 5
+    return min(100, base_score)
+
+def estimate_bullet_points(base_analysis):
+    """Estimate number of bullet points in resume"""
+    word_count = base_analysis.get('formatting_analysis', {}).get('word_count', 0)
+    return max(5, min(15, word_count // 50))
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the CPU-bound document paths
+
+Times the PDF generators, the rule-based resume parser and the ATS scorer on
+fixture resumes of three sizes, and compares the results with the stored
+baselines in benchmark_baseline.json:
+
+    small    1 job    (1 page)
+    medium   5 jobs   (2 pages)
+    large    20 jobs  (4 pages)
+
+Each benchmark reports the best and median wall time over --rounds runs
+(after a warm-up run) and the peak traced memory of one extra run. The best
+time is compared, as it is the least noisy; a result more than --threshold
+percent slower (or --memory-threshold percent larger) than its baseline is a
+regression and makes the script exit 1. parser_hybrid also reports the OpenAI
+tokens (prompt plus completion budget) an import of the fixture would spend,
+next to the whole-document AI pass it replaces:
+
+    python benchmark_suite.py                         # compare with the baselines
+    python benchmark_suite.py --save                  # record new baselines
+    python benchmark_suite.py --only robust_pdf --sizes large --rounds 20
+
+Baselines are machine specific; re-record them (--save) on the machine that
+runs the comparison, and commit them together with intended slowdowns.
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BACKEND_DIR, 'benchmark_baseline.json')
+DEFAULT_THRESHOLD = float(os.getenv('BENCHMARK_THRESHOLD', 20))
+DEFAULT_MEMORY_THRESHOLD = float(os.getenv('BENCHMARK_MEMORY_THRESHOLD', 25))
+
+SIZES = {'small': 1, 'medium': 5, 'large': 20}
+PROFESSION = 'Operations Manager'
+JOB_TITLE = 'Logistics Operations Manager'
+
+EMPLOYERS = ['Acme Logistics', 'Swift Couriers', 'Savannah Freight', 'Lakeside Distributors', 'Rift Valley Foods']
+TITLES = ['Operations Manager', 'Dispatch Coordinator', 'Fleet Supervisor', 'Warehouse Lead', 'Logistics Analyst']
+DUTIES = [
+    'Managed a team of {n} dispatch staff across two shifts and cut late deliveries by {p}%',
+    'Negotiated carrier contracts worth KES {n} million and reduced freight costs by {p}%',
+    'Implemented a route planning system that improved fleet utilisation by {p}%',
+    'Built weekly KPI dashboards in Excel for senior leadership covering {n} depots',
+    'Trained {n} new hires on safety procedures, achieving zero reportable incidents',
+]
+
+
+def build_resume(jobs: int) -> Dict[str, Any]:
+    """A Francisca form with `jobs` work experience entries"""
+    experience = []
+    for i in range(jobs):
+        end_year = 2024 - 2 * i
+        experience.append({
+            'jobTitle': TITLES[i % len(TITLES)],
+            'employer': EMPLOYERS[i % len(EMPLOYERS)],
+            'city': 'Nairobi',
+            'country': 'Kenya',
+            'startDate': f'{end_year - 2}-01',
+            'endDate': f'{end_year}-12',
+            'current': i == 0,
+            'responsibilities': [duty.format(n=5 + i, p=10 + i) for duty in DUTIES],
+        })
+    return {
+        'personalInfo': {
+            'firstName': 'Wanjiru', 'lastName': 'Kamau', 'email': 'wanjiru@example.com',
+            'phone': '+254712345678', 'city': 'Nairobi', 'country': 'Kenya',
+        },
+        'professionalSummary': ('Operations manager with a record of running reliable last-mile delivery '
+                                'networks, leading dispatch teams and cutting logistics costs.'),
+        'education': [{
+            'institution': 'University of Nairobi', 'degree': 'Bachelor of Commerce',
+            'fieldOfStudy': 'Supply Chain Management', 'city': 'Nairobi', 'country': 'Kenya',
+            'startDate': '2008-09', 'endDate': '2012-06',
+        }],
+        'workExperience': experience,
+        'skills': [{'name': name} for name in ['Logistics', 'Fleet management', 'Excel', 'Negotiation',
+                                                'Team leadership', 'Budgeting', 'SAP']],
+        'languages': [{'name': 'English', 'proficiency': 'Fluent'}, {'name': 'Swahili', 'proficiency': 'Native'}],
+        'interests': 'Running, Chess',
+        'referees': [{'name': 'Peter Otieno', 'position': 'Director', 'organization': 'Acme Logistics',
+                      'email': 'peter@example.com', 'phone': '+254700000001'}],
+    }
+
+
+def resume_text(resume: Dict[str, Any]) -> str:
+    """Plain-text rendering of a fixture resume, as text extraction would produce it"""
+    info = resume['personalInfo']
+    lines = [f"{info['firstName']} {info['lastName']}", info['email'], info['phone'],
+             f"{info['city']}, {info['country']}", '', 'PROFESSIONAL SUMMARY', resume['professionalSummary'], '',
+             'WORK EXPERIENCE']
+    for job in resume['workExperience']:
+        lines += [f"{job['jobTitle']} at {job['employer']}", f"{job['startDate']} - {job['endDate']}"]
+        lines += [f"• {duty}" for duty in job['responsibilities']]
+        lines.append('')
+    education = resume['education'][0]
+    lines += ['EDUCATION', f"{education['degree']} in {education['fieldOfStudy']}", education['institution'],
+              f"{education['startDate'][:4]} - {education['endDate'][:4]}", '',
+              'SKILLS', ', '.join(skill['name'] for skill in resume['skills'])]
+    return '\n'.join(lines)
+
+
+def pdf_page_count(pdf: Optional[bytes]) -> int:
+    return len(re.findall(rb'/Type\s*/Page\b', pdf or b''))
+
+
+# ----- benchmarks: each setup returns the function to time -----
+
+def _robust_pdf(resume):
+    from francisca_pdf_generator_robust import RobustFranciscaPDFGenerator
+    generator = RobustFranciscaPDFGenerator()
+    return lambda: generator.generate_resume_pdf_bytes(resume)
+
+
+def _professional_pdf(resume):
+    from francisca_pdf_generator import ProfessionalFranciscaPDFGenerator
+    generator = ProfessionalFranciscaPDFGenerator()
+    return lambda: generator.generate_resume_pdf_bytes(resume)
+
+
+def _parser_extraction(resume):
+    from resume_parser_service import ResumeParserService
+    parser = ResumeParserService()
+    text = resume_text(resume)
+    return lambda: parser._simple_reliable_extraction(text)
+
+
+def _parser_hybrid(resume):
+    # The import path: local parse and confidence scoring, plus the escalation prompt
+    from resume_parser_service import ResumeParserService
+    from resume_confidence import build_prompt, estimate_tokens, max_tokens_for, plan_escalation, split_sections
+    parser = ResumeParserService()
+    text = resume_text(resume)
+
+    def parse():
+        parsed, confidence, _ = parser.parse_with_confidence(text)
+        names = plan_escalation(confidence, split_sections(text))
+        prompt = build_prompt(names, split_sections(text)) if names else ''
+        full_prompt = parser._full_enhancement_prompt(parsed, text)
+        return {
+            'ai_tokens': estimate_tokens(prompt) + max_tokens_for(prompt) if names else 0,
+            'full_pass_tokens': estimate_tokens(full_prompt) + 2000,
+        }
+    return parse
+
+
+def _ats_analysis(resume):
+    from ats_routes import perform_real_ats_analysis
+    text = resume_text(resume)
+    return lambda: perform_real_ats_analysis(text, PROFESSION, JOB_TITLE)
+
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, Any]], Callable[[], Any]]] = {
+    'robust_pdf': _robust_pdf,
+    'professional_pdf': _professional_pdf,
+    'parser_extraction': _parser_extraction,
+    'parser_hybrid': _parser_hybrid,
+    'ats_analysis': _ats_analysis,
+}
+
+
+def measure(function: Callable[[], Any], rounds: int) -> Dict[str, Any]:
+    """Median and best wall time over `rounds` runs, then peak memory of one traced run"""
+    sink = io.StringIO()
+    with redirect_stdout(sink):   # the generators print progress
+        output = function()
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+            sink.seek(0)
+            sink.truncate()
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    result = {
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+    if isinstance(output, (bytes, bytearray)):
+        result['pages'] = pdf_page_count(output)
+    elif isinstance(output, dict):
+        result.update({key: value for key, value in output.items() if key.endswith('_tokens')})
+    return result
+
+
+def run(names: List[str], sizes: List[str], rounds: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name in names:
+        for size in sizes:
+            key = f"{name}[{size}]"
+            try:
+                function = BENCHMARKS[name](build_resume(SIZES[size]))
+            except ImportError as e:
+                results[key] = {'skipped': f"missing dependency: {e.name}"}
+                continue
+            results[key] = measure(function, rounds)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'system': platform.system(),
+            'cpus': str(os.cpu_count())}
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {'environment': {}, 'results': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_PATH):
+    baseline = load_baseline(path)
+    baseline['environment'] = environment()
+    baseline['results'].update({key: value for key, value in results.items() if 'skipped' not in value})
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float, memory_threshold: float) -> List[Dict[str, Any]]:
+    """One row per benchmark: change against baseline (percent) and status"""
+    rows = []
+    for key, result in results.items():
+        row = {'key': key, 'result': result, 'baseline': baseline.get(key)}
+        if 'skipped' in result:
+            row['status'] = 'skipped'
+        elif row['baseline'] is None:
+            row['status'] = 'new'
+        else:
+            row['time_change'] = 100.0 * (result['min_ms'] / row['baseline']['min_ms'] - 1)
+            row['memory_change'] = 100.0 * (result['peak_kib'] / max(row['baseline']['peak_kib'], 1) - 1)
+            slower = row['time_change'] > threshold
+            bigger = row['memory_change'] > memory_threshold
+            row['status'] = 'regression' if slower or bigger else 'ok'
+        rows.append(row)
+    return rows
+
+
+def report(rows: List[Dict[str, Any]], threshold: float, memory_threshold: float):
+    icons = {'ok': '✅', 'regression': '❌', 'new': '🆕', 'skipped': '⏭️ '}
+    print(f"{'benchmark':<30}{'pages':>6}{'median ms':>11}{'best ms':>9}{'base ms':>9}{'Δ time':>9}"
+          f"{'peak KiB':>11}{'Δ mem':>8}")
+    for row in rows:
+        result, baseline = row['result'], row['baseline']
+        if row['status'] == 'skipped':
+            print(f"{icons['skipped']} {row['key']:<27} {result['skipped']}")
+            continue
+        base_ms = f"{baseline['min_ms']:.1f}" if baseline else '-'
+        time_change = f"{row['time_change']:+.0f}%" if 'time_change' in row else '-'
+        memory_change = f"{row['memory_change']:+.0f}%" if 'memory_change' in row else '-'
+        print(f"{icons[row['status']]} {row['key']:<27}{result.get('pages', ''):>6}{result['median_ms']:>11.1f}"
+              f"{result['min_ms']:>9.1f}{base_ms:>9}{time_change:>9}{result['peak_kib']:>11.0f}{memory_change:>8}")
+        if 'ai_tokens' in result:
+            print(f"   AI tokens per import: {result['ai_tokens']} (whole-document pass: {result['full_pass_tokens']})")
+    regressions = [row['key'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond +{threshold:.0f}% time / "
+              f"+{memory_threshold:.0f}% memory: {', '.join(regressions)}")
+    else:
+        print(f"\n✅ No regressions beyond +{threshold:.0f}% time / +{memory_threshold:.0f}% memory")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF generation, resume parsing and ATS scoring')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--rounds', type=int, default=15, help='timed runs per benchmark')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown, percent')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help='allowed peak memory growth, percent')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help='store these results as the new baselines')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    results = run(args.only, args.sizes, args.rounds)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+    baseline = load_baseline(args.baseline)
+    if baseline['environment'] and baseline['environment'] != environment():
+        print(f"⚠️  Baselines were recorded on {baseline['environment']}, this is {environment()}")
+    rows = compare(results, baseline['results'], args.threshold, args.memory_threshold)
+    report(rows, args.threshold, args.memory_threshold)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"💾 Baselines saved to {args.baseline}")
+        return 0
+    return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""
+Circuit Breaker
+Shared circuit breaker for upstream APIs (OpenAI), so an outage is detected
+once per host instead of once per worker and request.
+
+    closed     calls go through; outcomes are counted in a rolling window of
+               BUCKETS time buckets. When at least MIN_CALLS calls in the
+               window failed at ERROR_RATE or more, the breaker opens.
+               Quota and authentication errors open it immediately.
+    open       calls are refused without touching the network (callers use
+               their fallback) until the cooldown has passed; the cooldown
+               doubles each time a probe fails, up to MAX_COOLDOWN
+    half_open  one caller on the host is let through as a probe: success
+               closes the breaker, failure opens it again
+
+State and window counts live in a host-local SQLite file shared by all
+gunicorn workers. Each process caches the state for STATE_TTL seconds, so
+refusing a call while open is an in-memory check.
+
+Errors are classified by type and HTTP status (openai 0.28 and 1.x), not by
+message text: timeouts, connection errors, 429 and 5xx count as failures;
+400/404-style request errors are the caller's problem and are not counted.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_BREAKER_DB_PATH = os.getenv('CIRCUIT_BREAKER_DB', os.path.join('data', 'circuit_breakers.db'))
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Error kinds
+QUOTA, AUTH, RATE_LIMIT, SERVER, TIMEOUT, CONNECTION, CLIENT, OTHER = (
+    'quota', 'auth', 'rate_limit', 'server', 'timeout', 'connection', 'client', 'other')
+TRIP_IMMEDIATELY = (QUOTA, AUTH)
+COUNTED = (QUOTA, AUTH, RATE_LIMIT, SERVER, TIMEOUT, CONNECTION)
+
+_TIMEOUT_TYPES = {'Timeout', 'APITimeoutError', 'ReadTimeout', 'ConnectTimeout', 'TimeoutError', 'timeout'}
+_CONNECTION_TYPES = {'APIConnectionError', 'ConnectionError', 'ServiceUnavailableError', 'TryAgain',
+                     'ConnectionResetError', 'ConnectionRefusedError', 'RemoteDisconnected'}
+_QUOTA_CODES = {'insufficient_quota', 'billing_hard_limit_reached', 'billing_not_active'}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit is open (retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    for attribute in ('http_status', 'status_code'):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, 'response', None)
+    value = getattr(response, 'status_code', None)
+    return value if isinstance(value, int) else None
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    code = getattr(error, 'code', None)
+    if code is None:
+        body = getattr(error, 'body', None) or getattr(error, 'json_body', None)
+        if isinstance(body, dict):
+            details = body.get('error', body)
+            code = details.get('code') or details.get('type') if isinstance(details, dict) else None
+    return code if isinstance(code, str) else None
+
+
+def classify_error(error: Exception) -> str:
+    """Map an exception from an OpenAI call to an error kind"""
+    names = {cls.__name__ for cls in type(error).__mro__}
+    status = _status_code(error)
+    if _error_code(error) in _QUOTA_CODES:
+        return QUOTA
+    if names & _TIMEOUT_TYPES:
+        return TIMEOUT
+    if status in (401, 403) or names & {'AuthenticationError', 'PermissionError', 'PermissionDeniedError'}:
+        return AUTH
+    if status == 429 or 'RateLimitError' in names:
+        return RATE_LIMIT
+    if names & _CONNECTION_TYPES:
+        return CONNECTION
+    if status is not None and status >= 500:
+        return SERVER
+    if (status is not None and status >= 400) or \
+            names & {'InvalidRequestError', 'BadRequestError', 'NotFoundError', 'UnprocessableEntityError'}:
+        return CLIENT
+    if names & {'APIError', 'InternalServerError'}:
+        return SERVER
+    return OTHER
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with state shared through SQLite"""
+
+    def __init__(self, name: str, db_path: str = CIRCUIT_BREAKER_DB_PATH, window: float = 60.0,
+                 buckets: int = 6, min_calls: int = 5, error_rate: float = 0.5, cooldown: float = 30.0,
+                 max_cooldown: float = 600.0, quota_cooldown: float = 900.0, probe_timeout: float = 60.0,
+                 state_ttl: float = 1.0, clock=time.time):
+        self.name = name
+        self.db_path = db_path
+        self.bucket_seconds = window / buckets
+        self.buckets = buckets
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.quota_cooldown = quota_cooldown
+        self.probe_timeout = probe_timeout
+        self.state_ttl = state_ttl
+        self.clock = clock
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._state = {'state': CLOSED, 'open_until': 0.0, 'probe_until': 0.0}
+        self._state_expires = 0.0
+        # Process-local counters (exported as metrics)
+        self.stats = {'calls': 0, 'successes': 0, 'failures': 0, 'short_circuits': 0, 'opened': 0}
+
+    # ----- storage -----
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._init_database()
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _init_database(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS breaker_state (
+                    name TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    open_until REAL NOT NULL DEFAULT 0,
+                    probe_until REAL NOT NULL DEFAULT 0,
+                    trips INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    changed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS breaker_calls (
+                    name TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    successes INTEGER NOT NULL DEFAULT 0,
+                    failures INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (name, bucket)
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _read_row(self, conn) -> Dict[str, Any]:
+        row = conn.execute("SELECT state, open_until, probe_until, trips, last_error FROM breaker_state WHERE name = ?",
+                           (self.name,)).fetchone()
+        if row is None:
+            return {'state': CLOSED, 'open_until': 0.0, 'probe_until': 0.0, 'trips': 0, 'last_error': None}
+        return dict(zip(('state', 'open_until', 'probe_until', 'trips', 'last_error'), row))
+
+    def _write_row(self, conn, row: Dict[str, Any], now: float):
+        conn.execute("""
+            INSERT INTO breaker_state (name, state, open_until, probe_until, trips, last_error, changed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                state = excluded.state, open_until = excluded.open_until, probe_until = excluded.probe_until,
+                trips = excluded.trips, last_error = excluded.last_error, changed_at = excluded.changed_at
+        """, (self.name, row['state'], row['open_until'], row['probe_until'], row['trips'], row['last_error'], now))
+
+    def _cache(self, row: Dict[str, Any], now: float):
+        self._state = {'state': row['state'], 'open_until': row['open_until'], 'probe_until': row['probe_until']}
+        self._state_expires = now + self.state_ttl
+
+    def _transaction(self, body):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = body(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ----- admission -----
+
+    def _refused(self, state: Dict[str, Any], now: float) -> bool:
+        if state['state'] == OPEN:
+            return now < state['open_until']
+        if state['state'] == HALF_OPEN:
+            return now < state['probe_until']
+        return False
+
+    def is_open(self) -> bool:
+        """True while calls are being refused (no probe is claimed)"""
+        now = self.clock()
+        if now >= self._state_expires:
+            try:
+                self._cache(self._read_row(self._connect()), now)
+            except sqlite3.Error as e:
+                logger.warning(f"Circuit breaker {self.name} unavailable: {e}")
+                return False
+        return self._refused(self._state, now)
+
+    def acquire(self) -> Optional[bool]:
+        """
+        Ask to make a call. Returns None when the call must be short-circuited,
+        otherwise whether this call is the half-open probe. Every admitted call
+        must be followed by record().
+        """
+        now = self.clock()
+        if now >= self._state_expires:
+            try:
+                self._cache(self._read_row(self._connect()), now)
+            except sqlite3.Error as e:
+                logger.warning(f"Circuit breaker {self.name} unavailable, allowing call: {e}")
+                return False
+        state = self._state
+        if state['state'] == CLOSED:
+            self.stats['calls'] += 1
+            return False
+        if self._refused(state, now):
+            self.stats['short_circuits'] += 1
+            return None
+
+        def claim(conn):
+            row = self._read_row(conn)
+            probe = False
+            if row['state'] != CLOSED and not self._refused(row, now):
+                row.update(state=HALF_OPEN, probe_until=now + self.probe_timeout)
+                self._write_row(conn, row, now)
+                probe = True
+            self._cache(row, now)
+            return row, probe
+
+        try:
+            row, probe = self._transaction(claim)
+        except sqlite3.Error as e:
+            logger.warning(f"Circuit breaker {self.name} unavailable, allowing call: {e}")
+            return False
+        if not probe and row['state'] != CLOSED:
+            self.stats['short_circuits'] += 1
+            return None
+        if probe:
+            logger.info(f"Circuit {self.name} half-open: probing upstream")
+        self.stats['calls'] += 1
+        return probe
+
+    # ----- outcomes -----
+
+    def _open(self, conn, row: Dict[str, Any], now: float, kind: str):
+        trips = row['trips'] + 1
+        cooldown = self.quota_cooldown if kind == QUOTA else min(self.max_cooldown, self.cooldown * 2 ** (trips - 1))
+        row.update(state=OPEN, open_until=now + cooldown, probe_until=0.0, trips=trips, last_error=kind)
+        self._write_row(conn, row, now)
+        conn.execute("DELETE FROM breaker_calls WHERE name = ?", (self.name,))
+        self.stats['opened'] += 1
+        logger.warning(f"Circuit {self.name} opened after {kind} errors; using fallback for {cooldown:.0f}s")
+
+    def record(self, probe: bool, error: Optional[Exception] = None) -> Optional[str]:
+        """Record the outcome of an admitted call; returns the error kind"""
+        kind = classify_error(error) if error is not None else None
+        failed = kind in COUNTED
+        if failed:
+            self.stats['failures'] += 1
+        elif kind is None:
+            self.stats['successes'] += 1
+        elif not probe:
+            return kind  # request errors and our own bugs say nothing about upstream health
+        now = self.clock()
+        bucket = int(now // self.bucket_seconds)
+
+        def update(conn):
+            row = self._read_row(conn)
+            if probe:
+                if failed:
+                    self._open(conn, row, now, kind)
+                else:
+                    row.update(state=CLOSED, open_until=0.0, probe_until=0.0, trips=0)
+                    self._write_row(conn, row, now)
+                    conn.execute("DELETE FROM breaker_calls WHERE name = ?", (self.name,))
+                    logger.info(f"Circuit {self.name} closed: upstream recovered")
+            elif row['state'] == CLOSED:
+                conn.execute(f"""
+                    INSERT INTO breaker_calls (name, bucket, successes, failures) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(name, bucket) DO UPDATE SET {'failures = failures + 1' if failed else 'successes = successes + 1'}
+                """, (self.name, bucket, 0 if failed else 1, 1 if failed else 0))
+                conn.execute("DELETE FROM breaker_calls WHERE name = ? AND bucket <= ?",
+                             (self.name, bucket - self.buckets))
+                if failed:
+                    if kind in TRIP_IMMEDIATELY:
+                        self._open(conn, row, now, kind)
+                    else:
+                        successes, failures = conn.execute(
+                            "SELECT COALESCE(SUM(successes), 0), COALESCE(SUM(failures), 0) FROM breaker_calls "
+                            "WHERE name = ?", (self.name,)).fetchone()
+                        calls = successes + failures
+                        if calls >= self.min_calls and failures >= self.error_rate * calls:
+                            self._open(conn, row, now, kind)
+            self._cache(row, now)
+
+        try:
+            self._transaction(update)
+        except sqlite3.Error as e:
+            logger.warning(f"Circuit breaker {self.name} could not record outcome: {e}")
+        return kind
+
+    @contextmanager
+    def guard(self):
+        """Run one upstream call under the breaker; raises CircuitOpenError while open"""
+        probe = self.acquire()
+        if probe is None:
+            raise CircuitOpenError(self.name, max(0.0, self._state['open_until'] - self.clock()))
+        try:
+            yield
+        except Exception as e:
+            self.record(probe, e)
+            raise
+        self.record(probe)
+
+    # ----- metrics -----
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Shared state, rolling window counts and this process's counters"""
+        now = self.clock()
+        try:
+            conn = self._connect()
+            row = self._read_row(conn)
+            successes, failures = conn.execute(
+                "SELECT COALESCE(SUM(successes), 0), COALESCE(SUM(failures), 0) FROM breaker_calls "
+                "WHERE name = ? AND bucket > ?", (self.name, int(now // self.bucket_seconds) - self.buckets)).fetchone()
+        except sqlite3.Error as e:
+            return {'name': self.name, 'state': 'unknown', 'error': str(e), 'process': dict(self.stats)}
+        return {
+            'name': self.name,
+            'state': row['state'],
+            'retry_in': round(max(0.0, row['open_until'] - now), 1) if row['state'] == OPEN else 0.0,
+            'trips': row['trips'],
+            'last_error': row['last_error'],
+            'window_calls': successes + failures,
+            'window_failures': failures,
+            'process': dict(self.stats),
+        }
+
+    def prometheus_lines(self) -> str:
+        snapshot = self.snapshot()
+        label = f'breaker="{self.name}"'
+        lines = [
+            "# HELP prowrite_circuit_breaker_state Circuit state (0 closed, 1 half-open, 2 open)",
+            "# TYPE prowrite_circuit_breaker_state gauge",
+            f"prowrite_circuit_breaker_state{{{label}}} {STATE_VALUES.get(snapshot['state'], -1)}",
+            "# HELP prowrite_circuit_breaker_window_calls Calls in the rolling window (all workers)",
+            "# TYPE prowrite_circuit_breaker_window_calls gauge",
+            f"prowrite_circuit_breaker_window_calls{{{label}}} {snapshot.get('window_calls', 0)}",
+            "# TYPE prowrite_circuit_breaker_window_failures gauge",
+            f"prowrite_circuit_breaker_window_failures{{{label}}} {snapshot.get('window_failures', 0)}",
+        ]
+        for counter in ('calls', 'failures', 'short_circuits', 'opened'):
+            lines.append(f"# TYPE prowrite_circuit_breaker_{counter}_total counter")
+            lines.append(f"prowrite_circuit_breaker_{counter}_total{{{label},pid=\"{os.getpid()}\"}} "
+                         f"{snapshot['process'][counter]}")
+        return '\n'.join(lines) + '\n'
+
+
+openai_breaker = CircuitBreaker(
+    'openai',
+    window=float(os.getenv('OPENAI_BREAKER_WINDOW', 60)),
+    min_calls=int(os.getenv('OPENAI_BREAKER_MIN_CALLS', 5)),
+    error_rate=float(os.getenv('OPENAI_BREAKER_ERROR_RATE', 0.5)),
+    cooldown=float(os.getenv('OPENAI_BREAKER_COOLDOWN', 30)),
+    max_cooldown=float(os.getenv('OPENAI_BREAKER_MAX_COOLDOWN', 600)),
+    quota_cooldown=float(os.getenv('OPENAI_BREAKER_QUOTA_COOLDOWN', 900)),
+)
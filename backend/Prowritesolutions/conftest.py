@@ -0,0 +1,31 @@
+"""
+pytest configuration for the backend tests.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Importing app_core sets up production logging; keep test runs out of the tracked logs/app.log
+if 'LOG_FILE' not in os.environ:
+    _log_dir = tempfile.mkdtemp(prefix='prowrite-tests-')
+    atexit.register(shutil.rmtree, _log_dir, ignore_errors=True)
+    os.environ['LOG_FILE'] = os.path.join(_log_dir, 'app.log')
+
+
+class Clock:
+    """Settable stand-in for time.time"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
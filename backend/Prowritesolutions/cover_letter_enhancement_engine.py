@@ -8,6 +8,7 @@ import json
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import openai
+from jd_features import jd_feature_store, mentioned, normalize
 
 @dataclass
 class ATSAnalysis:
@@ -126,15 +127,22 @@ class CoverLetterEnhancementEngine:
     
     def analyze_ats_compatibility(self, cover_letter_content: str, job_description: str) -> ATSAnalysis:
         """Analyze cover letter for ATS compatibility"""
-        # Extract keywords from job description
-        job_keywords = self._extract_keywords_from_text(job_description.lower())
+        # Weighted job description keywords, extracted once per posting and shared
+        job_weights = jd_feature_store.features(job_description)['keywords']
+        job_description_lower = job_description.lower()
+        for kw in self.ats_common_keywords:
+            if kw in job_description_lower:
+                job_weights.setdefault(kw, 0.5)
+        job_keywords = list(job_weights)
         
         # Extract keywords from cover letter
-        cover_letter_keywords = self._extract_keywords_from_text(cover_letter_content.lower())
+        cover_letter_lower = normalize(cover_letter_content)
+        cover_letter_keywords = set(self._extract_keywords_from_text(cover_letter_lower))
         
-        # Calculate keyword matches
-        keyword_matches = [kw for kw in job_keywords if kw in cover_letter_keywords]
-        keyword_score = len(keyword_matches) / max(len(job_keywords), 1) * 100
+        # Calculate keyword matches, weighted by how much the posting stresses each one
+        keyword_matches = [kw for kw in job_keywords
+                           if kw in cover_letter_keywords or (not kw.isalpha() and mentioned(kw, cover_letter_lower))]
+        keyword_score = sum(job_weights[kw] for kw in keyword_matches) / max(sum(job_weights.values()), 1) * 100
         
         # Analyze readability
         readability_score = self._calculate_readability_score(cover_letter_content)
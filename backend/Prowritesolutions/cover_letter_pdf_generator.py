@@ -4,6 +4,8 @@ ATS-friendly cover letter formatting with professional styling
 """
 
 import os
+import logging
+from io import BytesIO
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch, mm
@@ -16,6 +18,8 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.fonts import addMapping
 import re
 
+logger = logging.getLogger(__name__)
+
 class ProfessionalCoverLetterPDFGenerator:
     def __init__(self, theme_name="professional"):
         self.styles = getSampleStyleSheet()
@@ -131,8 +135,18 @@ class ProfessionalCoverLetterPDFGenerator:
             )
         }
 
+    def generate_cover_letter_pdf_bytes(self, cover_letter_data):
+        """Render the cover letter into an in-memory buffer and return the PDF bytes (None on failure)"""
+        buffer = BytesIO()
+        if not self.generate_cover_letter_pdf(cover_letter_data, buffer):
+            return None
+        return buffer.getvalue()
+
     def generate_cover_letter_pdf(self, cover_letter_data, output_path):
-        """Generate a professional cover letter PDF"""
+        """Generate a professional cover letter PDF
+
+        output_path may be a filesystem path or any writable file-like object (e.g. BytesIO).
+        """
         try:
             # Create the PDF document
             doc = SimpleDocTemplate(
@@ -220,37 +234,25 @@ class ProfessionalCoverLetterPDFGenerator:
             # Build the PDF
             doc.build(story)
             
-            print(f"Cover letter PDF successfully generated at: {output_path}")
+            logger.debug("Cover letter PDF generated at %s", output_path)
             return True
             
         except Exception as e:
-            print(f"Error generating cover letter PDF: {str(e)}")
+            logger.error(f"Error generating cover letter PDF: {e}")
             return False
 
     def generate_simple_cover_letter_pdf(self, cover_letter_content, output_path, title="Cover Letter"):
         """Generate a simple cover letter PDF with basic formatting"""
         try:
-            # Check if output_path is a BytesIO object or file path
-            if hasattr(output_path, 'write'):
-                # It's a BytesIO object
-                doc = SimpleDocTemplate(
-                    output_path,
-                    pagesize=self.page_size,
-                    leftMargin=self.margins[0],
-                    rightMargin=self.margins[1],
-                    topMargin=self.margins[2],
-                    bottomMargin=self.margins[3]
-                )
-            else:
-                # It's a file path
-                doc = SimpleDocTemplate(
-                    output_path,
-                    pagesize=self.page_size,
-                    leftMargin=self.margins[0],
-                    rightMargin=self.margins[1],
-                    topMargin=self.margins[2],
-                    bottomMargin=self.margins[3]
-                )
+            # output_path can be a file path or a BytesIO object
+            doc = SimpleDocTemplate(
+                output_path,
+                pagesize=self.page_size,
+                leftMargin=self.margins[0],
+                rightMargin=self.margins[1],
+                topMargin=self.margins[2],
+                bottomMargin=self.margins[3]
+            )
             
             # Get styles
             styles = self.create_styles()
@@ -280,9 +282,297 @@ class ProfessionalCoverLetterPDFGenerator:
             # Build the PDF
             doc.build(story)
             
-            print(f"Simple cover letter PDF successfully generated at: {output_path}")
+            logger.debug("Simple cover letter PDF generated at %s", output_path)
             return True
             
         except Exception as e:
-            print(f"Error generating simple cover letter PDF: {str(e)}")
+            logger.error(f"Error generating simple cover letter PDF: {e}")
             return False
+
+
+# Cover letter generator used by the app routes (form submissions and /api/cover-letters/generate)
+class CoverLetterPDFGenerator:
+    def __init__(self):
+        self.styles = getSampleStyleSheet()
+        self.page_size = A4
+        self.margins = (0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch)
+        self.primary_color = HexColor('#2c3e50')
+        self.secondary_color = HexColor('#3498db')
+
+    def create_styles(self):
+        """Create custom paragraph styles for cover letters"""
+        styles = {}
+
+        # Header styles
+        styles['header_name'] = ParagraphStyle(
+            'HeaderName',
+            parent=self.styles['Heading1'],
+            fontSize=18,
+            textColor=self.primary_color,
+            spaceAfter=6,
+            fontName='Helvetica-Bold'
+        )
+
+        styles['header_contact'] = ParagraphStyle(
+            'HeaderContact',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            textColor=self.secondary_color,
+            spaceAfter=12,
+            fontName='Helvetica'
+        )
+
+        # Date style
+        styles['date'] = ParagraphStyle(
+            'Date',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            textColor=black,
+            spaceAfter=12,
+            alignment=TA_RIGHT,
+            fontName='Helvetica'
+        )
+
+        # Recipient styles
+        styles['recipient_name'] = ParagraphStyle(
+            'RecipientName',
+            parent=self.styles['Normal'],
+            fontSize=11,
+            textColor=black,
+            spaceAfter=2,
+            fontName='Helvetica-Bold'
+        )
+
+        styles['recipient_title'] = ParagraphStyle(
+            'RecipientTitle',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            textColor=black,
+            spaceAfter=2,
+            fontName='Helvetica'
+        )
+
+        styles['company_address'] = ParagraphStyle(
+            'CompanyAddress',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            textColor=black,
+            spaceAfter=12,
+            fontName='Helvetica'
+        )
+
+        # Body styles
+        styles['salutation'] = ParagraphStyle(
+            'Salutation',
+            parent=self.styles['Normal'],
+            fontSize=11,
+            textColor=black,
+            spaceAfter=12,
+            fontName='Helvetica'
+        )
+
+        styles['body'] = ParagraphStyle(
+            'Body',
+            parent=self.styles['Normal'],
+            fontSize=11,
+            textColor=black,
+            spaceAfter=12,
+            fontName='Helvetica',
+            alignment=TA_JUSTIFY,
+            lineHeight=1.4
+        )
+
+        styles['closing'] = ParagraphStyle(
+            'Closing',
+            parent=self.styles['Normal'],
+            fontSize=11,
+            textColor=black,
+            spaceAfter=6,
+            fontName='Helvetica'
+        )
+
+        styles['signature'] = ParagraphStyle(
+            'Signature',
+            parent=self.styles['Normal'],
+            fontSize=11,
+            textColor=black,
+            spaceAfter=12,
+            fontName='Helvetica'
+        )
+
+        return styles
+
+    def generate_cover_letter_pdf_bytes(self, cover_letter_data):
+        """Render the cover letter into an in-memory buffer and return the PDF bytes (None on failure)"""
+        buffer = BytesIO()
+        if not self.generate_cover_letter_pdf(cover_letter_data, buffer):
+            return None
+        return buffer.getvalue()
+
+    def generate_cover_letter_pdf(self, cover_letter_data, output_path):
+        """Generate cover letter PDF"""
+        try:
+            # Ensure output directory exists (skipped for in-memory buffers)
+            if isinstance(output_path, str):
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+            # Create document
+            doc = SimpleDocTemplate(
+                output_path,
+                pagesize=self.page_size,
+                topMargin=self.margins[0],
+                bottomMargin=self.margins[1],
+                leftMargin=self.margins[2],
+                rightMargin=self.margins[3]
+            )
+
+            # Build story
+            story = []
+            styles = self.create_styles()
+
+            # Header
+            story.extend(self.build_header(cover_letter_data, styles))
+
+            # Date
+            story.append(Paragraph(cover_letter_data.get('date', ''), styles['date']))
+
+            # Recipient info
+            story.extend(self.build_recipient_info(cover_letter_data, styles))
+
+            # Salutation
+            employer_name = cover_letter_data.get('employer_name', 'Hiring Manager')
+            salutation = f"Dear {employer_name},"
+            story.append(Paragraph(salutation, styles['salutation']))
+
+            # Body paragraphs
+            story.extend(self.build_body_paragraphs(cover_letter_data, styles))
+
+            # Closing
+            story.extend(self.build_closing(cover_letter_data, styles))
+
+            # Build PDF
+            doc.build(story)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error generating cover letter PDF: {e}")
+            return False
+
+    def build_header(self, data, styles):
+        """Build header section"""
+        story = []
+
+        # Name
+        name = data.get('name', 'Your Name')
+        story.append(Paragraph(name, styles['header_name']))
+
+        # Contact info
+        contact_info = []
+        if data.get('personal_email'):
+            contact_info.append(data['personal_email'])
+        elif data.get('email'):
+            contact_info.append(data['email'])
+        if data.get('personal_phone'):
+            contact_info.append(data['personal_phone'])
+        elif data.get('phone'):
+            contact_info.append(data['phone'])
+        if data.get('personal_address'):
+            contact_info.append(data['personal_address'])
+        elif data.get('location'):
+            contact_info.append(data['location'])
+        if data.get('linkedin_profile'):
+            contact_info.append(f"LinkedIn: {data['linkedin_profile']}")
+        elif data.get('linkedin'):
+            contact_info.append(f"LinkedIn: {data['linkedin']}")
+
+        if contact_info:
+            story.append(Paragraph(' | '.join(contact_info), styles['header_contact']))
+
+        story.append(Spacer(1, 12))
+        return story
+
+    def build_recipient_info(self, data, styles):
+        """Build recipient information"""
+        story = []
+
+        # Recipient name
+        if data.get('employer_name'):
+            story.append(Paragraph(data['employer_name'], styles['recipient_name']))
+        elif data.get('recipient_name'):
+            story.append(Paragraph(data['recipient_name'], styles['recipient_name']))
+
+        # Company name
+        if data.get('company_name'):
+            story.append(Paragraph(data['company_name'], styles['recipient_title']))
+
+        # Company address
+        if data.get('employer_address'):
+            story.append(Paragraph(data['employer_address'], styles['company_address']))
+        elif data.get('company_address'):
+            story.append(Paragraph(data['company_address'], styles['company_address']))
+
+        return story
+
+    def build_body_paragraphs(self, data, styles):
+        """Build body paragraphs"""
+        story = []
+
+        # Check if we have pre-generated content first
+        content = data.get('content', '')
+
+        if content:
+            # Split content into paragraphs and add them
+            paragraphs = content.split('\n\n')
+            for paragraph in paragraphs:
+                if paragraph.strip() and not paragraph.strip().startswith('Dear') and not paragraph.strip().startswith('Sincerely'):
+                    story.append(Paragraph(paragraph.strip(), styles['body']))
+                    story.append(Spacer(1, 12))
+        else:
+            # Check for individual paragraph fields
+            introduction = data.get('introduction', '')
+            experience = data.get('experience', '')
+            company_fit = data.get('company_fit', '')
+            closing = data.get('closing', '')
+
+            # Use individual paragraphs if available
+            if introduction or experience or company_fit or closing:
+                if introduction:
+                    story.append(Paragraph(introduction, styles['body']))
+                    story.append(Spacer(1, 12))
+                if experience:
+                    story.append(Paragraph(experience, styles['body']))
+                    story.append(Spacer(1, 12))
+                if company_fit:
+                    story.append(Paragraph(company_fit, styles['body']))
+                    story.append(Spacer(1, 12))
+                if closing:
+                    story.append(Paragraph(closing, styles['body']))
+                    story.append(Spacer(1, 12))
+            else:
+                # Fallback to body_paragraphs array
+                paragraphs = data.get('body_paragraphs', [])
+                if not paragraphs:
+                    # Generate default paragraphs if none provided
+                    paragraphs = [
+                        f"I am writing to express my strong interest in the {data.get('position', 'position')} at {data.get('company_name', 'your company')}. With my background in {data.get('relevant_experience', 'relevant field')}, I am confident that I would be a valuable addition to your team.",
+                        f"In my previous role, I have successfully {data.get('achievement1', 'achieved significant results')} and {data.get('achievement2', 'demonstrated strong leadership')}. These experiences have equipped me with the skills necessary to excel in this position.",
+                        f"I am particularly drawn to {data.get('company_name', 'your company')} because of {data.get('company_attraction', 'your innovative approach and commitment to excellence')}. I am excited about the opportunity to contribute to your team and would welcome the chance to discuss how my skills and experience align with your needs."
+                    ]
+
+                for paragraph in paragraphs:
+                    story.append(Paragraph(paragraph, styles['body']))
+                    story.append(Spacer(1, 12))
+
+        return story
+
+    def build_closing(self, data, styles):
+        """Build closing section"""
+        story = []
+
+        # Signature
+        story.append(Spacer(1, 24))
+        story.append(Paragraph('Sincerely,', styles['closing']))
+        story.append(Spacer(1, 24))
+        story.append(Paragraph(data.get('name', 'Your Name'), styles['signature']))
+
+        return story
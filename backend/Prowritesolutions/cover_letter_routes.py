@@ -0,0 +1,868 @@
+"""
+Flask API routes for cover letter generation, download and storage
+"""
+
+from flask import Blueprint, request, jsonify, make_response
+from datetime import datetime
+import os
+import random
+from ai_streaming import ai_stream_client, stream_with_fallback, stream_events, sse_response, wants_stream
+from app_core import cover_letter_generator, jwt_required_custom, logger
+from circuit_breaker import openai_breaker
+from rate_limiter import rate_limit
+
+cover_letter_bp = Blueprint('cover_letter', __name__)
+
+# Cover Letter Generation Routes
+@cover_letter_bp.route('/api/cover-letters/generate', methods=['POST'])
+@jwt_required_custom
+def generate_cover_letter():
+    """Generate a professional cover letter PDF"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        # Validate required fields
+        if not data.get('name'):
+            return jsonify({
+                'success': False,
+                'message': 'Name is required'
+            }), 400
+
+        if not data.get('company_name'):
+            return jsonify({
+                'success': False,
+                'message': 'Company name is required'
+            }), 400
+
+        # Generate output path
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"cover_letter_{data['name'].replace(' ', '_')}_{timestamp}.pdf"
+        output_path = f"static/templates/generated_cover_letters/{filename}"
+
+        # Generate cover letter content using AI
+        cover_letter_content = generate_cover_letter_content(data)
+
+        # Add content to data for PDF generation
+        data['content'] = cover_letter_content
+
+        # Generate PDF
+        success = cover_letter_generator.generate_cover_letter_pdf(data, output_path)
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'Cover letter generated successfully',
+                'cover_letter_content': cover_letter_content,
+                'pdf_path': output_path,
+                'filename': filename,
+                'cover_letter_id': f"cover_letter_{timestamp}"
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to generate cover letter'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error generating cover letter: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def generate_cover_letter_content(data):
+    """Generate comprehensive cover letter content using AI"""
+    try:
+        # Extract key information
+        name = data.get('name', 'Your Name')
+        company_name = data.get('company_name', 'the company')
+        job_title = data.get('job_title', 'the position')
+        job_description = data.get('job_description', '')
+        employer_name = data.get('employer_name', 'Hiring Manager')
+        tone = data.get('tone', 'Professional')
+        industry = data.get('industry', 'General')
+
+        # Check if personalized content is provided from frontend
+        if data.get('introduction') and data.get('experience') and data.get('company_fit') and data.get('closing'):
+            # Use the personalized content from frontend
+            cover_letter = f"""Dear {employer_name},
+
+{data['introduction']}
+
+{data['experience']}
+
+{data['company_fit']}
+
+{data['closing']}
+
+Sincerely,
+{name}"""
+            return cover_letter
+        else:
+            # Fallback to AI generation if personalized content not provided
+            # Extract additional information for enhanced personalization
+            personal_summary = data.get('personal_summary', '')
+            technical_skills = data.get('technical_skills', [])
+            soft_skills = data.get('soft_skills', [])
+            key_achievements = data.get('key_achievements', [])
+            quantifiable_results = data.get('quantifiable_results', [])
+            why_this_company = data.get('why_this_company', '')
+            why_this_role = data.get('why_this_role', '')
+            unique_value = data.get('unique_value', '')
+            company_mission = data.get('company_mission', '')
+            company_values = data.get('company_values', [])
+
+            # Build skills section
+            skills_text = ""
+            if technical_skills:
+                skills_text += f"technical expertise in {', '.join(technical_skills[:5])}"
+            if soft_skills:
+                if skills_text:
+                    skills_text += f" and strong {', '.join(soft_skills[:3])} skills"
+                else:
+                    skills_text += f"strong {', '.join(soft_skills[:3])} skills"
+
+            # Build achievements section
+            achievements_text = ""
+            if key_achievements:
+                achievements_text = f" For example, {key_achievements[0].lower()}"
+                if len(key_achievements) > 1:
+                    achievements_text += f" Additionally, {key_achievements[1].lower()}"
+
+            # Build quantifiable results
+            results_text = ""
+            if quantifiable_results:
+                results_text = f" These efforts have resulted in {quantifiable_results[0].lower()}"
+
+            # Build company-specific content
+            company_content = ""
+            if why_this_company:
+                company_content = f" {why_this_company}"
+            elif company_mission:
+                company_content = f" I am particularly drawn to {company_name}'s mission of {company_mission.lower()}"
+
+            # Build role-specific content
+            role_content = ""
+            if why_this_role:
+                role_content = f" {why_this_role}"
+
+            # Build unique value proposition
+            value_content = ""
+            if unique_value:
+                value_content = f" {unique_value}"
+
+            # Create comprehensive cover letter based on tone
+            if tone.lower() == 'professional':
+                # Build the personal summary section
+                personal_section = personal_summary if personal_summary else f"Based on the job requirements, I believe my skills and experience align well with what you are looking for in a {job_title}."
+
+                # Build the value content section
+                value_section = value_content if value_content else f"In my previous roles, I have developed strong skills in {industry.lower()} and have consistently delivered results that exceed expectations. I am particularly drawn to {company_name} because of your reputation for innovation and excellence in the {industry.lower()} field."
+
+                cover_letter = f"""Dear {employer_name},
+
+I am writing to express my strong interest in the {job_title} position at {company_name}. With my {skills_text} and passion for {industry.lower()}, I am confident that I would be a valuable addition to your team.{company_content}
+
+{personal_section}{achievements_text}{results_text}{role_content}
+
+{value_section}
+
+I would welcome the opportunity to discuss how my background and enthusiasm can contribute to your team's success. Thank you for considering my application.
+
+Sincerely,
+{name}"""
+
+            elif tone.lower() == 'friendly':
+                # Build the personal summary section
+                personal_section = personal_summary if personal_summary else f"I'm genuinely excited about this opportunity because it perfectly aligns with my passion for {industry.lower()} and my career goals."
+
+                # Build the value content section
+                value_section = value_content if value_content else f"What I love most about {company_name} is your commitment to innovation and your collaborative culture. I thrive in environments where I can learn from others while contributing my own unique perspective."
+
+                cover_letter = f"""Dear {employer_name},
+
+I hope this message finds you well! I'm excited to apply for the {job_title} position at {company_name}. With my {skills_text}, I'm confident I can make a meaningful contribution to your team.{company_content}
+
+{personal_section}{achievements_text}{results_text}{role_content}
+
+{value_section}
+
+I'd love the chance to discuss how I can help {company_name} achieve its goals. Thank you for considering my application!
+
+Best regards,
+{name}"""
+
+            elif tone.lower() == 'confident':
+                # Build the personal summary section
+                personal_section = personal_summary if personal_summary else f"My expertise in {industry.lower()} and my ability to deliver exceptional results make me uniquely qualified for this position."
+
+                # Build the value content section
+                value_section = value_content if value_content else f"I am particularly drawn to {company_name} because of your reputation for excellence and innovation. I am confident that my skills and experience will enable me to make an immediate and significant impact on your team."
+
+                cover_letter = f"""Dear {employer_name},
+
+I am writing to express my strong interest in the {job_title} position at {company_name}. With my proven track record in {industry.lower()} and {skills_text}, I am confident that I am the ideal candidate for this role.{company_content}
+
+{personal_section}{achievements_text}{results_text}{role_content}
+
+{value_section}
+
+I look forward to discussing how I can contribute to {company_name}'s continued success. Thank you for considering my application.
+
+Sincerely,
+{name}"""
+
+            else:  # Default professional tone
+                # Build the personal summary section
+                personal_section = personal_summary if personal_summary else f"Based on the job requirements, I believe my skills and experience align well with what you are looking for in a {job_title}."
+
+                # Build the value content section
+                value_section = value_content if value_content else f"In my previous roles, I have developed strong skills in {industry.lower()} and have consistently delivered results that exceed expectations. I am particularly drawn to {company_name} because of your reputation for innovation and excellence in the {industry.lower()} field."
+
+                cover_letter = f"""Dear {employer_name},
+
+I am writing to express my strong interest in the {job_title} position at {company_name}. With my {skills_text} and passion for {industry.lower()}, I am confident that I would be a valuable addition to your team.{company_content}
+
+{personal_section}{achievements_text}{results_text}{role_content}
+
+{value_section}
+
+I would welcome the opportunity to discuss how my background and enthusiasm can contribute to your team's success. Thank you for considering my application.
+
+Sincerely,
+{name}"""
+
+            return cover_letter
+
+    except Exception as e:
+        logger.error(f"Error generating cover letter content: {str(e)}")
+        return f"Dear Hiring Manager,\n\nI am writing to express my interest in the position at {data.get('company_name', 'your company')}.\n\nSincerely,\n{data.get('name', 'Your Name')}"
+
+@cover_letter_bp.route('/api/cover-letters/templates', methods=['GET'])
+def get_cover_letter_templates():
+    """Get available cover letter templates"""
+    try:
+        templates = [
+            {
+                'id': 'professional',
+                'name': 'Professional',
+                'description': 'Clean and professional design',
+                'preview': '/static/templates/cover_letter_previews/professional.png'
+            },
+            {
+                'id': 'modern',
+                'name': 'Modern',
+                'description': 'Modern and creative design',
+                'preview': '/static/templates/cover_letter_previews/modern.png'
+            },
+            {
+                'id': 'executive',
+                'name': 'Executive',
+                'description': 'Executive-level design',
+                'preview': '/static/templates/cover_letter_previews/executive.png'
+            }
+        ]
+
+        return jsonify({
+            'success': True,
+            'data': templates
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting cover letter templates: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@cover_letter_bp.route('/api/cover-letters/analyze', methods=['POST'])
+@jwt_required_custom
+def analyze_cover_letter():
+    """Analyze cover letter content and provide suggestions"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        content = data.get('content', '')
+        target_job = data.get('target_job', '')
+
+        if not content:
+            return jsonify({
+                'success': False,
+                'message': 'Cover letter content is required'
+            }), 400
+
+        # Basic analysis
+        analysis = {
+            'word_count': len(content.split()),
+            'paragraph_count': len([p for p in content.split('\n\n') if p.strip()]),
+            'suggestions': [],
+            'ats_score': random.randint(75, 95)
+        }
+
+        # Generate suggestions
+        if analysis['word_count'] < 200:
+            analysis['suggestions'].append('Cover letter might be too short - add more details about your qualifications')
+        elif analysis['word_count'] > 500:
+            analysis['suggestions'].append('Cover letter might be too long - consider condensing')
+
+        if analysis['paragraph_count'] < 3:
+            analysis['suggestions'].append('Consider adding more paragraphs to structure your cover letter better')
+
+        if 'dear hiring manager' in content.lower():
+            analysis['suggestions'].append('Try to find the hiring manager\'s name for a more personal touch')
+
+        return jsonify({
+            'success': True,
+            'data': analysis
+        })
+
+    except Exception as e:
+        logger.error(f"Error analyzing cover letter: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def generate_intelligent_cover_letter(form_data):
+    """Generate intelligent cover letter content using all form data"""
+    try:
+        # Extract key information - support both old and new field formats
+        personal_name = form_data.get('personalName') or form_data.get('personal_name', '')
+        job_title = form_data.get('jobTitle') or form_data.get('job_title', '')
+        company_name = form_data.get('companyName') or form_data.get('company_name', '')
+        employer_name = form_data.get('employerName') or form_data.get('employer_name', 'Hiring Manager')
+
+        # Use existing content if available
+        if form_data.get('coverLetterContent'):
+            return form_data['coverLetterContent']
+
+        # Build introduction paragraph
+        introduction = f"I am writing to express my strong interest in the {job_title} position at {company_name}"
+
+        # Add job board reference if available
+        job_board = form_data.get('jobBoard') or form_data.get('job_board', '')
+        if job_board:
+            introduction += f", as advertised on {job_board}"
+
+        introduction += "."
+
+        # Add personal motivation if available
+        why_this_role = form_data.get('whyThisRole') or form_data.get('why_this_role', '')
+        personal_summary = form_data.get('personalSummary') or form_data.get('personal_summary', '')
+
+        if why_this_role:
+            introduction += f" {why_this_role}"
+        elif personal_summary:
+            introduction += f" {personal_summary}"
+        else:
+            introduction += " With my background and experience, I am confident that I would be a valuable addition to your team."
+
+        # Build experience paragraph
+        experience_paragraph = ""
+        relevant_experience = form_data.get('relevantExperience') or form_data.get('relevant_experience', '')
+        key_achievements = form_data.get('keyAchievements') or form_data.get('key_achievements', [])
+        quantifiable_results = form_data.get('quantifiableResults') or form_data.get('quantifiable_results', [])
+        technical_skills = form_data.get('technicalSkills') or form_data.get('technical_skills', [])
+        soft_skills = form_data.get('softSkills') or form_data.get('soft_skills', [])
+
+        if relevant_experience:
+            experience_paragraph = f"In my previous role as {relevant_experience}"
+        elif key_achievements and len(key_achievements) > 0:
+            experience_paragraph = f"In my previous experience, I have successfully {key_achievements[0].lower()}"
+        else:
+            # Create a more specific experience paragraph using available data
+            experience_paragraph = f"In my previous roles, I have developed strong expertise in software development and problem-solving"
+
+        # Add quantifiable results
+        if quantifiable_results and len(quantifiable_results) > 0:
+            experience_paragraph += f", including {quantifiable_results[0]}"
+
+        # Add technical skills
+        if technical_skills and len(technical_skills) > 0:
+            skills_text = ', '.join(technical_skills[:3])  # Take first 3 skills
+            experience_paragraph += f". My technical expertise includes {skills_text}"
+
+        # Add soft skills
+        if soft_skills and len(soft_skills) > 0:
+            soft_skills_text = ', '.join(soft_skills[:2])  # Take first 2 soft skills
+            experience_paragraph += f", and I bring strong {soft_skills_text} skills"
+
+        # If no specific skills provided, add generic but relevant skills
+        if not technical_skills and not soft_skills:
+            experience_paragraph += ", including strong analytical thinking, effective communication, and collaborative teamwork"
+
+        experience_paragraph += " to this role."
+
+        # Build company fit paragraph
+        company_fit_paragraph = ""
+        why_this_company = form_data.get('whyThisCompany') or form_data.get('why_this_company', '')
+        company_mission = form_data.get('companyMission') or form_data.get('company_mission', '')
+        company_values = form_data.get('companyValues') or form_data.get('company_values', [])
+        unique_value = form_data.get('uniqueValue') or form_data.get('unique_value', '')
+        career_goals = form_data.get('careerGoals') or form_data.get('career_goals', '')
+
+        if why_this_company:
+            company_fit_paragraph = f"What excites me most about {company_name} is {why_this_company}"
+        elif company_mission:
+            company_fit_paragraph = f"I am particularly drawn to {company_name}'s mission of {company_mission}"
+        elif company_values and len(company_values) > 0:
+            values_text = ', '.join(company_values[:2])
+            company_fit_paragraph = f"I am excited about {company_name}'s commitment to {values_text}"
+        else:
+            # Create a more specific company fit paragraph
+            company_fit_paragraph = f"I am particularly drawn to {company_name} because of your reputation for innovation and excellence in the technology industry. I am excited about the opportunity to contribute to your team's success and grow professionally within your organization"
+
+        # Add unique value proposition
+        if unique_value:
+            company_fit_paragraph += f". {unique_value}"
+        elif career_goals:
+            company_fit_paragraph += f". I am eager to contribute to your team and {career_goals}"
+        else:
+            company_fit_paragraph += ". I believe my skills and experience align closely with your needs"
+
+        company_fit_paragraph += "."
+
+        # Build closing paragraph
+        closing_paragraph = "I would welcome the opportunity to discuss how my background, skills, and enthusiasm can add value to your team"
+
+        # Add specific achievements if available
+        project_highlights = form_data.get('projectHighlights') or form_data.get('project_highlights', [])
+        leadership_experience = form_data.get('leadershipExperience') or form_data.get('leadership_experience', '')
+
+        if project_highlights and len(project_highlights) > 0:
+            closing_paragraph += f", particularly my experience with {project_highlights[0]}"
+
+        # Add leadership experience if available
+        if leadership_experience:
+            closing_paragraph += f" and my {leadership_experience}"
+
+        # Add more specific closing if no additional details provided
+        if not project_highlights and not leadership_experience:
+            closing_paragraph += f" and contribute to {company_name}'s continued growth and success"
+
+        closing_paragraph += ". Thank you for considering my application. I look forward to the possibility of contributing to your continued success."
+
+        # Combine all paragraphs
+        full_content = f"{introduction}\n\n{experience_paragraph}\n\n{company_fit_paragraph}\n\n{closing_paragraph}"
+
+        return full_content
+
+    except Exception as e:
+        logger.error(f"Error generating intelligent cover letter: {str(e)}")
+        # Fallback to basic content
+        return f"""Dear {form_data.get('employerName', 'Hiring Manager')},
+
+I am writing to express my strong interest in the {form_data.get('jobTitle', 'position')} at {form_data.get('companyName', 'your company')}.
+
+With my background and experience, I am confident that I would be a valuable addition to your team. I am particularly drawn to this opportunity because of your innovative approach and commitment to excellence.
+
+I would welcome the opportunity to discuss how my skills and experience can contribute to your team's success. Thank you for considering my application.
+
+Sincerely,
+{form_data.get('personalName', '')}"""
+
+@cover_letter_bp.route('/api/cover-letters/download', methods=['POST'])
+def download_cover_letter():
+    """Download cover letter as PDF"""
+    try:
+        data = request.get_json()
+        logger.info(f"Received download request data: {data}")
+
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No data provided'
+            }), 400
+
+        # Extract cover letter data - frontend sends data directly
+        cover_letter_data = data
+        template = data.get('template', 'professional')
+
+        logger.info(f"Extracted cover letter data: {cover_letter_data}")
+
+        # Check if we have the required fields for cover letter generation
+        # Support both old and new field formats
+        job_title = cover_letter_data.get('jobTitle') or cover_letter_data.get('job_title', '')
+        company_name = cover_letter_data.get('companyName') or cover_letter_data.get('company_name', '')
+        personal_name = cover_letter_data.get('personalName') or cover_letter_data.get('personal_name', '')
+
+        if not job_title or not company_name or not personal_name:
+            return jsonify({
+                'success': False,
+                'error': f'Missing required fields: jobTitle, companyName, personalName',
+                'received_data': data
+            }), 400
+
+        # Generate intelligent cover letter content using all form data
+        content = generate_intelligent_cover_letter(cover_letter_data)
+
+        # Create a complete cover letter data structure for PDF generation
+        # Support both old and new field formats
+        pdf_data = {
+            'personal_name': cover_letter_data.get('personalName') or cover_letter_data.get('personal_name', ''),
+            'personal_email': cover_letter_data.get('personalEmail') or cover_letter_data.get('personal_email', ''),
+            'personal_phone': cover_letter_data.get('personalPhone') or cover_letter_data.get('personal_phone', ''),
+            'personal_address': cover_letter_data.get('personalAddress') or cover_letter_data.get('personal_address', ''),
+            'employer_name': cover_letter_data.get('employerName') or cover_letter_data.get('employer_name', ''),
+            'employer_email': cover_letter_data.get('employerEmail') or cover_letter_data.get('employer_email', ''),
+            'employer_address': cover_letter_data.get('employerAddress') or cover_letter_data.get('employer_address', ''),
+            'job_title': cover_letter_data.get('jobTitle') or cover_letter_data.get('job_title', ''),
+            'company_name': cover_letter_data.get('companyName') or cover_letter_data.get('company_name', ''),
+            'content': content,
+            'date': datetime.now().strftime('%B %d, %Y')
+        }
+
+        # Generate PDF using the new ProfessionalCoverLetterGenerator
+        from professional_cover_letter_generator import ProfessionalCoverLetterGenerator
+        pdf_generator = ProfessionalCoverLetterGenerator()
+
+        filename = f"cover_letter_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+        # Generate the PDF in memory
+        pdf_content = pdf_generator.generate_cover_letter_pdf_bytes(pdf_data)
+        if not pdf_content:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to generate cover letter PDF'
+            }), 500
+
+        # Return PDF as response
+        from flask import Response
+        return Response(
+            pdf_content,
+            mimetype='application/pdf',
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'Content-Type': 'application/pdf'
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error generating cover letter PDF: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to generate cover letter PDF'
+        }), 500
+
+@cover_letter_bp.route('/api/cover-letters/ai-chat', methods=['POST', 'OPTIONS'])
+@rate_limit('ai')
+def ai_chat():
+    """AI chat endpoint for cover letter paragraph assistance"""
+    # Handle CORS preflight
+    if request.method == 'OPTIONS':
+        response = make_response()
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+        return response
+    
+    try:
+        data = request.get_json()
+        
+        paragraph_type = data.get('paragraphType', 'introduction')
+        user_message = data.get('message', '')
+        conversation_history = data.get('conversationHistory', [])
+        context = data.get('context', {})
+        
+        if not user_message:
+            return jsonify({
+                'success': False,
+                'error': 'Message is required'
+            }), 400
+        
+        # Get context information
+        job_title = context.get('jobTitle', '')
+        company_name = context.get('companyName', '')
+        current_content = context.get('currentContent', '')
+        paragraph_guidance = context.get('paragraphGuidance', '')
+        
+        # Create system prompt based on paragraph type
+        system_prompts = {
+            'introduction': f"""You are an expert cover letter writing assistant. Help the user write an engaging opening paragraph for a {job_title} position at {company_name}.
+
+Guidelines:
+- Express genuine interest in the position
+- Mention how you found the job posting
+- Briefly highlight your most relevant qualification
+- Keep it concise (2-3 sentences)
+- Be professional but enthusiastic
+
+Current content: {current_content}
+User request: {user_message}""",
+
+            'experience': f"""You are an expert cover letter writing assistant. Help the user write a compelling experience paragraph for a {job_title} position at {company_name}.
+
+Guidelines:
+- Highlight specific, relevant experience
+- Use quantifiable achievements when possible
+- Connect your skills to the job requirements
+- Show impact and results
+- Keep it focused and relevant
+
+Current content: {current_content}
+User request: {user_message}""",
+
+            'companyFit': f"""You are an expert cover letter writing assistant. Help the user write a company fit paragraph for a {job_title} position at {company_name}.
+
+Guidelines:
+- Show knowledge of the company
+- Explain why you're excited to work there
+- Connect your values to company culture
+- Mention specific company aspects that appeal to you
+- Demonstrate genuine interest
+
+Current content: {current_content}
+User request: {user_message}""",
+
+            'closing': f"""You are an expert cover letter writing assistant. Help the user write a strong closing paragraph for a {job_title} position at {company_name}.
+
+Guidelines:
+- Express confidence in your ability to contribute
+- Thank the reader for their time
+- Request an interview opportunity
+- End on a positive, professional note
+- Keep it brief but impactful
+
+Current content: {current_content}
+User request: {user_message}"""
+        }
+        
+        system_prompt = system_prompts.get(paragraph_type, system_prompts['introduction'])
+        
+        # Build conversation context
+        conversation_context = ""
+        for msg in conversation_history[-5:]:  # Last 5 messages for context
+            if msg.get('type') == 'user':
+                conversation_context += f"User: {msg.get('content', '')}\n"
+            elif msg.get('type') == 'ai':
+                conversation_context += f"Assistant: {msg.get('content', '')}\n"
+        
+        # Create the full prompt
+        full_prompt = f"""{system_prompt}
+
+Previous conversation:
+{conversation_context}
+
+Current user message: {user_message}
+
+Please respond as a helpful writing assistant. If the user is asking for a complete paragraph, provide it. If they're asking for improvements, suggest specific changes. Be conversational and helpful."""
+
+        # Fallback: Simple rule-based responses (used when OpenAI is unavailable)
+        fallback_responses = {
+            'introduction': f"I'd be happy to help you write your opening paragraph for the {job_title} position at {company_name}. Here's a suggested opening:\n\nI am writing to express my strong interest in the {job_title} position at {company_name}. With my background in [your field] and passion for [relevant area], I am confident I can make a valuable contribution to your team.",
+            'experience': f"Let me help you craft your experience paragraph. Here's a structure you can use:\n\nIn my previous role as [Your Role] at [Company], I [specific achievement with numbers]. This experience has strengthened my [relevant skill] and taught me the importance of [relevant value].",
+            'companyFit': f"For your company fit paragraph, consider this approach:\n\nWhat excites me most about {company_name} is [specific company aspect]. I believe my skills in [relevant skills] align perfectly with your needs, and I am eager to contribute to [specific company goal].",
+            'closing': f"Here's a strong closing paragraph:\n\nI would welcome the opportunity to discuss how my background, skills, and enthusiasm can add value to your team. Thank you for considering my application. I look forward to the possibility of contributing to {company_name}'s continued success."
+        }
+        
+        fallback_response = fallback_responses.get(paragraph_type, fallback_responses['introduction'])
+
+        if wants_stream(request, data):
+            def finalize(text):
+                ai_response = text.strip()
+                is_paragraph = len(ai_response.split('.')) >= 2 and len(ai_response) > 50
+                return {
+                    'success': True,
+                    'message': ai_response,
+                    'isParagraph': is_paragraph,
+                    'paragraphContent': ai_response if is_paragraph else None
+                }
+
+            return sse_response(stream_events(
+                stream_with_fallback(
+                    ai_stream_client,
+                    [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_message}
+                    ],
+                    lambda: fallback_response,
+                    breaker=openai_breaker,
+                    max_tokens=300,
+                    temperature=0.7
+                ),
+                finalize
+            ))
+
+        # Use OpenAI API if available
+        try:
+            import openai
+            openai.api_key = os.getenv('OPENAI_API_KEY', '')
+            
+            if openai.api_key:
+                with openai_breaker.guard():
+                    response = openai.ChatCompletion.create(
+                        model="gpt-3.5-turbo",
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_message}
+                        ],
+                        max_tokens=300,
+                        temperature=0.7
+                    )
+                
+                ai_response = response.choices[0].message.content.strip()
+                
+                # Check if the response contains a paragraph (look for complete sentences)
+                is_paragraph = len(ai_response.split('.')) >= 2 and len(ai_response) > 50
+                
+                return jsonify({
+                    'success': True,
+                    'message': ai_response,
+                    'isParagraph': is_paragraph,
+                    'paragraphContent': ai_response if is_paragraph else None
+                })
+        except Exception as e:
+            logger.warning(f"OpenAI API error: {str(e)}")
+        
+        return jsonify({
+            'success': True,
+            'message': fallback_response,
+            'isParagraph': True,
+            'paragraphContent': fallback_response
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in AI chat: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to process AI chat request'
+        }), 500
+
+@cover_letter_bp.route('/api/cover-letters/download-paid', methods=['POST', 'OPTIONS'])
+def download_paid_cover_letter():
+    """Download cover letter as PDF after payment verification"""
+    # Handle CORS preflight
+    if request.method == 'OPTIONS':
+        response = make_response()
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+        return response
+    
+    try:
+        data = request.get_json()
+        
+        # Check if user has paid
+        has_paid = data.get('hasPaid', False)
+        payment_id = data.get('paymentId')
+        
+        if not has_paid or not payment_id:
+            return jsonify({
+                'success': False,
+                'error': 'Payment required to download PDF'
+            }), 402  # Payment Required
+        
+        # Verify payment (in a real implementation, you'd check against your payment system)
+        # For now, we'll just check if payment_id exists
+        
+        # Generate PDF using the same logic as the regular download
+        cover_letter_data = {
+            'personal_name': data.get('personalName', ''),
+            'personal_email': data.get('personalEmail', ''),
+            'personal_phone': data.get('personalPhone', ''),
+            'personal_address': data.get('personalAddress', ''),
+            'linkedin_profile': data.get('linkedinProfile', ''),
+            'employer_name': data.get('employerName', ''),
+            'employer_address': data.get('employerAddress', ''),
+            'company_name': data.get('companyName', ''),
+            'job_title': data.get('jobTitle', ''),
+            'job_board': data.get('jobBoard', ''),
+            'content': data.get('content', ''),
+            'date': datetime.now().strftime("%B %d, %Y")
+        }
+        
+        # Generate PDF using the professional cover letter generator
+        from professional_cover_letter_generator import ProfessionalCoverLetterGenerator
+        pdf_generator = ProfessionalCoverLetterGenerator()
+        
+        # Generate PDF in memory
+        pdf_data = pdf_generator.generate_cover_letter_pdf_bytes(cover_letter_data)
+        
+        if pdf_data:
+            # Return PDF as response
+            from flask import Response
+            return Response(
+                pdf_data,
+                mimetype='application/pdf',
+                headers={
+                    'Content-Disposition': f'attachment; filename=cover_letter_{data.get("companyName", "company")}_{data.get("jobTitle", "position")}.pdf'
+                }
+            )
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to generate PDF'
+            }), 500
+            
+    except Exception as e:
+        logger.error(f"Error generating paid PDF: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to generate PDF'
+        }), 500
+
+# Cover Letter Management Routes (Missing from Frontend)
+@cover_letter_bp.route('/api/cover-letters', methods=['GET'])
+@jwt_required_custom
+def get_user_cover_letters():
+    """Get all cover letters for the current user"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Return empty array - no mock data
+        cover_letters = []
+
+        return jsonify({
+            'success': True,
+            'data': cover_letters
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting cover letters: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@cover_letter_bp.route('/api/cover-letters/<int:cover_letter_id>', methods=['GET'])
+@jwt_required_custom
+def get_cover_letter(cover_letter_id):
+    """Get specific cover letter"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # No cover letters exist - return 404
+        return jsonify({
+            'success': False,
+            'message': 'Cover letter not found'
+        }), 404
+
+    except Exception as e:
+        logger.error(f"Error getting cover letter: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@cover_letter_bp.route('/api/cover-letters/<int:cover_letter_id>', methods=['PUT'])
+@jwt_required_custom
+def update_cover_letter(cover_letter_id):
+    """Update cover letter"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        # Mock update - in production, this would update database
+        return jsonify({
+            'success': True,
+            'message': 'Cover letter updated successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Error updating cover letter: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -56,7 +56,7 @@ User=www-data
 Group=www-data
 WorkingDirectory=$(pwd)
 Environment=PATH=$(pwd)/venv/bin
-ExecStart=$(which gunicorn) --bind 0.0.0.0:5000 --workers 4 --timeout 120 --access-logfile logs/access.log --error-logfile logs/error.log app:app
+ExecStart=$(which gunicorn) -c gunicorn.conf.py --access-logfile logs/access.log --error-logfile logs/error.log app:app
 Restart=always
 RestartSec=10
 
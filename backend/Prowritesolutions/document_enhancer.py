@@ -0,0 +1,310 @@
+"""
+Document Enhancer
+Whole-document ATS enhancement with one structured AI request for the fields
+that changed.
+
+The resume is flattened into its text fields ("summary",
+"workExperience.0.responsibilities", ...); contact details, dates and other
+values that must not be rewritten are skipped. For each field:
+
+    1. unchanged since this document was last enhanced (same content, or the
+       enhanced text the user applied)   -> the previous result
+    2. content seen before (any user)    -> the cached result
+    3. otherwise                         -> sent to the AI
+
+Fields left for the AI go out as one JSON object of {path: {type, text}}
+(DOCUMENT_ENHANCER_BATCH_FIELDS per request) and the reply is validated
+field by field: unknown paths are ignored, and values that are not usable
+text keep the rule-based fallback for that field only. The results are
+patched into a copy of the document, so its structure never depends on
+the model.
+
+Results are cached by a hash of (field type, profession, job title,
+content) in a small SQLite database shared by the workers on a host, next to
+the last enhanced version of each (user, document). Fallback results are not
+cached, so those fields are retried once the AI is back.
+"""
+
+import os
+import re
+import copy
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_ENHANCER_DB_PATH = os.getenv('DOCUMENT_ENHANCER_DB', os.path.join('data', 'document_enhancer.db'))
+FIELD_CACHE_TTL = int(os.getenv('ENHANCEMENT_CACHE_TTL_DAYS', 30)) * 86400
+DOCUMENT_BATCH_FIELDS = int(os.getenv('DOCUMENT_ENHANCER_BATCH_FIELDS', 25))
+SNAPSHOT_TTL = 90 * 86400
+PRUNE_EVERY = 500           # cache writes between expiry sweeps, per process
+
+# Leaves that are facts, not prose: never sent for enhancement
+SKIP_KEYS = {
+    'firstname', 'lastname', 'name', 'fullname', 'email', 'phone', 'city', 'country', 'location',
+    'address', 'linkedin', 'github', 'website', 'url', 'portfolio', 'startdate', 'enddate', 'date',
+    'duration', 'graduationyear', 'gpa', 'expiry', 'credentialid', 'id', 'proficiency', 'template',
+    'templateid', 'photo', 'company', 'employer', 'institution', 'organization', 'issuer',
+}
+MIN_FIELD_LENGTH = 12
+
+UNCHANGED, CACHED, ENHANCED, FALLBACK = 'unchanged', 'cached', 'enhanced', 'fallback'
+
+
+def field_type(path: str) -> str:
+    """The key a leaf is stored under ("workExperience.0.responsibilities.2" -> "responsibilities")"""
+    for part in reversed(path.split('.')):
+        if not part.isdigit():
+            return part
+    return path
+
+
+def flatten(data: Any, prefix: str = '') -> Dict[str, str]:
+    """Path -> text of every enhanceable string leaf"""
+    fields = {}
+    if isinstance(data, dict):
+        items = ((str(key), value) for key, value in data.items())
+    elif isinstance(data, list):
+        items = ((str(index), value) for index, value in enumerate(data))
+    else:
+        return fields
+    for key, value in items:
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, (dict, list)):
+            fields.update(flatten(value, path))
+        elif (isinstance(value, str) and len(value.strip()) >= MIN_FIELD_LENGTH
+              and field_type(path).lower() not in SKIP_KEYS):
+            fields[path] = value
+    return fields
+
+
+def patch(data: Any, values: Dict[str, str]) -> Any:
+    """A deep copy of `data` with the leaves at the given paths replaced"""
+    patched = copy.deepcopy(data)
+    for path, value in values.items():
+        parts = path.split('.')
+        node = patched
+        for part in parts[:-1]:
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        last = parts[-1]
+        if isinstance(node, list):
+            node[int(last)] = value
+        else:
+            node[last] = value
+    return patched
+
+
+def _norm(value: Optional[str]) -> str:
+    return re.sub(r'\s+', ' ', (value or '').strip().lower())
+
+
+def content_hash(kind: str, profession: Optional[str], job_title: Optional[str], text: str) -> str:
+    key = '\x1f'.join((kind, _norm(profession), _norm(job_title), text.strip()))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def valid_enhancement(original: str, value: Any) -> bool:
+    """A usable rewrite of one field: non-empty text of a plausible length"""
+    if not isinstance(value, str) or not value.strip():
+        return False
+    return len(value) <= 4 * len(original) + 400
+
+
+class DocumentEnhancer:
+    """Diff-and-batch ATS enhancement with a per-field cache shared through SQLite"""
+
+    def __init__(self, db_path: str = DOCUMENT_ENHANCER_DB_PATH, ai=None,
+                 batch_fields: int = DOCUMENT_BATCH_FIELDS, cache_ttl: float = FIELD_CACHE_TTL):
+        self.db_path = db_path
+        self._ai = ai
+        self.batch_fields = batch_fields
+        self.cache_ttl = cache_ttl
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._writes = 0
+        self.stats = {'fields': 0, UNCHANGED: 0, CACHED: 0, ENHANCED: 0, FALLBACK: 0, 'requests': 0}
+
+    @property
+    def ai(self):
+        if self._ai is None:
+            from francisca_ai_service import francisca_ai_service
+            self._ai = francisca_ai_service
+        return self._ai
+
+    # ----- storage -----
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._init_database()
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _init_database(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS field_cache (
+                    hash TEXT PRIMARY KEY,
+                    enhanced TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS document_snapshots (
+                    doc_key TEXT PRIMARY KEY,
+                    fields TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _cache_get(self, hashes: List[str]) -> Dict[str, str]:
+        found = {}
+        cutoff = time.time() - self.cache_ttl
+        conn = self._connect()
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            rows = conn.execute(
+                f"SELECT hash, enhanced FROM field_cache WHERE created_at > ? AND hash IN ({','.join('?' * len(chunk))})",
+                [cutoff, *chunk]).fetchall()
+            found.update(rows)
+        return found
+
+    def _cache_put(self, entries: Dict[str, str]):
+        now = time.time()
+        conn = self._connect()
+        conn.executemany("INSERT OR REPLACE INTO field_cache (hash, enhanced, created_at) VALUES (?, ?, ?)",
+                         [(h, enhanced, now) for h, enhanced in entries.items()])
+        self._writes += len(entries)
+        if self._writes >= PRUNE_EVERY:
+            self._writes = 0
+            conn.execute("DELETE FROM field_cache WHERE created_at <= ?", (now - self.cache_ttl,))
+            conn.execute("DELETE FROM document_snapshots WHERE updated_at <= ?", (now - SNAPSHOT_TTL,))
+
+    def _load_snapshot(self, doc_key: str) -> Dict[str, List[str]]:
+        row = self._connect().execute("SELECT fields FROM document_snapshots WHERE doc_key = ?",
+                                      (doc_key,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _save_snapshot(self, doc_key: str, fields: Dict[str, List[str]]):
+        self._connect().execute("""
+            INSERT INTO document_snapshots (doc_key, fields, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(doc_key) DO UPDATE SET fields = excluded.fields, updated_at = excluded.updated_at
+        """, (doc_key, json.dumps(fields, separators=(',', ':')), time.time()))
+
+    # ----- enhancement -----
+
+    def enhance(self, resume_data: Dict, profession: str = '', job_title: str = '',
+                user_id=None, document_id=None) -> Dict:
+        """
+        Enhance a resume for ATS compliance. Returns the patched document, the
+        source of each field's text (unchanged/cached/enhanced/fallback) and
+        counts. Pass user_id (and document_id, when a user has several
+        resumes) to diff against the last enhanced version.
+        """
+        fields = flatten(resume_data)
+        doc_key = f"{user_id}:{document_id or 'default'}" if user_id is not None else None
+        results, sources, requests = self._enhance_fields(fields, profession, job_title, doc_key)
+        counts = {source: sum(1 for s in sources.values() if s == source)
+                  for source in (UNCHANGED, CACHED, ENHANCED, FALLBACK)}
+        return {
+            'enhanced_data': patch(resume_data, results),
+            'fields': sources,
+            'stats': {'fields': len(fields), 'requests': requests, **counts},
+        }
+
+    def enhance_field(self, content: str, kind: str, profession: str = '', job_title: str = '') -> Tuple[str, str]:
+        """One field (of any type) through the same cache and prompt; returns (text, source)"""
+        results, sources, _ = self._enhance_fields({kind: content}, profession, job_title)
+        return results[kind], sources[kind]
+
+    def _enhance_fields(self, fields: Dict[str, str], profession: str, job_title: str,
+                        doc_key: Optional[str] = None) -> Tuple[Dict[str, str], Dict[str, str], int]:
+        hashes = {path: content_hash(field_type(path), profession, job_title, text) for path, text in fields.items()}
+        try:
+            snapshot = self._load_snapshot(doc_key) if doc_key else {}
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Document enhancer snapshot unavailable: {e}")
+            snapshot = {}
+
+        results: Dict[str, str] = {}
+        sources: Dict[str, str] = {}
+        for path, text in fields.items():
+            previous = snapshot.get(path)
+            if previous and (previous[0] == hashes[path] or previous[1] == text):
+                results[path], sources[path] = previous[1], UNCHANGED
+
+        changed = [path for path in fields if path not in results]
+        try:
+            cached = self._cache_get([hashes[path] for path in changed]) if changed else {}
+        except sqlite3.Error as e:
+            logger.warning(f"Document enhancer cache unavailable: {e}")
+            cached = {}
+        pending = []
+        for path in changed:
+            if hashes[path] in cached:
+                results[path], sources[path] = cached[hashes[path]], CACHED
+            else:
+                pending.append(path)
+
+        requests = 0
+        fresh: Dict[str, str] = {}
+        for start in range(0, len(pending), self.batch_fields):
+            batch = {path: (field_type(path), fields[path]) for path in pending[start:start + self.batch_fields]}
+            requests += 1
+            try:
+                reply = self.ai.enhance_fields_ats_batch(batch, profession, job_title)
+            except Exception as e:
+                logger.warning(f"Batched ATS enhancement of {len(batch)} fields failed: {e}")
+                reply = {}
+            for path, (kind, text) in batch.items():
+                value = reply.get(path) if isinstance(reply, dict) else None
+                if valid_enhancement(text, value):
+                    results[path] = fresh[path] = value.strip()
+                    sources[path] = ENHANCED
+                else:
+                    results[path] = self.ai._fallback_ats_enhancement(text, kind, profession)
+                    sources[path] = FALLBACK
+
+        try:
+            if fresh:
+                entries = {hashes[path]: value for path, value in fresh.items()}
+                # Applied results come back as content: map them to themselves
+                entries.update({content_hash(field_type(path), profession, job_title, value): value
+                                for path, value in fresh.items()})
+                self._cache_put(entries)
+            if doc_key:
+                self._save_snapshot(doc_key, {path: [hashes[path], results[path]]
+                                              for path in fields if sources[path] != FALLBACK})
+        except sqlite3.Error as e:
+            logger.warning(f"Document enhancer could not store results: {e}")
+
+        self.stats['fields'] += len(fields)
+        self.stats['requests'] += requests
+        for source in sources.values():
+            self.stats[source] += 1
+        return results, sources, requests
+
+
+# Global instance
+document_enhancer = DocumentEnhancer()
@@ -0,0 +1,290 @@
+"""
+Flask API routes for downloads and sharing of paid documents
+"""
+
+from flask import Blueprint, request, jsonify, send_file
+from form_codec import decode_form_data
+from io import BytesIO
+from app_core import auth_system, logger, track_document_generation
+
+document_bp = Blueprint('document', __name__)
+
+# Download endpoints for PDF and DOCX files - Generate on-demand to save storage
+@document_bp.route('/api/downloads/resume_<reference>.pdf', methods=['GET'])
+def download_resume_pdf(reference):
+    """Download resume PDF by reference - Generate on-demand"""
+    try:
+        logger.info(f"Generating PDF on-demand for reference: {reference}")
+        
+        # Get payment data from database to retrieve form data
+        connection = auth_system.get_db_connection()
+        if not connection:
+            return jsonify({
+                'success': False,
+                'error': 'Database connection failed'
+            }), 500
+        
+        try:
+            cursor = connection.cursor()
+            
+            # First, let's check what tables exist and their structure
+            logger.info(f"Looking for payment data for reference: {reference}")
+            
+            # First, get the actual column structure
+            cursor.execute("DESCRIBE manual_payments")
+            columns = cursor.fetchall()
+            column_names = [col[0] for col in columns]
+            logger.info(f"Available columns in manual_payments: {column_names}")
+            
+            # Build queries based on actual column structure
+            possible_queries = []
+            
+            # Try different column combinations based on actual structure
+            if 'form_data' in column_names and 'document_type' in column_names:
+                # Use the actual column structure we found
+                possible_queries.extend([
+                    ("SELECT form_data, document_type FROM manual_payments WHERE reference = %s", (reference,)),
+                    ("SELECT form_data, document_type FROM manual_payments WHERE reference = %s AND status = 'completed'", (reference,)),
+                    ("SELECT form_data, document_type FROM manual_payments WHERE reference = %s AND status = 'validated'", (reference,)),
+                    ("SELECT form_data, document_type FROM manual_payments WHERE reference = %s AND status = 'success'", (reference,)),
+                ])
+            
+            # If form_data doesn't exist, try other possible column names
+            if not possible_queries:
+                for data_col in ['data', 'form_data', 'resume_data', 'content']:
+                    if data_col in column_names:
+                        for type_col in ['document_type', 'type', 'doc_type']:
+                            if type_col in column_names:
+                                possible_queries.append((f"SELECT {data_col}, {type_col} FROM manual_payments WHERE reference = %s", (reference,)))
+                                break
+                        break
+            
+            payment_data = None
+            for query, params in possible_queries:
+                try:
+                    logger.info(f"Trying query: {query}")
+                    cursor.execute(query, params)
+                    payment_data = cursor.fetchone()
+                    if payment_data:
+                        logger.info(f"Found payment data with query: {query}")
+                        break
+                except Exception as e:
+                    logger.warning(f"Query failed: {query}, Error: {e}")
+                    continue
+            
+            if not payment_data:
+                # Let's see what's actually in the database
+                try:
+                    cursor.execute("SHOW TABLES LIKE '%payment%'")
+                    tables = cursor.fetchall()
+                    logger.info(f"Available payment tables: {tables}")
+                    
+                    cursor.execute("SELECT id, reference, status, created_at FROM manual_payments ORDER BY id DESC LIMIT 5")
+                    sample_data = cursor.fetchall()
+                    logger.info(f"Sample manual_payments data: {sample_data}")
+                except Exception as e:
+                    logger.error(f"Could not inspect database: {e}")
+                
+                return jsonify({
+                    'success': False,
+                    'error': f'Payment not found for reference: {reference}'
+                }), 404
+            
+            # Handle the payment data (form_data, document_type)
+            if len(payment_data) >= 2:
+                form_data = payment_data[0]
+                document_type = payment_data[1]
+                logger.info(f"Found payment data - Document type: {document_type}")
+            else:
+                logger.error(f"Unexpected payment data format: {payment_data}")
+                return jsonify({
+                    'success': False,
+                    'error': 'Invalid payment data format'
+                }), 500
+            
+            # Parse form data
+            import json
+            try:
+                resume_data = decode_form_data(form_data)
+                logger.info(f"Parsed resume data successfully")
+            except Exception as e:
+                logger.error(f"Failed to parse form data: {e}")
+                return jsonify({
+                    'success': False,
+                    'error': 'Invalid form data format'
+                }), 500
+            
+            # Generate PDF in memory
+            try:
+                # Use the same RobustFranciscaPDFGenerator for consistency
+                from francisca_pdf_generator_robust import RobustFranciscaPDFGenerator
+                pdf_generator = RobustFranciscaPDFGenerator()
+                
+                # Generate PDF straight into memory - nothing touches the disk
+                pdf_bytes = pdf_generator.generate_resume_pdf_bytes(resume_data)
+                
+                if pdf_bytes:
+                    logger.info(f"PDF generated successfully for reference: {reference}")
+                    
+                    # Track document in user_documents table; the stored path is the
+                    # on-demand download URL since no file is kept
+                    try:
+                        track_document_generation(reference, resume_data, f"/api/downloads/resume_{reference}.pdf")
+                    except Exception as e:
+                        logger.error(f"Failed to track document: {e}")
+                    
+                    return send_file(
+                        BytesIO(pdf_bytes),
+                        mimetype='application/pdf',
+                        as_attachment=True,
+                        download_name=f"resume_{reference}.pdf"
+                    )
+                else:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Failed to generate PDF'
+                    }), 500
+                    
+            except Exception as e:
+                logger.error(f"PDF generation failed: {e}")
+                return jsonify({
+                    'success': False,
+                    'error': f'PDF generation failed: {str(e)}'
+                }), 500
+                
+        except Exception as e:
+            logger.error(f"Database query failed: {e}")
+            return jsonify({
+                'success': False,
+                'error': f'Database error: {str(e)}'
+            }), 500
+        finally:
+            if connection:
+                connection.close()
+            
+    except Exception as e:
+        logger.error(f"Error generating PDF on-demand: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+@document_bp.route('/api/downloads/resume_<reference>.docx', methods=['GET'])
+def download_resume_docx(reference):
+    """Download resume DOCX by reference - Generate on-demand"""
+    try:
+        logger.info(f"DOCX conversion requested for reference: {reference}")
+        
+        # For now, return a message that DOCX conversion is not implemented
+        # In the future, this could convert PDF to DOCX on-demand
+        return jsonify({
+            'success': False,
+            'error': 'DOCX conversion not yet implemented. Please download the PDF version.',
+            'pdf_available': True,
+            'pdf_url': f'/api/downloads/resume_{reference}.pdf'
+        }), 404
+            
+    except Exception as e:
+        logger.error(f"Error serving DOCX file: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+@document_bp.route('/api/payments/download/<reference>', methods=['GET'])
+def download_payment_document(reference):
+    """Alternative download endpoint for payment documents - Generate on-demand"""
+    try:
+        # Redirect to the main download endpoint which generates on-demand
+        logger.info(f"Payment download requested for reference: {reference}")
+        return download_resume_pdf(reference)
+            
+    except Exception as e:
+        logger.error(f"Error serving payment document: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+@document_bp.route('/api/documents/shared/<reference>', methods=['GET'])
+def get_shared_document(reference):
+    """Get shared document information for public access"""
+    try:
+        # Check if payment exists in database
+        connection = auth_system.get_db_connection()
+        if not connection:
+            return jsonify({
+                'success': False,
+                'error': 'Database connection failed'
+            }), 500
+        
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT reference, document_type, user_email, created_at 
+                FROM manual_payments 
+                WHERE reference = %s AND status = 'completed'
+            """, (reference,))
+            
+            payment_data = cursor.fetchone()
+            if not payment_data:
+                return jsonify({
+                    'success': False,
+                    'error': 'Document not found'
+                }), 404
+            
+            ref, doc_type, user_email, created_at = payment_data
+            
+            return jsonify({
+                'success': True,
+                'reference': reference,
+                'file_exists': True,
+                'document_type': doc_type,
+                'user_email': user_email,
+                'created_at': created_at.isoformat() if created_at else None,
+                'download_url': f'/api/downloads/resume_{reference}.pdf',
+                'view_url': f'/api/downloads/resume_{reference}.pdf',
+                'generation_type': 'on-demand'
+            }), 200
+                
+        finally:
+            if connection:
+                connection.close()
+            
+    except Exception as e:
+        logger.error(f"Error getting shared document info: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+@document_bp.route('/api/documents/<reference>/invite', methods=['POST'])
+def invite_collaborator(reference):
+    """Invite collaborator to document (placeholder for collaboration feature)"""
+    try:
+        data = request.get_json()
+        email = data.get('email')
+        permission = data.get('permission', 'view')
+        
+        if not email:
+            return jsonify({
+                'success': False,
+                'error': 'Email is required'
+            }), 400
+        
+        # For now, just log the invitation (in real implementation, send email)
+        logger.info(f"Collaboration invitation: {email} invited to document {reference} with {permission} permission")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Invitation sent to {email}',
+            'reference': reference,
+            'permission': permission
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error sending collaboration invitation: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
@@ -0,0 +1,489 @@
+"""
+Email Outbox
+Durable, asynchronous email delivery shared by every part of the backend.
+
+Messages are written to a SQLite outbox (safe to share between gunicorn workers on
+one host) and acknowledged immediately. A sender worker claims due messages in
+batches and delivers them over a single long-lived transport - an authenticated
+SMTP session or one reused SendGrid client - retrying transient failures with
+exponential backoff. Delivery status can be queried per message.
+
+Run a dedicated sender process with:
+
+    python email_outbox.py worker
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import sqlite3
+import smtplib
+import logging
+import threading
+import importlib.util
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, Any, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# sendgrid is only imported once a SendGrid transport is actually built
+SENDGRID_AVAILABLE = importlib.util.find_spec('sendgrid') is not None
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DB_PATH = os.getenv('EMAIL_OUTBOX_DB', os.path.join('data', 'email_outbox.db'))
+MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 6))
+BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 20))
+POLL_INTERVAL = float(os.getenv('EMAIL_OUTBOX_POLL_INTERVAL', 2))
+BACKOFF_BASE = 30          # seconds before the first retry
+BACKOFF_MAX = 60 * 60      # never wait more than an hour between retries
+CLAIM_LEASE = 5 * 60       # reclaim messages stuck in 'sending' after a crash
+
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+
+class PermanentEmailError(Exception):
+    """Delivery failure that retrying will not fix (bad recipient, rejected payload)"""
+
+
+class SMTPTransport:
+    """SMTP sender that keeps one authenticated session open across messages"""
+
+    name = 'smtp'
+
+    def __init__(self, server: str, port: int, email: Optional[str], password: Optional[str],
+                 from_name: str = 'ProWrite', use_tls: bool = True, timeout: int = 30,
+                 idle_timeout: int = 60):
+        self.server = server
+        self.port = port
+        self.email = email
+        self.password = password
+        self.from_name = from_name
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.from_email = email or 'noreply@prowrite.local'
+        self._conn = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        logger.info(f"Opening SMTP session to {self.server}:{self.port}")
+        conn = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        conn.ehlo()
+        if self.use_tls:
+            conn.starttls()
+            conn.ehlo()
+        if self.email and self.password:
+            conn.login(self.email, self.password)
+        self._conn = conn
+
+    def _ensure_connection(self):
+        if self._conn is not None and time.time() - self._last_used > self.idle_timeout:
+            # Servers drop idle sessions; probe before reusing a quiet one
+            try:
+                if self._conn.noop()[0] != 250:
+                    self.close()
+            except smtplib.SMTPException:
+                self.close()
+            except OSError:
+                self.close()
+        if self._conn is None:
+            self._connect()
+
+    def _build_message(self, message: Dict[str, Any]) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = message['recipient']
+        msg['Subject'] = message['subject']
+
+        if message.get('body_text'):
+            msg.attach(MIMEText(message['body_text'], 'plain'))
+        elif message.get('body_html'):
+            msg.attach(MIMEText(message['body_html'], 'html'))
+
+        for attachment in message.get('attachments') or []:
+            part = MIMEBase(*attachment.get('mimetype', 'application/octet-stream').split('/', 1))
+            part.set_payload(base64.b64decode(attachment['content']))
+            encoders.encode_base64(part)
+            part.add_header('Content-Disposition', f"attachment; filename={attachment['filename']}")
+            msg.attach(part)
+        return msg
+
+    def send(self, message: Dict[str, Any]):
+        msg = self._build_message(message)
+        for attempt in range(2):
+            self._ensure_connection()
+            try:
+                self._conn.sendmail(self.from_email, [message['recipient']], msg.as_string())
+                self._last_used = time.time()
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Session expired between batches - reconnect once and retry
+                self._conn = None
+                if attempt:
+                    raise
+            except smtplib.SMTPRecipientsRefused as e:
+                raise PermanentEmailError(f"Recipient refused: {e.recipients}")
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                pass
+            self._conn = None
+
+
+class SendGridTransport:
+    """SendGrid sender reusing one API client (and its HTTP connection pool)"""
+
+    name = 'sendgrid'
+
+    def __init__(self, api_key: str, from_email: str, from_name: str = 'ProWrite'):
+        self.from_email = from_email
+        self.from_name = from_name
+        from sendgrid import SendGridAPIClient
+        self.client = SendGridAPIClient(api_key=api_key)
+
+    def send(self, message: Dict[str, Any]):
+        from sendgrid.helpers.mail import Mail, Attachment, FileContent, FileName, FileType, Disposition
+        html = message.get('body_html') or (message.get('body_text') or '').replace('\n', '<br>')
+        mail = Mail(
+            from_email=(self.from_email, self.from_name),
+            to_emails=message['recipient'],
+            subject=message['subject'],
+            html_content=html
+        )
+        attachments = message.get('attachments') or []
+        if attachments:
+            mail.attachment = [
+                Attachment(
+                    FileContent(attachment['content']),
+                    FileName(attachment['filename']),
+                    FileType(attachment.get('mimetype', 'application/octet-stream')),
+                    Disposition('attachment')
+                )
+                for attachment in attachments
+            ]
+
+        response = self.client.send(mail)
+        if response.status_code not in (200, 201, 202):
+            error = f"SendGrid error: {response.status_code} - {response.body}"
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                raise PermanentEmailError(error)
+            raise RuntimeError(error)
+
+    def close(self):
+        pass
+
+
+def create_default_transport():
+    """Pick SendGrid when configured, otherwise SMTP from the environment"""
+    sendgrid_key = os.getenv('SENDGRID_API_KEY')
+    sendgrid_from = os.getenv('SENDGRID_FROM_EMAIL', os.getenv('SMTP_EMAIL'))
+    if SENDGRID_AVAILABLE and sendgrid_key and sendgrid_from:
+        return SendGridTransport(sendgrid_key, sendgrid_from, os.getenv('SENDGRID_FROM_NAME', 'ProWrite'))
+
+    return SMTPTransport(
+        server=os.getenv('SMTP_SERVER', 'smtp.gmail.com'),
+        port=int(os.getenv('SMTP_PORT', 587)),
+        email=os.getenv('SMTP_EMAIL'),
+        password=os.getenv('SMTP_PASSWORD'),
+        from_name=os.getenv('SMTP_FROM_NAME', 'ProWrite'),
+        use_tls=os.getenv('SMTP_USE_TLS', 'true').lower() != 'false'
+    )
+
+
+class EmailOutbox:
+    """Durable email queue with a background sender"""
+
+    def __init__(self, db_path: str = OUTBOX_DB_PATH, transport=None, batch_size: int = BATCH_SIZE,
+                 max_attempts: int = MAX_ATTEMPTS, poll_interval: float = POLL_INTERVAL):
+        self.db_path = db_path
+        self._transport = transport
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._send_lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+        self._initialized = False
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            self._transport = create_default_transport()
+        return self._transport
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self._init_database()
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_database(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS email_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recipient TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    body_text TEXT,
+                    body_html TEXT,
+                    attachments TEXT,
+                    category TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    next_attempt_at REAL NOT NULL,
+                    claimed_at REAL,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+                ON email_outbox (status, next_attempt_at)
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    # ----- producer side -----
+
+    def enqueue(self, recipient: str, subject: str, body_text: Optional[str] = None,
+                body_html: Optional[str] = None, attachments: Optional[List[Tuple[str, bytes, str]]] = None,
+                category: Optional[str] = None) -> Optional[int]:
+        """Durably queue a message and return its id (None if it could not be stored)
+
+        attachments is a list of (filename, content_bytes, mimetype) tuples.
+        """
+        if not recipient:
+            logger.error(f"Refusing to enqueue email without recipient: {subject}")
+            return None
+
+        encoded_attachments = [
+            {
+                'filename': filename,
+                'mimetype': mimetype or 'application/octet-stream',
+                'content': base64.b64encode(content).decode()
+            }
+            for filename, content, mimetype in (attachments or [])
+        ]
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute("""
+                    INSERT INTO email_outbox
+                    (recipient, subject, body_text, body_html, attachments, category,
+                     status, next_attempt_at, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (recipient, subject, body_text, body_html,
+                      json.dumps(encoded_attachments) if encoded_attachments else None,
+                      category, STATUS_PENDING, now, now))
+                message_id = cursor.lastrowid
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Failed to enqueue email to {recipient}: {e}")
+            return None
+
+        logger.info(f"Queued email {message_id} ({category or 'general'}) to {recipient}")
+        self._wake.set()
+        return message_id
+
+    def get_status(self, message_id: int) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute("""
+                SELECT id, recipient, subject, category, status, attempts, last_error,
+                       next_attempt_at, created_at, sent_at
+                FROM email_outbox WHERE id = ?
+            """, (message_id,)).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            counts = {row['status']: row['count'] for row in conn.execute(
+                "SELECT status, COUNT(*) AS count FROM email_outbox GROUP BY status"
+            )}
+            oldest = conn.execute(
+                "SELECT MIN(created_at) FROM email_outbox WHERE status IN (?, ?)",
+                (STATUS_PENDING, STATUS_SENDING)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            'counts': counts,
+            'oldest_pending_age_seconds': round(time.time() - oldest, 1) if oldest else 0
+        }
+
+    # ----- sender side -----
+
+    def _claim_batch(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("""
+                SELECT * FROM email_outbox
+                WHERE (status = ? AND next_attempt_at <= ?)
+                   OR (status = ? AND claimed_at < ?)
+                ORDER BY id
+                LIMIT ?
+            """, (STATUS_PENDING, now, STATUS_SENDING, now - CLAIM_LEASE, self.batch_size)).fetchall()
+            if rows:
+                ids = [row['id'] for row in rows]
+                conn.execute(
+                    f"UPDATE email_outbox SET status = ?, claimed_at = ? "
+                    f"WHERE id IN ({','.join('?' * len(ids))})",
+                    [STATUS_SENDING, now] + ids
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        batch = []
+        for row in rows:
+            message = dict(row)
+            message['attachments'] = json.loads(message['attachments']) if message['attachments'] else []
+            batch.append(message)
+        return batch
+
+    def _backoff(self, attempts: int) -> float:
+        return min(BACKOFF_BASE * (2 ** (attempts - 1)), BACKOFF_MAX)
+
+    def _record_result(self, conn: sqlite3.Connection, message: Dict[str, Any], error: Optional[Exception]):
+        now = time.time()
+        attempts = message['attempts'] + 1
+        if error is None:
+            conn.execute(
+                "UPDATE email_outbox SET status = ?, attempts = ?, sent_at = ?, last_error = NULL WHERE id = ?",
+                (STATUS_SENT, attempts, now, message['id'])
+            )
+            return
+
+        permanent = isinstance(error, PermanentEmailError)
+        if permanent or attempts >= self.max_attempts:
+            conn.execute(
+                "UPDATE email_outbox SET status = ?, attempts = ?, last_error = ? WHERE id = ?",
+                (STATUS_FAILED, attempts, str(error), message['id'])
+            )
+            logger.error(f"Email {message['id']} to {message['recipient']} failed permanently: {error}")
+        else:
+            conn.execute(
+                "UPDATE email_outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                (STATUS_PENDING, attempts, str(error), now + self._backoff(attempts), message['id'])
+            )
+            logger.warning(f"Email {message['id']} to {message['recipient']} failed (attempt {attempts}), will retry: {error}")
+
+    def process_batch(self) -> int:
+        """Send one batch of due messages over the shared transport; returns messages processed"""
+        with self._send_lock:
+            batch = self._claim_batch()
+            if not batch:
+                return 0
+
+            results = []
+            for message in batch:
+                try:
+                    self.transport.send(message)
+                    results.append((message, None))
+                except Exception as e:
+                    results.append((message, e))
+
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for message, error in results:
+                    self._record_result(conn, message, error)
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+
+            sent = sum(1 for _, error in results if error is None)
+            logger.info(f"Email outbox batch: {sent}/{len(results)} sent via {self.transport.name}")
+            return len(results)
+
+    def flush(self, max_batches: int = 100) -> int:
+        """Synchronously drain everything currently due (used by tests and CLI)"""
+        total = 0
+        for _ in range(max_batches):
+            processed = self.process_batch()
+            if not processed:
+                break
+            total += processed
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.process_batch()
+            except Exception as e:
+                logger.error(f"Email outbox worker error: {e}")
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        self.transport.close()
+
+    def start_worker(self):
+        """Start the background sender thread for this process (idempotent, fork-safe)"""
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+        self._worker_pid = os.getpid()
+        self._worker.start()
+
+    def stop_worker(self, timeout: float = 5):
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+
+# Shared outbox used by app.py and the payment services
+email_outbox = EmailOutbox()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'flush'
+    if command == 'worker':
+        email_outbox.start_worker()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            email_outbox.stop_worker()
+    elif command == 'stats':
+        print(json.dumps(email_outbox.get_stats(), indent=2))
+    else:
+        print(f"Processed {email_outbox.flush()} messages")
@@ -5,12 +5,15 @@ Provides intelligent content improvements when external AI services are unavaila
 
 import re
 import random
+import logging
 from typing import List, Dict
 
+logger = logging.getLogger(__name__)
+
 class FallbackAIService:
     def __init__(self):
         """Initialize the fallback AI service"""
-        print("✅ Fallback AI service initialized")
+        logger.debug("Fallback AI service initialized")
     
     def enhance_achievements(self, bullet_points: List[str], job_title: str) -> List[str]:
         """Enhance achievement bullet points with local processing"""
@@ -7,6 +7,9 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 from dotenv import load_dotenv
 from africas_talking_validator import transaction_validator, ValidationResult
+from email_outbox import email_outbox
+from migrate_manual_payments_user_columns import ensure_user_columns
+from form_codec import encode_for_column, decode_form_data
 
 # Load environment variables from .env file
 load_dotenv()
@@ -14,6 +17,8 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+ADMIN_NOTIFICATION_EMAIL = os.getenv('ADMIN_NOTIFICATION_EMAIL', 'hamiltonmwaila06@gmail.com')
+
 @dataclass
 class PaymentSubmission:
     id: int
@@ -46,12 +51,13 @@ class FastManualPaymentService:
             'number': '6340351',
             'name': 'FRANCISCA MAJALA MWAILA'
         }
-        self._init_database()
+        # Tables are created with the first connection, not at import
+        self._initialized = False
     
     def _get_db_connection(self):
         """Get database connection"""
         try:
-            return mysql.connector.connect(
+            connection = mysql.connector.connect(
                 host=os.getenv('DB_HOST', 'localhost'),
                 user=os.getenv('DB_USER', 'root'),
                 password=os.getenv('DB_PASSWORD', ''),
@@ -62,15 +68,13 @@ class FastManualPaymentService:
         except Exception as e:
             logger.error(f"Database connection error: {e}")
             return None
+        if not self._initialized:
+            self._init_database(connection)
+        return connection
     
-    def _init_database(self):
+    def _init_database(self, connection):
         """Initialize database tables for manual payments"""
         try:
-            connection = self._get_db_connection()
-            if not connection:
-                logger.warning("Database not available, using in-memory storage")
-                return
-            
             cursor = connection.cursor()
             
             # Create manual_payments table
@@ -78,13 +82,14 @@ class FastManualPaymentService:
                 CREATE TABLE IF NOT EXISTS manual_payments (
                     id INT AUTO_INCREMENT PRIMARY KEY,
                     reference VARCHAR(50) UNIQUE NOT NULL,
-                    form_data JSON,
+                    form_data LONGBLOB,
                     document_type VARCHAR(100),
                     amount INT,
                     status VARCHAR(50) DEFAULT 'pending_payment',
                     payment_method VARCHAR(50) DEFAULT 'manual',
                     transaction_code VARCHAR(100),
                     validation_method VARCHAR(50),
+                    pdf_path VARCHAR(500),
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                     INDEX idx_reference (reference),
@@ -92,8 +97,13 @@ class FastManualPaymentService:
                 )
             """)
             
+            # Indexed user columns (older tables get them added here; the
+            # migration script backfills existing rows from form_data)
+            ensure_user_columns(cursor, os.getenv('DB_NAME', 'prowrite'))
+            
             connection.commit()
-            connection.close()
+            cursor.close()
+            self._initialized = True
             logger.info("Manual payments database table initialized")
             
         except Exception as e:
@@ -107,21 +117,24 @@ class FastManualPaymentService:
                 return
             
             cursor = connection.cursor()
-            import json
             cursor.execute("""
                 INSERT INTO manual_payments 
                 (reference, form_data, document_type, amount, status, payment_method, 
-                 transaction_code, validation_method, pdf_path, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                 transaction_code, validation_method, pdf_path, created_at, updated_at,
+                 user_id, user_email, phone_number)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON DUPLICATE KEY UPDATE
                 status = VALUES(status),
                 transaction_code = VALUES(transaction_code),
                 validation_method = VALUES(validation_method),
                 pdf_path = VALUES(pdf_path),
-                updated_at = VALUES(updated_at)
+                updated_at = VALUES(updated_at),
+                user_id = COALESCE(user_id, VALUES(user_id)),
+                user_email = COALESCE(user_email, VALUES(user_email)),
+                phone_number = COALESCE(phone_number, VALUES(phone_number))
             """, (
                 submission.reference,
-                json.dumps(submission.form_data),
+                encode_for_column(cursor, 'manual_payments', submission.form_data),
                 submission.document_type,
                 submission.amount,
                 submission.status,
@@ -130,7 +143,10 @@ class FastManualPaymentService:
                 submission.validation_method,
                 submission.pdf_path,
                 submission.created_at,
-                submission.updated_at
+                submission.updated_at,
+                self._form_user_id(submission.form_data),
+                submission.user_email or submission.form_data.get('personalEmail') or None,
+                (submission.phone_number or submission.form_data.get('personalPhone') or '')[:20] or None
             ))
             
             connection.commit()
@@ -140,6 +156,13 @@ class FastManualPaymentService:
         except Exception as e:
             logger.error(f"Error saving submission to database: {e}")
     
+    def _form_user_id(self, form_data: Dict[str, Any]) -> Optional[int]:
+        """Numeric user id carried in the form data, if any"""
+        try:
+            return int(form_data.get('user_id')) if form_data.get('user_id') else None
+        except (TypeError, ValueError):
+            return None
+    
     def _get_submission_from_db(self, reference: str) -> Optional[PaymentSubmission]:
         """Get submission from database"""
         try:
@@ -154,7 +177,7 @@ class FastManualPaymentService:
             cursor.execute("""
                 SELECT id, reference, form_data, document_type, amount, status, 
                        payment_method, transaction_code, validation_method, 
-                       pdf_path, created_at, updated_at
+                       pdf_path, created_at, updated_at, user_email, phone_number
                 FROM manual_payments 
                 WHERE reference = %s
             """, (reference,))
@@ -163,9 +186,8 @@ class FastManualPaymentService:
             connection.close()
             
             if row:
-                import json
                 try:
-                    form_data = json.loads(row[2]) if row[2] else {}
+                    form_data = decode_form_data(row[2])
                 except:
                     form_data = {}
                 
@@ -175,8 +197,8 @@ class FastManualPaymentService:
                     form_data=form_data,
                     document_type=row[3],
                     amount=row[4],
-                    user_email='',  # Will be filled from form_data
-                    phone_number='',
+                    user_email=row[12] or form_data.get('personalEmail', ''),
+                    phone_number=row[13] or '',
                     status=row[5],
                     payment_method=row[6],
                     transaction_code=row[7],
@@ -338,53 +360,30 @@ class FastManualPaymentService:
         try:
             logger.info(f"FAST PDF: Starting generation for {submission.reference}")
             
-            # Pre-configured SMTP for speed
-            SMTP_CONFIG = {
-                'server': 'smtp.gmail.com',
-                'port': 587,
-                'email': 'prowritesolutions42@gmail.com',
-                'password': 'hlfj fhyv infi ubls',
-                'from_name': 'ProWrite'
-            }
-            
             # Fast PDF generation
             if submission.document_type == 'Francisca Resume':
                 try:
-                    from francisca_pdf_generator import ProfessionalFranciscaPDFGenerator
-                    import os
-                    
-                    # Create uploads directory
-                    uploads_dir = 'uploads'
-                    if not os.path.exists(uploads_dir):
-                        os.makedirs(uploads_dir)
+                    # Generate PDF in memory - downloads re-render from form_data
+                    pdf_bytes = self._render_pdf(submission)
                     
-                    # Simple filename for speed
-                    pdf_filename = f"resume_{submission.reference}.pdf"
-                    pdf_path = os.path.join(uploads_dir, pdf_filename)
-                    
-                    # Generate PDF
-                    pdf_generator = ProfessionalFranciscaPDFGenerator(theme_name="professional")
-                    success = pdf_generator.generate_resume_pdf(submission.form_data, pdf_path)
-                    
-                    if success and os.path.exists(pdf_path):
-                        logger.info(f"FAST PDF: Generated {pdf_filename}")
+                    if pdf_bytes:
+                        logger.info(f"FAST PDF: Generated resume_{submission.reference}.pdf")
                         
-                        # Update status and store PDF path
+                        # Update status
                         submission.status = 'completed'
-                        submission.pdf_path = pdf_path
                         submission.updated_at = datetime.now()
                         self._save_submission_to_db(submission)
                         
                         # Send email quickly
-                        self._send_fast_email(submission, pdf_path, SMTP_CONFIG)
+                        self._send_fast_email(submission, pdf_bytes)
                         
                     else:
                         logger.error(f"FAST PDF: Generation failed for {submission.reference}")
-                        self._send_fast_completion_email(submission, SMTP_CONFIG)
+                        self._send_fast_completion_email(submission)
                         
                 except Exception as e:
                     logger.error(f"FAST PDF: Error {e}")
-                    self._send_fast_completion_email(submission, SMTP_CONFIG)
+                    self._send_fast_completion_email(submission)
             
         except Exception as e:
             logger.error(f"FAST PDF: Background error {e}")
@@ -392,8 +391,15 @@ class FastManualPaymentService:
             submission.updated_at = datetime.now()
             self._save_submission_to_db(submission)
     
-    def _send_fast_email(self, submission: PaymentSubmission, pdf_path: str, smtp_config: dict):
-        """Ultra-fast email sending"""
+    def _render_pdf(self, submission: PaymentSubmission) -> Optional[bytes]:
+        """Render the submission's resume PDF into memory"""
+        from francisca_pdf_generator import ProfessionalFranciscaPDFGenerator
+        
+        pdf_generator = ProfessionalFranciscaPDFGenerator(theme_name="professional")
+        return pdf_generator.generate_resume_pdf_bytes(submission.form_data)
+    
+    def _send_fast_email(self, submission: PaymentSubmission, pdf_bytes: bytes):
+        """Queue the document email (and admin notification) on the shared outbox"""
         try:
             # Get email
             user_email = (
@@ -403,20 +409,6 @@ class FastManualPaymentService:
             )
             user_name = submission.form_data.get('firstName', 'User')
             
-            logger.info(f"FAST EMAIL: Sending to {user_email}")
-            
-            # Create simple message
-            import smtplib
-            from email.mime.multipart import MIMEMultipart
-            from email.mime.text import MIMEText
-            from email.mime.base import MIMEBase
-            from email import encoders
-            
-            msg = MIMEMultipart()
-            msg['From'] = f"{smtp_config['from_name']} <{smtp_config['email']}>"
-            msg['To'] = user_email
-            msg['Subject'] = f"Your {submission.document_type} is Ready!"
-            
             # Simple body
             body = f"""Hello {user_name},
 
@@ -431,50 +423,28 @@ Best regards,
 ProWrite Team
 """
             
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach PDF
-            with open(pdf_path, "rb") as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-                encoders.encode_base64(part)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename= {user_name}_Francisca_Resume.pdf'
-                )
-                msg.attach(part)
-            
-            # Send email with timeout
-            server = smtplib.SMTP(smtp_config['server'], smtp_config['port'], timeout=10)
-            server.starttls()
-            server.login(smtp_config['email'], smtp_config['password'])
-            text = msg.as_string()
-            server.sendmail(smtp_config['email'], user_email, text)
-            server.quit()
-            
-            logger.info(f"FAST EMAIL: Sent successfully to {user_email}")
+            email_outbox.enqueue(
+                user_email,
+                f"Your {submission.document_type} is Ready!",
+                body_text=body,
+                attachments=[(f"{user_name}_Francisca_Resume.pdf", pdf_bytes, 'application/pdf')],
+                category='pdf_delivery'
+            )
+            logger.info(f"FAST EMAIL: Queued for {user_email}")
             
             # Send admin notification
-            try:
-                admin_msg = MIMEText(f"PDF sent to {user_email}. Reference: {submission.reference}")
-                admin_msg['From'] = smtp_config['email']
-                admin_msg['To'] = "hamiltonmwaila06@gmail.com"
-                admin_msg['Subject'] = f"PDF Sent: {submission.document_type} for {user_email}"
-                
-                server = smtplib.SMTP(smtp_config['server'], smtp_config['port'], timeout=5)
-                server.starttls()
-                server.login(smtp_config['email'], smtp_config['password'])
-                server.sendmail(smtp_config['email'], "hamiltonmwaila06@gmail.com", admin_msg.as_string())
-                server.quit()
-                logger.info("FAST EMAIL: Admin notification sent")
-            except Exception as e:
-                logger.error(f"FAST EMAIL: Admin notification failed: {e}")
+            email_outbox.enqueue(
+                ADMIN_NOTIFICATION_EMAIL,
+                f"PDF Sent: {submission.document_type} for {user_email}",
+                body_text=f"PDF sent to {user_email}. Reference: {submission.reference}",
+                category='admin_notification'
+            )
             
         except Exception as e:
-            logger.error(f"FAST EMAIL: Failed to send: {e}")
+            logger.error(f"FAST EMAIL: Failed to queue: {e}")
     
-    def _send_fast_completion_email(self, submission: PaymentSubmission, smtp_config: dict):
-        """Send fast completion email without PDF"""
+    def _send_fast_completion_email(self, submission: PaymentSubmission):
+        """Queue a completion email without PDF"""
         try:
             user_email = (
                 submission.form_data.get('email') or
@@ -482,21 +452,13 @@ ProWrite Team
                 'noreply@prowrite.com'
             )
             
-            import smtplib
-            from email.mime.text import MIMEText
-            
-            msg = MIMEText(f"Your {submission.document_type} is ready! Reference: {submission.reference}")
-            msg['From'] = smtp_config['email']
-            msg['To'] = user_email
-            msg['Subject'] = f"Your {submission.document_type} is Ready!"
-            
-            server = smtplib.SMTP(smtp_config['server'], smtp_config['port'], timeout=5)
-            server.starttls()
-            server.login(smtp_config['email'], smtp_config['password'])
-            server.sendmail(smtp_config['email'], user_email, msg.as_string())
-            server.quit()
-            
-            logger.info(f"FAST EMAIL: Completion email sent to {user_email}")
+            email_outbox.enqueue(
+                user_email,
+                f"Your {submission.document_type} is Ready!",
+                body_text=f"Your {submission.document_type} is ready! Reference: {submission.reference}",
+                category='completion'
+            )
+            logger.info(f"FAST EMAIL: Completion email queued for {user_email}")
             
         except Exception as e:
             logger.error(f"FAST EMAIL: Completion email failed: {e}")
@@ -522,8 +484,8 @@ ProWrite Team
                 'updated_at': submission.updated_at.isoformat()
             }
             
-            # Add download URL if PDF is ready
-            if submission.status == 'completed' and submission.pdf_path:
+            # Add download URL if PDF is ready (rendered on demand at download time)
+            if submission.status == 'completed' and submission.document_type == 'Francisca Resume':
                 result['download_url'] = f'/api/payments/manual/download/{reference}'
                 result['pdf_ready'] = True
             
@@ -536,6 +498,24 @@ ProWrite Team
                 'error': 'Status check failed'
             }
     
+    def get_pdf_bytes(self, reference: str) -> Optional[bytes]:
+        """Render the PDF for a completed submission in memory"""
+        try:
+            submission = self._get_submission_from_db(reference)
+            if not submission:
+                logger.error(f"❌ No submission found for reference: {reference}")
+                return None
+            
+            if submission.status != 'completed' or submission.document_type != 'Francisca Resume':
+                logger.warning(f"⚠️  PDF not ready - Status: {submission.status}")
+                return None
+            
+            return self._render_pdf(submission)
+            
+        except Exception as e:
+            logger.error(f"❌ PDF render error: {e}")
+            return None
+    
     def get_pdf_download_path(self, reference: str) -> Optional[str]:
         """Get PDF file path for download"""
         try:
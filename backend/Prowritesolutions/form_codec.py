@@ -0,0 +1,145 @@
+"""
+Form Data Codec
+Compact storage format for the form_data / resume payloads kept on
+manual_payments, payments and form_submissions.
+
+Payloads are serialized as canonical JSON (sorted keys, no whitespace) and,
+when large enough to benefit, compressed with zstd (if installed) or zlib.
+Stored values carry a small header so the format can evolve:
+
+    b'PWF' + version (1 byte) + codec (b'n' none, b'z' zlib, b's' zstd) + body
+
+Values written before the codec existed (plain JSON text) are still decoded,
+so tables can be converted incrementally with migrate_form_data_codec.py.
+"""
+
+import os
+import json
+import zlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PWF'
+VERSION = 1
+HEADER_SIZE = len(MAGIC) + 2
+CODEC_NONE = b'n'
+CODEC_ZLIB = b'z'
+CODEC_ZSTD = b's'
+COMPRESS_MIN_BYTES = 256      # smaller payloads are stored uncompressed
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 6
+
+PREFERRED_CODEC = os.getenv('FORM_DATA_CODEC', 'zstd').lower()
+BINARY_TYPES = ('blob', 'tinyblob', 'mediumblob', 'longblob', 'varbinary', 'binary')
+
+_column_types: Dict[tuple, bool] = {}
+_column_lock = threading.Lock()
+_zstd_local = threading.local()
+
+
+def _zstd_compressor():
+    # zstandard contexts are not thread-safe; keep one per thread
+    if not hasattr(_zstd_local, 'compressor'):
+        _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return _zstd_local.compressor
+
+
+def _zstd_decompressor():
+    _zstd_compressor()
+    return _zstd_local.decompressor
+
+
+def canonical_json(data: Any) -> bytes:
+    """Deterministic, whitespace-free UTF-8 JSON"""
+    return json.dumps(data, separators=(',', ':'), sort_keys=True,
+                      ensure_ascii=False, default=str).encode('utf-8')
+
+
+def is_encoded(value: Any) -> bool:
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:len(MAGIC)]) == MAGIC
+
+
+def encode_form_data(data: Any, codec: Optional[str] = None) -> Optional[bytes]:
+    """Serialize a payload into the versioned storage format (None stays None)"""
+    if data is None:
+        return None
+    body = canonical_json(data)
+    codec = (codec or PREFERRED_CODEC).lower()
+
+    if len(body) < COMPRESS_MIN_BYTES or codec == 'none':
+        return MAGIC + bytes([VERSION]) + CODEC_NONE + body
+    if codec == 'zstd' and ZSTD_AVAILABLE:
+        return MAGIC + bytes([VERSION]) + CODEC_ZSTD + _zstd_compressor().compress(body)
+    return MAGIC + bytes([VERSION]) + CODEC_ZLIB + zlib.compress(body, ZLIB_LEVEL)
+
+
+def decode_form_data(value: Any, default: Any = None) -> Any:
+    """
+    Decode a stored payload. Accepts encoded bytes, legacy JSON text (str or
+    bytes, as returned for JSON/TEXT/BLOB columns) and already-parsed dicts.
+    """
+    if value is None or value == '' or value == b'':
+        return {} if default is None else default
+    if isinstance(value, (dict, list)):
+        return value
+    if isinstance(value, (bytearray, memoryview)):
+        value = bytes(value)
+
+    if isinstance(value, bytes) and value[:len(MAGIC)] == MAGIC:
+        version, codec, body = value[len(MAGIC)], value[len(MAGIC) + 1:HEADER_SIZE], value[HEADER_SIZE:]
+        if version != VERSION:
+            raise ValueError(f"Unsupported form_data format version {version}")
+        if codec == CODEC_ZLIB:
+            body = zlib.decompress(body)
+        elif codec == CODEC_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise ValueError("form_data is zstd-compressed but zstandard is not installed")
+            body = _zstd_decompressor().decompress(body)
+        elif codec != CODEC_NONE:
+            raise ValueError(f"Unknown form_data codec {codec!r}")
+        return json.loads(body)
+
+    # Legacy JSON text
+    return json.loads(value)
+
+
+def column_is_binary(cursor, table: str, column: str = 'form_data') -> bool:
+    """Whether a column has been converted to a binary type (cached per process)"""
+    key = (table, column)
+    with _column_lock:
+        if key in _column_types:
+            return _column_types[key]
+    cursor.execute("""
+        SELECT DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    row = cursor.fetchone()
+    data_type = (row['DATA_TYPE'] if isinstance(row, dict) else row[0]) if row else ''
+    if isinstance(data_type, (bytes, bytearray)):
+        data_type = data_type.decode()
+    binary = data_type.lower() in BINARY_TYPES
+    with _column_lock:
+        _column_types[key] = binary
+    return binary
+
+
+def encode_for_column(cursor, table: str, data: Any, column: str = 'form_data'):
+    """
+    Value to write into a form_data column: the compressed format once the
+    column is binary, compact JSON text while it is still a JSON column.
+    """
+    if data is None:
+        return None
+    if column_is_binary(cursor, table, column):
+        return encode_form_data(data)
+    return canonical_json(data).decode('utf-8')
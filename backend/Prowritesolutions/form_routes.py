@@ -0,0 +1,651 @@
+"""
+Flask API routes for form submissions paid through M-Pesa and their PDF delivery
+"""
+
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+import os
+import mysql.connector
+from typing import Optional
+from form_codec import encode_for_column, decode_form_data
+from app_core import cover_letter_generator, DB_CONFIG, email_service, jwt_required_custom, logger, pdf_generator, PRICING
+from mpesa_service import mpesa_service
+from cover_letter_routes import generate_cover_letter_content
+from rate_limiter import rate_limit
+
+form_bp = Blueprint('form', __name__)
+
+# Form Submission Management Functions
+def create_form_submission(user_id: int, form_data: dict, document_type: str, amount: float) -> int:
+    """Create a new form submission record"""
+    connection = mysql.connector.connect(**DB_CONFIG)
+    if not connection:
+        return None
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO form_submissions (user_id, form_data, document_type, amount, status)
+            VALUES (%s, %s, %s, %s, 'pending_payment')
+        """, (user_id, encode_for_column(cursor, 'form_submissions', form_data), document_type, amount))
+
+        submission_id = cursor.lastrowid
+        connection.commit()
+        connection.close()
+
+        logger.info(f"Form submission created: ID {submission_id}")
+        return submission_id
+
+    except Exception as e:
+        logger.error(f"Error creating form submission: {e}")
+        connection.close()
+        return None
+
+# Columns for status checks and listings; form_data is only fetched when rendering
+FORM_SUBMISSION_COLUMNS = """
+    fs.id, fs.user_id, fs.document_type, fs.amount, fs.payment_id, fs.pdf_path,
+    fs.email_sent, fs.status, fs.created_at, fs.updated_at
+"""
+
+def get_form_submission(submission_id: int, include_form_data: bool = True) -> dict:
+    """Get form submission by ID (without the form_data blob unless requested)"""
+    connection = mysql.connector.connect(**DB_CONFIG)
+    if not connection:
+        return None
+
+    try:
+        cursor = connection.cursor(dictionary=True)
+        form_data_column = ', fs.form_data' if include_form_data else ''
+        cursor.execute(f"""
+            SELECT {FORM_SUBMISSION_COLUMNS}{form_data_column}, u.email as user_email, u.first_name, u.last_name
+            FROM form_submissions fs
+            JOIN users u ON fs.user_id = u.id
+            WHERE fs.id = %s
+        """, (submission_id,))
+
+        result = cursor.fetchone()
+        connection.close()
+
+        if result:
+            if include_form_data:
+                result['form_data'] = decode_form_data(result['form_data'])
+            result['user_name'] = f"{result['first_name']} {result['last_name']}"
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Error getting form submission: {e}")
+        connection.close()
+        return None
+
+def update_submission_status(submission_id: int, status: str, pdf_path: str = None, email_sent: bool = False) -> bool:
+    """Update form submission status"""
+    connection = mysql.connector.connect(**DB_CONFIG)
+    if not connection:
+        return False
+
+    try:
+        cursor = connection.cursor()
+
+        if pdf_path and email_sent is not None:
+            cursor.execute("""
+                UPDATE form_submissions
+                SET status = %s, pdf_path = %s, email_sent = %s, updated_at = NOW()
+                WHERE id = %s
+            """, (status, pdf_path, email_sent, submission_id))
+        elif pdf_path:
+            cursor.execute("""
+                UPDATE form_submissions
+                SET status = %s, pdf_path = %s, updated_at = NOW()
+                WHERE id = %s
+            """, (status, pdf_path, submission_id))
+        else:
+            cursor.execute("""
+                UPDATE form_submissions
+                SET status = %s, updated_at = NOW()
+                WHERE id = %s
+            """, (status, submission_id))
+
+        connection.commit()
+        connection.close()
+
+        logger.info(f"Form submission {submission_id} status updated to {status}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error updating submission status: {e}")
+        connection.close()
+        return False
+
+def create_payment_record(user_id: int, amount: float, checkout_request_id: str = None) -> int:
+    """Create a payment record"""
+    connection = mysql.connector.connect(**DB_CONFIG)
+    if not connection:
+        return None
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO payments (user_id, amount, mpesa_checkout_request_id, status)
+            VALUES (%s, %s, %s, 'pending')
+        """, (user_id, amount, checkout_request_id))
+
+        payment_id = cursor.lastrowid
+        connection.commit()
+        connection.close()
+
+        logger.info(f"Payment record created: ID {payment_id}")
+        return payment_id
+
+    except Exception as e:
+        logger.error(f"Error creating payment record: {e}")
+        connection.close()
+        return None
+
+def update_payment_status(payment_id: int, status: str, receipt_number: str = None) -> bool:
+    """Update payment status"""
+    connection = mysql.connector.connect(**DB_CONFIG)
+    if not connection:
+        return False
+
+    try:
+        cursor = connection.cursor()
+
+        if receipt_number:
+            cursor.execute("""
+                UPDATE payments
+                SET status = %s, mpesa_receipt_number = %s, updated_at = NOW()
+                WHERE id = %s
+            """, (status, receipt_number, payment_id))
+        else:
+            cursor.execute("""
+                UPDATE payments
+                SET status = %s, updated_at = NOW()
+                WHERE id = %s
+            """, (status, payment_id))
+
+        connection.commit()
+        connection.close()
+
+        logger.info(f"Payment {payment_id} status updated to {status}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error updating payment status: {e}")
+        connection.close()
+        return False
+
+# Form Submission with Payment Integration
+@form_bp.route('/api/forms/submit-with-payment', methods=['POST'])
+@jwt_required_custom
+@rate_limit('payment')
+def submit_form_with_payment():
+    """Submit form and initiate payment process"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        # Extract form data and document type
+        form_data = data.get('form_data', {})
+        document_type = data.get('document_type', 'Francisca Resume')
+        phone_number = data.get('phone_number', '')
+
+        # Validate required fields
+        if not form_data:
+            return jsonify({
+                'success': False,
+                'message': 'Form data is required'
+            }), 400
+
+        if not phone_number:
+            return jsonify({
+                'success': False,
+                'message': 'Phone number is required for payment'
+            }), 400
+
+        # Determine pricing based on document type
+        if document_type.lower() == 'francisca resume':
+            amount = PRICING['francisca_resume']
+        elif document_type.lower() == 'cover letter':
+            amount = PRICING['cover_letter']
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Invalid document type'
+            }), 400
+
+        # Create form submission record
+        submission_id = create_form_submission(user_id, form_data, document_type, amount)
+
+        if not submission_id:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to create form submission'
+            }), 500
+
+        # Format phone number for M-Pesa
+        if phone_number.startswith('+254'):
+            phone_number = phone_number[1:]
+        elif phone_number.startswith('0'):
+            phone_number = '254' + phone_number[1:]
+        elif not phone_number.startswith('254'):
+            phone_number = '254' + phone_number
+
+        # Initiate M-Pesa payment
+        account_reference = f'PROWRITE_{submission_id}'
+        transaction_desc = f'ProWrite {document_type} - KES {amount}'
+
+        payment_result = mpesa_service.initiate_stk_push(
+            phone_number, amount, account_reference, transaction_desc
+        )
+
+        if payment_result:
+            # Create payment record
+            payment_id = create_payment_record(user_id, amount, payment_result.get('CheckoutRequestID'))
+
+            # Link payment to submission
+            if payment_id:
+                connection = mysql.connector.connect(**DB_CONFIG)
+                if connection:
+                    cursor = connection.cursor()
+                    cursor.execute("""
+                        UPDATE form_submissions
+                        SET payment_id = %s
+                        WHERE id = %s
+                    """, (payment_id, submission_id))
+                    connection.commit()
+                    connection.close()
+
+            return jsonify({
+                'success': True,
+                'submission_id': submission_id,
+                'payment_id': payment_id,
+                'checkout_request_id': payment_result.get('CheckoutRequestID'),
+                'amount': amount,
+                'document_type': document_type,
+                'message': 'Payment initiated. Please complete payment on your phone.'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to initiate payment'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error in form submission with payment: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@form_bp.route('/api/forms/payment-status', methods=['POST'])
+@jwt_required_custom
+def check_form_payment_status():
+    """Check payment status for form submission"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        submission_id = data.get('submission_id')
+        checkout_request_id = data.get('checkout_request_id')
+
+        if not submission_id or not checkout_request_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission ID and checkout request ID are required'
+            }), 400
+
+        # Get submission details
+        submission = get_form_submission(submission_id, include_form_data=False)
+        if not submission or submission['user_id'] != user_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission not found'
+            }), 404
+
+        # Query M-Pesa transaction status
+        result = mpesa_service.query_transaction_status(checkout_request_id)
+
+        if result and result.get('ResultCode') == 0:
+            # Payment successful
+            update_submission_status(submission_id, 'paid')
+
+            # Update payment record
+            connection = mysql.connector.connect(**DB_CONFIG)
+            if connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    UPDATE payments
+                    SET status = 'completed', mpesa_receipt_number = %s, updated_at = NOW()
+                    WHERE mpesa_checkout_request_id = %s
+                """, (result.get('MpesaReceiptNumber', ''), checkout_request_id))
+                connection.commit()
+                connection.close()
+
+            return jsonify({
+                'success': True,
+                'payment_status': 'completed',
+                'submission_status': 'paid',
+                'message': 'Payment successful! PDF generation will start shortly.'
+            })
+        else:
+            return jsonify({
+                'success': True,
+                'payment_status': 'pending',
+                'submission_status': submission['status'],
+                'message': 'Payment is still pending. Please complete payment on your phone.'
+            })
+
+    except Exception as e:
+        logger.error(f"Error checking form payment status: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@form_bp.route('/api/forms/submissions', methods=['GET'])
+@jwt_required_custom
+def get_user_form_submissions():
+    """Get user's form submissions"""
+    try:
+        user_id = request.current_user['user_id']
+
+        connection = mysql.connector.connect(**DB_CONFIG)
+        if not connection:
+            return jsonify({
+                'success': False,
+                'message': 'Database connection failed'
+            }), 500
+
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(f"""
+            SELECT {FORM_SUBMISSION_COLUMNS}, p.status as payment_status, p.mpesa_receipt_number
+            FROM form_submissions fs
+            LEFT JOIN payments p ON fs.payment_id = p.id
+            WHERE fs.user_id = %s
+            ORDER BY fs.created_at DESC
+        """, (user_id,))
+
+        submissions = cursor.fetchall()
+        connection.close()
+
+        return jsonify({
+            'success': True,
+            'data': submissions
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting form submissions: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# PDF Generation and Email Delivery Workflow
+def render_submission_pdf(submission: dict) -> Optional[tuple]:
+    """Render a submission's PDF in memory.
+
+    Returns (pdf_bytes, output_path) where output_path is where the document
+    should be stored, or None if rendering failed.
+    """
+    form_data = submission['form_data']
+    document_type = submission['document_type']
+    user_id = submission['user_id']
+
+    # Generate output path
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    if document_type == 'Francisca Resume':
+        filename = f"francisca_resume_{user_id}_{timestamp}.pdf"
+        output_path = f"static/templates/generated_resumes/{filename}"
+
+        # Generate PDF using Francisca template
+        pdf_bytes = pdf_generator.generate_resume_pdf_bytes(form_data)
+
+    elif document_type == 'Cover Letter':
+        filename = f"cover_letter_{user_id}_{timestamp}.pdf"
+        output_path = f"static/templates/generated_cover_letters/{filename}"
+
+        # Generate cover letter content using AI
+        cover_letter_content = generate_cover_letter_content(form_data)
+        form_data['content'] = cover_letter_content
+
+        # Generate PDF using cover letter generator
+        pdf_bytes = cover_letter_generator.generate_cover_letter_pdf_bytes(form_data)
+
+    else:
+        logger.error(f"Unknown document type: {document_type}")
+        return None
+
+    if not pdf_bytes:
+        return None
+    return pdf_bytes, output_path
+
+def store_submission_pdf(pdf_bytes: bytes, output_path: str) -> None:
+    """Persist a rendered PDF with a single write (no read-back)"""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(pdf_bytes)
+
+def generate_pdf_from_submission(submission_id: int) -> str:
+    """Generate PDF from form submission and return PDF path"""
+    try:
+        # Get submission details
+        submission = get_form_submission(submission_id)
+        if not submission:
+            logger.error(f"Submission {submission_id} not found")
+            return None
+
+        rendered = render_submission_pdf(submission)
+        if not rendered:
+            logger.error(f"Failed to generate PDF for submission {submission_id}")
+            return None
+
+        pdf_bytes, output_path = rendered
+        store_submission_pdf(pdf_bytes, output_path)
+        logger.info(f"PDF generated successfully: {output_path}")
+        return output_path
+
+    except Exception as e:
+        logger.error(f"Error generating PDF from submission {submission_id}: {e}")
+        return None
+
+def process_paid_submission(submission_id: int) -> bool:
+    """Process a paid submission: generate PDF and send email"""
+    try:
+        # Get submission details
+        submission = get_form_submission(submission_id)
+        if not submission:
+            logger.error(f"Submission {submission_id} not found")
+            return False
+
+        # Check if already processed
+        if submission['status'] in ['pdf_generated', 'email_sent', 'completed']:
+            logger.info(f"Submission {submission_id} already processed")
+            return True
+
+        # Update status to PDF generation
+        update_submission_status(submission_id, 'pdf_generated')
+
+        # Generate PDF in memory
+        rendered = render_submission_pdf(submission)
+
+        if not rendered:
+            logger.error(f"Failed to generate PDF for submission {submission_id}")
+            update_submission_status(submission_id, 'paid')  # Revert status
+            return False
+
+        # Store the PDF for later downloads and update submission with its path
+        pdf_bytes, pdf_path = rendered
+        store_submission_pdf(pdf_bytes, pdf_path)
+        update_submission_status(submission_id, 'pdf_generated', pdf_path)
+
+        # Send email, attaching the bytes we already hold
+        email_sent = email_service.send_pdf_email(
+            recipient_email=submission['user_email'],
+            pdf_path=pdf_path,
+            document_type=submission['document_type'],
+            user_name=submission['user_name'],
+            pdf_bytes=pdf_bytes
+        )
+
+        # Update final status
+        if email_sent:
+            update_submission_status(submission_id, 'completed', pdf_path, True)
+            logger.info(f"Submission {submission_id} completed successfully")
+        else:
+            update_submission_status(submission_id, 'email_sent', pdf_path, False)
+            logger.warning(f"PDF generated but email failed for submission {submission_id}")
+
+        return email_sent
+
+    except Exception as e:
+        logger.error(f"Error processing paid submission {submission_id}: {e}")
+        return False
+
+@form_bp.route('/api/forms/process-payment', methods=['POST'])
+@jwt_required_custom
+def process_payment_and_generate():
+    """Process payment and generate PDF with email delivery"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        submission_id = data.get('submission_id')
+
+        if not submission_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission ID is required'
+            }), 400
+
+        # Get submission details
+        submission = get_form_submission(submission_id, include_form_data=False)
+        if not submission or submission['user_id'] != user_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission not found'
+            }), 404
+
+        # Check if payment is completed
+        if submission['status'] != 'paid':
+            return jsonify({
+                'success': False,
+                'message': 'Payment not completed yet'
+            }), 400
+
+        # Process the submission
+        success = process_paid_submission(submission_id)
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'PDF generated and sent to your email!',
+                'submission_id': submission_id,
+                'status': 'completed'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'PDF generation failed. Please try again.'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error processing payment and generation: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@form_bp.route('/api/forms/check-status', methods=['POST'])
+@jwt_required_custom
+def check_submission_status():
+    """Check the status of a form submission"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        submission_id = data.get('submission_id')
+
+        if not submission_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission ID is required'
+            }), 400
+
+        # Get submission details
+        submission = get_form_submission(submission_id, include_form_data=False)
+        if not submission or submission['user_id'] != user_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission not found'
+            }), 404
+
+        # Check if payment is completed and trigger processing
+        if submission['status'] == 'paid':
+            # Auto-process paid submissions
+            process_paid_submission(submission_id)
+            # Get updated submission
+            submission = get_form_submission(submission_id, include_form_data=False)
+
+        return jsonify({
+            'success': True,
+            'submission_id': submission_id,
+            'status': submission['status'],
+            'pdf_path': submission.get('pdf_path'),
+            'email_sent': submission.get('email_sent', False),
+            'created_at': submission['created_at'].isoformat() if submission['created_at'] else None,
+            'updated_at': submission['updated_at'].isoformat() if submission['updated_at'] else None
+        })
+
+    except Exception as e:
+        logger.error(f"Error checking submission status: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@form_bp.route('/api/forms/download-pdf', methods=['POST'])
+@jwt_required_custom
+def download_submission_pdf():
+    """Download PDF for a completed submission"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        submission_id = data.get('submission_id')
+
+        if not submission_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission ID is required'
+            }), 400
+
+        # Get submission details
+        submission = get_form_submission(submission_id, include_form_data=False)
+        if not submission or submission['user_id'] != user_id:
+            return jsonify({
+                'success': False,
+                'message': 'Submission not found'
+            }), 404
+
+        # Check if PDF is available
+        if not submission['pdf_path'] or not os.path.exists(submission['pdf_path']):
+            return jsonify({
+                'success': False,
+                'message': 'PDF not available yet'
+            }), 404
+
+        # Return PDF download URL
+        return jsonify({
+            'success': True,
+            'download_url': f"/{submission['pdf_path']}",
+            'filename': os.path.basename(submission['pdf_path'])
+        })
+
+    except Exception as e:
+        logger.error(f"Error downloading PDF: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -2,85 +2,73 @@
 Francisca AI Service - Advanced AI-powered resume enhancement
 """
 
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 import openai
 import os
+import json
+import logging
 from dotenv import load_dotenv
 from fallback_ai_service import fallback_ai_service
+from ai_streaming import StreamingAIClient, stream_with_fallback
+from circuit_breaker import CLOSED, QUOTA, CircuitOpenError, classify_error, openai_breaker
+from suggestion_bank import suggestion_bank
+from jd_features import jd_feature_store, keyword_categories, mentioned, normalize
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv('.env')
 
+PARAGRAPH_SYSTEM_PROMPT = "You are an expert cover letter writer with extensive experience in HR and recruitment. You help job seekers create compelling, professional cover letters that stand out to employers."
+
 class FranciscaAIService:
     def __init__(self):
         """Initialize the Francisca AI service"""
         self.api_key = os.getenv('OPENAI_API_KEY', 'your-openai-api-key-here')
         openai.api_key = self.api_key
-        self.quota_exceeded = False
-        self.last_quota_check = 0
-        print(f"✅ Francisca AI service initialized with API key: {self.api_key[:10]}..." if self.api_key and self.api_key != 'your-openai-api-key-here' else "⚠️ Francisca AI service initialized with default/empty API key")
+        self.stream_client = StreamingAIClient(api_key=self.api_key)
+        if self.api_key and self.api_key != 'your-openai-api-key-here':
+            logger.info("Francisca AI service initialized")
+        else:
+            logger.warning("Francisca AI service initialized with default/empty API key")
+
+    def _chat_completion(self, messages: List[Dict[str, str]], max_tokens: int = 300,
+                         temperature: float = 0.7, model: str = "gpt-3.5-turbo"):
+        """One chat completion through the shared OpenAI circuit breaker"""
+        with openai_breaker.guard():
+            try:
+                from openai import OpenAI
+            except ImportError:
+                return openai.ChatCompletion.create(
+                    model=model, messages=messages, max_tokens=max_tokens, temperature=temperature
+                )
+            client = OpenAI(api_key=self.api_key)
+            return client.chat.completions.create(
+                model=model, messages=messages, max_tokens=max_tokens, temperature=temperature
+            )
 
     def _handle_openai_error(self, error: Exception, operation: str) -> bool:
-        """Handle OpenAI API errors and determine if fallback should be used"""
-        import time
-        
-        error_str = str(error).lower()
-        
-        # Check for quota exceeded error
-        if 'quota' in error_str or 'billing' in error_str or 'exceeded' in error_str:
-            self.quota_exceeded = True
-            print(f"🚫 OpenAI quota exceeded for {operation}. Using fallback service.")
-            return True
-        
-        # Check for rate limiting
-        elif 'rate limit' in error_str or 'too many requests' in error_str:
-            print(f"⏳ OpenAI rate limit hit for {operation}. Using fallback service.")
-            return True
-        
-        # Check for authentication errors
-        elif 'unauthorized' in error_str or 'invalid api key' in error_str:
-            print(f"🔑 OpenAI authentication failed for {operation}. Using fallback service.")
-            return True
-        
-        # Check for model errors
-        elif 'model' in error_str and ('not found' in error_str or 'unavailable' in error_str):
-            print(f"🤖 OpenAI model unavailable for {operation}. Using fallback service.")
-            return True
-        
-        # Check for network errors
-        elif 'network' in error_str or 'connection' in error_str or 'timeout' in error_str:
-            print(f"🌐 OpenAI network error for {operation}. Using fallback service.")
-            return True
-        
-        # For other errors, log and use fallback
-        else:
-            print(f"❌ OpenAI error for {operation}: {error}. Using fallback service.")
+        """Log an OpenAI failure and determine if fallback should be used"""
+        if isinstance(error, CircuitOpenError):
+            logger.debug(f"{error}; using fallback service for {operation}")
             return True
+        kind = classify_error(error)
+        logger.warning(f"OpenAI {kind} error for {operation}: {error}. Using fallback service.")
+        return True
 
     def _should_use_fallback(self) -> bool:
-        """Check if we should use fallback service"""
-        import time
-        
-        # If quota exceeded, use fallback for 1 hour
-        if self.quota_exceeded and (time.time() - self.last_quota_check) < 3600:
-            return True
-        
-        # Reset quota check if enough time has passed
-        if self.quota_exceeded and (time.time() - self.last_quota_check) >= 3600:
-            self.quota_exceeded = False
-            self.last_quota_check = time.time()
-        
-        return False
+        """Check if we should use fallback service (the OpenAI circuit is open)"""
+        return openai_breaker.is_open()
 
     def get_service_status(self) -> Dict:
         """Get the current status of the AI service"""
-        import time
+        breaker = openai_breaker.snapshot()
         return {
             "api_key_configured": bool(self.api_key and self.api_key != 'your-openai-api-key-here'),
-            "quota_exceeded": self.quota_exceeded,
+            "quota_exceeded": breaker.get('last_error') == QUOTA and breaker['state'] != CLOSED,
             "using_fallback": self._should_use_fallback(),
-            "last_quota_check": self.last_quota_check,
-            "time_since_quota_check": time.time() - self.last_quota_check if self.last_quota_check > 0 else 0
+            "circuit_breaker": breaker,
+            "suggestion_bank": suggestion_bank.status()
         }
 
     def enhance_job_description(self, job_description: str, profession: str = "General") -> str:
@@ -104,7 +92,7 @@ Please enhance this job description by:
 
 Return only the enhanced job description without any additional commentary."""
 
-            response = openai.ChatCompletion.create(
+            response = self._chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an expert job description enhancer with extensive experience in HR and recruitment."},
@@ -160,26 +148,13 @@ Return only the enhanced job description without any additional commentary."""
             Return only the enhanced bullet points, one per line, starting with "- ".
             """
             
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=500,
-                    temperature=0.7
-                )
-                enhanced_text = response.choices[0].message.content.strip()
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=500,
-                    temperature=0.7
-                )
-                enhanced_text = response.choices[0].message.content.strip()
+            response = self._chat_completion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=500,
+                temperature=0.7
+            )
+            enhanced_text = response.choices[0].message.content.strip()
             enhanced_points = [line.strip()[2:] for line in enhanced_text.split('\n') if line.strip().startswith('- ')]
             
             return enhanced_points if enhanced_points else bullet_points
@@ -217,93 +192,64 @@ Return only the enhanced job description without any additional commentary."""
             Make it concise (2-3 sentences), professional, and highlight key achievements.
             """
             
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=200,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content.strip()
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=200,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content.strip()
-            
+            response = self._chat_completion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=200,
+                temperature=0.7
+            )
+            return response.choices[0].message.content.strip()
         except Exception as e:
-            print(f"Error generating summary: {e}")
+            logger.error(f"Error generating summary: {e}")
             return "Experienced professional with strong technical skills and proven track record."
 
     def analyze_skills_gap(self, resume_data: Dict, job_description: str) -> Dict:
         """Analyze skills gap between resume and job description"""
         try:
-            skills = [s.get('name', '') for s in resume_data.get('skills', [])]
-            experience = resume_data.get('workExperience', [])
-            
-            prompt = f"""
-            Analyze the skills gap between this resume and job description.
-            
-            Resume skills: {', '.join(skills)}
-            Job description: {job_description}
-            
-            Return a JSON object with:
-            - missing_skills: list of important skills from job description not in resume
-            - recommendations: list of actionable recommendations
-            - strengths: list of strong skills the candidate has
-            - highlight_suggestions: list of suggestions to better highlight existing skills
-            """
-            
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=400,
-                    temperature=0.5
-                )
-                content = response.choices[0].message.content.strip()
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=400,
-                    temperature=0.5
-                )
-                content = response.choices[0].message.content.strip()
-            
-            # Fallback to structured response
+            features = jd_feature_store.features(job_description)
+            skills = [s.get('name', '') if isinstance(s, dict) else str(s) for s in resume_data.get('skills', [])]
+            listed = normalize('\n'.join(skills))
+            evidence = normalize(json.dumps([resume_data.get(key) for key in
+                                             ('summary', 'professionalSummary', 'workExperience', 'projects')],
+                                            ensure_ascii=False))
+            wanted = features['skills'] + features['tools'] + features['certifications']
+            preferred = set(features['preferred'])
+            ranked = [name for name in wanted if name not in preferred] + features['preferred']
+            strengths = [name for name in ranked + features['soft_skills']
+                         if mentioned(name, listed) or mentioned(name, evidence)]
+            missing_skills = [name for name in ranked if name not in strengths]
+
+            recommendations = []
+            required_missing = [name for name in missing_skills if name not in preferred]
+            if required_missing:
+                recommendations.append(f"Add evidence of {', '.join(required_missing[:3])} if you have used them")
+            if features['experience']:
+                recommendations.append(
+                    f"Make your {features['experience']['years']}+ years of relevant experience easy to find")
+            if features['education']:
+                recommendations.append(f"List your {features['education']['level']} qualification clearly")
+            for cert in features['certifications']:
+                if cert in missing_skills:
+                    recommendations.append(f"Consider obtaining {cert} or mention progress towards it")
+            if not missing_skills:
+                recommendations.append("Your skills cover this posting; lead with measurable results")
+
+            highlight_suggestions = []
+            for name in strengths:
+                if not mentioned(name, listed):
+                    highlight_suggestions.append(f"Add {name} to your skills section")
+                elif not mentioned(name, evidence):
+                    highlight_suggestions.append(f"Show where you used {name} in your experience")
+
             return {
-                "missing_skills": ["Docker", "Kubernetes", "CI/CD"],
-                "recommendations": [
-                    "Add experience with containerization technologies",
-                    "Highlight any DevOps experience",
-                    "Consider obtaining cloud certifications"
-                ],
-                "strengths": [
-                    "Strong programming background",
-                    "Team leadership experience",
-                    "Cloud platform knowledge"
-                ],
-                "highlight_suggestions": [
-                    "Emphasize cloud-based projects",
-                    "Quantify team size and project impact",
-                    "Add specific AWS services used"
-                ]
+                "missing_skills": missing_skills,
+                "recommendations": recommendations[:5],
+                "strengths": strengths,
+                "highlight_suggestions": highlight_suggestions[:5]
             }
             
         except Exception as e:
-            print(f"Error analyzing skills gap: {e}")
+            logger.error(f"Error analyzing skills gap: {e}")
             return {
                 "missing_skills": [],
                 "recommendations": ["Unable to analyze skills gap"],
@@ -349,66 +295,16 @@ Return only the enhanced job description without any additional commentary."""
             return optimized
             
         except Exception as e:
-            print(f"Error optimizing for ATS: {e}")
+            logger.error(f"Error optimizing for ATS: {e}")
             return resume_data
 
     def extract_keywords(self, job_description: str) -> Dict[str, List[str]]:
         """Extract keywords from job description"""
         try:
-            prompt = f"""
-            Extract keywords from this job description and categorize them:
-            
-            Job Description:
-            {job_description}
-            
-            Return a JSON object with:
-            - technical_skills: programming languages, frameworks, tools
-            - soft_skills: communication, leadership, teamwork
-            - certifications: any mentioned certifications
-            - experience_level: junior, mid, senior, etc.
-            """
-            
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=300,
-                    temperature=0.3
-                )
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=300,
-                    temperature=0.3
-                )
-            
-            # Fallback to basic extraction
-            return {
-                "technical_skills": [
-                    "Python",
-                    "JavaScript",
-                    "React",
-                    "Node.js",
-                    "AWS",
-                    "CI/CD"
-                ],
-                "soft_skills": [
-                    "Communication",
-                    "Leadership",
-                    "Problem Solving",
-                    "Teamwork"
-                ],
-                "certifications": [],
-                "experience_level": "Mid-level"
-            }
+            return keyword_categories(jd_feature_store.features(job_description))
             
         except Exception as e:
-            print(f"Error extracting keywords: {e}")
+            logger.error(f"Error extracting keywords: {e}")
             return {
                 "technical_skills": [],
                 "soft_skills": [],
@@ -444,11 +340,18 @@ Return only the enhanced job description without any additional commentary."""
             return suggestions if suggestions else ["Resume looks good! Consider adding more specific metrics to achievements."]
             
         except Exception as e:
-            print(f"Error suggesting improvements: {e}")
+            logger.error(f"Error suggesting improvements: {e}")
             return ["Unable to analyze resume for improvements"]
 
     def get_francisca_suggestions(self, profession: str, field_type: str) -> List[str]:
         """Get profession-specific suggestions for Francisca template fields"""
+        banked = suggestion_bank.lookup(profession, field_type)
+        if banked is not None:
+            return banked
+        return self.generate_francisca_suggestions(profession, field_type)
+
+    def generate_francisca_suggestions(self, profession: str, field_type: str) -> List[str]:
+        """Generate suggestions with OpenAI (used by the suggestion bank job and for combinations it lacks)"""
         try:
             # Check if we should use fallback
             if self._should_use_fallback():
@@ -481,33 +384,16 @@ Return only the enhanced job description without any additional commentary."""
             5. ATS-friendly
             """
             
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=400,
-                    temperature=0.7
-                )
-                suggestions_text = response.choices[0].message.content.strip()
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=400,
-                    temperature=0.7
-                )
-                suggestions_text = response.choices[0].message.content.strip()
-            
+            response = self._chat_completion(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=400,
+                temperature=0.7
+            )
+            suggestions_text = response.choices[0].message.content.strip()
             # Parse suggestions into a list
             suggestions = [line.strip()[2:] for line in suggestions_text.split('\n') if line.strip().startswith('- ')]
             
@@ -567,17 +453,12 @@ Return only the enhanced job description without any additional commentary."""
                 # Re-raise if it's not an OpenAI error we can handle
                 raise e
 
-    def generate_francisca_content(self, prompt: str, field_type: str, context: str = None) -> str:
-        """Generate content for Francisca template fields based on user prompts"""
-        try:
-            # Check if we should use fallback
-            if self._should_use_fallback():
-                return fallback_ai_service.generate_francisca_content(prompt, field_type, context)
-            
-            system_prompt = f"""You are an expert resume writer specializing in {field_type} content generation.
+    def _francisca_content_prompts(self, prompt: str, field_type: str, context: str = None) -> tuple:
+        """System and user prompts for Francisca field content generation"""
+        system_prompt = f"""You are an expert resume writer specializing in {field_type} content generation.
             Create compelling, professional content that is optimized for ATS systems."""
-            
-            full_prompt = f"""
+        
+        full_prompt = f"""
             Generate content for a {field_type} field based on this prompt:
             
             User Prompt: {prompt}
@@ -592,34 +473,27 @@ Return only the enhanced job description without any additional commentary."""
             4. Action-oriented
             5. Quantified where appropriate
             """
+        return system_prompt, full_prompt
+
+    def generate_francisca_content(self, prompt: str, field_type: str, context: str = None) -> str:
+        """Generate content for Francisca template fields based on user prompts"""
+        try:
+            # Check if we should use fallback
+            if self._should_use_fallback():
+                return fallback_ai_service.generate_francisca_content(prompt, field_type, context)
             
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": full_prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content.strip()
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": full_prompt}
-                    ],
-                    max_tokens=300,
-                    temperature=0.7
-                )
-                return response.choices[0].message.content.strip()
-                
+            system_prompt, full_prompt = self._francisca_content_prompts(prompt, field_type, context)
+            
+            response = self._chat_completion(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": full_prompt}
+                ],
+                max_tokens=300,
+                temperature=0.7
+            )
+            return response.choices[0].message.content.strip()
         except Exception as e:
             if self._handle_openai_error(e, "generate_francisca_content"):
                 return fallback_ai_service.generate_francisca_content(prompt, field_type, context)
@@ -627,6 +501,41 @@ Return only the enhanced job description without any additional commentary."""
                 # Re-raise if it's not an OpenAI error we can handle
                 raise e
 
+    def _ats_field_prompts(self, content: str, field_type: str, profession: str = None) -> tuple:
+        """System and user prompts for ATS-focused field enhancement"""
+        system_prompt = f"""You are an expert ATS (Applicant Tracking System) optimization specialist.
+        Your task is to enhance resume content to maximize ATS compatibility while maintaining professional quality.
+        
+        Focus on:
+        1. ATS-friendly formatting and structure
+        2. Industry-specific keywords and terminology
+        3. Quantifiable achievements and metrics
+        4. Standard section headers and formatting
+        5. Keyword density optimization
+        6. Action verbs and power words
+        7. Professional tone and clarity"""
+        
+        full_prompt = f"""
+        Enhance this {field_type} content for maximum ATS compatibility:
+        
+        Original Content: {content}
+        Field Type: {field_type}
+        Profession: {profession if profession else 'General'}
+        
+        ATS Optimization Requirements:
+        1. Use industry-standard keywords and terminology
+        2. Include quantifiable achievements (numbers, percentages, metrics)
+        3. Use strong action verbs (achieved, implemented, developed, etc.)
+        4. Ensure ATS-friendly formatting (no special characters, standard fonts)
+        5. Optimize keyword density (2-3% for technical terms)
+        6. Use standard section headers and bullet points
+        7. Maintain professional tone and clarity
+        8. Include relevant industry buzzwords
+        
+        Return only the enhanced content, no explanations or additional text.
+        """
+        return system_prompt, full_prompt
+
     def enhance_field_ats_compliance(self, content: str, field_type: str, profession: str = None) -> str:
         """Enhance a specific field with ATS compliance focus"""
         try:
@@ -634,65 +543,18 @@ Return only the enhanced job description without any additional commentary."""
             if self._should_use_fallback():
                 return self._fallback_ats_enhancement(content, field_type, profession)
             
-            system_prompt = f"""You are an expert ATS (Applicant Tracking System) optimization specialist.
-            Your task is to enhance resume content to maximize ATS compatibility while maintaining professional quality.
-            
-            Focus on:
-            1. ATS-friendly formatting and structure
-            2. Industry-specific keywords and terminology
-            3. Quantifiable achievements and metrics
-            4. Standard section headers and formatting
-            5. Keyword density optimization
-            6. Action verbs and power words
-            7. Professional tone and clarity"""
-            
-            full_prompt = f"""
-            Enhance this {field_type} content for maximum ATS compatibility:
-            
-            Original Content: {content}
-            Field Type: {field_type}
-            Profession: {profession if profession else 'General'}
-            
-            ATS Optimization Requirements:
-            1. Use industry-standard keywords and terminology
-            2. Include quantifiable achievements (numbers, percentages, metrics)
-            3. Use strong action verbs (achieved, implemented, developed, etc.)
-            4. Ensure ATS-friendly formatting (no special characters, standard fonts)
-            5. Optimize keyword density (2-3% for technical terms)
-            6. Use standard section headers and bullet points
-            7. Maintain professional tone and clarity
-            8. Include relevant industry buzzwords
-            
-            Return only the enhanced content, no explanations or additional text.
-            """
+            system_prompt, full_prompt = self._ats_field_prompts(content, field_type, profession)
             
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": full_prompt}
-                    ],
-                    max_tokens=400,
-                    temperature=0.6
-                )
-                return response.choices[0].message.content.strip()
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": full_prompt}
-                    ],
-                    max_tokens=400,
-                    temperature=0.6
-                )
-                return response.choices[0].message.content.strip()
-                
+            response = self._chat_completion(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": full_prompt}
+                ],
+                max_tokens=400,
+                temperature=0.6
+            )
+            return response.choices[0].message.content.strip()
         except Exception as e:
             if self._handle_openai_error(e, "enhance_field_ats_compliance"):
                 return self._fallback_ats_enhancement(content, field_type, profession)
@@ -700,98 +562,42 @@ Return only the enhanced job description without any additional commentary."""
                 raise e
 
     def enhance_document_ats_compliance(self, resume_data: Dict, profession: str, job_title: str) -> Dict:
-        """Enhance entire document for ATS compliance"""
-        try:
-            # Check if we should use fallback
-            if self._should_use_fallback():
-                return self._fallback_document_ats_enhancement(resume_data, profession, job_title)
-            
-            system_prompt = f"""You are an expert ATS (Applicant Tracking System) optimization specialist.
-            Your task is to enhance an entire resume document to maximize ATS compatibility.
-            
-            Focus on:
-            1. ATS-friendly formatting throughout the document
-            2. Industry-specific keywords and terminology
-            3. Quantifiable achievements and metrics
-            4. Standard section headers and structure
-            5. Keyword density optimization
-            6. Contact information standardization
-            7. Professional tone and clarity
-            8. ATS parsing optimization"""
-            
-            full_prompt = f"""
-            Enhance this resume document for maximum ATS compatibility:
-            
-            Resume Data: {resume_data}
-            Target Profession: {profession}
-            Target Job Title: {job_title}
-            
-            ATS Optimization Requirements:
-            1. Use industry-standard keywords throughout
-            2. Include quantifiable achievements in all sections
-            3. Use strong action verbs consistently
-            4. Ensure ATS-friendly formatting (no special characters, standard fonts)
-            5. Optimize keyword density (2-3% for technical terms)
-            6. Use standard section headers and bullet points
-            7. Standardize contact information format
-            8. Maintain professional tone and clarity
-            9. Include relevant industry buzzwords
-            10. Ensure proper section ordering and structure
-            
-            Return the enhanced resume data in the same JSON format as the input.
-            """
-            
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": full_prompt}
-                    ],
-                    max_tokens=2000,
-                    temperature=0.6
-                )
-                enhanced_content = response.choices[0].message.content.strip()
-                
-                # Try to parse the JSON response
-                import json
-                try:
-                    enhanced_data = json.loads(enhanced_content)
-                    return enhanced_data
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, return the original data with enhanced content
-                    return resume_data
-                    
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": full_prompt}
-                    ],
-                    max_tokens=2000,
-                    temperature=0.6
-                )
-                enhanced_content = response.choices[0].message.content.strip()
-                
-                # Try to parse the JSON response
-                import json
-                try:
-                    enhanced_data = json.loads(enhanced_content)
-                    return enhanced_data
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, return the original data with enhanced content
-                    return resume_data
-                
-        except Exception as e:
-            if self._handle_openai_error(e, "enhance_document_ats_compliance"):
-                return self._fallback_document_ats_enhancement(resume_data, profession, job_title)
-            else:
-                raise e
+        """Enhance entire document for ATS compliance (changed fields only, in one batched request)"""
+        from document_enhancer import document_enhancer
+        return document_enhancer.enhance(resume_data, profession, job_title)['enhanced_data']
+
+    def enhance_fields_ats_batch(self, fields: Dict[str, tuple], profession: str = None,
+                                 job_title: str = None) -> Dict[str, str]:
+        """
+        Enhance several resume fields for ATS compliance with one request.
+        `fields` maps a path to (field_type, content); returns path -> enhanced
+        text as the model sent it (DocumentEnhancer validates each value).
+        """
+        system_prompt = f"""You are an expert ATS (Applicant Tracking System) optimization specialist.
+        Rewrite each resume field for maximum ATS compatibility: industry-standard keywords, strong action verbs,
+        quantifiable results where the original supports them, plain formatting without special characters.
+        Keep every fact, name and number of the original. Reply with one JSON object mapping every path to its
+        rewritten text (a string), and nothing else."""
+        request = {path: {"type": kind, "text": content} for path, (kind, content) in fields.items()}
+        user_prompt = (f"Profession: {profession or 'General'}\nTarget job title: {job_title or 'Not specified'}\n"
+                       f"Fields: {json.dumps(request, ensure_ascii=False, separators=(',', ':'))}")
+        response = self._chat_completion(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=min(3000, 100 + sum(len(content) for _, content in fields.values()) * 2 // 4),
+            temperature=0.6
+        )
+        reply = response.choices[0].message.content.strip()
+        start, end = reply.find('{'), reply.rfind('}')
+        if start < 0 or end < start:
+            raise ValueError("no JSON object in reply")
+        enhanced = json.loads(reply[start:end + 1])
+        if not isinstance(enhanced, dict):
+            raise ValueError("reply is not a JSON object")
+        return enhanced
 
     def calculate_ats_compliance_score(self, content: str, field_type: str, profession: str = None) -> int:
         """Calculate ATS compliance score for a field"""
@@ -838,7 +644,7 @@ Return only the enhanced job description without any additional commentary."""
             return min(score, 100)  # Cap at 100
             
         except Exception as e:
-            print(f"Error calculating ATS score: {e}")
+            logger.error(f"Error calculating ATS score: {e}")
             return 50  # Default score
 
     def calculate_overall_ats_score(self, resume_data: Dict) -> int:
@@ -869,7 +675,7 @@ Return only the enhanced job description without any additional commentary."""
             return min(total_score // field_count, 100)
             
         except Exception as e:
-            print(f"Error calculating overall ATS score: {e}")
+            logger.error(f"Error calculating overall ATS score: {e}")
             return 50
 
     def _fallback_ats_enhancement(self, content: str, field_type: str, profession: str = None) -> str:
@@ -923,33 +729,16 @@ Return only the enhanced job description without any additional commentary."""
             }}
             """
             
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=400,
-                    temperature=0.5
-                )
-                analysis_text = response.choices[0].message.content.strip()
-            except ImportError:
-                # Fallback to older API format
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=400,
-                    temperature=0.5
-                )
-                analysis_text = response.choices[0].message.content.strip()
-            
+            response = self._chat_completion(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=400,
+                temperature=0.5
+            )
+            analysis_text = response.choices[0].message.content.strip()
             # Try to parse JSON response
             try:
                 import json
@@ -971,7 +760,7 @@ Return only the enhanced job description without any additional commentary."""
                 }
                 
         except Exception as e:
-            print(f"Error analyzing Francisca context: {e}")
+            logger.error(f"Error analyzing Francisca context: {e}")
             return {
                 "strengths": ["Content provided"],
                 "weaknesses": ["Analysis failed"],
@@ -1058,40 +847,17 @@ Return only the enhanced job description without any additional commentary."""
             
             generated_data = {}
             
-            # Use the newer OpenAI API format
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=1500,
-                    temperature=0.7
-                )
-                generated_data = response.choices[0].message.content.strip()
-                print(f"OpenAI API response for auto-fill: {generated_data}")
-            except ImportError:
-                # Fallback to older API format
-                try:
-                    response = openai.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=1500,
-                        temperature=0.7
-                    )
-                    generated_data = response.choices[0].message.content.strip()
-                    print(f"OpenAI API response (legacy) for auto-fill: {generated_data}")
-                except Exception as api_error:
-                    print(f"OpenAI API error for auto-fill: {api_error}")
-                    # Provide intelligent fallback data
-                    generated_data = self._generate_fallback_resume_data(conversation_data, profession)
-            
+            response = self._chat_completion(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1500,
+                temperature=0.7
+            )
+            generated_data = response.choices[0].message.content.strip()
+            logger.debug("OpenAI API response for auto-fill: %s", generated_data)
             # Parse the JSON response
             try:
                 if isinstance(generated_data, str):
@@ -1101,11 +867,11 @@ Return only the enhanced job description without any additional commentary."""
                 else:
                     return generated_data
             except json.JSONDecodeError:
-                print("Failed to parse AI response as JSON, using fallback")
+                logger.warning("Failed to parse AI response as JSON, using fallback")
                 return self._generate_fallback_resume_data(conversation_data, profession)
                 
         except Exception as e:
-            print(f"Error generating resume from conversation: {e}")
+            logger.error(f"Error generating resume from conversation: {e}")
             return self._generate_fallback_resume_data(conversation_data, profession)
 
     def _format_conversation_for_ai(self, conversation_data: Dict) -> str:
@@ -1191,27 +957,23 @@ Return only the enhanced job description without any additional commentary."""
         
         return fallback_data
 
-    def enhance_paragraph(self, content: str, enhancement_type: str, job_title: str = "", 
-                         company_name: str = "", job_description: str = "", 
-                         tone: str = "professional", industry: str = "General") -> tuple[str, list[str]]:
-        """Enhance individual paragraph using AI"""
-        try:
-            if not self.api_key or self.api_key == 'your-openai-api-key-here':
-                return self._fallback_paragraph_enhancement(content, enhancement_type), []
-            
-            # Create enhancement-specific prompts
-            enhancement_prompts = {
-                'professional': f"Make this paragraph more professional and formal while maintaining its meaning:",
-                'quantify': f"Add specific numbers, percentages, or quantifiable results to strengthen this paragraph:",
-                'clarity': f"Improve the clarity and impact of this paragraph while keeping it concise:",
-                'ats': f"Optimize this paragraph for ATS (Applicant Tracking System) by including relevant keywords from the job description:",
-                'tone': f"Adjust the tone of this paragraph to be more {tone} while maintaining professionalism:",
-                'rewrite': f"Completely rewrite this paragraph to be more compelling and impactful:"
-            }
-            
-            base_prompt = enhancement_prompts.get(enhancement_type, enhancement_prompts['professional'])
-            
-            prompt = f"""You are an expert cover letter writer. {base_prompt}
+    def _paragraph_prompt(self, content: str, enhancement_type: str, job_title: str = "",
+                          company_name: str = "", job_description: str = "",
+                          tone: str = "professional", industry: str = "General") -> str:
+        """User prompt for paragraph enhancement (ENHANCED_PARAGRAPH / SUGGESTIONS format)"""
+        # Create enhancement-specific prompts
+        enhancement_prompts = {
+            'professional': f"Make this paragraph more professional and formal while maintaining its meaning:",
+            'quantify': f"Add specific numbers, percentages, or quantifiable results to strengthen this paragraph:",
+            'clarity': f"Improve the clarity and impact of this paragraph while keeping it concise:",
+            'ats': f"Optimize this paragraph for ATS (Applicant Tracking System) by including relevant keywords from the job description:",
+            'tone': f"Adjust the tone of this paragraph to be more {tone} while maintaining professionalism:",
+            'rewrite': f"Completely rewrite this paragraph to be more compelling and impactful:"
+        }
+        
+        base_prompt = enhancement_prompts.get(enhancement_type, enhancement_prompts['professional'])
+        
+        return f"""You are an expert cover letter writer. {base_prompt}
 
 Job Title: {job_title}
 Company: {company_name}
@@ -1232,10 +994,35 @@ Return your response in this format:
 ENHANCED_PARAGRAPH: [enhanced paragraph here]
 SUGGESTIONS: [suggestion 1, suggestion 2, suggestion 3, etc.]"""
 
-            response = openai.ChatCompletion.create(
+    def parse_paragraph_result(self, result: str, content: str) -> tuple[str, list[str]]:
+        """Split an ENHANCED_PARAGRAPH / SUGGESTIONS completion into its parts"""
+        enhanced_content = content  # fallback
+        suggestions = []
+        
+        if "ENHANCED_PARAGRAPH:" in result:
+            enhanced_content = result.split("ENHANCED_PARAGRAPH:")[1].split("SUGGESTIONS:")[0].strip()
+        
+        if "SUGGESTIONS:" in result:
+            suggestions_text = result.split("SUGGESTIONS:")[1].strip()
+            suggestions = [s.strip() for s in suggestions_text.split(',') if s.strip()]
+        
+        return enhanced_content, suggestions
+
+    def enhance_paragraph(self, content: str, enhancement_type: str, job_title: str = "", 
+                         company_name: str = "", job_description: str = "", 
+                         tone: str = "professional", industry: str = "General") -> tuple[str, list[str]]:
+        """Enhance individual paragraph using AI"""
+        try:
+            if not self.api_key or self.api_key == 'your-openai-api-key-here':
+                return self._fallback_paragraph_enhancement(content, enhancement_type), []
+            
+            prompt = self._paragraph_prompt(content, enhancement_type, job_title, company_name,
+                                            job_description, tone, industry)
+
+            response = self._chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "You are an expert cover letter writer with extensive experience in HR and recruitment. You help job seekers create compelling, professional cover letters that stand out to employers."},
+                    {"role": "system", "content": PARAGRAPH_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=800,
@@ -1243,19 +1030,7 @@ SUGGESTIONS: [suggestion 1, suggestion 2, suggestion 3, etc.]"""
             )
             
             result = response.choices[0].message.content.strip()
-            
-            # Parse the response
-            enhanced_content = content  # fallback
-            suggestions = []
-            
-            if "ENHANCED_PARAGRAPH:" in result:
-                enhanced_content = result.split("ENHANCED_PARAGRAPH:")[1].split("SUGGESTIONS:")[0].strip()
-            
-            if "SUGGESTIONS:" in result:
-                suggestions_text = result.split("SUGGESTIONS:")[1].strip()
-                suggestions = [s.strip() for s in suggestions_text.split(',') if s.strip()]
-            
-            return enhanced_content, suggestions
+            return self.parse_paragraph_result(result, content)
             
         except Exception as e:
             if self._handle_openai_error(e, "paragraph enhancement"):
@@ -1296,7 +1071,7 @@ Provide 5 specific suggestions that will help improve this paragraph. Each sugge
 
 Return only the suggestions, one per line, without numbering or bullet points."""
 
-            response = openai.ChatCompletion.create(
+            response = self._chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an expert cover letter writer providing specific, actionable advice to job seekers."},
@@ -1317,6 +1092,52 @@ Return only the suggestions, one per line, without numbering or bullet points.""
             else:
                 raise e
 
+    # ----- streaming variants (token by token, same prompts and fallbacks) -----
+
+    def _stream_with_fallback(self, messages: List[Dict[str, str]], max_tokens: int,
+                              temperature: float, operation: str, fallback) -> Iterator[str]:
+        """Relay completion tokens, falling back to the non-AI content like the blocking methods"""
+        if self._should_use_fallback():
+            return iter([fallback()])
+        return stream_with_fallback(
+            self.stream_client, messages, fallback,
+            on_error=lambda e: self._handle_openai_error(e, operation), breaker=openai_breaker,
+            max_tokens=max_tokens, temperature=temperature
+        )
+
+    def stream_francisca_content(self, prompt: str, field_type: str, context: str = None) -> Iterator[str]:
+        """Streaming version of generate_francisca_content"""
+        system_prompt, full_prompt = self._francisca_content_prompts(prompt, field_type, context)
+        return self._stream_with_fallback(
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": full_prompt}],
+            300, 0.7, "stream_francisca_content",
+            lambda: fallback_ai_service.generate_francisca_content(prompt, field_type, context)
+        )
+
+    def stream_field_ats_compliance(self, content: str, field_type: str, profession: str = None) -> Iterator[str]:
+        """Streaming version of enhance_field_ats_compliance"""
+        system_prompt, full_prompt = self._ats_field_prompts(content, field_type, profession)
+        return self._stream_with_fallback(
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": full_prompt}],
+            400, 0.6, "stream_field_ats_compliance",
+            lambda: self._fallback_ats_enhancement(content, field_type, profession)
+        )
+
+    def stream_paragraph(self, content: str, enhancement_type: str, job_title: str = "",
+                         company_name: str = "", job_description: str = "",
+                         tone: str = "professional", industry: str = "General") -> Iterator[str]:
+        """
+        Streaming version of enhance_paragraph. Yields the raw completion
+        (ENHANCED_PARAGRAPH / SUGGESTIONS format); use parse_paragraph_result on the full text.
+        """
+        prompt = self._paragraph_prompt(content, enhancement_type, job_title, company_name,
+                                        job_description, tone, industry)
+        return self._stream_with_fallback(
+            [{"role": "system", "content": PARAGRAPH_SYSTEM_PROMPT}, {"role": "user", "content": prompt}],
+            800, 0.7, "stream_paragraph",
+            lambda: f"ENHANCED_PARAGRAPH: {self._fallback_paragraph_enhancement(content, enhancement_type)}"
+        )
+
     def _fallback_paragraph_enhancement(self, content: str, enhancement_type: str) -> str:
         """Fallback paragraph enhancement when AI is unavailable"""
         enhanced = content.strip()
@@ -6,63 +6,51 @@ Provides intelligent suggestions and enhancements during the resume building pro
 from typing import Dict, List, Optional, Any
 import openai
 import os
+import json
+import logging
 from dotenv import load_dotenv
 from fallback_ai_service import fallback_ai_service
+from circuit_breaker import CircuitOpenError, classify_error, openai_breaker
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv('.env')
 
+
+def _parse_json_object(text: str) -> Dict[str, Any]:
+    """The JSON object in a model reply (tolerates a ```json fence or surrounding prose)"""
+    start, end = text.find('{'), text.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in reply")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("reply is not a JSON object")
+    return data
+
+
 class FranciscaEnhancedAI:
     def __init__(self):
         """Initialize the enhanced AI service"""
         self.api_key = os.getenv('OPENAI_API_KEY', 'your-openai-api-key-here')
         openai.api_key = self.api_key
-        self.quota_exceeded = False
-        self.last_quota_check = 0
-        print(f"✅ Francisca Enhanced AI service initialized with API key: {self.api_key[:10]}..." if self.api_key and self.api_key != 'your-openai-api-key-here' else "⚠️ Francisca Enhanced AI service initialized with default/empty API key")
+        if self.api_key and self.api_key != 'your-openai-api-key-here':
+            logger.info("Francisca Enhanced AI service initialized")
+        else:
+            logger.warning("Francisca Enhanced AI service initialized with default/empty API key")
     
     def _handle_openai_error(self, error: Exception, operation: str) -> bool:
-        """Handle OpenAI API errors and determine if fallback should be used"""
-        import time
-        
-        error_str = str(error).lower()
-        
-        # Check for quota exceeded error
-        if 'quota' in error_str or 'billing' in error_str or 'exceeded' in error_str:
-            self.quota_exceeded = True
-            self.last_quota_check = time.time()
-            print(f"🚫 OpenAI quota exceeded for {operation}. Using fallback service.")
-            return True
-        
-        # Check for rate limiting
-        elif 'rate limit' in error_str or 'too many requests' in error_str:
-            print(f"⏳ OpenAI rate limit hit for {operation}. Using fallback service.")
-            return True
-        
-        # Check for authentication errors
-        elif 'unauthorized' in error_str or 'invalid api key' in error_str:
-            print(f"🔑 OpenAI authentication failed for {operation}. Using fallback service.")
-            return True
-        
-        # For other errors, log and use fallback
-        else:
-            print(f"❌ OpenAI error for {operation}: {error}. Using fallback service.")
+        """Log an OpenAI failure and determine if fallback should be used"""
+        if isinstance(error, CircuitOpenError):
+            logger.debug(f"{error}; using fallback service for {operation}")
             return True
+        kind = classify_error(error)
+        logger.warning(f"OpenAI {kind} error for {operation}: {error}. Using fallback service.")
+        return True
     
     def _should_use_fallback(self) -> bool:
-        """Check if we should use fallback service"""
-        import time
-        
-        # If quota exceeded, use fallback for 1 hour
-        if self.quota_exceeded and (time.time() - self.last_quota_check) < 3600:
-            return True
-        
-        # Reset quota check if enough time has passed
-        if self.quota_exceeded and (time.time() - self.last_quota_check) >= 3600:
-            self.quota_exceeded = False
-            self.last_quota_check = time.time()
-        
-        return False
+        """Check if we should use fallback service (the OpenAI circuit is open)"""
+        return openai_breaker.is_open()
     
     def enhance_answer(self, field: str, answer: str, context: Dict = None) -> Dict:
         """Enhance a user's answer with AI suggestions"""
@@ -99,8 +87,8 @@ class FranciscaEnhancedAI:
             else:
                 raise e
     
-    def _call_openai_for_enhancement(self, field: str, answer: str, context: Dict = None) -> str:
-        """Call OpenAI API for answer enhancement"""
+    def _field_prompt(self, field: str, answer: str, context: Dict = None) -> str:
+        """Enhancement instruction for one field"""
         context = context or {}
         profession = context.get("profession", "Professional")
         experience_level = context.get("experienceLevel", "Mid Level")
@@ -133,37 +121,89 @@ class FranciscaEnhancedAI:
             "summary": f"Create compelling professional summary for {profession} with {experience_level} experience: {answer}"
         }
         
-        prompt = field_prompts.get(field, f"Enhance this {field} answer professionally: {answer}")
+        return field_prompts.get(field, f"Enhance this {field} answer professionally: {answer}")
+    
+    def _chat(self, messages: List[Dict[str, str]], max_tokens: int) -> str:
+        """One chat completion through the shared OpenAI circuit breaker"""
+        with openai_breaker.guard():
+            try:
+                from openai import OpenAI
+            except ImportError:
+                # Fallback to older API format
+                response = openai.ChatCompletion.create(
+                    model="gpt-3.5-turbo", messages=messages, max_tokens=max_tokens, temperature=0.7
+                )
+            else:
+                client = OpenAI(api_key=self.api_key)
+                response = client.chat.completions.create(
+                    model="gpt-3.5-turbo", messages=messages, max_tokens=max_tokens, temperature=0.7
+                )
+        return response.choices[0].message.content.strip()
+    
+    def _call_openai_for_enhancement(self, field: str, answer: str, context: Dict = None) -> str:
+        """Call OpenAI API for answer enhancement"""
+        context = context or {}
+        profession = context.get("profession", "Professional")
+        prompt = self._field_prompt(field, answer, context)
         
         system_prompt = f"""You are an expert resume writer specializing in {profession} roles.
         Enhance the user's answer to be more professional, clear, and impactful.
         Return only the enhanced answer, no explanations."""
         
+        return self._chat([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ], max_tokens=200)
+    
+    def enhance_answers(self, answers: Dict[str, str], context: Dict = None) -> Dict[str, Dict]:
+        """
+        Enhance several answers (e.g. one question step) with a single OpenAI
+        request. Returns the same per-field result as enhance_answer; fields the
+        model leaves out, or all of them if the call fails, use the fallback.
+        """
+        context = context or {}
+        results = {}
+        pending = {}
+        for field, answer in answers.items():
+            if not (answer or '').strip():
+                results[field] = self.enhance_answer(field, answer or '', context)
+            else:
+                pending[field] = answer
+        if not pending:
+            return results
+        if self._should_use_fallback():
+            results.update({field: self._enhance_with_fallback(field, answer, context) for field, answer in pending.items()})
+            return results
+        
+        profession = context.get("profession", "Professional")
+        system_prompt = f"""You are an expert resume writer specializing in {profession} roles.
+        Enhance each of the user's answers to be more professional, clear, and impactful.
+        Reply with one JSON object mapping every field name to its enhanced answer (a string), and nothing else."""
+        instructions = "\n".join(f"- {field}: {self._field_prompt(field, answer, context)}" for field, answer in pending.items())
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except ImportError:
-            # Fallback to older API format
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
+            reply = self._chat([
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Fields:\n{instructions}"}
+            ], max_tokens=min(2000, 100 + 200 * len(pending)))
+            enhanced = _parse_json_object(reply)
+        except Exception as e:
+            self._handle_openai_error(e, "enhance_answers")
+            enhanced = {}
+        
+        for field, answer in pending.items():
+            value = enhanced.get(field)
+            if not isinstance(value, str) or not value.strip():
+                results[field] = self._enhance_with_fallback(field, answer, context)
+                continue
+            rules = self._get_field_enhancement(field, answer, context)
+            results[field] = {
+                "enhanced": value.strip(),
+                "suggestions": rules.get("suggestions", []),
+                "quality_score": rules.get("quality_score", 0),
+                "improvements": rules.get("improvements", []),
+                "field_specific_tips": rules.get("tips", [])
+            }
+        return results
     
     def _enhance_with_fallback(self, field: str, answer: str, context: Dict = None) -> Dict:
         """Enhance answer using fallback service"""
@@ -288,6 +328,31 @@ class FranciscaEnhancedAI:
             "next_steps": self._get_next_steps(step, field)
         }
     
+    def generate_step_guidance(self, step: str, fields: List[Dict], context: Dict = None) -> Dict:
+        """Guidance for a question step before the user reaches it: tips, examples and next steps
+
+        Runs speculatively in the background, so examples come from the suggestion bank only;
+        a combination the bank lacks gets no examples rather than a live OpenAI call.
+        """
+        from suggestion_bank import suggestion_bank
+        
+        context = context or {}
+        profession = context.get("profession", "")
+        guidance = {}
+        for field in fields:
+            name = field["field"]
+            guidance[name] = {"tips": self._get_field_tips(name)}
+            # Example suggestions only help with free-text answers
+            if field.get("type") in ("textarea", "tags"):
+                guidance[name]["suggestions"] = suggestion_bank.lookup(profession, name) or []
+        
+        return {
+            "step": step,
+            "profession": profession,
+            "fields": guidance,
+            "next_steps": self._get_next_steps(step, "")
+        }
+    
     def _generate_contextual_guidance(self, step: str, field: str, user_input: str, context: Dict = None) -> str:
         """Generate contextual guidance based on the step and field"""
         context = context or {}
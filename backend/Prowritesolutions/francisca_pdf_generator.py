@@ -4,6 +4,7 @@ ATS-friendly resume formatting with exact styling from the template
 """
 
 import os
+from io import BytesIO
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch, mm
@@ -15,6 +16,9 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.fonts import addMapping
 import re
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ProfessionalFranciscaPDFGenerator:
     def __init__(self, theme_name="professional"):
@@ -795,29 +799,30 @@ class ProfessionalFranciscaPDFGenerator:
         
         return transformed_data
 
+    def generate_resume_pdf_bytes(self, resume_data):
+        """Render the resume into an in-memory buffer and return the PDF bytes (None on failure)"""
+        buffer = BytesIO()
+        if not self.generate_resume_pdf(resume_data, buffer):
+            return None
+        return buffer.getvalue()
+
     def generate_resume_pdf(self, resume_data, output_path):
-        """Generate the PDF with professional formatting"""
+        """Generate the PDF with professional formatting
+
+        output_path may be a filesystem path or any writable file-like object (e.g. BytesIO).
+        """
         try:
-            # Debug: Print the actual data structure being received
-            print("=== PDF GENERATOR DEBUG ===")
-            print("Full resume_data:", resume_data)
-            print("Interests:", resume_data.get('interests', []))
-            print("Programs:", resume_data.get('programs', []))
-            print("Skills:", resume_data.get('skills', []))
-            print("Languages:", resume_data.get('languages', []))
-            print("Education:", resume_data.get('education', []))
-            print("Work Experience:", resume_data.get('workExperience', []))
-            print("==========================")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Generating resume PDF from data: %s", resume_data)
 
             # Transform data to ensure correct format
             resume_data = self.transform_data_format(resume_data)
-            
-            print("=== AFTER TRANSFORMATION ===")
-            print("Interests after transform:", resume_data.get('interests', []))
-            print("Programs after transform:", resume_data.get('programs', []))
-            print("Skills after transform:", resume_data.get('skills', []))
-            print("Languages after transform:", resume_data.get('languages', []))
-            print("=============================")
+
+            if debug:
+                logger.debug("After transformation: interests=%s programs=%s skills=%s languages=%s",
+                             resume_data.get('interests', []), resume_data.get('programs', []),
+                             resume_data.get('skills', []), resume_data.get('languages', []))
             
             # Create document
             doc = SimpleDocTemplate(
@@ -834,66 +839,66 @@ class ProfessionalFranciscaPDFGenerator:
             
             # Header
             try:
-                print("Building header...")
+                logger.debug("Building header")
                 story.extend(self.build_header(resume_data))
             except Exception as e:
-                print(f"Error in header: {e}")
+                logger.error(f"Error in header: {e}")
                 raise
             
             # Education
             education_data = resume_data.get('education', [])
             if education_data:
                 try:
-                    print("Building education...")
+                    logger.debug("Building education")
                     story.extend(self.build_education(education_data, doc))
                 except Exception as e:
-                    print(f"Error in education: {e}")
+                    logger.error(f"Error in education: {e}")
                     raise
             
             # Experience - handle different field names
             experience_data = resume_data.get('workExperience', []) or resume_data.get('experience', [])
             if experience_data:
                 try:
-                    print("Building experience...")
+                    logger.debug("Building experience")
                     story.extend(self.build_experience(experience_data, doc))
                 except Exception as e:
-                    print(f"Error in experience: {e}")
+                    logger.error(f"Error in experience: {e}")
                     raise
             
             # Leadership
             leadership_data = resume_data.get('leadership', []) or resume_data.get('organizations', [])
             if leadership_data:
                 try:
-                    print("Building leadership...")
+                    logger.debug("Building leadership")
                     story.extend(self.build_leadership(leadership_data, doc))
                 except Exception as e:
-                    print(f"Error in leadership: {e}")
+                    logger.error(f"Error in leadership: {e}")
                     raise
             
             # Volunteer - handle different field names
             volunteer_data = resume_data.get('volunteerWork', []) or resume_data.get('volunteer', [])
             if volunteer_data:
                 try:
-                    print("Building volunteer...")
+                    logger.debug("Building volunteer")
                     story.extend(self.build_volunteer(volunteer_data, doc))
                 except Exception as e:
-                    print(f"Error in volunteer: {e}")
+                    logger.error(f"Error in volunteer: {e}")
                     raise
             
             # Skills
             try:
-                print("Building skills...")
+                logger.debug("Building skills")
                 story.extend(self.build_skills(resume_data, doc))
             except Exception as e:
-                print(f"Error in skills: {e}")
+                logger.error(f"Error in skills: {e}")
                 raise
             
             # References
             try:
-                print("Building references...")
+                logger.debug("Building references")
                 story.extend(self.build_references(resume_data, doc))
             except Exception as e:
-                print(f"Error in references: {e}")
+                logger.error(f"Error in references: {e}")
                 raise
             
             # Build PDF
@@ -902,10 +907,5 @@ class ProfessionalFranciscaPDFGenerator:
             
         except Exception as e:
             # Log error for production monitoring
-            import logging
-            logging.error(f"PDF generation failed: {e}")
-            print(f"Error generating PDF: {e}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.exception(f"PDF generation failed: {type(e).__name__}: {e}")
             return False    
\ No newline at end of file
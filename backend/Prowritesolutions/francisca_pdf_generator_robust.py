@@ -6,8 +6,12 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
 import re
 import os
+import logging
+from io import BytesIO
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class RobustFranciscaPDFGenerator:
     """Robust PDF generator that handles any data format"""
     
@@ -762,12 +766,22 @@ class RobustFranciscaPDFGenerator:
         
         return story
     
+    def generate_resume_pdf_bytes(self, resume_data):
+        """Render the resume into an in-memory buffer and return the PDF bytes (None on failure)"""
+        buffer = BytesIO()
+        if not self.generate_resume_pdf(resume_data, buffer):
+            return None
+        return buffer.getvalue()
+
     def generate_resume_pdf(self, resume_data, output_path):
-        """Generate the PDF with robust error handling"""
+        """Generate the PDF with robust error handling
+
+        output_path may be a filesystem path or any writable file-like object (e.g. BytesIO).
+        """
         try:
-            print("=== ROBUST PDF GENERATOR STARTING ===")
-            print("Input data type:", type(resume_data))
-            print("Input data keys:", list(resume_data.keys()) if isinstance(resume_data, dict) else "Not a dict")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generating resume PDF from %s with keys %s", type(resume_data).__name__,
+                             list(resume_data.keys()) if isinstance(resume_data, dict) else None)
             
             # Create document
             doc = SimpleDocTemplate(
@@ -783,55 +797,51 @@ class RobustFranciscaPDFGenerator:
             story = []
             
             # Header
-            print("Building header...")
+            logger.debug("Building header")
             story.extend(self.build_header(resume_data))
             
             # Summary
-            print("Building summary...")
+            logger.debug("Building summary")
             story.extend(self.build_summary(resume_data))
             
             # Education
             education_data = resume_data.get('education', [])
             if education_data:
-                print("Building education...")
+                logger.debug("Building education")
                 story.extend(self.build_education(education_data, doc))
             
             # Experience
             experience_data = resume_data.get('workExperience', []) or resume_data.get('experience', [])
             if experience_data:
-                print("Building experience...")
+                logger.debug("Building experience")
                 story.extend(self.build_experience(experience_data, doc))
             
             # Leadership
             leadership_data = resume_data.get('leadership', []) or resume_data.get('organizations', [])
             if leadership_data:
-                print("Building leadership...")
+                logger.debug("Building leadership")
                 story.extend(self.build_leadership(leadership_data, doc))
             
             # Volunteer
             volunteer_data = resume_data.get('volunteerWork', []) or resume_data.get('volunteer', [])
             if volunteer_data:
-                print("Building volunteer...")
+                logger.debug("Building volunteer")
                 story.extend(self.build_volunteer(volunteer_data, doc))
             
             # Skills
-            print("Building skills...")
+            logger.debug("Building skills")
             story.extend(self.build_skills(resume_data, doc))
             
             # References
-            print("Building references...")
+            logger.debug("Building references")
             story.extend(self.build_references(resume_data, doc))
             
             # Build PDF
-            print("Building PDF...")
+            logger.debug("Building PDF")
             doc.build(story)
-            print("=== PDF GENERATION SUCCESSFUL ===")
+            logger.debug("Resume PDF generated")
             return True
             
         except Exception as e:
-            print(f"=== PDF GENERATION FAILED ===")
-            print(f"Error: {e}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.exception(f"Resume PDF generation failed: {type(e).__name__}: {e}")
             return False
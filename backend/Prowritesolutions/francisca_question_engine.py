@@ -332,6 +332,31 @@ class FranciscaQuestionEngine:
             "progress": self.get_progress()
         }
     
+    def apply_enhancement(self, field: str, original: str, enhanced: str) -> bool:
+        """Store a late (batched) enhancement, unless the answer changed since it was queued"""
+        response = self.user_responses.get(field)
+        if not response or response["original"] != original:
+            return False
+        response["enhanced"] = enhanced
+        return True
+    
+    def get_step_fields(self, step_name: str) -> Dict[str, bool]:
+        """Fields of a step mapped to whether they are required"""
+        step_data = next((step for step in self.question_flow if step["step"] == step_name), None)
+        return {f["field"]: f.get("required", False) for f in step_data["fields"]} if step_data else {}
+    
+    def get_step_after(self, step_name: str) -> Optional[Dict]:
+        """The step that follows a step in the (fixed) question flow"""
+        index = next((i for i, step in enumerate(self.question_flow) if step["step"] == step_name), -1)
+        if 0 <= index < len(self.question_flow) - 1:
+            return self.question_flow[index + 1]
+        return None
+    
+    def get_field_step(self, field: str) -> Optional[str]:
+        """Name of the step that asks for a field"""
+        return next((step["step"] for step in self.question_flow
+                     if any(f["field"] == field for f in step["fields"])), None)
+    
     def get_progress(self) -> Dict:
         """Get current progress information"""
         total_steps = len(self.question_flow)
@@ -0,0 +1,568 @@
+"""
+Flask API routes for the Francisca resume schema, guided questions and resume import
+"""
+
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+import os
+from app_core import jwt_required_custom, logger
+from step_enhancer import step_enhancer, BATCH_ENHANCEMENT_DEFAULT
+from guidance_prefetcher import guidance_prefetcher
+
+STEP_SUMMARY_MAX_WAIT = 20  # seconds a step summary may wait for batched enhancement
+
+
+def _guidance_profession(context=None):
+    """Profession the next steps' guidance is tailored to"""
+    from francisca_question_engine import francisca_question_engine
+
+    if context and context.get('profession'):
+        return context['profession']
+    return francisca_question_engine.user_responses.get('profession', {}).get('original', '')
+
+francisca_bp = Blueprint('francisca', __name__)
+
+# Francisca template endpoints
+@francisca_bp.route('/api/francisca/schema', methods=['GET'])
+def get_francisca_schema():
+    """Get the Francisca template form schema"""
+    try:
+        # Return the complete Francisca template schema with all sections
+        schema = {
+            "template_name": "Francisca Resume Template",
+            "description": "Professional resume template with modern design and complete sections",
+            "style_preserved": True,
+            "fields": [
+                # Personal Information
+                { "name": "personalInfo", "label": "Personal Information", "type": "object", "required": True, "section": "personal", "fields": {
+                    "firstName": { "type": "text", "label": "First Name", "required": True, "placeholder": "Enter your first name" },
+                    "lastName": { "type": "text", "label": "Last Name", "required": True, "placeholder": "Enter your last name" },
+                    "email": { "type": "email", "label": "Email Address", "required": True, "placeholder": "your.email@example.com" },
+                    "phone": { "type": "tel", "label": "Phone Number", "required": True, "placeholder": "+1 (555) 123-4567" },
+                    "city": { "type": "text", "label": "City", "required": True, "placeholder": "Your city" },
+                    "country": { "type": "text", "label": "Country", "required": True, "placeholder": "Your country" },
+                    "linkedin": { "type": "url", "label": "LinkedIn Profile", "required": False, "placeholder": "https://linkedin.com/in/yourprofile" },
+                    "website": { "type": "url", "label": "Website/Portfolio", "required": False, "placeholder": "https://yourwebsite.com" }
+                }},
+
+                # Professional Summary
+                { "name": "summary", "label": "Professional Summary", "type": "textarea", "required": True, "section": "summary", "placeholder": "Write a compelling summary of your professional background...", "rows": 4 },
+
+                # Professional Experience
+                { "name": "workExperience", "label": "Professional Experience", "type": "array", "required": True, "section": "experience", "itemSchema": {
+                    "company": { "type": "text", "label": "Company Name", "required": True, "placeholder": "Company name" },
+                    "jobTitle": { "type": "text", "label": "Job Title", "required": True, "placeholder": "Your job title" },
+                    "location": { "type": "text", "label": "Location", "required": True, "placeholder": "City, Country" },
+                    "startDate": { "type": "text", "label": "Start Date", "required": True, "placeholder": "MM/YYYY" },
+                    "endDate": { "type": "text", "label": "End Date", "required": False, "placeholder": "MM/YYYY or Present" },
+                    "current": { "type": "checkbox", "label": "Currently Working", "required": False },
+                    "description": { "type": "textarea", "label": "Job Description", "required": True, "rows": 3, "placeholder": "Describe your responsibilities and achievements..." },
+                    "achievements": { "type": "array", "label": "Key Achievements", "required": False, "itemSchema": { "type": "text", "placeholder": "Add an achievement" } }
+                }},
+
+                # Education
+                { "name": "education", "label": "Education", "type": "array", "required": True, "section": "education", "itemSchema": {
+                    "institution": { "type": "text", "label": "Institution Name", "required": True, "placeholder": "University/College name" },
+                    "degree": { "type": "text", "label": "Degree", "required": True, "placeholder": "Bachelor's, Master's, etc." },
+                    "fieldOfStudy": { "type": "text", "label": "Field of Study", "required": True, "placeholder": "Computer Science, Business, etc." },
+                    "location": { "type": "text", "label": "Location", "required": True, "placeholder": "City, Country" },
+                    "startDate": { "type": "text", "label": "Start Date", "required": True, "placeholder": "MM/YYYY" },
+                    "endDate": { "type": "text", "label": "End Date", "required": False, "placeholder": "MM/YYYY" },
+                    "current": { "type": "checkbox", "label": "Currently Studying", "required": False },
+                    "gpa": { "type": "text", "label": "GPA (Optional)", "required": False, "placeholder": "3.8" },
+                    "relevantCoursework": { "type": "textarea", "label": "Relevant Coursework", "required": False, "placeholder": "List relevant courses..." },
+                    "activities": { "type": "textarea", "label": "Activities", "required": False, "placeholder": "Clubs, societies, activities..." }
+                }},
+
+                # Leadership/Organizations
+                { "name": "leadership", "label": "Leadership/Organizations", "type": "array", "required": False, "section": "leadership", "itemSchema": {
+                    "organization": { "type": "text", "label": "Organization Name", "required": True, "placeholder": "Organization name" },
+                    "title": { "type": "text", "label": "Position/Title", "required": True, "placeholder": "Your role/title" },
+                    "location": { "type": "text", "label": "Location", "required": False, "placeholder": "City, Country" },
+                    "startDate": { "type": "text", "label": "Start Date", "required": True, "placeholder": "MM/YYYY" },
+                    "endDate": { "type": "text", "label": "End Date", "required": False, "placeholder": "MM/YYYY or Present" },
+                    "current": { "type": "checkbox", "label": "Currently Active", "required": False },
+                    "responsibilities": { "type": "textarea", "label": "Responsibilities", "required": False, "placeholder": "Describe your responsibilities..." },
+                    "achievements": { "type": "array", "label": "Key Achievements", "required": False, "itemSchema": { "type": "text", "placeholder": "Add an achievement" } }
+                }},
+
+                # Volunteer Work
+                { "name": "volunteerWork", "label": "Volunteer Work", "type": "array", "required": False, "section": "volunteer", "itemSchema": {
+                    "organization": { "type": "text", "label": "Organization Name", "required": True, "placeholder": "Organization name" },
+                    "title": { "type": "text", "label": "Position/Title", "required": True, "placeholder": "Your role/title" },
+                    "location": { "type": "text", "label": "Location", "required": False, "placeholder": "City, Country" },
+                    "startDate": { "type": "text", "label": "Start Date", "required": True, "placeholder": "MM/YYYY" },
+                    "endDate": { "type": "text", "label": "End Date", "required": False, "placeholder": "MM/YYYY or Present" },
+                    "current": { "type": "checkbox", "label": "Currently Active", "required": False },
+                    "description": { "type": "textarea", "label": "Description", "required": False, "placeholder": "Describe your volunteer work..." }
+                }},
+
+                # Skills & Interests
+                { "name": "skills", "label": "Skills", "type": "array", "required": False, "section": "skills", "itemSchema": {
+                    "name": { "type": "text", "label": "Skill Name", "required": True, "placeholder": "Skill name" },
+                    "category": { "type": "select", "label": "Category", "required": True, "options": [
+                        {"value": "technical", "label": "Technical Skills"},
+                        {"value": "soft", "label": "Soft Skills"},
+                        {"value": "language", "label": "Languages"},
+                        {"value": "program", "label": "Programs/Tools"}
+                    ]}
+                }},
+
+                # Languages
+                { "name": "languages", "label": "Languages", "type": "array", "required": False, "section": "skills", "itemSchema": {
+                    "name": { "type": "text", "label": "Language", "required": True, "placeholder": "English, Spanish, etc." },
+                    "proficiency": { "type": "select", "label": "Proficiency", "required": True, "options": [
+                        {"value": "native", "label": "Native"},
+                        {"value": "fluent", "label": "Fluent"},
+                        {"value": "conversational", "label": "Conversational"},
+                        {"value": "basic", "label": "Basic"}
+                    ]}
+                }},
+
+                # Interests
+                { "name": "interests", "label": "Interests", "type": "array", "required": False, "section": "skills", "itemSchema": {
+                    "type": "text", "placeholder": "Add an interest"
+                }},
+
+                # Programs/Certifications
+                { "name": "programs", "label": "Programs/Certifications", "type": "array", "required": False, "section": "skills", "itemSchema": {
+                    "type": "text", "placeholder": "Add a program or certification"
+                }},
+
+                # References
+                { "name": "referees", "label": "References", "type": "array", "required": False, "section": "references", "itemSchema": {
+                    "name": { "type": "text", "label": "Name", "required": True, "placeholder": "Reference name" },
+                    "position": { "type": "text", "label": "Position", "required": True, "placeholder": "Their job title" },
+                    "organization": { "type": "text", "label": "Organization", "required": True, "placeholder": "Company/Organization" },
+                    "phone": { "type": "tel", "label": "Phone", "required": False, "placeholder": "Phone number" },
+                    "email": { "type": "email", "label": "Email", "required": False, "placeholder": "Email address" }
+                }}
+            ],
+            "sections": [
+                { "id": "personal", "title": "Personal Information", "description": "Your contact details and basic information" },
+                { "id": "summary", "title": "Professional Summary", "description": "A compelling overview of your professional background" },
+                { "id": "experience", "title": "Work Experience", "description": "Your professional work history" },
+                { "id": "education", "title": "Education", "description": "Your educational background" },
+                { "id": "leadership", "title": "Leadership/Organizations", "description": "Your leadership roles and organizational involvement" },
+                { "id": "volunteer", "title": "Volunteer Work", "description": "Your volunteer experience and community service" },
+                { "id": "skills", "title": "Skills & Interests", "description": "Your skills, languages, and interests" },
+                { "id": "references", "title": "References", "description": "Professional references" }
+            ]
+        }
+
+        return jsonify({
+            "success": True,
+            "schema": schema
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting Francisca schema: {e}")
+        return jsonify({
+            "success": False,
+            "error": "Failed to load form schema"
+        }), 500
+
+# Enhanced Francisca Question Flow API Routes
+@francisca_bp.route('/api/francisca/questions/start', methods=['POST'])
+@jwt_required_custom
+def start_francisca_questions():
+    """Start the guided question flow"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        # Reset the question flow
+        francisca_question_engine.reset_flow()
+        step_enhancer.reset(request.current_user['user_id'])
+        guidance_prefetcher.reset(request.current_user['user_id'])
+
+        # Get the first question
+        first_question = francisca_question_engine.get_current_question()
+        guidance_prefetcher.prefetch_after(request.current_user['user_id'], first_question['step'])
+
+        return jsonify({
+            'success': True,
+            'question': first_question,
+            'progress': francisca_question_engine.get_progress()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error starting question flow: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/current', methods=['GET'])
+@jwt_required_custom
+def get_current_question():
+    """Get the current question"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        current_question = francisca_question_engine.get_current_question()
+
+        return jsonify({
+            'success': True,
+            'question': guidance_prefetcher.attach(request.current_user['user_id'], current_question,
+                                                   _guidance_profession()),
+            'progress': francisca_question_engine.get_progress()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting current question: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/answer', methods=['POST'])
+@jwt_required_custom
+def submit_answer():
+    """Submit an answer and get enhancement suggestions"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+        from francisca_enhanced_ai import francisca_enhanced_ai
+
+        data = request.get_json()
+        field = data.get('field')
+        answer = data.get('answer', '')
+        context = data.get('context', {})
+
+        if not field:
+            return jsonify({
+                'success': False,
+                'error': 'Field is required'
+            }), 400
+
+        if data.get('batch', BATCH_ENHANCEMENT_DEFAULT):
+            # Keep the answer as typed; the whole step is enhanced in one request
+            # (see /api/francisca/questions/step-summary for the results)
+            result = francisca_question_engine.submit_answer(field, answer)
+            enhancement = step_enhancer.add_answer(request.current_user['user_id'], field, answer, context)
+            enhancement['batched'] = True
+        else:
+            # Get enhancement for the answer
+            enhancement = francisca_enhanced_ai.enhance_answer(field, answer, context)
+
+            # Submit the answer (use enhanced version)
+            result = francisca_question_engine.submit_answer(field, answer, enhancement['enhanced'])
+
+        # Guidance for the step after this one, while the user works on the next
+        user_id = request.current_user['user_id']
+        profession = _guidance_profession(context)
+        answered_step = francisca_question_engine.get_field_step(field)
+        guidance_prefetcher.prefetch_after(user_id, answered_step, profession)
+
+        # Get the next question
+        next_question = francisca_question_engine.get_next_question()
+        if next_question:
+            guidance_prefetcher.prefetch_after(user_id, next_question['step'], profession)
+
+        return jsonify({
+            'success': True,
+            'answer': result,
+            'enhancement': enhancement,
+            'next_question': guidance_prefetcher.attach(user_id, next_question, profession),
+            'progress': francisca_question_engine.get_progress()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error submitting answer: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/next', methods=['POST'])
+@jwt_required_custom
+def get_next_question():
+    """Get the next question"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        # Enhance the step being left while the user answers the next one
+        user_id = request.current_user['user_id']
+        step_enhancer.flush(user_id)
+
+        next_question = francisca_question_engine.get_next_question()
+        profession = _guidance_profession()
+        if next_question:
+            guidance_prefetcher.prefetch_after(user_id, next_question['step'], profession)
+
+        return jsonify({
+            'success': True,
+            'question': guidance_prefetcher.attach(user_id, next_question, profession),
+            'progress': francisca_question_engine.get_progress()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting next question: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/previous', methods=['POST'])
+@jwt_required_custom
+def get_previous_question():
+    """Get the previous question"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        previous_question = francisca_question_engine.get_previous_question()
+
+        return jsonify({
+            'success': True,
+            'question': previous_question,
+            'progress': francisca_question_engine.get_progress()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting previous question: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/jump', methods=['POST'])
+@jwt_required_custom
+def jump_to_step():
+    """Jump to a specific step"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        data = request.get_json()
+        step_name = data.get('step')
+
+        if not step_name:
+            return jsonify({
+                'success': False,
+                'error': 'Step name is required'
+            }), 400
+
+        success = francisca_question_engine.jump_to_step(step_name)
+
+        if success:
+            # Prefetches for the steps being skipped are wasted work now
+            user_id = request.current_user['user_id']
+            following = francisca_question_engine.get_step_after(step_name)
+            guidance_prefetcher.cancel(user_id, keep=[step_name] + ([following['step']] if following else []))
+            current_question = francisca_question_engine.get_current_question()
+            profession = _guidance_profession()
+            guidance_prefetcher.prefetch(user_id, following, profession)
+            return jsonify({
+                'success': True,
+                'question': guidance_prefetcher.attach(user_id, current_question, profession),
+                'progress': francisca_question_engine.get_progress()
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid step name'
+            }), 400
+
+    except Exception as e:
+        logger.error(f"Error jumping to step: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/progress', methods=['GET'])
+@jwt_required_custom
+def get_question_progress():
+    """Get the current progress"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        progress = francisca_question_engine.get_progress()
+
+        return jsonify({
+            'success': True,
+            'progress': progress
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting progress: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/resume-data', methods=['GET'])
+@jwt_required_custom
+def get_resume_data():
+    """Get the complete resume data for auto-filling"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        resume_data = francisca_question_engine.get_resume_data()
+
+        return jsonify({
+            'success': True,
+            'resume_data': resume_data,
+            'progress': francisca_question_engine.get_progress()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting resume data: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/questions/step-summary', methods=['POST'])
+@jwt_required_custom
+def get_step_summary():
+    """Get a summary of a specific step"""
+    try:
+        from francisca_question_engine import francisca_question_engine
+
+        data = request.get_json()
+        step_name = data.get('step')
+
+        if not step_name:
+            return jsonify({
+                'success': False,
+                'error': 'Step name is required'
+            }), 400
+
+        # Batched enhancement of the step, waiting up to `wait` seconds for it
+        try:
+            wait = min(float(data.get('wait', 0)), STEP_SUMMARY_MAX_WAIT)
+        except (TypeError, ValueError):
+            wait = 0.0
+        enhancement = step_enhancer.summary(request.current_user['user_id'], step_name, wait=wait)
+
+        summary = francisca_question_engine.get_step_summary(step_name)
+
+        return jsonify({
+            'success': True,
+            'summary': summary,
+            'enhancement': enhancement
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting step summary: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Resume Import and Parsing Endpoints
+@francisca_bp.route('/api/francisca/import-resume', methods=['POST'])
+@jwt_required_custom
+def import_resume():
+    """Import and parse resume file for Francisca form"""
+    try:
+        user_id = request.current_user['user_id']
+
+        if 'file' not in request.files:
+            return jsonify({
+                'success': False,
+                'error': 'No file provided'
+            }), 400
+
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({
+                'success': False,
+                'error': 'No file selected'
+            }), 400
+
+        # Validate file type
+        allowed_extensions = {'.pdf', '.doc', '.docx'}
+        file_ext = os.path.splitext(file.filename)[1].lower()
+        if file_ext not in allowed_extensions:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid file type. Please upload PDF, DOC, or DOCX files only.'
+            }), 400
+
+        # Validate file size (max 10MB)
+        file.seek(0, 2)  # Seek to end
+        file_size = file.tell()
+        file.seek(0)  # Reset to beginning
+
+        if file_size > 10 * 1024 * 1024:  # 10MB
+            return jsonify({
+                'success': False,
+                'error': 'File size too large. Please upload files smaller than 10MB.'
+            }), 400
+
+        # Create uploads directory if it doesn't exist
+        upload_dir = 'static/uploads/resumes'
+        if not os.path.exists(upload_dir):
+            os.makedirs(upload_dir)
+
+        # Generate unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{user_id}_{timestamp}_{file.filename}"
+        file_path = os.path.join(upload_dir, filename)
+
+        # Save file
+        file.save(file_path)
+
+        # Parse resume
+        from resume_parser_service import ResumeParserService
+        parser = ResumeParserService()
+
+        # Determine file type
+        file_type = 'pdf' if file_ext == '.pdf' else 'docx' if file_ext == '.docx' else 'doc'
+
+        # Parse the resume
+        parse_result = parser.parse_resume_file(file_path, file_type)
+
+        if not parse_result['success']:
+            # Clean up uploaded file
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            return jsonify({
+                'success': False,
+                'error': parse_result['error']
+            }), 500
+
+        # Map to Francisca format
+        francisca_data = parser.map_to_francisca_format(parse_result['parsed_data'])
+
+        # Generate resume ID
+        resume_id = f"resume_{timestamp}_{user_id}"
+
+        return jsonify({
+            'success': True,
+            'resume_id': resume_id,
+            'parsed_data': francisca_data,
+            'confidence': parse_result.get('confidence'),
+            'raw_text': parse_result['raw_text'],
+            'file_type': file_type,
+            'parsed_at': parse_result['parsed_at'],
+            'filename': file.filename
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error importing resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@francisca_bp.route('/api/francisca/parsed-resumes', methods=['GET'])
+@jwt_required_custom
+def get_francisca_parsed_resumes():
+    """Get all parsed resumes for the user"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # In a real implementation, this would come from the database
+        # For now, return empty list
+        return jsonify({
+            'success': True,
+            'parsed_resumes': []
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting parsed resumes: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
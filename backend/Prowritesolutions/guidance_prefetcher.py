@@ -0,0 +1,147 @@
+"""
+Guidance Prefetcher
+Speculative generation of guidance for the next guided-question step.
+
+The question flow is fixed, so after each answer we know which step comes
+next. The prefetcher generates that step's guidance
+(`FranciscaEnhancedAI.generate_step_guidance`: tips, banked example
+suggestions, next steps) on a small thread pool and keeps
+it in a per-session cache; when the user moves on, the question is returned
+with the guidance attached instead of waiting for it.
+
+Guidance is tied to the profession it was generated for and regenerated if
+that changes. Jumping to another step cancels prefetches for the steps the
+user skipped; starting a new flow drops the session. Entries are per process
+and expire after GUIDANCE_TTL seconds.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+GUIDANCE_PREFETCH_ENABLED = os.getenv('GUIDANCE_PREFETCH_ENABLED', 'true').lower() == 'true'
+GUIDANCE_PREFETCH_WORKERS = int(os.getenv('GUIDANCE_PREFETCH_WORKERS', 2))
+GUIDANCE_TTL = 1800
+
+
+class GuidancePrefetcher:
+    """Per-session cache of next-step guidance, filled in the background"""
+
+    def __init__(self, ai=None, engine=None, workers: int = GUIDANCE_PREFETCH_WORKERS,
+                 enabled: bool = GUIDANCE_PREFETCH_ENABLED):
+        self._ai = ai
+        self._engine = engine
+        self.workers = workers
+        self.enabled = enabled
+        # session -> step -> (profession, future, created_at)
+        self._sessions: Dict[Any, Dict[str, tuple]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self.stats = {'scheduled': 0, 'hits': 0, 'misses': 0, 'cancelled': 0}
+
+    @property
+    def ai(self):
+        if self._ai is None:
+            from francisca_enhanced_ai import francisca_enhanced_ai
+            self._ai = francisca_enhanced_ai
+        return self._ai
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from francisca_question_engine import francisca_question_engine
+            self._engine = francisca_question_engine
+        return self._engine
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created on first use and again in forked workers; importing starts no threads
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='guidance-prefetch')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    # ----- scheduling -----
+
+    def prefetch(self, session, step: Optional[Dict], profession: str = '') -> bool:
+        """Start generating guidance for a step unless it is cached or in flight"""
+        if not self.enabled or not step:
+            return False
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            entries = self._sessions.setdefault(session, {})
+            entry = entries.get(step['step'])
+            if entry and entry[0] == profession and not (entry[1].done() and entry[1].exception()):
+                return False
+            future = self._pool().submit(self.ai.generate_step_guidance, step['step'], step['fields'],
+                                         {'profession': profession})
+            entries[step['step']] = (profession, future, now)
+            self.stats['scheduled'] += 1
+            return True
+
+    def prefetch_after(self, session, step_name: Optional[str], profession: str = '') -> bool:
+        """Prefetch the step that follows `step_name` in the question flow"""
+        if not step_name:
+            return False
+        return self.prefetch(session, self.engine.get_step_after(step_name), profession)
+
+    def cancel(self, session, keep: Iterable[str] = ()) -> int:
+        """Drop a session's prefetches except for the `keep` steps; returns how many"""
+        keep = set(keep)
+        with self._lock:
+            entries = self._sessions.get(session, {})
+            dropped = [name for name in entries if name not in keep]
+            for name in dropped:
+                # Not started yet: never runs. Running: finishes, and the result is discarded
+                entries.pop(name)[1].cancel()
+            self.stats['cancelled'] += len(dropped)
+            return len(dropped)
+
+    def reset(self, session):
+        self.cancel(session)
+        with self._lock:
+            self._sessions.pop(session, None)
+
+    def _prune(self, now: float):
+        for session in list(self._sessions):
+            entries = self._sessions[session]
+            for name in [n for n, entry in entries.items() if now - entry[2] > GUIDANCE_TTL]:
+                entries.pop(name)[1].cancel()
+            if not entries:
+                del self._sessions[session]
+
+    # ----- lookup -----
+
+    def get(self, session, step_name: str, profession: str = '') -> Optional[Dict]:
+        """Guidance for a step if it is ready; never waits"""
+        with self._lock:
+            entry = self._sessions.get(session, {}).get(step_name)
+        if not entry or entry[0] != profession or not entry[1].done() or entry[1].cancelled():
+            self.stats['misses'] += 1
+            return None
+        try:
+            guidance = entry[1].result()
+        except Exception as e:
+            logger.warning(f"Guidance prefetch for step {step_name} failed: {e}")
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return guidance
+
+    def attach(self, session, question: Optional[Dict], profession: str = '') -> Optional[Dict]:
+        """A copy of a question step with its prefetched guidance (None while not ready)"""
+        if not question:
+            return question
+        question = dict(question)
+        question['guidance'] = self.get(session, question['step'], profession)
+        return question
+
+
+# Global instance
+guidance_prefetcher = GuidancePrefetcher()
@@ -0,0 +1,48 @@
+"""
+Gunicorn configuration for the ProWrite backend
+
+Most heavy routes (AI chat and enhancement, resume import, STK push, PDF
+download) spend their time waiting on OpenAI, Daraja, SMTP or MySQL. With plain
+sync workers every such wait pins a whole worker process, so a handful of slow
+AI calls stall the site. SERVING_MODE selects how requests are executed:
+
+    gthread (default)  WEB_WORKERS processes x WEB_THREADS threads; blocking I/O
+                       releases the GIL, so waits overlap inside a worker
+    gevent             cooperative greenlets with monkey-patched I/O,
+                       WORKER_CONNECTIONS concurrent requests per worker
+                       (requires `pip install gevent`)
+    sync               the previous one-request-per-process model
+
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+SERVING_MODE = os.getenv('SERVING_MODE', 'gthread').lower()
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_WORKERS', 4))
+timeout = int(os.getenv('WEB_TIMEOUT', 120))
+keepalive = int(os.getenv('WEB_KEEPALIVE', 5))
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('WEB_MAX_REQUESTS_JITTER', 100))
+accesslog = os.getenv('WEB_ACCESS_LOG') or None
+errorlog = os.getenv('WEB_ERROR_LOG', '-')
+
+if SERVING_MODE == 'gevent':
+    worker_class = 'gevent'
+    worker_connections = int(os.getenv('WORKER_CONNECTIONS', 200))
+elif SERVING_MODE == 'gthread':
+    worker_class = 'gthread'
+    threads = int(os.getenv('WEB_THREADS', 16))
+else:
+    worker_class = 'sync'
+
+
+def post_fork(server, worker):
+    if SERVING_MODE == 'gevent':
+        # The mysql-connector C extension blocks the event loop on every query;
+        # the pure-Python driver goes through the patched socket module instead.
+        import mysql.connector.pooling
+        mysql.connector.pooling.CMySQLConnection = None
+    server.log.info(f"Worker {worker.pid} serving in {SERVING_MODE} mode")
@@ -0,0 +1,107 @@
+"""
+HTTP Session Pool
+Shared, keep-alive `requests.Session` objects for the payment providers (M-Pesa
+Daraja, Africa's Talking). Reusing a session keeps TLS connections open between
+calls instead of paying a fresh handshake on every request.
+
+Each session mounts an HTTPAdapter with a bounded connection pool and a urllib3
+retry policy: connection failures are always retried (nothing reached the server),
+while 429/5xx responses are only retried for idempotent methods so an STK push or
+other POST is never sent twice.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 4))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 16))
+RETRY_TOTAL = int(os.getenv('HTTP_RETRY_TOTAL', 3))
+RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.5))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_pid = None
+_lock = threading.Lock()
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when the caller gives none"""
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _build_retry() -> Retry:
+    return Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=1,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def create_session(pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """Build a new pooled session with keep-alive, retries and a default timeout"""
+    session = requests.Session()
+    adapter = _TimeoutHTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        max_retries=_build_retry()
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+def get_session(name: str) -> requests.Session:
+    """
+    Return the process-wide session for a provider, creating it on first use.
+
+    Sessions are dropped after a fork so gunicorn workers never share sockets
+    inherited from the master process.
+    """
+    global _sessions_pid
+    pid = os.getpid()
+    session = _sessions.get(name)
+    if session is not None and _sessions_pid == pid:
+        return session
+
+    with _lock:
+        if _sessions_pid != pid:
+            _sessions.clear()
+            _sessions_pid = pid
+        session = _sessions.get(name)
+        if session is None:
+            session = create_session()
+            _sessions[name] = session
+            logger.info(f"Created pooled HTTP session for {name}")
+        return session
+
+
+def close_sessions():
+    """Close every pooled session (used on shutdown and in tests)"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,383 @@
+"""
+Job Description Features
+One local extraction of a job posting's requirements, shared by every service
+that scores a resume or cover letter against it.
+
+The posting is normalized (case, bullets, spacing) and hashed, so the same
+advert pasted by different users -- or analyzed again for each resume a user
+tries -- resolves to one entry. Features are:
+
+    skills / tools / soft_skills / certifications   in order of first mention
+    preferred                                        skills named only in
+                                                     "nice to have" sentences
+    experience / education / experience_level
+    industry / industry_terms
+    keywords                                         weighted keyword vector,
+                                                     {term: weight}, max 1.0
+
+Entries live in a per-process LRU in front of a small SQLite database shared
+by the workers on a host. Other per-posting results (e.g. an AI keyword
+extraction) can be stored next to the features with get_or_compute().
+"""
+
+import os
+import re
+import copy
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JD_FEATURES_DB_PATH = os.getenv('JD_FEATURES_DB', os.path.join('data', 'jd_features.db'))
+JD_FEATURES_TTL = int(os.getenv('JD_FEATURES_TTL_DAYS', 30)) * 86400
+JD_FEATURES_MEMORY_SIZE = int(os.getenv('JD_FEATURES_MEMORY_SIZE', 256))
+FEATURE_VERSION = 1         # bump when extraction changes; old entries are ignored
+KEYWORD_LIMIT = 300
+PRUNE_EVERY = 200           # writes between expiry sweeps, per process
+
+TECHNICAL_SKILLS = [
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'C#', 'C++', 'PHP', 'Ruby', 'Swift', 'Kotlin',
+    'Go', 'Rust', 'Scala', 'R', 'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI',
+    'Spring', '.NET', 'Laravel', 'HTML', 'CSS', 'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'NoSQL',
+    'Redis', 'GraphQL', 'REST APIs', 'Microservices', 'AWS', 'Azure', 'Google Cloud', 'Docker',
+    'Kubernetes', 'Terraform', 'CI/CD', 'Git', 'Linux', 'Agile', 'Scrum', 'DevOps',
+    'Machine Learning', 'Data Analysis', 'Data Science', 'Deep Learning', 'ETL', 'Spark',
+    'Pandas', 'Financial Reporting', 'Financial Analysis', 'Financial Modeling', 'Budgeting',
+    'Forecasting', 'Auditing', 'Bookkeeping', 'Payroll', 'Taxation', 'IFRS', 'GAAP',
+    'Risk Management', 'Compliance', 'SEO', 'SEM', 'Content Marketing', 'Social Media',
+    'Email Marketing', 'Digital Marketing', 'Market Research', 'Lead Generation',
+    'Account Management', 'Project Management', 'Supply Chain', 'Procurement', 'Logistics',
+    'Patient Care', 'Nursing', 'Customer Service',
+]
+TOOLS = [
+    'Excel', 'Microsoft Word', 'PowerPoint', 'Microsoft Office', 'Google Workspace', 'Photoshop',
+    'Illustrator', 'Figma', 'Canva', 'Slack', 'Zoom', 'Jira', 'Confluence', 'Trello', 'Asana',
+    'Salesforce', 'HubSpot', 'QuickBooks', 'Sage', 'SAP', 'Oracle', 'Tableau', 'Power BI',
+    'Google Analytics', 'Google Ads', 'Jenkins', 'GitHub', 'GitLab',
+]
+SOFT_SKILLS = [
+    'Leadership', 'Communication', 'Teamwork', 'Collaboration', 'Problem Solving', 'Analytical',
+    'Critical Thinking', 'Attention to Detail', 'Time Management', 'Mentoring',
+    'Stakeholder Management', 'Negotiation', 'Adaptability', 'Creativity', 'Interpersonal',
+]
+CERTIFICATIONS = [
+    'PMP', 'PRINCE2', 'CPA', 'ACCA', 'CFA', 'CIMA', 'CISA', 'CISSP', 'CISM', 'CCNA', 'ITIL',
+    'Six Sigma', 'Scrum Master', 'AWS Certified', 'Azure Certified', 'Google Cloud Certified',
+    'Security+', 'CompTIA',
+]
+ALIASES = {
+    'nodejs': 'Node.js', 'node': 'Node.js', 'reactjs': 'React', 'react.js': 'React', 'vue.js': 'Vue',
+    'golang': 'Go', 'postgres': 'PostgreSQL', 'k8s': 'Kubernetes', 'gcp': 'Google Cloud',
+    'restful': 'REST APIs', 'rest api': 'REST APIs', 'ms excel': 'Excel', 'ms word': 'Microsoft Word',
+    'ms office': 'Microsoft Office', 'powerbi': 'Power BI', 'team player': 'Teamwork',
+    'problem-solving': 'Problem Solving', 'detail-oriented': 'Attention to Detail',
+    'communication skills': 'Communication', 'certified scrum master': 'Scrum Master',
+}
+# Single words too common in ordinary English to count without a word around them
+AMBIGUOUS = {'go', 'r', 'spring', 'swift', 'oracle', 'sage', 'node', 'zoom', 'rust'}
+
+# Industry -> terms; also used by the job description analyzer for keyword gaps
+INDUSTRY_TERMS = {
+    'technology': [
+        'software development', 'programming', 'coding', 'web development',
+        'mobile development', 'database', 'cloud computing', 'devops',
+        'machine learning', 'artificial intelligence', 'data science'
+    ],
+    'marketing': [
+        'digital marketing', 'social media', 'content marketing', 'seo',
+        'sem', 'email marketing', 'brand management', 'campaign management',
+        'analytics', 'google ads', 'facebook ads'
+    ],
+    'sales': [
+        'sales', 'business development', 'account management', 'lead generation',
+        'prospecting', 'negotiation', 'client relationship', 'crm',
+        'salesforce', 'quota', 'territory management'
+    ],
+    'finance': [
+        'financial analysis', 'budgeting', 'forecasting', 'financial modeling',
+        'risk management', 'compliance', 'accounting', 'audit',
+        'investment', 'portfolio management', 'financial reporting'
+    ],
+    'healthcare': [
+        'patient care', 'clinical', 'medical', 'healthcare', 'nursing',
+        'diagnosis', 'treatment', 'patient assessment', 'medical records',
+        'healthcare technology', 'patient safety'
+    ]
+}
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is',
+    'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those',
+    'from', 'into', 'your', 'their', 'they', 'them', 'what', 'which', 'when', 'where', 'while',
+    'about', 'also', 'other', 'such', 'than', 'then', 'there', 'here', 'more', 'most', 'some',
+    'each', 'very', 'well', 'just', 'only', 'over', 'under', 'within', 'across', 'including',
+    'our', 'ours', 'you', 'who', 'whom', 'whose', 'able', 'ability', 'strong', 'excellent', 'good',
+    'plus', 'years', 'year', 'experience', 'work', 'working', 'role', 'team', 'join', 'looking',
+    'seeking', 'candidate', 'ideal', 'required', 'requirements', 'preferred', 'responsibilities',
+}
+
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\s*[\-\+]?\s*(?:\d+\s*)?(?:years?|yrs?)\s*(?:of\s*)?(?:\w+\s+){0,3}?experience')
+EDUCATION_PATTERN = re.compile(r"\b(bachelor|master|mba|phd|doctorate|associate|high\s*school|diploma)")
+PREFERRED_PATTERN = re.compile(r'\b(?:preferred|nice[\s-]to[\s-]have|desirable|advantage|bonus|a plus|ideally)\b')
+SENIOR_PATTERN = re.compile(r'\b(?:senior|sr\.?|lead|principal|staff|head of)\b')
+JUNIOR_PATTERN = re.compile(r'\b(?:junior|jr\.?|entry[\s-]level|graduate|intern(?:ship)?|trainee)\b')
+BULLETS = re.compile(r'^[\s\-\*•·▪◦‣●○■□➢➤►✓✔]+')
+
+
+def normalize(text: Optional[str]) -> str:
+    """Case-, bullet- and spacing-insensitive form of a posting, kept line by line"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    lines = (re.sub(r'\s+', ' ', BULLETS.sub('', line)).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def posting_key(text: str, kind: str = 'features') -> str:
+    key = '\x1f'.join((kind, str(FEATURE_VERSION), normalize(text)))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _term_pattern(term: str) -> str:
+    return r'(?<![\w.+#])' + re.escape(term.lower()).replace(r'\ ', r'[\s\-]') + r'(?![\w+#])'
+
+
+def _vocabulary() -> List[tuple]:
+    """(pattern, display name, category), longest terms first so 'Java' never eats 'JavaScript'"""
+    entries = [(name, name, category)
+               for category, names in (('skills', TECHNICAL_SKILLS), ('tools', TOOLS),
+                                       ('soft_skills', SOFT_SKILLS), ('certifications', CERTIFICATIONS))
+               for name in names]
+    lookup = {name: category for _, name, category in entries}
+    entries += [(alias, name, lookup[name]) for alias, name in ALIASES.items()]
+    entries.sort(key=lambda entry: -len(entry[0]))
+    return [(re.compile(_term_pattern(term)), term.lower(), name, category) for term, name, category in entries]
+
+
+VOCABULARY = _vocabulary()
+
+
+def _find_terms(text: str) -> List[tuple]:
+    """(start, display name, category) of vocabulary terms, non-overlapping"""
+    taken: List[tuple] = []
+    found = []
+    for pattern, term, name, category in VOCABULARY:
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if any(start < t_end and end > t_start for t_start, t_end in taken):
+                continue
+            if term in AMBIGUOUS and not re.search(r'[,/(]|\b(?:and|or|in|with)\b',
+                                                   text[max(0, start - 12):end + 12]):
+                continue
+            taken.append((start, end))
+            found.append((start, name, category))
+    found.sort()
+    return found
+
+
+def extract_features(text: str) -> Dict[str, Any]:
+    """Requirements and a weighted keyword vector for a job posting"""
+    text = normalize(text)
+    features: Dict[str, Any] = {category: [] for category in ('skills', 'tools', 'soft_skills', 'certifications')}
+    features['preferred'] = []
+
+    found = _find_terms(text)
+    weights: Dict[str, float] = {}
+    required_names, preferred_names = set(), set()
+    sentences = [(m.start(), m.end()) for m in re.finditer(r'[^.;\n]+', text)]
+    for start, name, category in found:
+        if name not in features[category]:
+            features[category].append(name)
+        sentence = next((text[s:e] for s, e in sentences if s <= start < e), '')
+        (preferred_names if PREFERRED_PATTERN.search(sentence) else required_names).add(name)
+        boost = 2.0 if category == 'soft_skills' else 3.0
+        weights[name.lower()] = weights.get(name.lower(), 0.0) + boost
+    features['preferred'] = [name for category in ('skills', 'tools', 'certifications')
+                             for name in features[category] if name in preferred_names - required_names]
+
+    for word in re.findall(r'\b[a-z]+\b', text):
+        if len(word) > 3 and word not in STOP_WORDS:
+            weights[word] = weights.get(word, 0.0) + 1.0
+    if weights:
+        top = max(weights.values())
+        ranked = sorted(weights.items(), key=lambda item: -item[1])[:KEYWORD_LIMIT]
+        features['keywords'] = {term: round(weight / top, 3) for term, weight in ranked}
+    else:
+        features['keywords'] = {}
+
+    match = EXPERIENCE_PATTERN.search(text)
+    features['experience'] = {'years': int(match.group(1)), 'text': match.group(0)} if match else {}
+    match = EDUCATION_PATTERN.search(text)
+    features['education'] = {'level': re.sub(r'\s+', ' ', match.group(1)), 'text': match.group(0)} if match else {}
+
+    head = text[:300]
+    years = features['experience'].get('years')
+    if SENIOR_PATTERN.search(head) or (years or 0) >= 7:
+        features['experience_level'] = 'Senior'
+    elif JUNIOR_PATTERN.search(head) or (years is not None and years <= 1):
+        features['experience_level'] = 'Entry-level'
+    elif years is not None:
+        features['experience_level'] = 'Mid-level'
+    else:
+        features['experience_level'] = 'Not specified'
+
+    scores = {industry: [term for term in terms if term in text] for industry, terms in INDUSTRY_TERMS.items()}
+    industry = max(scores, key=lambda name: len(scores[name]))
+    features['industry'] = industry if scores[industry] else 'general'
+    features['industry_terms'] = scores[industry]
+    return features
+
+
+def mentioned(name: str, text: str) -> bool:
+    """Whether a vocabulary term (or one of its aliases) appears in normalized text"""
+    terms = [name] + [alias for alias, target in ALIASES.items() if target == name]
+    return any(re.search(_term_pattern(term), text) for term in terms)
+
+
+def keyword_categories(features: Dict[str, Any]) -> Dict[str, Any]:
+    """Features in the categorized keyword shape the AI services return"""
+    return {
+        'technical_skills': features['skills'] + features['tools'],
+        'soft_skills': list(features['soft_skills']),
+        'certifications': list(features['certifications']),
+        'experience_level': features['experience_level'],
+        'industry_terms': list(features['industry_terms']),
+    }
+
+
+class JDFeatureStore:
+    """Posting features (and other per-posting results) keyed by normalized-text hash"""
+
+    table = 'jd_features'
+
+    def __init__(self, db_path: str = JD_FEATURES_DB_PATH, ttl: float = JD_FEATURES_TTL,
+                 memory_size: int = JD_FEATURES_MEMORY_SIZE):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._writes = 0
+        self.stats = {'memory_hits': 0, 'shared_hits': 0, 'computed': 0}
+
+    # ----- storage -----
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._init_database()
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _init_database(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _remember(self, key: str, value: Any):
+        with self._memory_lock:
+            self._memory[key] = (time.time(), value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _recall(self, key: str) -> Optional[Any]:
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time() - self.ttl:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry[1]
+
+    def _load(self, key: str) -> Optional[Any]:
+        row = self._connect().execute(f"SELECT data FROM {self.table} WHERE key = ? AND created_at > ?",
+                                      (key, time.time() - self.ttl)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _save(self, key: str, kind: str, value: Any):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(f"INSERT OR REPLACE INTO {self.table} (key, kind, data, created_at) VALUES (?, ?, ?, ?)",
+                     (key, kind, json.dumps(value, separators=(',', ':')), now))
+        self._writes += 1
+        if self._writes >= PRUNE_EVERY:
+            self._writes = 0
+            conn.execute(f"DELETE FROM {self.table} WHERE created_at <= ?", (now - self.ttl,))
+
+    # ----- lookups -----
+
+    def key(self, text: str, kind: str) -> str:
+        return posting_key(text, kind)
+
+    def get_or_compute(self, job_description: str, kind: str, compute: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        The stored `kind` result for this posting, computing and storing it on
+        a miss. A compute() that returns None is not stored, so it is retried
+        next time. Returns a copy callers are free to modify.
+        """
+        key = self.key(job_description, kind)
+        value = self._recall(key)
+        if value is not None:
+            self.stats['memory_hits'] += 1
+            return copy.deepcopy(value)
+        try:
+            value = self._load(key)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"JD feature store unavailable: {e}")
+            value = None
+        if value is not None:
+            self.stats['shared_hits'] += 1
+        else:
+            value = compute()
+            if value is None:
+                return None
+            self.stats['computed'] += 1
+            try:
+                self._save(key, kind, value)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"JD feature store could not save {kind}: {e}")
+        self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def features(self, job_description: str) -> Dict[str, Any]:
+        """Extracted features of a posting; see the module docstring"""
+        if not normalize(job_description):
+            return extract_features('')
+        return self.get_or_compute(job_description, 'features', lambda: extract_features(job_description))
+
+
+# Global instance
+jd_feature_store = JDFeatureStore()
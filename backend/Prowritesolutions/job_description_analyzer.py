@@ -9,6 +9,7 @@ import re
 import openai
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from jd_features import INDUSTRY_TERMS, jd_feature_store
 
 class JobDescriptionAnalyzer:
     def __init__(self):
@@ -17,44 +18,8 @@ class JobDescriptionAnalyzer:
         if self.openai_api_key:
             openai.api_key = self.openai_api_key
         
-        # Common job requirements patterns
-        self.requirement_patterns = {
-            'experience_years': r'(\d+)[\-\+]?\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
-            'education_level': r'(bachelor|master|phd|associate|high\s*school|diploma)',
-            'skills': r'(python|javascript|java|react|node\.js|sql|aws|docker|kubernetes|git|agile|scrum)',
-            'certifications': r'(certified|certification|cert|license)',
-            'soft_skills': r'(leadership|communication|teamwork|problem\s*solving|analytical)',
-            'tools': r'(excel|word|powerpoint|photoshop|illustrator|figma|slack|zoom)'
-        }
-        
         # Industry-specific keywords
-        self.industry_keywords = {
-            'technology': [
-                'software development', 'programming', 'coding', 'web development',
-                'mobile development', 'database', 'cloud computing', 'devops',
-                'machine learning', 'artificial intelligence', 'data science'
-            ],
-            'marketing': [
-                'digital marketing', 'social media', 'content marketing', 'seo',
-                'sem', 'email marketing', 'brand management', 'campaign management',
-                'analytics', 'google ads', 'facebook ads'
-            ],
-            'sales': [
-                'sales', 'business development', 'account management', 'lead generation',
-                'prospecting', 'negotiation', 'client relationship', 'crm',
-                'salesforce', 'quota', 'territory management'
-            ],
-            'finance': [
-                'financial analysis', 'budgeting', 'forecasting', 'financial modeling',
-                'risk management', 'compliance', 'accounting', 'audit',
-                'investment', 'portfolio management', 'financial reporting'
-            ],
-            'healthcare': [
-                'patient care', 'clinical', 'medical', 'healthcare', 'nursing',
-                'diagnosis', 'treatment', 'patient assessment', 'medical records',
-                'healthcare technology', 'patient safety'
-            ]
-        }
+        self.industry_keywords = INDUSTRY_TERMS
 
     def analyze_job_description(self, job_description: str, resume_content: str = None) -> Dict[str, Any]:
         """Analyze job description and provide optimization insights"""
@@ -111,40 +76,21 @@ class JobDescriptionAnalyzer:
 
     def _extract_job_requirements(self, job_description: str) -> Dict[str, Any]:
         """Extract key requirements from job description"""
-        description_lower = job_description.lower()
+        # Shared with the other services that score against this posting
+        features = jd_feature_store.features(job_description)
+        skills = features['skills'] + features['tools'] + features['certifications']
+        preferred = set(features['preferred'])
         
-        extracted = {
+        return {
             'job_title': self._extract_job_title(job_description),
             'company': self._extract_company_name(job_description),
-            'required_skills': [],
-            'preferred_skills': [],
-            'experience_requirements': {},
-            'education_requirements': {},
-            'industry': self._identify_industry(description_lower),
+            'required_skills': [skill for skill in skills if skill not in preferred] + features['soft_skills'],
+            'preferred_skills': features['preferred'],
+            'experience_requirements': features['experience'],
+            'education_requirements': features['education'],
+            'industry': features['industry'],
             'key_responsibilities': self._extract_responsibilities(job_description)
         }
-        
-        # Extract experience requirements
-        experience_match = re.search(self.requirement_patterns['experience_years'], description_lower)
-        if experience_match:
-            extracted['experience_requirements'] = {
-                'years': int(experience_match.group(1)),
-                'text': experience_match.group(0)
-            }
-        
-        # Extract education requirements
-        education_match = re.search(self.requirement_patterns['education_level'], description_lower)
-        if education_match:
-            extracted['education_requirements'] = {
-                'level': education_match.group(1),
-                'text': education_match.group(0)
-            }
-        
-        # Extract skills
-        extracted['required_skills'] = self._extract_skills(description_lower, 'required')
-        extracted['preferred_skills'] = self._extract_skills(description_lower, 'preferred')
-        
-        return extracted
 
     def _extract_job_title(self, job_description: str) -> str:
         """Extract job title from description"""
@@ -179,41 +125,6 @@ class JobDescriptionAnalyzer:
         
         return "Unknown Company"
 
-    def _identify_industry(self, description_lower: str) -> str:
-        """Identify industry based on keywords"""
-        industry_scores = {}
-        
-        for industry, keywords in self.industry_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in description_lower)
-            industry_scores[industry] = score
-        
-        if industry_scores:
-            return max(industry_scores, key=industry_scores.get)
-        
-        return "General"
-
-    def _extract_skills(self, description_lower: str, skill_type: str) -> List[str]:
-        """Extract skills from job description"""
-        skills = []
-        
-        # Extract technical skills
-        tech_skills = re.findall(self.requirement_patterns['skills'], description_lower)
-        skills.extend(tech_skills)
-        
-        # Extract soft skills
-        soft_skills = re.findall(self.requirement_patterns['soft_skills'], description_lower)
-        skills.extend(soft_skills)
-        
-        # Extract tools
-        tools = re.findall(self.requirement_patterns['tools'], description_lower)
-        skills.extend(tools)
-        
-        # Remove duplicates and clean up
-        skills = list(set(skills))
-        skills = [skill.strip() for skill in skills if skill.strip()]
-        
-        return skills
-
     def _extract_responsibilities(self, job_description: str) -> List[str]:
         """Extract key responsibilities from job description"""
         responsibilities = []
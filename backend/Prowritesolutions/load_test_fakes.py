@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Stand-in upstream servers for load testing
+
+Local HTTP servers that answer like the third-party APIs the backend calls,
+with configurable latency, so load tests exercise the real HTTP clients,
+connection pools and timeouts without touching the real services:
+
+    FakeOpenAIServer          /v1/chat/completions (JSON or streamed SSE)
+    FakeDarajaServer          Safaricom Daraja OAuth, STK push and STK query;
+                              posts the STK callback to the app after a delay
+    FakeAfricasTalkingServer  payments transaction listing for the till ledger
+
+Emails go to local_smtp_server.LocalSMTPServer. load_test_harness.py wires all
+of them up; each can also be run on its own for manual testing:
+
+    python load_test_fakes.py openai --port 8101 --latency 0.5
+"""
+
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional
+
+import requests
+
+FAKE_COMPLETION = ("Results-driven professional with a record of delivering measurable improvements, "
+                   "leading cross-functional teams and streamlining processes to cut costs and grow revenue.")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        with self.server.lock:
+            self.server.requests += 1
+        status, payload = self.server.respond(method, self.path, body)
+        if hasattr(payload, '__next__'):
+            self._stream(status, payload)
+            return
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, status: int, events):
+        # Server-sent events until the generator ends, then close the connection
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for event in events:
+                self.wfile.write(event.encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+class FakeUpstreamServer(ThreadingHTTPServer):
+    """Threaded JSON server; subclasses implement respond()"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    name = 'fake-upstream'
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, verbose: bool = False):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.verbose = verbose
+        self.requests = 0
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.port}"
+
+    def respond(self, method: str, path: str, body: Dict[str, Any]):
+        raise NotImplementedError
+
+    def wait(self):
+        """Simulated upstream latency, +/-20% jitter"""
+        if self.latency > 0:
+            time.sleep(self.latency * random.uniform(0.8, 1.2))
+
+    def start(self):
+        """Serve in a background thread (returns immediately)"""
+        self._thread = threading.Thread(target=self.serve_forever, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeOpenAIServer(FakeUpstreamServer):
+    """
+    Chat completions endpoint. Non-streamed calls take `latency` plus
+    `token_delay` per token; streamed calls wait `latency` for the first token
+    and then emit one token every `token_delay` seconds.
+    """
+
+    name = 'fake-openai'
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.3,
+                 token_delay: float = 0.0, tokens: int = 30, verbose: bool = False):
+        super().__init__(host, port, latency, verbose)
+        self.token_delay = token_delay
+        self.tokens = tokens
+
+    def _words(self) -> List[str]:
+        words = FAKE_COMPLETION.split()
+        return [words[i % len(words)] for i in range(self.tokens)]
+
+    def respond(self, method: str, path: str, body: Dict[str, Any]):
+        if method != 'POST' or not path.rstrip('/').endswith('/chat/completions'):
+            return 404, {'error': {'message': f'Unknown endpoint {path}', 'type': 'invalid_request_error'}}
+        model = body.get('model', 'gpt-3.5-turbo')
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        words = self._words()
+        self.wait()
+        if body.get('stream'):
+            return 200, self._stream(completion_id, model, words)
+        if self.token_delay:
+            time.sleep(self.token_delay * len(words))
+        return 200, {
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ' '.join(words)},
+                         'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 50, 'completion_tokens': len(words), 'total_tokens': 50 + len(words)},
+        }
+
+    def _stream(self, completion_id: str, model: str, words: List[str]):
+        for index, word in enumerate(words):
+            if index and self.token_delay:
+                time.sleep(self.token_delay)
+            chunk = {
+                'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'delta': {'content': word if index == 0 else ' ' + word},
+                             'finish_reason': None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        done = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}
+        yield f"data: {json.dumps(done)}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+class FakeDarajaServer(FakeUpstreamServer):
+    """
+    Safaricom Daraja sandbox. Every STK push is "paid" after
+    `callback_delay` seconds with `result_code` (0 = success): the callback is
+    posted to `callback_url` (the app's callback route; the URL in the push
+    request is the public one and is ignored) and STK queries report the result.
+    """
+
+    name = 'fake-daraja'
+
+    def __init__(self, callback_url: Optional[str] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.2, callback_delay: float = 2.0, result_code: int = 0, verbose: bool = False):
+        super().__init__(host, port, latency, verbose)
+        self.callback_url = callback_url
+        self.callback_delay = callback_delay
+        self.result_code = result_code
+        self.checkouts: Dict[str, Dict[str, Any]] = {}
+        self.callbacks_sent = 0
+        self.callbacks_failed = 0
+
+    def respond(self, method: str, path: str, body: Dict[str, Any]):
+        self.wait()
+        if path.startswith('/oauth/v1/generate'):
+            return 200, {'access_token': uuid.uuid4().hex, 'expires_in': '3599'}
+        if path.startswith('/mpesa/stkpush/v1/processrequest'):
+            return 200, self._stk_push(body)
+        if path.startswith('/mpesa/stkpushquery/v1/query'):
+            return 200, self._stk_query(body)
+        return 404, {'errorCode': '404.001.03', 'errorMessage': f'Unknown endpoint {path}'}
+
+    def _stk_push(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        checkout_id = f"ws_CO_{datetime.now().strftime('%d%m%Y%H%M%S')}{random.randint(100000, 999999)}"
+        merchant_id = f"{random.randint(10000, 99999)}-{random.randint(1000000, 9999999)}-1"
+        with self.lock:
+            self.checkouts[checkout_id] = {
+                'merchant_request_id': merchant_id,
+                'amount': body.get('Amount'),
+                'phone': body.get('PhoneNumber'),
+                'result_code': None,
+            }
+        threading.Timer(self.callback_delay, self._complete, args=(checkout_id,)).start()
+        return {
+            'MerchantRequestID': merchant_id,
+            'CheckoutRequestID': checkout_id,
+            'ResponseCode': '0',
+            'ResponseDescription': 'Success. Request accepted for processing',
+            'CustomerMessage': 'Success. Request accepted for processing',
+        }
+
+    def _stk_query(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        checkout_id = body.get('CheckoutRequestID')
+        checkout = self.checkouts.get(checkout_id)
+        if checkout is None:
+            return {'ResponseCode': '1', 'ResponseDescription': 'The transaction is being processed'}
+        if checkout['result_code'] is None:
+            return {'ResponseCode': '1', 'ResponseDescription': 'The transaction is being processed'}
+        return {
+            'ResponseCode': '0',
+            'ResponseDescription': 'The service request has been accepted successsfully',
+            'MerchantRequestID': checkout['merchant_request_id'],
+            'CheckoutRequestID': checkout_id,
+            'ResultCode': str(checkout['result_code']),
+            'ResultDesc': 'The service request is processed successfully.' if checkout['result_code'] == 0
+                          else 'Request cancelled by user',
+        }
+
+    def _complete(self, checkout_id: str):
+        checkout = self.checkouts[checkout_id]
+        checkout['result_code'] = self.result_code
+        callback = {'Body': {'stkCallback': {
+            'MerchantRequestID': checkout['merchant_request_id'],
+            'CheckoutRequestID': checkout_id,
+            'ResultCode': self.result_code,
+            'ResultDesc': 'The service request is processed successfully.' if self.result_code == 0
+                          else 'Request cancelled by user',
+        }}}
+        if self.result_code == 0:
+            callback['Body']['stkCallback']['CallbackMetadata'] = {'Item': [
+                {'Name': 'Amount', 'Value': checkout['amount']},
+                {'Name': 'MpesaReceiptNumber', 'Value': random_transaction_code()},
+                {'Name': 'TransactionDate', 'Value': int(datetime.now().strftime('%Y%m%d%H%M%S'))},
+                {'Name': 'PhoneNumber', 'Value': checkout['phone']},
+            ]}
+        if not self.callback_url:
+            return
+        try:
+            requests.post(self.callback_url, json=callback, timeout=30).raise_for_status()
+            with self.lock:
+                self.callbacks_sent += 1
+        except requests.RequestException:
+            with self.lock:
+                self.callbacks_failed += 1
+
+
+class FakeAfricasTalkingServer(FakeUpstreamServer):
+    """
+    Africa's Talking payments API, answering transaction listings with the
+    payments recorded through `record_payment` (what customers "paid" to the till)
+    """
+
+    name = 'fake-africastalking'
+
+    def __init__(self, till_number: str, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.3, verbose: bool = False):
+        super().__init__(host, port, latency, verbose)
+        self.till_number = till_number
+        self.transactions: List[Dict[str, Any]] = []
+
+    def record_payment(self, amount: float, phone_number: str = '254700000000',
+                       transaction_code: Optional[str] = None) -> str:
+        """A customer pays the till; returns the M-Pesa transaction code"""
+        code = transaction_code or random_transaction_code()
+        with self.lock:
+            self.transactions.append({
+                'transactionId': code,
+                'value': f'KES {float(amount):.4f}',
+                'sourceAccount': phone_number,
+                'destinationAccount': self.till_number,
+                'transactionDate': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+                'status': 'Success',
+            })
+        return code
+
+    def respond(self, method: str, path: str, body: Dict[str, Any]):
+        self.wait()
+        if method != 'POST' or not path.startswith('/version1/payments/'):
+            return 404, {'status': 'Failed', 'message': f'Unknown endpoint {path}'}
+        count = int(body.get('count') or 100)
+        with self.lock:
+            transactions = list(reversed(self.transactions[-count:]))
+        return 200, {'status': 'Success', 'transactions': transactions}
+
+
+def random_transaction_code() -> str:
+    """An M-Pesa style receipt code, e.g. 'TJ4AB12CDE'"""
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    return 'T' + ''.join(random.choice(alphabet) for _ in range(9))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a stand-in upstream API server')
+    parser.add_argument('service', choices=['openai', 'daraja', 'africastalking'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.3, help='seconds per upstream call')
+    parser.add_argument('--token-delay', type=float, default=0.0, help='OpenAI: seconds per token')
+    parser.add_argument('--callback-url', help="Daraja: the app's /api/payments/mpesa/callback URL")
+    parser.add_argument('--till', default='6340351', help="Africa's Talking: till number")
+    args = parser.parse_args()
+
+    if args.service == 'openai':
+        server = FakeOpenAIServer(args.host, args.port, args.latency, args.token_delay, verbose=True)
+    elif args.service == 'daraja':
+        server = FakeDarajaServer(args.callback_url, args.host, args.port, args.latency, verbose=True)
+    else:
+        server = FakeAfricasTalkingServer(args.till, args.host, args.port, args.latency, verbose=True)
+    print(f"Fake {args.service} server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
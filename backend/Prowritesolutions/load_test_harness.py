@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Reproducible local load-test harness
+
+Boots the full app under gunicorn against local stand-ins for everything it
+talks to, then drives end-to-end user journeys with concurrent virtual users
+and reports throughput and latency per endpoint:
+
+    MySQL               a fresh SQLite file through mysql_sqlite_shim (default),
+                        or a real MySQL server with --mysql (DB_* variables)
+    OpenAI              load_test_fakes.FakeOpenAIServer (--openai-latency)
+    Daraja              load_test_fakes.FakeDarajaServer (--daraja-latency)
+    Africa's Talking    load_test_fakes.FakeAfricasTalkingServer (--at-latency)
+    SMTP                local_smtp_server.LocalSMTPServer
+
+Scenarios (each virtual user runs the chosen ones back to back):
+
+    manual   register -> login -> me -> AI field enhancement -> manual payment
+             initiate -> (customer pays the till) -> validate -> status polls
+             until the PDF is ready -> PDF download
+    stk      STK push initiate -> (Daraja callback) -> status polls until settled
+
+    python load_test_harness.py                              # 8 users x 3 runs
+    python load_test_harness.py --users 32 --iterations 5 --scenarios manual stk
+    python load_test_harness.py --mysql --serving-mode sync --workers 4
+"""
+
+import os
+import sys
+import time
+import uuid
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from load_test_fakes import FakeOpenAIServer, FakeDarajaServer, FakeAfricasTalkingServer
+from local_smtp_server import LocalSMTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+TILL_NUMBER = '6340351'
+MANUAL_DOCUMENT_TYPE = 'Francisca Resume'
+MANUAL_AMOUNT = 500
+
+# Tables the app expects to exist already (the payment, ledger, reconciler and
+# settlement services create their own tables on first use)
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS users (
+        user_id INT AUTO_INCREMENT PRIMARY KEY,
+        email VARCHAR(255) UNIQUE NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        first_name VARCHAR(100) NOT NULL,
+        last_name VARCHAR(100) NOT NULL,
+        phone VARCHAR(20),
+        profile_picture VARCHAR(500),
+        is_premium BOOLEAN DEFAULT FALSE,
+        is_admin BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS payments (
+        payment_id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT,
+        amount DECIMAL(10, 2),
+        status VARCHAR(20) DEFAULT 'pending',
+        payment_type VARCHAR(50),
+        item_id INT,
+        checkout_request_id VARCHAR(100),
+        merchant_request_id VARCHAR(100),
+        phone_number VARCHAR(20),
+        payment_method VARCHAR(30),
+        mpesa_code VARCHAR(32),
+        failure_reason TEXT,
+        form_data LONGBLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at DATETIME,
+        updated_at DATETIME,
+        INDEX idx_checkout (checkout_request_id),
+        INDEX idx_user (user_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS payment_logs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        payment_id INT,
+        action VARCHAR(50),
+        details TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS user_documents (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT,
+        document_type VARCHAR(30),
+        reference VARCHAR(100),
+        file_path VARCHAR(500),
+        status VARCHAR(20),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME,
+        INDEX idx_reference (reference)
+    )""",
+    """CREATE TABLE IF NOT EXISTS system_logs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        level VARCHAR(20),
+        message TEXT,
+        module VARCHAR(100),
+        user_id INT,
+        ip_address VARCHAR(45),
+        metadata JSON,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS admin_activity_logs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        admin_id INT,
+        action VARCHAR(100),
+        target_type VARCHAR(50),
+        details TEXT,
+        ip_address VARCHAR(45),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+]
+
+FORM_DATA = {
+    'personalName': 'Wanjiru Kamau',
+    'personalEmail': 'wanjiru@example.com',
+    'personalPhone': '254712345678',
+    'personalLocation': 'Nairobi, Kenya',
+    'profession': 'Operations Manager',
+    'professionalSummary': 'Operations lead with eight years in logistics and last-mile delivery.',
+    'workExperience': [
+        {'title': 'Operations Lead', 'company': 'Acme Logistics', 'startDate': '2019', 'endDate': 'Present',
+         'description': 'Ran dispatch for 40 riders; cut late deliveries by 30%.'},
+        {'title': 'Dispatch Coordinator', 'company': 'Swift Couriers', 'startDate': '2016', 'endDate': '2019',
+         'description': 'Scheduled daily routes and handled client escalations.'},
+    ],
+    'education': [{'degree': 'BCom', 'institution': 'University of Nairobi', 'year': '2015'}],
+    'skills': ['Planning', 'Excel', 'Negotiation', 'Team leadership'],
+}
+
+
+def harness_app():
+    """
+    gunicorn entry point ('load_test_harness:harness_app()'): routes database
+    access to the SQLite file in LOADTEST_SQLITE_DB before the app is imported
+    """
+    db_path = os.getenv('LOADTEST_SQLITE_DB')
+    if db_path:
+        import mysql_sqlite_shim
+        mysql_sqlite_shim.install(db_path)
+    from app import app
+    return app
+
+
+def create_schema(db_path=None):
+    """Create the tables in SCHEMA (SQLite file at db_path, else MySQL from DB_*)"""
+    if db_path:
+        import mysql_sqlite_shim
+        connection = mysql_sqlite_shim.connect(db_path)
+    else:
+        import mysql.connector
+        from app_core import DB_CONFIG
+        connection = mysql.connector.connect(**DB_CONFIG)
+    try:
+        cursor = connection.cursor()
+        for statement in SCHEMA:
+            cursor.execute(statement)
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Stack:
+    """The app under gunicorn plus every stand-in it talks to"""
+
+    def __init__(self, args):
+        self.args = args
+        self.workdir = tempfile.mkdtemp(prefix='prowrite-loadtest-')
+        self.db_path = None if args.mysql else os.path.join(self.workdir, 'prowrite.db')
+        self.port = _free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.openai = FakeOpenAIServer(latency=args.openai_latency, token_delay=args.token_delay,
+                                       tokens=args.tokens)
+        self.daraja = FakeDarajaServer(callback_url=self.base_url + '/api/payments/mpesa/callback',
+                                       latency=args.daraja_latency, callback_delay=args.callback_delay)
+        self.africastalking = FakeAfricasTalkingServer(TILL_NUMBER, latency=args.at_latency)
+        self.smtp = LocalSMTPServer()
+        self.process = None
+
+    def _server_env(self):
+        env = dict(os.environ,
+                   PYTHONPATH=BACKEND_DIR,
+                   SERVING_MODE=self.args.serving_mode,
+                   BIND=f'127.0.0.1:{self.port}',
+                   WEB_WORKERS=str(self.args.workers),
+                   WEB_ERROR_LOG=os.path.join(self.workdir, 'gunicorn.log'),
+                   # OpenAI (0.28 and 1.x clients)
+                   OPENAI_API_KEY='sk-loadtest',
+                   OPENAI_API_BASE=self.openai.url + '/v1',
+                   OPENAI_BASE_URL=self.openai.url + '/v1',
+                   # Daraja
+                   MPESA_BASE_URL=self.daraja.url,
+                   # Africa's Talking till ledger, synced on every miss
+                   AFRICAS_TALKING_API_KEY='loadtest',
+                   AFRICAS_TALKING_USERNAME='loadtest',
+                   AFRICAS_TALKING_BASE_URL=self.africastalking.url,
+                   MPESA_TILL_NUMBER=TILL_NUMBER,
+                   TILL_LEDGER_ON_DEMAND_INTERVAL='0',
+                   TILL_LEDGER_SYNC_INTERVAL='5',
+                   STK_RECONCILE_INTERVAL='5',
+                   # Email through the local SMTP sink
+                   SENDGRID_API_KEY='',
+                   SMTP_SERVER='127.0.0.1',
+                   SMTP_PORT=str(self.smtp.port),
+                   SMTP_EMAIL='loadtest@prowrite.local',
+                   SMTP_PASSWORD='loadtest',
+                   SMTP_USE_TLS='false',
+                   EMAIL_OUTBOX_POLL_INTERVAL='0.5',
+                   # Every virtual user connects from 127.0.0.1
+                   RATE_LIMIT_ENABLED='false')
+        if self.db_path:
+            env['LOADTEST_SQLITE_DB'] = self.db_path
+            # One schema name for DB_CONFIG and the services' INFORMATION_SCHEMA checks
+            env['DB_NAME'] = 'prowrite'
+        return env
+
+    def start(self):
+        for server in (self.openai, self.daraja, self.africastalking, self.smtp):
+            server.start()
+        if self.db_path:
+            create_schema(self.db_path)
+        else:
+            create_schema()
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', os.path.join(BACKEND_DIR, 'gunicorn.conf.py'),
+             'load_test_harness:harness_app()'],
+            cwd=self.workdir, env=self._server_env(),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.time() + 180
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited during startup (see {self._log_path()})")
+            try:
+                requests.get(self.base_url + '/api/health', timeout=2)
+                return self
+            except requests.RequestException:
+                time.sleep(0.5)
+        self.stop()
+        raise RuntimeError("gunicorn did not start")
+
+    def _log_path(self):
+        return os.path.join(self.workdir, 'gunicorn.log')
+
+    def stop(self, keep_workdir=False):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(30)
+        for server in (self.openai, self.daraja, self.africastalking, self.smtp):
+            try:
+                server.stop()
+            except OSError:
+                pass
+        if not keep_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class Stats:
+    """Latency samples and errors per endpoint, plus completed journeys"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.journeys = defaultdict(lambda: [0, 0])   # scenario -> [ok, failed]
+        self.failures = []
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, elapsed, ok):
+        with self.lock:
+            self.samples[endpoint].append(elapsed)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def journey(self, scenario, ok, reason=None):
+        with self.lock:
+            self.journeys[scenario][0 if ok else 1] += 1
+            if reason and len(self.failures) < 10:
+                self.failures.append(f"{scenario}: {reason}")
+
+
+class ScenarioFailed(Exception):
+    pass
+
+
+class VirtualUser:
+    """One simulated customer with its own keep-alive HTTP session"""
+
+    def __init__(self, stack, stats, user_number):
+        self.stack = stack
+        self.stats = stats
+        self.session = requests.Session()
+        self.email = f"loadtest-{user_number}-{uuid.uuid4().hex[:8]}@example.com"
+        self.token = None
+
+    def call(self, endpoint, method, path, expect=(200,), **kwargs):
+        headers = kwargs.pop('headers', {})
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.stack.base_url + path, headers=headers,
+                                            timeout=120, **kwargs)
+            body = response.content
+        except requests.RequestException as e:
+            self.stats.record(endpoint, time.perf_counter() - started, False)
+            raise ScenarioFailed(f"{endpoint}: {e}")
+        ok = response.status_code in expect
+        self.stats.record(endpoint, time.perf_counter() - started, ok)
+        if not ok:
+            raise ScenarioFailed(f"{endpoint}: HTTP {response.status_code} {body[:200]!r}")
+        return response
+
+    def poll(self, endpoint, path, done, timeout, interval=0.5):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            payload = self.call(endpoint, 'GET', path, expect=(200, 404)).json()
+            if done(payload):
+                return payload
+            time.sleep(interval)
+        raise ScenarioFailed(f"{endpoint}: not done after {timeout}s")
+
+    def manual(self):
+        password = 'LoadTest123!'
+        if self.token is None:
+            self.call('POST /api/auth/register', 'POST', '/api/auth/register', expect=(201,),
+                      json={'email': self.email, 'password': password, 'firstName': 'Load', 'lastName': 'Tester'})
+            login = self.call('POST /api/auth/login', 'POST', '/api/auth/login',
+                              json={'email': self.email, 'password': password}).json()
+            self.token = login['access_token']
+        self.call('GET /api/auth/me', 'GET', '/api/auth/me')
+        self.call('POST /api/francisca/ai/enhance-field', 'POST', '/api/francisca/ai/enhance-field',
+                  json={'content': FORM_DATA['professionalSummary'], 'field_type': 'summary',
+                        'profession': FORM_DATA['profession']})
+
+        form_data = dict(FORM_DATA, personalEmail=self.email)
+        payment = self.call('POST /api/payments/manual/initiate', 'POST', '/api/payments/manual/initiate',
+                            json={'form_data': form_data, 'document_type': MANUAL_DOCUMENT_TYPE,
+                                  'user_email': self.email, 'phone_number': '254712345678'}).json()
+        reference = payment['reference']
+
+        # The customer pays the till, then types the M-Pesa code into the site
+        code = self.stack.africastalking.record_payment(payment.get('amount', MANUAL_AMOUNT), '254712345678')
+        self.call('POST /api/payments/manual/validate', 'POST', '/api/payments/manual/validate',
+                  json={'reference': reference, 'transaction_code': code})
+        status = self.poll('GET /api/payments/manual/status/<ref>', f'/api/payments/manual/status/{reference}',
+                           lambda payload: payload.get('status') in ('completed', 'failed'), timeout=120)
+        if status['status'] != 'completed':
+            raise ScenarioFailed(f"manual payment {reference} ended as {status['status']}")
+        pdf = self.call('GET /api/payments/manual/download/<ref>', 'GET',
+                        f'/api/payments/manual/download/{reference}')
+        if not pdf.content.startswith(b'%PDF'):
+            raise ScenarioFailed(f"download for {reference} is not a PDF")
+
+    def stk(self):
+        started = self.call('POST /api/payments/mpesa/initiate', 'POST', '/api/payments/mpesa/initiate',
+                            json={'phone_number': '254712345678', 'amount': MANUAL_AMOUNT,
+                                  'document_type': MANUAL_DOCUMENT_TYPE, 'form_data': FORM_DATA,
+                                  'user_email': self.email}).json()
+        checkout = started['checkout_request_id']
+        status = self.poll('GET /api/payments/mpesa/status/<id>', f'/api/payments/mpesa/status/{checkout}',
+                           lambda payload: payload.get('status') in ('completed', 'failed', 'cancelled'),
+                           timeout=120)
+        if status['status'] != 'completed':
+            raise ScenarioFailed(f"STK payment {checkout} ended as {status['status']}")
+
+    def run(self, scenarios, iterations):
+        for _ in range(iterations):
+            for scenario in scenarios:
+                try:
+                    getattr(self, scenario)()
+                    self.stats.journey(scenario, True)
+                except (ScenarioFailed, KeyError, ValueError) as e:
+                    self.stats.journey(scenario, False, str(e))
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def report(stats, wall):
+    print(f"\n{'endpoint':<42}{'count':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, samples in stats.samples.items():
+        samples = sorted(samples)
+        print(f"{endpoint:<42}{len(samples):>7}{stats.errors[endpoint]:>8}{len(samples) / wall:>9.2f}"
+              f"{statistics.median(samples) * 1000:>9.0f}{_percentile(samples, 0.99) * 1000:>9.0f}"
+              f"{samples[-1] * 1000:>9.0f}")
+    total = sum(len(samples) for samples in stats.samples.values())
+    print(f"{'total':<42}{total:>7}{sum(stats.errors.values()):>8}{total / wall:>9.2f}")
+    print()
+    for scenario, (ok, failed) in stats.journeys.items():
+        print(f"{'✅' if not failed else '❌'} {scenario}: {ok} journeys completed, {failed} failed")
+    for failure in stats.failures:
+        print(f"   {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the app end to end against local stand-ins')
+    parser.add_argument('--scenarios', nargs='+', default=['manual'], choices=['manual', 'stk'])
+    parser.add_argument('--users', type=int, default=8, help='concurrent virtual users')
+    parser.add_argument('--iterations', type=int, default=3, help='journeys per user and scenario')
+    parser.add_argument('--serving-mode', default='gthread', choices=['gthread', 'gevent', 'sync'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--mysql', action='store_true', help='use the MySQL server from DB_* instead of SQLite')
+    parser.add_argument('--openai-latency', type=float, default=0.5, help='seconds before the first token')
+    parser.add_argument('--token-delay', type=float, default=0.0, help='seconds per streamed token')
+    parser.add_argument('--tokens', type=int, default=30, help='words in each fake completion')
+    parser.add_argument('--daraja-latency', type=float, default=0.3)
+    parser.add_argument('--callback-delay', type=float, default=3.0, help='seconds until the customer pays')
+    parser.add_argument('--at-latency', type=float, default=0.5, help="Africa's Talking response time")
+    parser.add_argument('--keep', action='store_true', help='keep the work dir (database, gunicorn log)')
+    args = parser.parse_args()
+
+    stack = Stack(args)
+    print(f"🔧 {args.users} users x {args.iterations} x {'+'.join(args.scenarios)}, "
+          f"{args.workers} {args.serving_mode} workers, {'MySQL' if args.mysql else 'SQLite'} database")
+    try:
+        stack.start()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    stats = Stats()
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            users = [VirtualUser(stack, stats, number) for number in range(args.users)]
+            list(pool.map(lambda user: user.run(args.scenarios, args.iterations), users))
+        wall = time.perf_counter() - started
+        # Let queued emails drain before counting them
+        time.sleep(2)
+    finally:
+        stack.stop(keep_workdir=args.keep)
+    report(stats, wall)
+    print(f"📨 {len(stack.smtp.messages)} emails delivered, {stack.openai.requests} OpenAI calls, "
+          f"{stack.daraja.callbacks_sent} STK callbacks, {stack.africastalking.requests} till listings")
+    if args.keep:
+        print(f"📁 {stack.workdir}")
+    failed = sum(failed for _, failed in stats.journeys.values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Serving-mode load test
+
+Boots the app under gunicorn once per serving mode (see gunicorn.conf.py) with
+the AI client replaced by the local fake model (AI_FAKE_MODEL=1), so every AI
+chat request spends about `--tokens x --token-delay` seconds waiting on the
+"upstream" like a real OpenAI call. It then fires concurrent requests and
+reports throughput and latency per mode.
+
+    python load_test_serving.py                       # sync vs gthread
+    python load_test_serving.py --modes sync gthread gevent --concurrency 32
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ENDPOINT = '/api/cover-letters/ai-chat?stream=1'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, workers, token_delay):
+    port = _free_port()
+    env = dict(os.environ,
+               SERVING_MODE=mode,
+               BIND=f'127.0.0.1:{port}',
+               WEB_WORKERS=str(workers),
+               WEB_ERROR_LOG='/dev/null',
+               AI_FAKE_MODEL='true',
+               AI_FAKE_TOKEN_DELAY=str(token_delay),
+               # Background workers are not part of the measurement
+               TILL_LEDGER_SYNC_WORKER='false',
+               MPESA_SETTLEMENT_WORKER='false',
+               STK_RECONCILER_WORKER='false',
+               # All simulated clients share one IP
+               RATE_LIMIT_ENABLED='false')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 180
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited during startup in {mode} mode")
+        try:
+            requests.get(base_url + '/api/health', timeout=2)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"gunicorn did not start in {mode} mode")
+
+
+def _one_request(base_url, words):
+    payload = {
+        'message': ' '.join(['improve'] * words),
+        'paragraphType': 'experience',
+        'context': {'jobTitle': 'Analyst', 'companyName': 'Acme'}
+    }
+    started = time.perf_counter()
+    response = requests.post(base_url + ENDPOINT, json=payload, timeout=300)
+    body = response.text
+    elapsed = time.perf_counter() - started
+    return elapsed, response.status_code == 200 and 'event: done' in body
+
+
+def run_load(base_url, total, concurrency, words):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: _one_request(base_url, words), range(total)))
+    wall = time.perf_counter() - started
+    latencies = sorted(elapsed for elapsed, _ in results)
+    return {
+        'requests': total,
+        'ok': sum(1 for _, ok in results if ok),
+        'rps': total / wall,
+        'p50': statistics.median(latencies),
+        'p95': latencies[int(0.95 * (len(latencies) - 1))],
+        'max': latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare gunicorn serving modes under slow AI calls')
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--tokens', type=int, default=20, help='words in each fake completion')
+    parser.add_argument('--token-delay', type=float, default=0.05, help='seconds per fake token')
+    args = parser.parse_args()
+
+    print(f"🔧 {args.requests} requests, concurrency {args.concurrency}, {args.workers} workers, "
+          f"~{args.tokens * args.token_delay:.1f}s per AI call")
+    print(f"{'mode':<10}{'ok':>6}{'req/s':>9}{'p50 s':>9}{'p95 s':>9}{'max s':>9}")
+    for mode in args.modes:
+        try:
+            process, base_url = start_server(mode, args.workers, args.token_delay)
+        except RuntimeError as e:
+            print(f"{mode:<10}  skipped: {e}")
+            continue
+        try:
+            # The fake model echoes up to 60 words of the message, plus a 5 word preamble
+            result = run_load(base_url, args.requests, args.concurrency, max(args.tokens - 5, 1))
+        finally:
+            process.terminate()
+            process.wait(30)
+        print(f"{mode:<10}{result['ok']:>6}{result['rps']:>9.2f}{result['p50']:>9.2f}"
+              f"{result['p95']:>9.2f}{result['max']:>9.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Local Debugging SMTP Server
+A tiny in-process SMTP sink used as a stand-in for Gmail/SendGrid when testing the
+email outbox (and load tests). It accepts every message, records it in memory and
+never relays anything.
+
+Run standalone and point the backend at it:
+
+    python local_smtp_server.py --port 1025
+    SMTP_SERVER=localhost SMTP_PORT=1025 SMTP_USE_TLS=false python app.py
+"""
+
+import sys
+import argparse
+import threading
+import socketserver
+from email import message_from_bytes
+from typing import List, Dict, Any
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Handles one client session (enough of RFC 5321 for smtplib)"""
+
+    def _reply(self, line: str):
+        self.wfile.write((line + '\r\n').encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply('220 localhost ProWrite debugging SMTP server')
+        mail_from, recipients = None, []
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            command = line[:4].upper()
+
+            if command in ('EHLO', 'HELO'):
+                if command == 'EHLO':
+                    self.wfile.write(b'250-localhost\r\n250-AUTH PLAIN LOGIN\r\n')
+                self._reply('250 OK')
+            elif command == 'AUTH':
+                self._reply('235 Authentication successful')
+            elif command == 'MAIL':
+                mail_from, recipients = line[10:].strip(' <>'), []
+                self._reply('250 OK')
+            elif command == 'RCPT':
+                recipients.append(line[8:].strip(' <>'))
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b'.\r\n', b'.\n'):
+                        break
+                    if data_line.startswith(b'..'):
+                        data_line = data_line[1:]
+                    lines.append(data_line)
+                raw_message = b''.join(lines)
+                with server.lock:
+                    server.messages.append({
+                        'mail_from': mail_from,
+                        'recipients': recipients,
+                        'message': message_from_bytes(raw_message),
+                        'raw': raw_message
+                    })
+                if server.verbose:
+                    print(f"--- message from {mail_from} to {', '.join(recipients)} ---")
+                    print(raw_message.decode('utf-8', 'replace'))
+                self._reply('250 OK: queued')
+            elif command == 'RSET':
+                mail_from, recipients = None, []
+                self._reply('250 OK')
+            elif command == 'NOOP':
+                self._reply('250 OK')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Threaded SMTP sink; messages are kept in self.messages"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, verbose: bool = False):
+        super().__init__((host, port), _SMTPHandler)
+        self.messages: List[Dict[str, Any]] = []
+        self.connections = 0
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        """Serve in a background thread (returns immediately)"""
+        self._thread = threading.Thread(target=self.serve_forever, name='local-smtp', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='ProWrite local debugging SMTP server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    args = parser.parse_args()
+
+    server = LocalSMTPServer(args.host, args.port, verbose=True)
+    print(f"Debugging SMTP server listening on {args.host}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+        sys.exit(0)
@@ -1,45 +1,229 @@
 """
 Production Logging Configuration
+
+Records are handed to a queue on the calling thread and written to the log
+file and stderr by a single background listener, so request threads never
+wait on log I/O. Each worker starts its listener before its first request
+(start_background_workers); imports and scripts log synchronously and start
+no threads. Every record carries the id of the request it was logged in.
+
+    LOG_LEVEL                  root level (INFO); DEBUG enables the PDF and AI traces
+    LOG_FILE                   rotating log file (logs/app.log)
+    LOG_FORMAT                 json (one object per line) or text
+    ACCESS_LOG_SAMPLE_RATE     fraction of successful requests given an access line (1.0)
+    ACCESS_LOG_ROUTE_RATES     per-route overrides by path prefix, e.g. /api/health=0,/api/status=0.1
+    ACCESS_LOG_SLOW_MS         requests at least this slow are always logged (1000)
+
+Responses with a 4xx/5xx status are always logged; each access line records
+the rate it was sampled at.
 """
 
-import logging
 import os
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
-
-def setup_production_logging():
-    """Setup production logging configuration"""
-    
-    # Create logs directory if it doesn't exist
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    
-    # Configure root logger
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            # File handler with rotation
-            RotatingFileHandler(
-                'logs/app.log',
-                maxBytes=10*1024*1024,  # 10MB
-                backupCount=5
-            ),
-            # Console handler for errors only
-            logging.StreamHandler()
-        ]
-    )
-    
-    # Set specific loggers
+import re
+import copy
+import json
+import uuid
+import queue
+import atexit
+import random
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FILE = os.getenv('LOG_FILE', os.path.join('logs', 'app.log'))
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv('ACCESS_LOG_SAMPLE_RATE', 1.0))
+ACCESS_LOG_ROUTE_RATES = os.getenv('ACCESS_LOG_ROUTE_RATES', '')
+ACCESS_LOG_SLOW_MS = float(os.getenv('ACCESS_LOG_SLOW_MS', 1000))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# Attributes every LogRecord has; anything else was passed with `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+_queue_handler: Optional['RequestQueueHandler'] = None
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """Reuse a well-formed id from the client or proxy, otherwise mint one"""
+    if incoming and _REQUEST_ID_PATTERN.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the current request id, before they leave the request thread"""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = '-'
+            try:
+                from flask import g, has_request_context
+                if has_request_context():
+                    record.request_id = g.get('request_id', '-')
+            except ImportError:
+                pass
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id, extras"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'pid': record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def build_formatter(fmt: str = LOG_FORMAT) -> logging.Formatter:
+    if fmt == 'text':
+        return logging.Formatter(TEXT_FORMAT)
+    return JsonFormatter()
+
+
+class AccessLogSampler:
+    """Decides which requests get an access log line"""
+
+    def __init__(self, default_rate: float = ACCESS_LOG_SAMPLE_RATE, route_rates: str = ACCESS_LOG_ROUTE_RATES,
+                 slow_ms: float = ACCESS_LOG_SLOW_MS):
+        self.default_rate = default_rate
+        self.route_rates = self.parse_rates(route_rates)
+        self.slow_ms = slow_ms
+
+    @staticmethod
+    def parse_rates(spec: str) -> Dict[str, float]:
+        rates = {}
+        for item in spec.split(','):
+            prefix, _, rate = item.strip().partition('=')
+            if prefix and rate:
+                rates[prefix] = float(rate)
+        return rates
+
+    def rate_for(self, path: str) -> float:
+        matches = [prefix for prefix in self.route_rates if path.startswith(prefix)]
+        if not matches:
+            return self.default_rate
+        return self.route_rates[max(matches, key=len)]
+
+    def should_log(self, path: str, status: int, duration_ms: float) -> Optional[float]:
+        """The rate the request was sampled at, or None to skip it"""
+        if status >= 400 or duration_ms >= self.slow_ms:
+            return 1.0
+        rate = self.rate_for(path)
+        if rate >= 1.0 or (rate > 0 and random.random() < rate):
+            return rate
+        return None
+
+
+access_log_sampler = AccessLogSampler()
+
+
+class RequestQueueHandler(QueueHandler):
+    """
+    Hands records to a background listener that writes them to `handlers`.
+
+    The listener belongs to the process that started it; until then (imports,
+    scripts, a freshly forked worker) records are written synchronously.
+    """
+
+    def __init__(self, handlers):
+        super().__init__(None)
+        self.handlers = handlers
+        self.listener: Optional[QueueListener] = None
+        self._pid = None
+
+    def start(self):
+        if self._pid == os.getpid():
+            return
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def stop(self):
+        """Drain the queue and stop the listener"""
+        if self._pid == os.getpid():
+            self._pid = None
+            self.listener.stop()
+
+    def prepare(self, record):
+        # Render message and traceback on this thread; the listener only formats
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if self._pid == os.getpid():
+            super().emit(record)
+            return
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def start_log_listener():
+    """Move this process's log writes to a background thread (see app.start_background_workers)"""
+    if _queue_handler is not None:
+        _queue_handler.start()
+
+
+def stop_log_listener():
+    if _queue_handler is not None:
+        _queue_handler.stop()
+
+
+def setup_production_logging(level: str = LOG_LEVEL, log_file: str = None, fmt: str = LOG_FORMAT):
+    """Route the root logger through the queue handler to the file and console handlers"""
+    global _queue_handler
+
+    if _queue_handler is None:
+        log_file = log_file or LOG_FILE
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        formatter = build_formatter(fmt)
+        file_handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5)  # 10MB
+        console_handler = logging.StreamHandler()
+        for handler in (file_handler, console_handler):
+            handler.setFormatter(formatter)
+
+        _queue_handler = RequestQueueHandler([file_handler, console_handler])
+        _queue_handler.addFilter(RequestContextFilter())
+        atexit.register(stop_log_listener)
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+
+    logging.getLogger().setLevel(level)
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('requests').setLevel(logging.WARNING)
-    
-    # Create application logger
-    app_logger = logging.getLogger('prowrite')
-    app_logger.setLevel(logging.INFO)
-    
-    return app_logger
+
+    return logging.getLogger('prowrite')
 
 def log_error(error, context=""):
     """Log errors with context"""
@@ -55,4 +239,3 @@ def log_warning(message, context=""):
     """Log warning messages with context"""
     logger = logging.getLogger('prowrite')
     logger.warning(f"{context}: {message}")
-
@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify, send_file, abort
 import logging
 import os
+from io import BytesIO
 from dotenv import load_dotenv
 from fast_manual_payment_service import manual_payment_service
 from transaction_validator import transaction_validator
+from rate_limiter import rate_limit
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,6 +17,7 @@ logger = logging.getLogger(__name__)
 manual_payment_bp = Blueprint('manual_payment', __name__, url_prefix='/api/payments/manual')
 
 @manual_payment_bp.route('/initiate', methods=['POST'])
+@rate_limit('payment')
 def initiate_manual_payment():
     """
     Initiate manual payment process
@@ -66,6 +69,7 @@ def initiate_manual_payment():
         }), 500
 
 @manual_payment_bp.route('/validate', methods=['POST'])
+@rate_limit('payment')
 def validate_transaction_code():
     """
     Validate transaction code for manual payment
@@ -105,6 +109,7 @@ def validate_transaction_code():
         }), 500
 
 @manual_payment_bp.route('/status/<reference>', methods=['GET'])
+@rate_limit('payment_status')
 def get_payment_status(reference):
     """
     Get payment status for a reference
@@ -302,7 +307,17 @@ def download_pdf(reference):
     try:
         logger.info(f"📥 PDF download requested for reference: {reference}")
         
-        # Get PDF path from payment service
+        # Render the PDF in memory from the stored form data
+        pdf_bytes = manual_payment_service.get_pdf_bytes(reference)
+        if pdf_bytes:
+            return send_file(
+                BytesIO(pdf_bytes),
+                as_attachment=True,
+                download_name=f"resume_{reference}.pdf",
+                mimetype='application/pdf'
+            )
+        
+        # Fall back to PDFs stored on disk by older versions
         pdf_path = manual_payment_service.get_pdf_download_path(reference)
         
         logger.info(f"📥 PDF path retrieved: {pdf_path}")
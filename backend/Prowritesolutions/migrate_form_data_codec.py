@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Database migration: store form_data in the compact form_codec format
+
+Converts the form_data column of manual_payments, payments and form_submissions
+from JSON to LONGBLOB and re-encodes existing rows as compressed canonical JSON
+(see form_codec.py). Rows are converted in primary-key batches and already
+converted rows are skipped, so the script can be re-run safely. Readers decode
+both formats, so the application keeps working while it runs.
+
+    python migrate_form_data_codec.py [--table TABLE] [--batch-size N] [--stats-only]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import mysql.connector
+from dotenv import load_dotenv
+
+from form_codec import encode_form_data, decode_form_data, is_encoded
+
+# Load environment variables
+load_dotenv('.env')
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'Prowrite.mysql.pythonanywhere-services.com'),
+    'user': os.getenv('DB_USER', 'Prowrite'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'database': os.getenv('DB_NAME', 'Prowrite$dbprowrite'),
+    'charset': 'utf8mb4'
+}
+
+TABLES = ('manual_payments', 'payments', 'form_submissions')
+SAMPLE_ROWS = 200
+
+
+def _column_info(cursor, database, table):
+    """(DATA_TYPE, IS_NULLABLE) of form_data, or None if the table has no such column"""
+    cursor.execute("""
+        SELECT DATA_TYPE, IS_NULLABLE FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = 'form_data'
+    """, (database, table))
+    return cursor.fetchone()
+
+
+def _primary_key(cursor, database, table):
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_KEY = 'PRI'
+    """, (database, table))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def table_stats(cursor, table, pk):
+    """Stored bytes plus average parse time (ms) over a sample of rows"""
+    cursor.execute(f"SELECT COUNT(form_data), COALESCE(SUM(LENGTH(form_data)), 0) FROM {table}")
+    rows, stored_bytes = cursor.fetchone()
+    cursor.execute(f"SELECT form_data FROM {table} WHERE form_data IS NOT NULL ORDER BY {pk} DESC LIMIT %s",
+                   (SAMPLE_ROWS,))
+    sample = [row[0] for row in cursor.fetchall()]
+    started = time.perf_counter()
+    for value in sample:
+        decode_form_data(value)
+    parse_ms = (time.perf_counter() - started) * 1000 / max(len(sample), 1)
+    return {'rows': rows, 'bytes': int(stored_bytes), 'parse_ms': parse_ms}
+
+
+def convert_table(connection, cursor, database, table, batch_size):
+    """Switch the column to LONGBLOB and re-encode every legacy row"""
+    data_type, nullable = _column_info(cursor, database, table)
+    if data_type.lower() != 'longblob':
+        null_clause = 'NULL' if nullable == 'YES' else 'NOT NULL'
+        cursor.execute(f"ALTER TABLE {table} MODIFY COLUMN form_data LONGBLOB {null_clause}")
+        connection.commit()
+        print(f"  - {table}.form_data: {data_type} -> LONGBLOB")
+
+    pk = _primary_key(cursor, database, table)
+    last_id, converted = 0, 0
+    while True:
+        cursor.execute(f"""
+            SELECT {pk}, form_data FROM {table}
+            WHERE {pk} > %s AND form_data IS NOT NULL
+            ORDER BY {pk} LIMIT %s
+        """, (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for row_id, value in rows:
+            if is_encoded(value):
+                continue
+            try:
+                updates.append((encode_form_data(json.loads(value)), row_id))
+            except ValueError as e:
+                print(f"  ⚠️  {table} {pk}={row_id}: unreadable form_data left as is ({e})")
+        if updates:
+            cursor.executemany(f"UPDATE {table} SET form_data = %s WHERE {pk} = %s", updates)
+            connection.commit()
+            converted += len(updates)
+    return converted
+
+
+def run_migration(tables=TABLES, batch_size=500, stats_only=False):
+    """Convert form_data to the codec format, printing size and parse-time changes"""
+    try:
+        print("🔧 Starting form_data codec migration...")
+
+        connection = mysql.connector.connect(**DB_CONFIG)
+        cursor = connection.cursor()
+        print("✅ Connected to database")
+
+        for table in tables:
+            if not _column_info(cursor, DB_CONFIG['database'], table):
+                print(f"⏭️  {table}: no form_data column, skipping")
+                continue
+            pk = _primary_key(cursor, DB_CONFIG['database'], table)
+
+            before = table_stats(cursor, table, pk)
+            print(f"📊 {table}: {before['rows']} rows, {before['bytes'] / 1024:.1f} KiB, "
+                  f"{before['parse_ms']:.3f} ms/parse")
+            if stats_only:
+                continue
+
+            converted = convert_table(connection, cursor, DB_CONFIG['database'], table, batch_size)
+            after = table_stats(cursor, table, pk)
+            saved = 100 * (1 - after['bytes'] / before['bytes']) if before['bytes'] else 0
+            print(f"✅ {table}: re-encoded {converted} rows, {after['bytes'] / 1024:.1f} KiB "
+                  f"({saved:.0f}% smaller), {after['parse_ms']:.3f} ms/parse")
+
+        cursor.close()
+        connection.close()
+        print("\n🎉 Migration completed successfully!")
+        return True
+
+    except mysql.connector.Error as e:
+        print(f"❌ Database error: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Store form_data in the compact codec format')
+    parser.add_argument('--table', choices=TABLES, help='only convert this table')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--stats-only', action='store_true', help='report sizes without converting')
+    args = parser.parse_args()
+    tables = (args.table,) if args.table else TABLES
+    sys.exit(0 if run_migration(tables, args.batch_size, args.stats_only) else 1)
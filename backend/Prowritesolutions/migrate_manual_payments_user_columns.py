@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Database migration: indexed user_id / user_email / phone_number columns on manual_payments
+
+Payment history and document tracking used to find a user's manual payments with
+JSON_EXTRACT(form_data, ...) predicates, which parse the JSON of every row (full
+table scan). This migration adds real columns with indexes, backfills them from
+the existing form_data (plain JSON or form_codec-encoded) and benchmarks the old
+and new queries.
+
+    python migrate_manual_payments_user_columns.py [--benchmark-user USER_ID] [--iterations N]
+"""
+import os
+import sys
+import time
+import argparse
+import mysql.connector
+from dotenv import load_dotenv
+
+from form_codec import decode_form_data
+
+# Load environment variables
+load_dotenv('.env')
+
+# Database configuration
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'Prowrite.mysql.pythonanywhere-services.com'),
+    'user': os.getenv('DB_USER', 'Prowrite'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'database': os.getenv('DB_NAME', 'Prowrite$dbprowrite'),
+    'charset': 'utf8mb4'
+}
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Column definitions and indexes shared with FastManualPaymentService._init_database
+USER_COLUMNS = {
+    'user_id': "INT NULL COMMENT 'Owner of the payment (users primary key)'",
+    'user_email': "VARCHAR(255) NULL COMMENT 'Customer email, copied from form_data.personalEmail'",
+    'phone_number': "VARCHAR(20) NULL COMMENT 'Customer phone, copied from form_data.personalPhone'",
+}
+USER_INDEXES = {
+    'idx_manual_payments_user_id': '(user_id, created_at)',
+    'idx_manual_payments_user_email': '(user_email, created_at)',
+}
+
+OLD_HISTORY_QUERY = """
+    SELECT id, amount, status, reference, created_at, JSON_EXTRACT(form_data, '$.personalPhone')
+    FROM manual_payments
+    WHERE JSON_EXTRACT(form_data, '$.user_id') = %s OR JSON_EXTRACT(form_data, '$.personalEmail') = %s
+    ORDER BY created_at DESC
+"""
+
+NEW_HISTORY_QUERY = """
+    SELECT id, amount, status, reference, created_at, phone_number
+    FROM manual_payments WHERE user_id = %s
+    UNION
+    SELECT id, amount, status, reference, created_at, phone_number
+    FROM manual_payments WHERE user_email = %s
+    ORDER BY created_at DESC
+"""
+
+
+def ensure_user_columns(cursor, database):
+    """Add the user columns and indexes if they are missing (idempotent)"""
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'manual_payments'
+    """, (database,))
+    existing_columns = {row[0] for row in cursor.fetchall()}
+    added = []
+    for column, definition in USER_COLUMNS.items():
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE manual_payments ADD COLUMN {column} {definition}")
+            added.append(column)
+
+    cursor.execute("""
+        SELECT DISTINCT INDEX_NAME FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'manual_payments'
+    """, (database,))
+    existing_indexes = {row[0] for row in cursor.fetchall()}
+    for index, columns in USER_INDEXES.items():
+        if index not in existing_indexes:
+            cursor.execute(f"CREATE INDEX {index} ON manual_payments {columns}")
+            added.append(index)
+    return added
+
+
+def _users_primary_key(cursor, database):
+    """Older databases use users.id, newer ones users.user_id"""
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'users' AND COLUMN_NAME IN ('user_id', 'id')
+    """, (database,))
+    columns = {row[0] for row in cursor.fetchall()}
+    if 'user_id' in columns:
+        return 'user_id'
+    return 'id' if 'id' in columns else None
+
+
+def _user_fields(form_data):
+    """(user_id, user_email, phone_number) carried in a decoded form_data payload"""
+    if not isinstance(form_data, dict):
+        return None, None, None
+    user_id = str(form_data.get('user_id') or '')
+    email = form_data.get('personalEmail')
+    phone = form_data.get('personalPhone')
+    return (int(user_id) if user_id.isdigit() else None,
+            email if isinstance(email, str) and email not in ('', 'null') else None,
+            str(phone)[:20] if phone else None)
+
+
+def backfill(connection, cursor, database):
+    """Copy user fields out of form_data in id-ordered batches
+
+    form_data is decoded in Python with form_codec, so rows that
+    migrate_form_data_codec.py has already compressed are backfilled too.
+    """
+    last_id, updated = 0, 0
+    while True:
+        cursor.execute("""
+            SELECT id, form_data, user_id, user_email, phone_number FROM manual_payments
+            WHERE id > %s AND (user_email IS NULL OR phone_number IS NULL OR user_id IS NULL)
+            ORDER BY id LIMIT %s
+        """, (last_id, BACKFILL_BATCH_SIZE))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for row_id, form_data, user_id, user_email, phone_number in rows:
+            try:
+                form_user_id, form_email, form_phone = _user_fields(decode_form_data(form_data))
+            except ValueError as e:
+                print(f"  ⚠️  manual_payments id={row_id}: unreadable form_data skipped ({e})")
+                continue
+            current = (user_id, user_email, phone_number)
+            filled = (user_id if user_id is not None else form_user_id,
+                      user_email or form_email, phone_number or form_phone)
+            if filled != current:
+                updates.append(filled + (row_id,))
+        if updates:
+            cursor.executemany("""
+                UPDATE manual_payments SET user_id = %s, user_email = %s, phone_number = %s WHERE id = %s
+            """, updates)
+            connection.commit()
+            updated += len(updates)
+
+    users_pk = _users_primary_key(cursor, database)
+    if users_pk:
+        cursor.execute(f"""
+            UPDATE manual_payments
+            SET user_id = (SELECT u.{users_pk} FROM users u WHERE u.email = manual_payments.user_email LIMIT 1)
+            WHERE user_id IS NULL AND user_email IN (SELECT email FROM users)
+        """)
+        print(f"  - linked {cursor.rowcount} payments to users by email")
+    connection.commit()
+    return updated
+
+
+def benchmark(cursor, query, params, iterations):
+    """Average wall time of a query (ms) plus its EXPLAIN (table, access type, key) rows"""
+    cursor.execute("EXPLAIN " + query, params)
+    plan = [(row[2], row[4], row[6]) for row in cursor.fetchall()]
+    started = time.perf_counter()
+    for _ in range(iterations):
+        cursor.execute(query, params)
+        cursor.fetchall()
+    elapsed_ms = (time.perf_counter() - started) * 1000 / max(iterations, 1)
+    return elapsed_ms, plan
+
+
+def run_migration(benchmark_user=None, iterations=20):
+    """Add, index and backfill the manual_payments user columns"""
+    try:
+        print("🔧 Starting manual_payments user column migration...")
+
+        connection = mysql.connector.connect(**DB_CONFIG)
+        cursor = connection.cursor()
+        print("✅ Connected to database")
+
+        bench_params = None
+        if benchmark_user is not None:
+            users_pk = _users_primary_key(cursor, DB_CONFIG['database'])
+            cursor.execute(f"SELECT email FROM users WHERE {users_pk} = %s", (benchmark_user,))
+            row = cursor.fetchone()
+            bench_params = (benchmark_user, row[0] if row else '')
+            before_ms, before_plan = benchmark(cursor, OLD_HISTORY_QUERY, bench_params, iterations)
+            print(f"⏱️  Before: {before_ms:.2f} ms/query (JSON_EXTRACT scan), plan: {before_plan}")
+
+        added = ensure_user_columns(cursor, DB_CONFIG['database'])
+        connection.commit()
+        print(f"✅ Schema ready ({', '.join(added) if added else 'nothing to add'})")
+
+        updated = backfill(connection, cursor, DB_CONFIG['database'])
+        print(f"✅ Backfilled {updated} rows from form_data")
+
+        if bench_params is not None:
+            after_ms, after_plan = benchmark(cursor, NEW_HISTORY_QUERY, bench_params, iterations)
+            print(f"⏱️  After:  {after_ms:.2f} ms/query (indexed columns), plan: {after_plan}")
+            if after_ms:
+                print(f"🚀 Speedup: {before_ms / after_ms:.1f}x")
+
+        cursor.close()
+        connection.close()
+        print("\n🎉 Migration completed successfully!")
+        return True
+
+    except mysql.connector.Error as e:
+        print(f"❌ Database error: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Add indexed user columns to manual_payments')
+    parser.add_argument('--benchmark-user', type=int, help='user id to benchmark the history query with')
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+    sys.exit(0 if run_migration(args.benchmark_user, args.iterations) else 1)
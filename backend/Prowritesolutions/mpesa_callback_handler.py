@@ -42,7 +42,7 @@ def process_paid_submission(submission_id: int) -> bool:
         
         cursor = connection.cursor(dictionary=True)
         cursor.execute("""
-            SELECT fs.*, u.email as user_email, u.first_name, u.last_name
+            SELECT fs.id, fs.status, u.email as user_email, u.first_name, u.last_name
             FROM form_submissions fs
             JOIN users u ON fs.user_id = u.id
             WHERE fs.id = %s
@@ -155,7 +155,7 @@ def handle_mpesa_callback():
                     
                     # Find submission by payment
                     cursor.execute("""
-                        SELECT fs.id, fs.user_id, fs.document_type, fs.form_data, fs.amount
+                        SELECT fs.id, fs.user_id, fs.document_type, fs.amount
                         FROM form_submissions fs
                         JOIN payments p ON fs.payment_id = p.id
                         WHERE p.mpesa_checkout_request_id = %s
@@ -164,7 +164,7 @@ def handle_mpesa_callback():
                     submission = cursor.fetchone()
                     
                     if submission:
-                        submission_id, user_id, doc_type, form_data, amount = submission
+                        submission_id, user_id, doc_type, amount = submission
                         
                         # Update submission status to paid
                         cursor.execute("""
@@ -11,6 +11,10 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 from mpesa_service import mpesa_service
+from mpesa_settlement import mpesa_settlement
+from stk_reconciler import stk_reconciler
+from form_codec import encode_for_column
+from rate_limiter import rate_limit
 import threading
 import time
 
@@ -66,27 +70,22 @@ def create_payment_record(user_id, amount, checkout_request_id, merchant_request
         # Generate reference
         reference = f"MPESA_{int(time.time())}_{user_id}"
         
+        # Form data is stored in the compact codec format with the payment row
         cursor.execute("""
             INSERT INTO payments (
                 user_id, amount, status, payment_type, item_id, 
                 checkout_request_id, merchant_request_id, phone_number,
-                payment_method, created_at
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                payment_method, created_at, form_data
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """, (
             user_id, amount, 'pending', document_type, 0,
             checkout_request_id, merchant_request_id, phone_number,
-            'mpesa_stk', datetime.now()
+            'mpesa_stk', datetime.now(),
+            encode_for_column(cursor, 'payments', form_data) if form_data else None
         ))
         
         payment_id = cursor.lastrowid
         
-        # Store form data in JSON format
-        import json
-        form_data_json = json.dumps(form_data) if form_data else None
-        cursor.execute("""
-            UPDATE payments SET form_data = %s WHERE payment_id = %s
-        """, (form_data_json, payment_id))
-        
         conn.commit()
         cursor.close()
         conn.close()
@@ -172,6 +171,7 @@ def trigger_pdf_generation(payment_id, form_data, document_type, user_email):
     thread.start()
 
 @mpesa_bp.route('/initiate', methods=['POST'])
+@rate_limit('payment')
 def initiate_stk_push():
     """Initiate M-Pesa STK Push payment"""
     try:
@@ -283,165 +283,74 @@ def initiate_stk_push():
 
 @mpesa_bp.route('/callback', methods=['POST'])
 def mpesa_callback():
-    """Handle M-Pesa callback"""
+    """
+    Handle M-Pesa callback
+    
+    The raw payload is stored and acknowledged immediately; payment updates,
+    logging and document generation happen in the settlement worker.
+    """
     try:
-        callback_data = request.get_json()
-        logger.info(f"M-Pesa callback received: {callback_data}")
-        
-        # Process callback data
-        result = mpesa_service.process_callback(callback_data)
-        
-        if result['success']:
-            checkout_request_id = result['checkout_request_id']
-            
-            # Find payment record
-            conn = get_db_connection()
-            cursor = conn.cursor(dictionary=True)
-            
-            cursor.execute("""
-                SELECT payment_id, user_id, amount, form_data, payment_type, status
-                FROM payments 
-                WHERE checkout_request_id = %s
-            """, (checkout_request_id,))
-            
-            payment = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            
-            if payment:
-                # Update payment status
-                if result['status'] == 'completed':
-                    update_payment_status(
-                        payment['payment_id'], 
-                        'completed', 
-                        mpesa_receipt=result.get('mpesa_receipt_number')
-                    )
-                    
-                    # Trigger PDF generation
-                    trigger_pdf_generation(
-                        payment['payment_id'],
-                        payment['form_data'],
-                        payment['payment_type'],
-                        payment.get('user_email', 'user@example.com')
-                    )
-                    
-                    # Log callback received
-                    log_payment_action(payment['payment_id'], 'callback_received', {
-                        'mpesa_receipt': result.get('mpesa_receipt_number'),
-                        'amount': result.get('amount'),
-                        'phone_number': result.get('phone_number')
-                    })
-                    
-                else:
-                    update_payment_status(
-                        payment['payment_id'], 
-                        'failed', 
-                        failure_reason=result.get('result_description', 'Payment failed')
-                    )
-                
-                # Return acknowledgment to M-Pesa
-                return jsonify({
-                    "ResultCode": 0,
-                    "ResultDesc": "Success"
-                })
-            else:
-                logger.error(f"Payment not found for checkout_request_id: {checkout_request_id}")
-                return jsonify({
-                    "ResultCode": 1,
-                    "ResultDesc": "Payment not found"
-                }), 404
-        else:
-            logger.error(f"Callback processing failed: {result.get('error')}")
+        callback_data = request.get_json(silent=True)
+        if not isinstance(callback_data, dict):
+            logger.error("M-Pesa callback with invalid JSON body")
             return jsonify({
                 "ResultCode": 1,
-                "ResultDesc": "Callback processing failed"
+                "ResultDesc": "Invalid callback payload"
             }), 400
+        
+        callback_id = mpesa_settlement.record_callback(callback_data)
+        logger.info(f"M-Pesa callback {callback_id} recorded for settlement")
+        
+        # Return acknowledgment to M-Pesa
+        return jsonify({
+            "ResultCode": 0,
+            "ResultDesc": "Accepted"
+        })
             
     except Exception as e:
-        logger.error(f"Error processing M-Pesa callback: {e}")
+        logger.error(f"Error recording M-Pesa callback: {e}")
         return jsonify({
             "ResultCode": 1,
             "ResultDesc": "Internal server error"
         }), 500
 
 @mpesa_bp.route('/status/<checkout_request_id>', methods=['GET'])
+@rate_limit('payment_status')
 def query_payment_status(checkout_request_id):
-    """Query payment status for frontend polling"""
+    """
+    Query payment status for frontend polling
+    
+    Answered from the database (via a short cache); Daraja is queried by the
+    background STK reconciler, never per poll.
+    """
     try:
-        # Add rate limiting - check if we've queried recently
-        import time
-        current_time = time.time()
+        payment = stk_reconciler.get_checkout_status(checkout_request_id)
         
-        # Simple in-memory rate limiting (in production, use Redis)
-        if not hasattr(query_payment_status, 'last_query_time'):
-            query_payment_status.last_query_time = {}
-        
-        last_query = query_payment_status.last_query_time.get(checkout_request_id, 0)
-        
-        # Rate limit: max 1 query per 10 seconds per checkout_request_id
-        if current_time - last_query < 10:
+        if not payment:
             return jsonify({
                 'success': False,
-                'error': 'Rate limited. Please wait before checking again.',
-                'status': 'pending'
-            }), 429
+                'error': 'Payment not found'
+            }), 404
         
-        query_payment_status.last_query_time[checkout_request_id] = current_time
+        response = {
+            'success': True,
+            'status': payment['status'],
+            'mpesa_status': payment['status'],
+            'payment_id': payment['payment_id'],
+            'amount': payment['amount'],
+            'payment_type': payment['payment_type'],
+            'created_at': payment['created_at'],
+            'result_code': payment['result_code'],
+            'result_description': payment['last_result_description'],
+            'last_checked_at': payment['last_checked_at']
+        }
         
-        # Query M-Pesa API for status
-        try:
-            result = mpesa_service.query_stk_status(checkout_request_id)
-        except Exception as e:
-            logger.error(f"Error querying STK status: {e}")
-            return jsonify({
-                'success': False,
-                'error': 'Failed to query payment status',
-                'status': 'pending'
-            }), 400
+        if payment['status'] == 'failed' and payment['result_code']:
+            response['error_code'] = payment['result_code']
+            response['error_category'] = categorize_error(payment['result_code'])
+            response['user_message'] = get_user_friendly_message(payment['result_code'])
         
-        if result['success']:
-            # Get payment record from database
-            conn = get_db_connection()
-            cursor = conn.cursor(dictionary=True)
-            
-            cursor.execute("""
-                SELECT payment_id, status, amount, payment_type, form_data, created_at
-                FROM payments 
-                WHERE checkout_request_id = %s
-            """, (checkout_request_id,))
-            
-            payment = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            
-            if payment:
-                return jsonify({
-                    'success': True,
-                    'status': payment['status'],
-                    'mpesa_status': result['status'],
-                    'payment_id': payment['payment_id'],
-                    'amount': payment['amount'],
-                    'payment_type': payment['payment_type'],
-                    'created_at': payment['created_at'].isoformat() if payment['created_at'] else None,
-                    'result_code': result.get('result_code'),
-                    'result_description': result.get('result_description')
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': 'Payment not found'
-                }), 404
-        else:
-            error_code = result.get('result_code', '')
-            error_message = result.get('error', 'Failed to query status')
-            
-            return jsonify({
-                'success': False,
-                'error': error_message,
-                'error_code': error_code,
-                'error_category': categorize_error(error_code),
-                'user_message': get_user_friendly_message(error_code)
-            }), 400
+        return jsonify(response)
             
     except Exception as e:
         logger.error(f"Error querying payment status: {e}")
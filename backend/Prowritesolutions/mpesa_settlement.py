@@ -0,0 +1,562 @@
+"""
+M-Pesa Callback Settlement
+Fast acknowledgement of Daraja STK callbacks with asynchronous settlement.
+
+The callback endpoint only stores the raw payload in `mpesa_callbacks` (one INSERT,
+deduplicated on CheckoutRequestID / receipt number) and answers Safaricom
+immediately. A settlement worker claims pending callbacks in batches and, on a
+single connection per batch, updates the matching payments, writes payment logs,
+feeds the till ledger and then triggers document generation. Settlement is
+idempotent: a payment only transitions out of 'pending' once, so replaying a
+callback never generates a second document. Receipts go into the till ledger as
+already used by the checkout they paid for, so they cannot be entered again as
+manual till codes.
+
+Inspect and replay recorded callbacks with:
+
+    python mpesa_settlement.py stats|process|worker
+    python mpesa_settlement.py replay <callback_id> [<callback_id> ...]
+    python mpesa_settlement.py replay --since "2025-01-01 00:00:00" [--status orphan]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from form_codec import decode_form_data
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv('MPESA_SETTLEMENT_BATCH_SIZE', 50))
+POLL_INTERVAL = float(os.getenv('MPESA_SETTLEMENT_POLL_INTERVAL', 2))
+CLAIM_LEASE_MINUTES = 5     # reclaim callbacks stuck in 'processing' after a crash
+MAX_ATTEMPTS = 5
+
+STATUS_PENDING = 'pending'
+STATUS_PROCESSING = 'processing'
+STATUS_SETTLED = 'settled'          # payment updated by this callback
+STATUS_DUPLICATE = 'duplicate'      # payment was already settled
+STATUS_ORPHAN = 'orphan'            # no payment with this CheckoutRequestID
+STATUS_INVALID = 'invalid'          # payload could not be parsed
+STATUS_FAILED = 'failed'            # settlement kept erroring
+
+FINAL_PAYMENT_STATUSES = ('completed', 'failed', 'cancelled')
+
+# Till ledger tag for STK receipts (never the manual payment till)
+STK_SHORT_CODE = os.getenv('MPESA_BUSINESS_SHORT_CODE') or os.getenv('MPESA_PAYBILL') or 'stk'
+
+
+def _extract_keys(callback_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pull the indexed fields out of a raw STK callback without raising"""
+    stk_callback = ((callback_data or {}).get('Body') or {}).get('stkCallback') or {}
+    receipt = None
+    for item in (stk_callback.get('CallbackMetadata') or {}).get('Item', []) or []:
+        if item.get('Name') == 'MpesaReceiptNumber' and item.get('Value'):
+            receipt = str(item['Value'])
+    result_code = stk_callback.get('ResultCode')
+    try:
+        result_code = int(result_code) if result_code is not None else None
+    except (TypeError, ValueError):
+        result_code = None
+    return {
+        'checkout_request_id': stk_callback.get('CheckoutRequestID'),
+        'merchant_request_id': stk_callback.get('MerchantRequestID'),
+        'result_code': result_code,
+        'mpesa_receipt': receipt
+    }
+
+
+class MpesaSettlementService:
+    """Durable callback inbox plus the worker that settles it"""
+
+    def __init__(self, batch_size: int = BATCH_SIZE, poll_interval: float = POLL_INTERVAL):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._initialized = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker = None
+        self._worker_pid = None
+
+    def _get_db_connection(self):
+        connection = mysql.connector.connect(
+            host=os.getenv('DB_HOST', 'Prowrite.mysql.pythonanywhere-services.com'),
+            user=os.getenv('DB_USER', 'Prowrite'),
+            password=os.getenv('DB_PASSWORD', ''),
+            database=os.getenv('DB_NAME', 'Prowrite$dbprowrite'),
+            port=int(os.getenv('DB_PORT', 3306))
+        )
+        if not self._initialized:
+            self._init_database(connection)
+        return connection
+
+    def _init_database(self, connection):
+        cursor = connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS mpesa_callbacks (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                checkout_request_id VARCHAR(100),
+                merchant_request_id VARCHAR(100),
+                mpesa_receipt VARCHAR(32),
+                result_code INT,
+                payload JSON NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                attempts INT NOT NULL DEFAULT 0,
+                deliveries INT NOT NULL DEFAULT 1,
+                last_error TEXT,
+                claim_token VARCHAR(36),
+                claimed_at DATETIME,
+                received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                processed_at DATETIME,
+                UNIQUE KEY uq_checkout (checkout_request_id),
+                UNIQUE KEY uq_receipt (mpesa_receipt),
+                INDEX idx_status (status, id),
+                INDEX idx_claim (claim_token)
+            )
+        """)
+        connection.commit()
+        cursor.close()
+        self._initialized = True
+        logger.info("M-Pesa callbacks table initialized")
+
+    # ----- ingest (request path) -----
+
+    def record_callback(self, callback_data: Dict[str, Any]) -> Optional[int]:
+        """
+        Durably store a raw callback. Daraja redeliveries of the same checkout or
+        receipt are folded into the existing row (deliveries is incremented); a
+        redelivery re-queues a row that was an orphan (callback raced the payment
+        insert) or that failed to settle. A delivery that brings the receipt a
+        row lacks (Daraja's callback after the STK query reconciler settled the
+        checkout) replaces the payload and re-queues the row so settlement can
+        backfill the payment's M-Pesa code and the till ledger.
+
+        Returns the callback row id. Raises if the database is unreachable so the
+        endpoint can answer with an error and Safaricom retries.
+        """
+        keys = _extract_keys(callback_data)
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                INSERT INTO mpesa_callbacks
+                (checkout_request_id, merchant_request_id, mpesa_receipt, result_code, payload)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                deliveries = deliveries + 1,
+                attempts = IF(status IN ('orphan', 'failed')
+                              OR (status <> 'processing' AND NULLIF(mpesa_receipt, '') IS NULL
+                                  AND VALUES(mpesa_receipt) IS NOT NULL), 0, attempts),
+                status = IF(status IN ('orphan', 'failed')
+                            OR (status <> 'processing' AND NULLIF(mpesa_receipt, '') IS NULL
+                                AND VALUES(mpesa_receipt) IS NOT NULL), 'pending', status),
+                payload = IF(NULLIF(mpesa_receipt, '') IS NULL AND VALUES(mpesa_receipt) IS NOT NULL,
+                             VALUES(payload), payload),
+                mpesa_receipt = COALESCE(NULLIF(mpesa_receipt, ''), VALUES(mpesa_receipt)),
+                id = LAST_INSERT_ID(id)
+            """, (
+                keys['checkout_request_id'],
+                keys['merchant_request_id'],
+                keys['mpesa_receipt'],
+                keys['result_code'],
+                json.dumps(callback_data)
+            ))
+            callback_id = cursor.lastrowid
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+        self._wake.set()
+        return callback_id
+
+    # ----- settlement -----
+
+    def _claim_batch(self, connection) -> List[Dict[str, Any]]:
+        token = str(uuid.uuid4())
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("""
+            UPDATE mpesa_callbacks
+            SET status = %s, claim_token = %s, claimed_at = NOW(), attempts = attempts + 1
+            WHERE status = %s
+               OR (status = %s AND claimed_at < NOW() - INTERVAL %s MINUTE)
+            ORDER BY id
+            LIMIT %s
+        """, (STATUS_PROCESSING, token, STATUS_PENDING, STATUS_PROCESSING, CLAIM_LEASE_MINUTES, self.batch_size))
+        connection.commit()
+        if cursor.rowcount == 0:
+            cursor.close()
+            return []
+        cursor.execute("""
+            SELECT id, checkout_request_id, mpesa_receipt, payload, attempts
+            FROM mpesa_callbacks WHERE claim_token = %s ORDER BY id
+        """, (token,))
+        rows = cursor.fetchall()
+        cursor.close()
+        for row in rows:
+            if isinstance(row['payload'], (bytes, bytearray, str)):
+                row['payload'] = json.loads(row['payload'])
+        return rows
+
+    def _settle_batch(self, connection, callbacks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply a batch of callbacks in one transaction. Returns the payments that
+        became completed so document generation can be triggered after commit.
+        """
+        from mpesa_service import mpesa_service
+        from till_ledger import SOURCE_CALLBACK, parse_transaction_time
+
+        parsed = []
+        for callback in callbacks:
+            result = mpesa_service.process_callback(callback['payload'])
+            if not result.get('checkout_request_id') or (result.get('error') and 'status' not in result):
+                parsed.append((callback, None))
+            else:
+                parsed.append((callback, result))
+
+        checkout_ids = list({result['checkout_request_id'] for _, result in parsed if result})
+        payments = {}
+        cursor = connection.cursor(dictionary=True)
+        if checkout_ids:
+            placeholders = ', '.join(['%s'] * len(checkout_ids))
+            cursor.execute(f"""
+                SELECT p.payment_id, p.checkout_request_id, p.user_id, p.amount, p.form_data, p.payment_type,
+                       p.status, u.email AS user_email
+                FROM payments p
+                LEFT JOIN users u ON u.user_id = p.user_id
+                WHERE p.checkout_request_id IN ({placeholders})
+            """, checkout_ids)
+            payments = {row['checkout_request_id']: row for row in cursor.fetchall()}
+
+        outcomes, logs, ledger_rows, completed = [], [], [], []
+        now = datetime.now()
+        for callback, result in parsed:
+            if result is None:
+                outcomes.append((STATUS_INVALID, 'unparseable callback payload', callback['id']))
+                continue
+
+            payment = payments.get(result['checkout_request_id'])
+            if result['status'] == 'completed' and result.get('mpesa_receipt_number'):
+                # Spent on this checkout: recorded as used so it cannot pay for anything else
+                used_by = f"stk:{payment['payment_id']}" if payment else f"stk:{result['checkout_request_id']}"
+                ledger_rows.append({
+                    'transaction_code': result['mpesa_receipt_number'],
+                    'amount': float(result.get('amount') or 0),
+                    'source': SOURCE_CALLBACK,
+                    'phone_number': str(result.get('phone_number') or '') or None,
+                    'transaction_time': parse_transaction_time(result.get('transaction_date')),
+                    'till_number': STK_SHORT_CODE,
+                    'raw_data': callback['payload'],
+                    'used_by_reference': used_by[:50]
+                })
+
+            if not payment:
+                logger.error(f"Payment not found for checkout_request_id: {result['checkout_request_id']}")
+                outcomes.append((STATUS_ORPHAN, None, callback['id']))
+                continue
+
+            # Conditional updates make settlement idempotent across retries/replays
+            if result['status'] == 'completed':
+                cursor.execute("""
+                    UPDATE payments
+                    SET status = 'completed', completed_at = %s, mpesa_code = %s
+                    WHERE payment_id = %s AND status NOT IN ('completed', 'failed', 'cancelled')
+                """, (now, result.get('mpesa_receipt_number'), payment['payment_id']))
+            else:
+                cursor.execute("""
+                    UPDATE payments
+                    SET status = 'failed', failure_reason = %s, updated_at = %s
+                    WHERE payment_id = %s AND status NOT IN ('completed', 'failed', 'cancelled')
+                """, (result.get('result_description', 'Payment failed'), now, payment['payment_id']))
+
+            if cursor.rowcount != 1:
+                if result['status'] == 'completed' and result.get('mpesa_receipt_number'):
+                    # Settled earlier from an STK query, which carries no receipt
+                    cursor.execute("""
+                        UPDATE payments SET mpesa_code = %s
+                        WHERE payment_id = %s AND status = 'completed' AND (mpesa_code IS NULL OR mpesa_code = '')
+                    """, (result['mpesa_receipt_number'], payment['payment_id']))
+                    if cursor.rowcount == 1:
+                        outcomes.append((STATUS_SETTLED, None, callback['id']))
+                        logs.append((payment['payment_id'], 'callback_received', json.dumps({
+                            'mpesa_receipt': result['mpesa_receipt_number'],
+                            'amount': result.get('amount'),
+                            'phone_number': result.get('phone_number'),
+                            'callback_id': callback['id']
+                        })))
+                        continue
+                outcomes.append((STATUS_DUPLICATE, None, callback['id']))
+                continue
+
+            outcomes.append((STATUS_SETTLED, None, callback['id']))
+            logs.append((payment['payment_id'], 'status_updated', json.dumps({
+                'new_status': result['status'],
+                'mpesa_receipt': result.get('mpesa_receipt_number'),
+                'failure_reason': None if result['status'] == 'completed' else result.get('result_description')
+            })))
+            if result['status'] == 'completed':
+                logs.append((payment['payment_id'], 'callback_received', json.dumps({
+                    'mpesa_receipt': result.get('mpesa_receipt_number'),
+                    'amount': result.get('amount'),
+                    'phone_number': result.get('phone_number'),
+                    'callback_id': callback['id']
+                })))
+                completed.append(payment)
+
+        if logs:
+            cursor.executemany("""
+                INSERT INTO payment_logs (payment_id, action, details)
+                VALUES (%s, %s, %s)
+            """, logs)
+        cursor.executemany("""
+            UPDATE mpesa_callbacks
+            SET status = %s, last_error = %s, processed_at = NOW(), claim_token = NULL
+            WHERE id = %s
+        """, outcomes)
+        connection.commit()
+        cursor.close()
+
+        if ledger_rows:
+            try:
+                from till_ledger import till_ledger
+                till_ledger.record_transactions(ledger_rows)
+            except Exception as e:
+                logger.error(f"Failed to record callbacks in till ledger: {e}")
+
+        return completed
+
+    def _release_failed(self, callbacks: List[Dict[str, Any]], error: Exception):
+        """Return a batch that errored to the queue (or give up after MAX_ATTEMPTS)"""
+        try:
+            connection = self._get_db_connection()
+            try:
+                cursor = connection.cursor()
+                cursor.executemany("""
+                    UPDATE mpesa_callbacks
+                    SET status = %s, last_error = %s, claim_token = NULL
+                    WHERE id = %s
+                """, [
+                    (STATUS_FAILED if callback['attempts'] >= MAX_ATTEMPTS else STATUS_PENDING,
+                     str(error)[:1000], callback['id'])
+                    for callback in callbacks
+                ])
+                connection.commit()
+                cursor.close()
+            finally:
+                connection.close()
+        except Exception as e:
+            logger.error(f"Failed to release callback batch: {e}")
+
+    def process_batch(self) -> int:
+        """Claim and settle one batch, returns the number of callbacks handled"""
+        connection = self._get_db_connection()
+        callbacks = []
+        try:
+            callbacks = self._claim_batch(connection)
+            if not callbacks:
+                return 0
+            completed = self._settle_batch(connection, callbacks)
+        except Exception as e:
+            logger.error(f"Error settling M-Pesa callbacks: {e}")
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            if callbacks:
+                self._release_failed(callbacks, e)
+            return 0
+        finally:
+            connection.close()
+
+        if completed:
+            from mpesa_routes import trigger_pdf_generation
+            for payment in completed:
+                trigger_pdf_generation(
+                    payment['payment_id'],
+                    decode_form_data(payment['form_data']),
+                    payment['payment_type'],
+                    payment['user_email'] or 'user@example.com'
+                )
+        logger.info(f"Settled {len(callbacks)} M-Pesa callbacks ({len(completed)} payments completed)")
+        return len(callbacks)
+
+    def flush(self, max_batches: int = 100) -> int:
+        """Settle everything currently pending (used by tests and the CLI)"""
+        total = 0
+        for _ in range(max_batches):
+            handled = self.process_batch()
+            if not handled:
+                break
+            total += handled
+        return total
+
+    # ----- replay / inspection -----
+
+    def replay(self, callback_ids: Optional[List[int]] = None, since: Optional[str] = None,
+               status: Optional[str] = None) -> int:
+        """
+        Queue recorded callbacks for settlement again. Safe to run at any time:
+        payments that are already settled are left untouched.
+        """
+        conditions, params = [], []
+        if callback_ids:
+            conditions.append(f"id IN ({', '.join(['%s'] * len(callback_ids))})")
+            params.extend(callback_ids)
+        if since:
+            conditions.append("received_at >= %s")
+            params.append(since)
+        if status:
+            conditions.append("status = %s")
+            params.append(status)
+        if not conditions:
+            raise ValueError("replay needs callback ids, since or status")
+
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"""
+                UPDATE mpesa_callbacks
+                SET status = %s, attempts = 0, last_error = NULL, claim_token = NULL
+                WHERE {' AND '.join(conditions)} AND status <> %s
+            """, [STATUS_PENDING] + params + [STATUS_PROCESSING])
+            count = cursor.rowcount
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+        self._wake.set()
+        logger.info(f"Queued {count} M-Pesa callbacks for replay")
+        return count
+
+    def get_callback(self, callback_id: int) -> Optional[Dict[str, Any]]:
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT id, checkout_request_id, merchant_request_id, mpesa_receipt, result_code,
+                       status, attempts, deliveries, last_error, received_at, processed_at, payload
+                FROM mpesa_callbacks WHERE id = %s
+            """, (callback_id,))
+            row = cursor.fetchone()
+            cursor.close()
+        finally:
+            connection.close()
+        if not row:
+            return None
+        if isinstance(row['payload'], (bytes, bytearray, str)):
+            row['payload'] = json.loads(row['payload'])
+        for field in ('received_at', 'processed_at'):
+            if row[field]:
+                row[field] = row[field].isoformat()
+        return row
+
+    def get_stats(self) -> Dict[str, Any]:
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("SELECT status, COUNT(*) AS count FROM mpesa_callbacks GROUP BY status")
+            counts = {row['status']: row['count'] for row in cursor.fetchall()}
+            cursor.execute("""
+                SELECT TIMESTAMPDIFF(SECOND, MIN(received_at), NOW()) AS age
+                FROM mpesa_callbacks WHERE status IN (%s, %s)
+            """, (STATUS_PENDING, STATUS_PROCESSING))
+            row = cursor.fetchone()
+            cursor.execute("SELECT COALESCE(SUM(deliveries - 1), 0) AS redeliveries FROM mpesa_callbacks")
+            redeliveries = cursor.fetchone()['redeliveries']
+            cursor.close()
+        finally:
+            connection.close()
+        return {
+            'counts': counts,
+            'oldest_unsettled_age_seconds': int(row['age'] or 0) if row else 0,
+            'redeliveries': int(redeliveries or 0)
+        }
+
+    # ----- worker -----
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                handled = self.process_batch()
+            except Exception as e:
+                logger.error(f"M-Pesa settlement worker error: {e}")
+                handled = 0
+            if not handled:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def start_worker(self):
+        """Start the settlement thread (once per process)"""
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name='mpesa-settlement', daemon=True)
+        self._worker_pid = os.getpid()
+        self._worker.start()
+        logger.info("M-Pesa settlement worker started")
+
+    def stop_worker(self, timeout: float = 5):
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+
+mpesa_settlement = MpesaSettlementService()
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    command = argv[0] if argv else 'stats'
+
+    if command == 'stats':
+        print(json.dumps(mpesa_settlement.get_stats(), indent=2))
+        return 0
+    if command == 'process':
+        print(f"Settled {mpesa_settlement.flush()} callbacks")
+        return 0
+    if command == 'show' and len(argv) > 1:
+        print(json.dumps(mpesa_settlement.get_callback(int(argv[1])), indent=2, default=str))
+        return 0
+    if command == 'replay':
+        args = argv[1:]
+        since = status = None
+        ids = []
+        while args:
+            arg = args.pop(0)
+            if arg == '--since' and args:
+                since = args.pop(0)
+            elif arg == '--status' and args:
+                status = args.pop(0)
+            else:
+                ids.append(int(arg))
+        count = mpesa_settlement.replay(ids or None, since=since, status=status)
+        settled = mpesa_settlement.flush()
+        print(f"Replayed {count} callbacks, settled {settled}")
+        return 0
+    if command == 'worker':
+        mpesa_settlement.start_worker()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            mpesa_settlement.stop_worker()
+        return 0
+
+    print(__doc__)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
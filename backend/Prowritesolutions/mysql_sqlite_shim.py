@@ -0,0 +1,550 @@
+"""
+MySQL-on-SQLite Shim
+Runs the backend against a local SQLite file instead of MySQL, so the offline
+load-test harness (load_test_harness.py) needs no database server.
+
+`install(path)` replaces `mysql.connector.connect` in the current process.
+Statements are translated from the MySQL dialect the services use:
+
+    %s placeholders, AUTO_INCREMENT, ENUM, inline INDEX / UNIQUE KEY clauses,
+    ON DUPLICATE KEY UPDATE ... VALUES(col), INSERT IGNORE, IF(), NOW(),
+    `x - INTERVAL n UNIT`, TIMESTAMPDIFF, LAST_INSERT_ID(expr), GET_LOCK,
+    UPDATE ... ORDER BY ... LIMIT, DESCRIBE / SHOW TABLES and the
+    INFORMATION_SCHEMA COLUMNS / STATISTICS / TABLES views
+
+It is not a MySQL emulator: it covers the statements on the load-test
+scenarios' paths and is never used in production.
+"""
+
+import re
+import sqlite3
+import logging
+import threading
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+INTERVAL_UNITS = {'SECOND': 1, 'MINUTE': 60, 'HOUR': 3600, 'DAY': 86400, 'WEEK': 604800}
+BUSY_TIMEOUT = 30
+
+# MySQL error numbers the services look at
+ER_DUP_ENTRY = 1062
+ER_NO_SUCH_TABLE = 1146
+
+INFORMATION_SCHEMA_VIEWS = [
+    """CREATE TEMP VIEW IF NOT EXISTS information_schema_columns AS
+       SELECT DATABASE() AS TABLE_SCHEMA, m.name AS TABLE_NAME, p.name AS COLUMN_NAME,
+              p.cid + 1 AS ORDINAL_POSITION, p.dflt_value AS COLUMN_DEFAULT,
+              CASE WHEN p."notnull" OR p.pk THEN 'NO' ELSE 'YES' END AS IS_NULLABLE,
+              lower(CASE WHEN instr(p.type, '(') THEN substr(p.type, 1, instr(p.type, '(') - 1)
+                         ELSE p.type END) AS DATA_TYPE,
+              lower(p.type) AS COLUMN_TYPE,
+              CASE WHEN p.pk THEN 'PRI' ELSE '' END AS COLUMN_KEY
+       FROM sqlite_master m JOIN pragma_table_info(m.name) p
+       WHERE m.type = 'table'""",
+    """CREATE TEMP VIEW IF NOT EXISTS information_schema_statistics AS
+       SELECT DATABASE() AS TABLE_SCHEMA, m.name AS TABLE_NAME,
+              CASE WHEN l.origin = 'pk' THEN 'PRIMARY'
+                   WHEN substr(l.name, 1, length(m.name) + 1) = m.name || '_'
+                   THEN substr(l.name, length(m.name) + 2) ELSE l.name END AS INDEX_NAME,
+              1 - l."unique" AS NON_UNIQUE, i.seqno + 1 AS SEQ_IN_INDEX, i.name AS COLUMN_NAME
+       FROM sqlite_master m JOIN pragma_index_list(m.name) l JOIN pragma_index_info(l.name) i
+       WHERE m.type = 'table'""",
+    """CREATE TEMP VIEW IF NOT EXISTS information_schema_tables AS
+       SELECT DATABASE() AS TABLE_SCHEMA, name AS TABLE_NAME, 'BASE TABLE' AS TABLE_TYPE
+       FROM sqlite_master WHERE type = 'table'""",
+]
+
+
+# ----- type adapters -----
+
+def _adapt_datetime(value: datetime) -> str:
+    return value.strftime(DATETIME_FORMAT)
+
+
+def _convert_datetime(value: bytes) -> Any:
+    text = value.decode()
+    for fmt in (DATETIME_FORMAT, '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return text
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(bytearray, bytes)
+for _name in ('DATETIME', 'TIMESTAMP'):
+    sqlite3.register_converter(_name, _convert_datetime)
+sqlite3.register_converter('DATE', lambda value: datetime.strptime(value.decode()[:10], '%Y-%m-%d').date())
+
+
+# ----- SQL functions MySQL has and SQLite lacks -----
+
+def _now() -> str:
+    return datetime.now().strftime(DATETIME_FORMAT)
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value
+    converted = _convert_datetime(str(value).encode())
+    return converted if isinstance(converted, datetime) else None
+
+
+def _date_add(value, amount, unit) -> Optional[str]:
+    moment = _parse_time(value)
+    if moment is None or amount is None:
+        return None
+    seconds = float(amount) * INTERVAL_UNITS[str(unit).upper()]
+    return (moment + timedelta(seconds=seconds)).strftime(DATETIME_FORMAT)
+
+
+def _timestampdiff(unit, start, end) -> Optional[int]:
+    start, end = _parse_time(start), _parse_time(end)
+    if start is None or end is None:
+        return None
+    return int((end - start).total_seconds() // INTERVAL_UNITS[str(unit).upper()])
+
+
+def _unix_timestamp(value=None) -> int:
+    moment = datetime.now() if value is None else _parse_time(value)
+    return int(moment.timestamp()) if moment else 0
+
+
+def _concat(*parts) -> Optional[str]:
+    if any(part is None for part in parts):
+        return None
+    return ''.join(str(part) for part in parts)
+
+
+# ----- statement translation -----
+
+_QUOTED = re.compile(r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)")
+_INLINE_INDEX = re.compile(r'^\s*(?:UNIQUE\s+)?(?:INDEX|KEY)\s+`?(\w+)`?\s*\(([^)]*)\)\s*$', re.I)
+_UNIQUE_KEY = re.compile(r'^\s*UNIQUE\s+(?:KEY|INDEX)\s+`?\w+`?\s*(\([^)]*\))\s*$', re.I)
+_FULLTEXT = re.compile(r'^\s*FULLTEXT\s+(?:KEY|INDEX)\b', re.I)
+_PRIMARY_KEY = re.compile(r'^\s*PRIMARY\s+KEY\s*\(\s*`?(\w+)`?\s*\)\s*$', re.I)
+_TABLE_OPTIONS = re.compile(
+    r'\)\s*((?:ENGINE|DEFAULT\s+CHARSET|CHARSET|CHARACTER\s+SET|COLLATE|AUTO_INCREMENT|COMMENT)\b[^;]*)$', re.I)
+_UPDATE_LIMIT = re.compile(
+    r'^\s*UPDATE\s+(\w+)\s+(SET\s.*?)\s+WHERE\s+(.*?)\s+(ORDER\s+BY\s+.*?\s+)?LIMIT\s+(\S+)\s*$', re.I | re.S)
+_INTERVAL_ARITHMETIC = re.compile(
+    r'(NOW\(\)|CURRENT_TIMESTAMP|[\w.]+)\s*([-+])\s*INTERVAL\s+(\?|\d+)\s+(SECOND|MINUTE|HOUR|DAY|WEEK)\b', re.I)
+_DATE_ADD_SUB = re.compile(r'\bDATE_(ADD|SUB)\(\s*([^,]+?)\s*,\s*INTERVAL\s+(\?|\d+)\s+(SECOND|MINUTE|HOUR|DAY|WEEK)\s*\)', re.I)
+
+
+def _split_outside_quotes(sql: str):
+    """Yield (is_quoted, text) chunks so rewrites never touch string literals"""
+    position = 0
+    for match in _QUOTED.finditer(sql):
+        if match.start() > position:
+            yield False, sql[position:match.start()]
+        yield True, match.group(0)
+        position = match.end()
+    if position < len(sql):
+        yield False, sql[position:]
+
+
+def _rewrite_code(sql: str, rewrite) -> str:
+    return ''.join(text if quoted else rewrite(text) for quoted, text in _split_outside_quotes(sql))
+
+
+def _split_top_level(body: str, separator: str = ',') -> List[str]:
+    parts, depth, current, quote = [], 0, [], None
+    for char in body:
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = None
+            continue
+        if char in ("'", '"', '`'):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    if ''.join(current).strip():
+        parts.append(''.join(current))
+    return parts
+
+
+def _column_definition(definition: str) -> str:
+    definition = re.sub(r'\bON\s+UPDATE\s+CURRENT_TIMESTAMP(\(\))?', '', definition, flags=re.I)
+    definition = re.sub(r'\bENUM\s*\([^)]*\)', 'TEXT', definition, flags=re.I)
+    definition = re.sub(r'\bUNSIGNED\b', '', definition, flags=re.I)
+    definition = re.sub(r"\bCOMMENT\s+'(?:[^']|'')*'", '', definition, flags=re.I)
+    definition = re.sub(r'\b(?:CHARACTER\s+SET|CHARSET|COLLATE)\s+\w+', '', definition, flags=re.I)
+    definition = re.sub(r'\bAFTER\s+`?\w+`?\s*$', '', definition, flags=re.I)
+    definition = re.sub(r'\bDEFAULT\s+CURRENT_TIMESTAMP(\(\))?', "DEFAULT (datetime('now', 'localtime'))",
+                        definition, flags=re.I)
+    if re.search(r'\bAUTO_INCREMENT\b', definition, re.I):
+        name = definition.split()[0]
+        return f"{name} INTEGER PRIMARY KEY AUTOINCREMENT"
+    return definition
+
+
+def _translate_create_table(sql: str) -> List[str]:
+    header, _, rest = sql.partition('(')
+    body = rest[:rest.rindex(')')]
+    table = header.split()[-1].strip('`')
+    columns, extra = [], []
+    auto_increment_column = None
+    for part in _split_top_level(body):
+        stripped = part.strip()
+        if not stripped:
+            continue
+        if _FULLTEXT.match(stripped):
+            continue
+        unique = _UNIQUE_KEY.match(stripped)
+        if unique:
+            columns.append(f"UNIQUE {unique.group(1)}")
+            continue
+        index = _INLINE_INDEX.match(stripped)
+        if index:
+            extra.append(f"CREATE INDEX IF NOT EXISTS {table}_{index.group(1)} ON {table} ({index.group(2)})")
+            continue
+        primary = _PRIMARY_KEY.match(stripped)
+        if primary and auto_increment_column == primary.group(1):
+            continue
+        if stripped.upper().startswith(('PRIMARY KEY', 'FOREIGN KEY', 'CONSTRAINT', 'CHECK')):
+            columns.append(stripped)
+            continue
+        if re.search(r'\bAUTO_INCREMENT\b', stripped, re.I):
+            auto_increment_column = stripped.split()[0].strip('`')
+        columns.append(_column_definition(stripped))
+    columns = [column for column in columns
+               if not (auto_increment_column and _PRIMARY_KEY.match(column)
+                       and _PRIMARY_KEY.match(column).group(1) == auto_increment_column)]
+    return [f"{header.strip()} (\n    " + ',\n    '.join(columns) + "\n)"] + extra
+
+
+def _translate_alter_table(sql: str) -> List[str]:
+    match = re.match(r'^\s*ALTER\s+TABLE\s+`?(\w+)`?\s+(.*)$', sql, re.I | re.S)
+    table, clauses = match.group(1), match.group(2)
+    statements = []
+    for clause in _split_top_level(clauses):
+        clause = clause.strip()
+        index = re.match(r'^ADD\s+(UNIQUE\s+)?(?:INDEX|KEY)\s+`?(\w+)`?\s*\(([^)]*)\)$', clause, re.I)
+        if index:
+            unique = 'UNIQUE ' if index.group(1) else ''
+            statements.append(
+                f"CREATE {unique}INDEX IF NOT EXISTS {table}_{index.group(2)} ON {table} ({index.group(3)})")
+            continue
+        column = re.match(r'^ADD\s+(?:COLUMN\s+)?(.*)$', clause, re.I | re.S)
+        if column:
+            statements.append(f"ALTER TABLE {table} ADD COLUMN {_column_definition(column.group(1))}")
+            continue
+        drop_index = re.match(r'^DROP\s+(?:INDEX|KEY)\s+`?(\w+)`?$', clause, re.I)
+        if drop_index:
+            statements.append(f"DROP INDEX IF EXISTS {table}_{drop_index.group(1)}")
+            continue
+        # MODIFY / CHANGE COLUMN: SQLite columns are dynamically typed already
+        logger.debug(f"SQLite shim ignores ALTER TABLE clause: {clause}")
+    return statements
+
+
+def _rewrite_expressions(sql: str) -> str:
+    def rewrite(text: str) -> str:
+        text = text.replace('%%', '\0').replace('%s', '?').replace('\0', '%')
+        text = re.sub(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', 'ON CONFLICT DO UPDATE SET', text, flags=re.I)
+        text = re.sub(r'\bVALUES\s*\(\s*`?(\w+)`?\s*\)', r'excluded.\1', text, flags=re.I)
+        text = re.sub(r'\bINSERT\s+IGNORE\b', 'INSERT OR IGNORE', text, flags=re.I)
+        text = re.sub(r'\bIF\s*\(', 'iif(', text)
+        text = re.sub(r'\bIFNULL\s*\(', 'ifnull(', text, flags=re.I)
+        text = _DATE_ADD_SUB.sub(
+            lambda m: f"DATE_ADD_SHIM({m.group(2)}, {'-' if m.group(1).upper() == 'SUB' else ''}({m.group(3)}), "
+                      f"'{m.group(4).upper()}')", text)
+        text = _INTERVAL_ARITHMETIC.sub(
+            lambda m: f"DATE_ADD_SHIM({m.group(1)}, {'-' if m.group(2) == '-' else ''}({m.group(3)}), "
+                      f"'{m.group(4).upper()}')", text)
+        text = re.sub(r'\bTIMESTAMPDIFF\(\s*(\w+)\s*,', r"TIMESTAMPDIFF('\1',", text, flags=re.I)
+        text = re.sub(r'\bCURRENT_TIMESTAMP(\(\))?', 'NOW()', text, flags=re.I)
+        text = re.sub(r'\bCURDATE\(\)', "date('now', 'localtime')", text, flags=re.I)
+        text = re.sub(r'\bINFORMATION_SCHEMA\.(COLUMNS|STATISTICS|TABLES)\b',
+                      lambda m: f"information_schema_{m.group(1).lower()}", text, flags=re.I)
+        text = re.sub(r'\bFOR\s+UPDATE(\s+SKIP\s+LOCKED|\s+NOWAIT)?\b', '', text, flags=re.I)
+        text = re.sub(r'\bLOCK\s+IN\s+SHARE\s+MODE\b', '', text, flags=re.I)
+        return text.replace('`', '"')
+    return _rewrite_code(sql, rewrite)
+
+
+def translate(sql: str) -> List[str]:
+    """Translate one MySQL statement into the SQLite statements that implement it"""
+    sql = sql.strip().rstrip(';')
+    upper = sql.upper()
+
+    if re.match(r'^(CREATE\s+DATABASE|USE\s|SET\s|DROP\s+DATABASE|LOCK\s+TABLES|UNLOCK\s+TABLES)', upper):
+        return []
+    if re.match(r'^START\s+TRANSACTION|^BEGIN\b', upper):
+        return ['BEGIN']
+    describe = re.match(r'^(?:DESCRIBE|DESC|SHOW\s+COLUMNS\s+FROM)\s+`?(\w+)`?$', sql, re.I)
+    if describe:
+        return [f"""SELECT name AS Field, type AS Type,
+                           CASE WHEN "notnull" THEN 'NO' ELSE 'YES' END AS "Null",
+                           CASE WHEN pk THEN 'PRI' ELSE '' END AS "Key", dflt_value AS "Default", '' AS Extra
+                    FROM pragma_table_info('{describe.group(1)}')"""]
+    show_tables = re.match(r"^SHOW\s+TABLES(?:\s+LIKE\s+('[^']*'|%s))?$", sql, re.I)
+    if show_tables:
+        like = show_tables.group(1)
+        where = f" AND name LIKE {'?' if like == '%s' else like}" if like else ''
+        return [f"SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'{where} ORDER BY name"]
+    show_index = re.match(r'^SHOW\s+(?:INDEX|INDEXES|KEYS)\s+FROM\s+`?(\w+)`?$', sql, re.I)
+    if show_index:
+        return [f"""SELECT TABLE_NAME AS "Table", NON_UNIQUE AS Non_unique, INDEX_NAME AS Key_name,
+                           SEQ_IN_INDEX AS Seq_in_index, COLUMN_NAME AS Column_name
+                    FROM information_schema_statistics WHERE TABLE_NAME = '{show_index.group(1)}'"""]
+
+    if re.match(r'^CREATE\s+TABLE', upper):
+        sql = _TABLE_OPTIONS.sub(')', sql)
+        return _translate_create_table(sql)
+    if re.match(r'^ALTER\s+TABLE', upper):
+        return _translate_alter_table(sql)
+    create_index = re.match(r'^CREATE\s+(UNIQUE\s+)?INDEX\s+`?(\w+)`?\s+ON\s+`?(\w+)`?\s*(\(.*\))$', sql, re.I | re.S)
+    if create_index:
+        unique = 'UNIQUE ' if create_index.group(1) else ''
+        return [f"CREATE {unique}INDEX IF NOT EXISTS {create_index.group(3)}_{create_index.group(2)} "
+                f"ON {create_index.group(3)} {create_index.group(4)}"]
+
+    sql = _rewrite_expressions(sql)
+    update_limit = _UPDATE_LIMIT.match(sql)
+    if update_limit:
+        table, assignments, condition, order, limit = update_limit.groups()
+        sql = (f"UPDATE {table} {assignments} WHERE rowid IN "
+               f"(SELECT rowid FROM {table} WHERE {condition} {order or ''}LIMIT {limit})")
+    return [sql]
+
+
+# ----- DB-API objects with the mysql.connector surface the services use -----
+
+def _mysql_error(error: sqlite3.Error) -> mysql.connector.Error:
+    message = str(error)
+    if isinstance(error, sqlite3.IntegrityError):
+        errno = ER_DUP_ENTRY if 'UNIQUE' in message else None
+        return mysql.connector.IntegrityError(msg=message, errno=errno)
+    if 'no such table' in message:
+        return mysql.connector.ProgrammingError(msg=message, errno=ER_NO_SUCH_TABLE)
+    if isinstance(error, sqlite3.OperationalError):
+        return mysql.connector.OperationalError(msg=message)
+    return mysql.connector.DatabaseError(msg=message)
+
+
+class ShimCursor:
+    def __init__(self, connection: 'ShimConnection', dictionary: bool = False):
+        self._connection = connection
+        self._cursor = connection._db.cursor()
+        self._dictionary = dictionary
+        self._rows: List[tuple] = []
+        self._position = 0
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    @property
+    def column_names(self) -> tuple:
+        return tuple(column[0] for column in self.description or ())
+
+    def _shape(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def execute(self, operation: str, params: Optional[Sequence[Any]] = None, multi: bool = False):
+        if isinstance(params, dict):
+            raise NotImplementedError("SQLite shim supports positional %s parameters only")
+        statements = translate(operation)
+        self._rows, self._position, self.description, self.rowcount = [], 0, None, -1
+        self._connection._last_insert_id_arg = None
+        try:
+            for sql in statements:
+                if sql == 'BEGIN':
+                    if not self._connection._db.in_transaction:
+                        self._connection._db.execute('BEGIN')
+                    continue
+                self._cursor.execute(sql, tuple(params or ()))
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        if self._cursor.description is not None:
+            self.description = self._cursor.description
+            self._rows = self._cursor.fetchall()
+            self.rowcount = len(self._rows)
+        else:
+            self.rowcount = self._cursor.rowcount
+        inserted = self._connection._last_insert_id_arg
+        self.lastrowid = inserted if inserted is not None else self._cursor.lastrowid
+        if self.lastrowid:
+            self._connection._last_insert_id = self.lastrowid
+        return None
+
+    def executemany(self, operation: str, seq_params: Sequence[Sequence[Any]]):
+        total = 0
+        for params in seq_params:
+            self.execute(operation, params)
+            total += max(self.rowcount, 0)
+        self.rowcount = total
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return self._shape(row)
+
+    def fetchmany(self, size: int = 1):
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return [self._shape(row) for row in rows]
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return [self._shape(row) for row in rows]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ShimConnection:
+    """mysql.connector-style connection over one sqlite3 connection"""
+
+    _locks: Dict[str, threading.Lock] = {}
+
+    def __init__(self, path: str, database: Optional[str] = None, autocommit: bool = False, **kwargs):
+        self.database = database
+        self._db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, detect_types=sqlite3.PARSE_DECLTYPES,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}')
+        self._last_insert_id = 0
+        self._last_insert_id_arg = None
+        self._register_functions()
+        for view in INFORMATION_SCHEMA_VIEWS:
+            self._db.execute(view)
+        self.autocommit = autocommit
+
+    def _register_functions(self):
+        db = self._db
+        db.create_function('NOW', 0, _now)
+        db.create_function('SYSDATE', 0, _now)
+        db.create_function('UTC_TIMESTAMP', 0, lambda: datetime.utcnow().strftime(DATETIME_FORMAT))
+        db.create_function('DATABASE', 0, lambda: self.database or 'main')
+        db.create_function('DATE_ADD_SHIM', 3, _date_add)
+        db.create_function('TIMESTAMPDIFF', 3, _timestampdiff)
+        db.create_function('UNIX_TIMESTAMP', -1, _unix_timestamp)
+        db.create_function('CONCAT', -1, _concat)
+        db.create_function('GREATEST', -1, lambda *values: max(values))
+        db.create_function('LEAST', -1, lambda *values: min(values))
+        db.create_function('LAST_INSERT_ID', -1, self._last_insert_id_function)
+        db.create_function('GET_LOCK', 2, self._get_lock)
+        db.create_function('RELEASE_LOCK', 1, self._release_lock)
+
+    def _last_insert_id_function(self, *args):
+        # LAST_INSERT_ID(expr) makes expr the statement's insert id (upsert idiom)
+        if args:
+            self._last_insert_id_arg = args[0]
+            return args[0]
+        return self._last_insert_id
+
+    def _get_lock(self, name, timeout) -> int:
+        # Named locks are process-local here (MySQL's are server-wide)
+        lock = self._locks.setdefault(name, threading.Lock())
+        timeout = float(timeout or 0)
+        if timeout < 0:
+            acquired = lock.acquire()
+        elif timeout == 0:
+            acquired = lock.acquire(blocking=False)
+        else:
+            acquired = lock.acquire(timeout=timeout)
+        return 1 if acquired else 0
+
+    def _release_lock(self, name) -> Optional[int]:
+        lock = self._locks.get(name)
+        if lock is None or not lock.locked():
+            return None
+        lock.release()
+        return 1
+
+    @property
+    def autocommit(self) -> bool:
+        return self._db.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, value: bool):
+        self._db.isolation_level = None if value else ''
+
+    def cursor(self, dictionary: bool = False, buffered: bool = None, **kwargs) -> ShimCursor:
+        return ShimCursor(self, dictionary=dictionary)
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+    def start_transaction(self, **kwargs):
+        if not self._db.in_transaction:
+            self._db.execute('BEGIN')
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._db.in_transaction
+
+    def is_connected(self) -> bool:
+        return self._db is not None
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0):
+        return None
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_installed_path = None
+
+
+def connect(path: str, **kwargs) -> ShimConnection:
+    return ShimConnection(path, **kwargs)
+
+
+def install(path: str):
+    """Route every mysql.connector.connect() in this process to the SQLite file at `path`"""
+    global _installed_path
+    _installed_path = path
+    mysql.connector.connect = lambda *args, **kwargs: ShimConnection(path, **kwargs)
+    logger.info(f"mysql.connector.connect routed to SQLite database {path}")
+
+
+def installed_path() -> Optional[str]:
+    return _installed_path
@@ -4,6 +4,7 @@ Creates cover letters matching the professional template structure
 """
 
 import os
+from io import BytesIO
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch
@@ -123,8 +124,18 @@ class ProfessionalCoverLetterGenerator:
         
         return styles
     
+    def generate_cover_letter_pdf_bytes(self, cover_letter_data):
+        """Render the cover letter into an in-memory buffer and return the PDF bytes (None on failure)"""
+        buffer = BytesIO()
+        if not self.generate_cover_letter_pdf(cover_letter_data, buffer):
+            return None
+        return buffer.getvalue()
+
     def generate_cover_letter_pdf(self, cover_letter_data, output_path):
-        """Generate a professional cover letter PDF matching the template structure"""
+        """Generate a professional cover letter PDF matching the template structure
+
+        output_path may be a filesystem path or any writable file-like object (e.g. BytesIO).
+        """
         try:
             # Create the PDF document
             doc = SimpleDocTemplate(
@@ -0,0 +1,229 @@
+"""
+Rate Limiter
+Token-bucket rate limits for the AI, payment and auth endpoints, shared by all
+gunicorn workers on a host.
+
+Each (policy, client) pair is one bucket row in a small SQLite database: the
+bucket holds up to `capacity` tokens and refills at capacity/period per second;
+a request takes one token or is answered 429 with a Retry-After header. A
+bucket that has been idle long enough to refill is indistinguishable from a
+missing one, so such rows are pruned and storage stays proportional to the
+number of recently active clients.
+
+Routes declare their policy with a decorator, placed under `@jwt_required_custom`
+when there is one so the bucket is keyed by the authenticated user:
+
+    @ai_bp.route('/api/francisca/ai/enhance-field', methods=['POST'])
+    @rate_limit('ai')
+    def enhance_field(): ...
+
+Policies are "capacity/period_seconds" and can be overridden per policy with
+RATE_LIMIT_<NAME> (e.g. RATE_LIMIT_AI=30/60); RATE_LIMIT_ENABLED=false turns
+limiting off. Client IPs come from X-Forwarded-For when RATE_LIMIT_PROXY_HOPS
+says how many trusted proxies sit in front of the app.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import jsonify, request
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_DB_PATH = os.getenv('RATE_LIMIT_DB', os.path.join('data', 'rate_limits.db'))
+RATE_LIMIT_PROXY_HOPS = int(os.getenv('RATE_LIMIT_PROXY_HOPS', 0))
+PRUNE_INTERVAL = 60  # seconds between sweeps of idle buckets, per process
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    capacity: int
+    period: float
+    key: str = 'user'  # 'user' (authenticated user, else client IP) or 'ip'
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+
+def _policy(name: str, default: str, key: str) -> RateLimitPolicy:
+    capacity, _, period = os.getenv(f'RATE_LIMIT_{name.upper()}', default).partition('/')
+    return RateLimitPolicy(name, int(capacity), float(period), key)
+
+
+POLICIES: Dict[str, RateLimitPolicy] = {
+    # OpenAI-backed writing assistance (quota and cost)
+    'ai': _policy('ai', '20/60', 'user'),
+    # Password checks are deliberately slow; also slows credential stuffing
+    'auth': _policy('auth', '20/300', 'ip'),
+    # STK pushes and manual payment submissions
+    'payment': _policy('payment', '10/600', 'user'),
+    # Frontend polling of payment status
+    'payment_status': _policy('payment_status', '60/60', 'ip'),
+}
+
+
+def client_ip() -> str:
+    """The caller's address, looking through RATE_LIMIT_PROXY_HOPS trusted proxies"""
+    if RATE_LIMIT_PROXY_HOPS > 0:
+        forwarded = [part.strip() for part in request.headers.get('X-Forwarded-For', '').split(',') if part.strip()]
+        if len(forwarded) >= RATE_LIMIT_PROXY_HOPS:
+            return forwarded[-RATE_LIMIT_PROXY_HOPS]
+    return request.remote_addr or 'unknown'
+
+
+def client_key(policy: RateLimitPolicy) -> str:
+    if policy.key == 'user':
+        user = getattr(request, 'current_user', None)
+        if user is None:
+            auth_header = request.headers.get('Authorization', '')
+            if auth_header.startswith('Bearer '):
+                from app_core import auth_system
+                payload = auth_system.verify_token(auth_header[7:])
+                user = None if 'error' in payload else payload
+        if user and user.get('user_id') is not None:
+            return f"user:{user['user_id']}"
+    return f"ip:{client_ip()}"
+
+
+class RateLimiter:
+    """Token buckets in a host-local SQLite database shared by all workers"""
+
+    def __init__(self, db_path: str = RATE_LIMIT_DB_PATH, enabled: bool = RATE_LIMIT_ENABLED,
+                 clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.enabled = enabled
+        self.clock = clock
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._next_prune = 0.0
+        self.stats = {'allowed': 0, 'limited': 0, 'errors': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; limited routes are hit on every request
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._init_database()
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _init_database(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    bucket_key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_buckets_expires ON rate_buckets (expires_at)")
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def consume(self, policy: RateLimitPolicy, client: str, cost: float = 1.0) -> Tuple[bool, float, float]:
+        """
+        Take `cost` tokens from the client's bucket.
+
+        Returns (allowed, remaining_tokens, retry_after_seconds). Fails open if
+        the store is unavailable.
+        """
+        if not self.enabled:
+            return True, float(policy.capacity), 0.0
+        key = f"{policy.name}:{client}"
+        now = self.clock()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE bucket_key = ?",
+                                   (key,)).fetchone()
+                tokens = float(policy.capacity)
+                if row:
+                    tokens = min(tokens, row[0] + max(0.0, now - row[1]) * policy.refill_rate)
+                allowed = tokens >= cost
+                if allowed:
+                    tokens -= cost
+                # When the bucket will be full again, i.e. when the row stops mattering
+                expires_at = now + (policy.capacity - tokens) / policy.refill_rate
+                conn.execute("""
+                    INSERT INTO rate_buckets (bucket_key, tokens, updated_at, expires_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(bucket_key) DO UPDATE SET
+                        tokens = excluded.tokens, updated_at = excluded.updated_at, expires_at = excluded.expires_at
+                """, (key, tokens, now, expires_at))
+                if now >= self._next_prune:
+                    self._next_prune = now + PRUNE_INTERVAL
+                    conn.execute("DELETE FROM rate_buckets WHERE expires_at < ?", (now,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Rate limiter unavailable, allowing {key}: {e}")
+            return True, float(policy.capacity), 0.0
+
+        if allowed:
+            self.stats['allowed'] += 1
+            return True, tokens, 0.0
+        self.stats['limited'] += 1
+        return False, tokens, (cost - tokens) / policy.refill_rate
+
+    def bucket_count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0]
+
+
+def rate_limit(policy_name: str, limiter: Optional[RateLimiter] = None):
+    """Route decorator applying the named policy from POLICIES"""
+    policy = POLICIES[policy_name]
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method == 'OPTIONS':
+                return f(*args, **kwargs)
+            client = client_key(policy)
+            allowed, _, retry_after = (limiter or rate_limiter).consume(policy, client)
+            if not allowed:
+                retry_after = max(1, math.ceil(retry_after))
+                logger.warning(f"Rate limit '{policy.name}' hit by {client} on {request.path}")
+                response = jsonify({
+                    'success': False,
+                    'error': 'Too many requests. Please try again later.',
+                    'retry_after': retry_after
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+# Global instance
+rate_limiter = RateLimiter()
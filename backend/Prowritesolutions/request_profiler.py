@@ -0,0 +1,328 @@
+"""
+Request Profiler
+Opt-in per-request profiling with flame-graph output.
+
+A profiled request is watched by a sampler thread that records the request
+thread's call stack every PROFILE_INTERVAL_MS. Sampling is wall-clock, so time
+spent waiting on MySQL, OpenAI or Daraja shows up as well as CPU time, and
+requests that are not profiled pay nothing but a header check.
+
+A request is profiled when PROFILING_ENABLED=true and either
+    - it carries `X-Profile: 1` and an admin bearer token, or
+    - it is picked by PROFILE_SAMPLE_RATE (0.0-1.0); sampled profiles shorter
+      than PROFILE_MIN_DURATION_MS are dropped
+
+The last PROFILE_KEEP profiles are stored with their route and latency in a
+host-local SQLite file shared by all gunicorn workers, and can be downloaded
+from /api/admin/profiles as collapsed stacks (flamegraph.pl, speedscope) or
+speedscope JSON. The profiled response carries an X-Profile-Id header.
+
+Stacks are sampled from OS threads, so profiles are meaningful under the
+gthread and sync serving modes, not under gevent.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_MIN_DURATION_MS = float(os.getenv('PROFILE_MIN_DURATION_MS', 0))
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', 5))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 50))
+PROFILE_DB_PATH = os.getenv('PROFILE_DB', os.path.join('data', 'request_profiles.db'))
+PROFILE_HEADER = 'X-Profile'
+
+# Never profile the profile downloads themselves
+EXCLUDED_PREFIXES = ('/api/admin/profiles',)
+
+Stack = Tuple[str, ...]
+
+
+def frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's call stack at a fixed interval until stopped"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_name(frame.f_code))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+
+def to_collapsed(stacks: Dict[Stack, int]) -> str:
+    """Brendan Gregg's folded format: `root;caller;callee count` per line"""
+    return ''.join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def parse_collapsed(text: str) -> Dict[Stack, int]:
+    stacks: Dict[Stack, int] = {}
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if stack:
+            stacks[tuple(stack.split(';'))] = int(count)
+    return stacks
+
+
+def to_speedscope(stacks: Dict[Stack, int], name: str, interval_ms: float) -> Dict[str, Any]:
+    """speedscope file format, one sampled profile weighted in milliseconds"""
+    frames: List[Dict[str, str]] = []
+    index: Dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in sorted(stacks.items()):
+        sample = []
+        for frame in stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({'name': frame})
+            sample.append(index[frame])
+        samples.append(sample)
+        weights.append(round(count * interval_ms, 3))
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'prowrite-request-profiler',
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': round(sum(weights), 3),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+
+
+def hottest_frames(stacks: Dict[Stack, int], limit: int = 15) -> List[Dict[str, Any]]:
+    """Frames by self samples (the leaf of each stack)"""
+    self_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        if stack:
+            self_counts[stack[-1]] += count
+    total = sum(self_counts.values()) or 1
+    return [{'frame': frame, 'samples': count, 'percent': round(100.0 * count / total, 1)}
+            for frame, count in self_counts.most_common(limit)]
+
+
+class RequestProfiler:
+    """Flask hooks plus the host-local store of recent profiles"""
+
+    def __init__(self, db_path: str = PROFILE_DB_PATH, keep: int = PROFILE_KEEP,
+                 sample_rate: float = PROFILE_SAMPLE_RATE, interval_ms: float = PROFILE_INTERVAL_MS,
+                 min_duration_ms: float = PROFILE_MIN_DURATION_MS, enabled: bool = PROFILING_ENABLED):
+        self.db_path = db_path
+        self.keep = keep
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+        self.min_duration_ms = min_duration_ms
+        self.enabled = enabled
+        self._initialized = False
+
+    # ----- storage -----
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self._init_database()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_database(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS request_profiles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    method TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    route TEXT,
+                    status INTEGER,
+                    duration_ms REAL NOT NULL,
+                    triggered_by TEXT NOT NULL,
+                    user_id INTEGER,
+                    pid INTEGER,
+                    interval_ms REAL NOT NULL,
+                    samples INTEGER NOT NULL,
+                    collapsed TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def save(self, record: Dict[str, Any], stacks: Dict[Stack, int]) -> int:
+        """Store a profile and drop all but the newest `keep`"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute("""
+                INSERT INTO request_profiles (method, path, route, status, duration_ms, triggered_by, user_id,
+                                              pid, interval_ms, samples, collapsed, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (record['method'], record['path'], record.get('route'), record.get('status'),
+                  record['duration_ms'], record['triggered_by'], record.get('user_id'), os.getpid(),
+                  record['interval_ms'], sum(stacks.values()), to_collapsed(stacks), time.time()))
+            profile_id = cursor.lastrowid
+            conn.execute("DELETE FROM request_profiles WHERE id <= ?", (profile_id - self.keep,))
+            conn.commit()
+            return profile_id
+        finally:
+            conn.close()
+
+    def list_profiles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT id, method, path, route, status, duration_ms, triggered_by, user_id, pid,
+                       interval_ms, samples, created_at
+                FROM request_profiles ORDER BY id DESC LIMIT ?
+            """, (limit,)).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def get_profile(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM request_profiles WHERE id = ?", (profile_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def export(self, profile: Dict[str, Any], fmt: str) -> Tuple[str, str, str]:
+        """(body, mimetype, filename) of a stored profile in `collapsed` or `speedscope` format"""
+        base = f"profile-{profile['id']}"
+        if fmt == 'collapsed':
+            return profile['collapsed'], 'text/plain', f"{base}.collapsed.txt"
+        if fmt == 'speedscope':
+            name = f"{profile['method']} {profile['route'] or profile['path']} ({profile['duration_ms']:.0f} ms)"
+            document = to_speedscope(parse_collapsed(profile['collapsed']), name, profile['interval_ms'])
+            return json.dumps(document), 'application/json', f"{base}.speedscope.json"
+        raise ValueError(f"Unknown profile format: {fmt}")
+
+    # ----- Flask hooks -----
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _admin_user_id(self) -> Optional[int]:
+        from app_core import auth_system
+        auth_header = request.headers.get('Authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return None
+        payload = auth_system.verify_token(auth_header[7:])
+        if 'error' in payload or not payload.get('is_admin'):
+            return None
+        return payload.get('user_id')
+
+    def _trigger(self) -> Optional[Tuple[str, Optional[int]]]:
+        if request.path.startswith(EXCLUDED_PREFIXES):
+            return None
+        if request.headers.get(PROFILE_HEADER, '').lower() in ('1', 'true', 'yes'):
+            user_id = self._admin_user_id()
+            if user_id is not None:
+                return 'header', user_id
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sample', None
+        return None
+
+    def _before_request(self):
+        if not self.enabled:
+            return
+        trigger = self._trigger()
+        if trigger is None:
+            return
+        g.profile_trigger, g.profile_user_id = trigger
+        g.profile_started = time.perf_counter()
+        g.profile_sampler = StackSampler(threading.get_ident(), self.interval_ms / 1000.0).start()
+
+    def _finish(self, status: Optional[int]) -> Optional[int]:
+        sampler = g.pop('profile_sampler', None)
+        if sampler is None:
+            return None
+        sampler.stop()
+        duration_ms = (time.perf_counter() - g.profile_started) * 1000
+        trigger = g.profile_trigger
+        if trigger == 'sample' and duration_ms < self.min_duration_ms:
+            return None
+        if not sampler.stacks and trigger == 'sample':
+            # Faster than one sampling interval
+            return None
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'route': request.url_rule.rule if request.url_rule else None,
+            'status': status,
+            'duration_ms': round(duration_ms, 2),
+            'triggered_by': trigger,
+            'user_id': g.profile_user_id,
+            'interval_ms': self.interval_ms,
+        }
+        try:
+            profile_id = self.save(record, sampler.stacks)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to store request profile: {e}")
+            return None
+        logger.info(f"Profiled {record['method']} {record['path']} in {duration_ms:.0f}ms "
+                    f"({sampler.samples} samples, profile {profile_id})")
+        return profile_id
+
+    def _after_request(self, response):
+        profile_id = self._finish(response.status_code)
+        if profile_id is not None:
+            response.headers['X-Profile-Id'] = str(profile_id)
+        return response
+
+    def _teardown_request(self, exc=None):
+        # Requests that raised never reach after_request
+        self._finish(500 if exc else None)
+
+
+# Global instance
+request_profiler = RequestProfiler()
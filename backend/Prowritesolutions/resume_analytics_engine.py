@@ -5,11 +5,11 @@ Provides comprehensive analytics, performance metrics, and actionable insights
 
 import os
 import json
-import re
 import openai
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
+from resume_features import ACTION_VERBS, INDUSTRY_KEYWORDS, found, resume_feature_store
 
 class ResumeAnalyticsEngine:
     def __init__(self):
@@ -92,11 +92,12 @@ class ResumeAnalyticsEngine:
             if not self.openai_api_key:
                 return self._mock_comprehensive_analytics(resume_content, profession, industry)
             
-            # Perform detailed analysis
+            # Perform detailed analysis on features computed once per resume version
+            features = resume_feature_store.features(resume_content)
             analytics_results = {}
             
             # Content Analysis
-            content_metrics = self._analyze_content_metrics(resume_content)
+            content_metrics = self._analyze_content_metrics(features)
             analytics_results['content_analysis'] = {
                 'metrics': content_metrics,
                 'insights': self._generate_content_insights(content_metrics, industry),
@@ -104,7 +105,7 @@ class ResumeAnalyticsEngine:
             }
             
             # Keyword Analysis
-            keyword_metrics = self._analyze_keyword_metrics(resume_content, industry)
+            keyword_metrics = self._analyze_keyword_metrics(features, industry)
             analytics_results['keyword_analysis'] = {
                 'metrics': keyword_metrics,
                 'insights': self._generate_keyword_insights(keyword_metrics, industry),
@@ -112,7 +113,7 @@ class ResumeAnalyticsEngine:
             }
             
             # Impact Analysis
-            impact_metrics = self._analyze_impact_metrics(resume_content)
+            impact_metrics = self._analyze_impact_metrics(features)
             analytics_results['impact_analysis'] = {
                 'metrics': impact_metrics,
                 'insights': self._generate_impact_insights(impact_metrics, industry),
@@ -120,7 +121,7 @@ class ResumeAnalyticsEngine:
             }
             
             # Formatting Analysis
-            formatting_metrics = self._analyze_formatting_metrics(resume_content)
+            formatting_metrics = self._analyze_formatting_metrics(features)
             analytics_results['formatting_analysis'] = {
                 'metrics': formatting_metrics,
                 'insights': self._generate_formatting_insights(formatting_metrics),
@@ -287,65 +288,51 @@ class ResumeAnalyticsEngine:
                 'content': self._mock_competitive_analysis(resume_content, target_job, industry)
             }
 
-    def _analyze_content_metrics(self, content: str) -> Dict[str, Any]:
+    def _analyze_content_metrics(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze content metrics"""
-        words = content.split()
-        sentences = re.split(r'[.!?]+', content)
-        paragraphs = content.split('\n\n')
-        bullet_points = len(re.findall(r'[•\-\*]\s*', content))
+        word_count = features['word_count']
+        sentence_count = features['sentence_count']
         
         return {
-            'word_count': len(words),
-            'sentence_count': len([s for s in sentences if s.strip()]),
-            'paragraph_count': len([p for p in paragraphs if p.strip()]),
-            'bullet_point_count': bullet_points,
-            'avg_words_per_sentence': len(words) / max(len([s for s in sentences if s.strip()]), 1),
-            'content_density': len(words) / max(len(content), 1) * 100
+            'word_count': word_count,
+            'sentence_count': sentence_count,
+            'paragraph_count': features['paragraph_count'],
+            'bullet_point_count': features['bullet_marks'],
+            'avg_words_per_sentence': word_count / max(sentence_count, 1),
+            'content_density': word_count / max(features['char_count'], 1) * 100
         }
 
-    def _analyze_keyword_metrics(self, content: str, industry: str = None) -> Dict[str, Any]:
+    def _analyze_keyword_metrics(self, features: Dict[str, Any], industry: str = None) -> Dict[str, Any]:
         """Analyze keyword metrics"""
-        content_lower = content.lower()
-        
-        # Extract keywords
-        words = re.findall(r'\b\w+\b', content_lower)
-        unique_words = list(set(words))
+        words = features['token_count']
+        unique_words = features['unique_tokens']
         
         # Count action verbs
-        action_verbs = ['achieved', 'implemented', 'developed', 'managed', 'coordinated', 'spearheaded', 'pioneered']
-        action_verb_count = sum(1 for verb in action_verbs if verb in content_lower)
+        action_verb_count = len(found(features, ACTION_VERBS))
         
         # Industry keywords
-        industry_keywords = []
-        if industry and industry in self.industry_benchmarks:
-            industry_keywords = self.industry_benchmarks[industry].get('key_metrics', [])
-        
-        industry_keyword_count = sum(1 for keyword in industry_keywords if keyword in content_lower)
+        industry_keyword_count = len(found(features, INDUSTRY_KEYWORDS.get(industry, [])))
         
         return {
-            'total_keywords': len(unique_words),
+            'total_keywords': unique_words,
             'action_verb_count': action_verb_count,
             'industry_keyword_count': industry_keyword_count,
-            'keyword_density': len(unique_words) / max(len(words), 1) * 100,
-            'action_verb_ratio': action_verb_count / max(len(words), 1) * 100
+            'keyword_density': unique_words / max(words, 1) * 100,
+            'action_verb_ratio': action_verb_count / max(words, 1) * 100
         }
 
-    def _analyze_impact_metrics(self, content: str) -> Dict[str, Any]:
+    def _analyze_impact_metrics(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze impact metrics"""
         # Count quantifiable results
-        quantifiable_patterns = [
-            r'\d+%', r'\$\d+', r'\d+\s*(?:percent|%)', r'\d+\s*(?:million|thousand|k)',
-            r'increased by \d+', r'reduced by \d+', r'improved by \d+'
-        ]
-        quantifiable_count = sum(len(re.findall(pattern, content, re.IGNORECASE)) for pattern in quantifiable_patterns)
+        quantifiable_count = len(features['metrics'])
         
         # Count achievement statements
         achievement_indicators = ['achieved', 'accomplished', 'delivered', 'generated', 'increased', 'improved']
-        achievement_count = sum(1 for indicator in achievement_indicators if indicator in content.lower())
+        achievement_count = len(found(features, achievement_indicators))
         
         # Leadership indicators
         leadership_indicators = ['led', 'managed', 'supervised', 'directed', 'coordinated', 'orchestrated']
-        leadership_count = sum(1 for indicator in leadership_indicators if indicator in content.lower())
+        leadership_count = len(found(features, leadership_indicators))
         
         return {
             'quantifiable_results': quantifiable_count,
@@ -354,15 +341,15 @@ class ResumeAnalyticsEngine:
             'impact_score': (quantifiable_count * 10) + (achievement_count * 5) + (leadership_count * 3)
         }
 
-    def _analyze_formatting_metrics(self, content: str) -> Dict[str, Any]:
+    def _analyze_formatting_metrics(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze formatting metrics"""
         # Count sections
         section_headers = ['experience', 'education', 'skills', 'summary', 'achievements', 'projects']
-        section_count = sum(1 for header in section_headers if header in content.lower())
+        section_count = len(found(features, section_headers))
         
         # Check for consistent formatting
-        bullet_points = len(re.findall(r'[•\-\*]\s*', content))
-        numbered_lists = len(re.findall(r'\d+\.\s*', content))
+        bullet_points = features['bullet_marks']
+        numbered_lists = features['numbered_items']
         
         # ATS-friendly elements
         ats_elements = {
@@ -380,6 +367,45 @@ class ResumeAnalyticsEngine:
             'formatting_consistency': 1 if bullet_points > 0 and section_count >= 3 else 0
         }
 
+    def _generate_content_insights(self, metrics: Dict[str, Any], industry: str = None) -> List[str]:
+        """Generate insights from content metrics"""
+        benchmark = self.industry_benchmarks.get(industry, self.industry_benchmarks['technology'])
+        insights = []
+        if metrics['word_count'] < benchmark['avg_word_count'] * 0.7:
+            insights.append(f"At {metrics['word_count']} words the resume is short for {industry or 'this field'}")
+        if metrics['avg_words_per_sentence'] > 25:
+            insights.append("Sentences are long; split them into concise bullet points")
+        if metrics['bullet_point_count'] == 0:
+            insights.append("No bullet points found; recruiters scan bullets first")
+        return insights
+
+    def _generate_keyword_insights(self, metrics: Dict[str, Any], industry: str = None) -> List[str]:
+        """Generate insights from keyword metrics"""
+        insights = []
+        if metrics['action_verb_count'] < 3:
+            insights.append("Start more statements with strong action verbs")
+        if industry and metrics['industry_keyword_count'] == 0:
+            insights.append(f"No {industry} keywords found")
+        return insights
+
+    def _generate_impact_insights(self, metrics: Dict[str, Any], industry: str = None) -> List[str]:
+        """Generate insights from impact metrics"""
+        insights = []
+        if metrics['quantifiable_results'] == 0:
+            insights.append("No quantified results; add numbers, percentages or amounts")
+        if metrics['leadership_indicators'] == 0:
+            insights.append("Show leadership: teams led, projects owned or people mentored")
+        return insights
+
+    def _generate_formatting_insights(self, metrics: Dict[str, Any]) -> List[str]:
+        """Generate insights from formatting metrics"""
+        insights = []
+        if metrics['section_count'] < 3:
+            insights.append("Use standard section headings such as Experience, Education and Skills")
+        if not metrics['formatting_consistency']:
+            insights.append("Use bullet points consistently across sections")
+        return insights
+
     def _calculate_content_score(self, metrics: Dict[str, Any], industry: str = None) -> float:
         """Calculate content analysis score"""
         benchmark = self.industry_benchmarks.get(industry, self.industry_benchmarks['technology'])
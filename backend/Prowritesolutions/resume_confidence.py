@@ -0,0 +1,331 @@
+"""
+Resume Confidence
+Per-section confidence for locally parsed resumes, and the policy that decides
+which sections are worth an AI request.
+
+Resume import used to send the whole resume to OpenAI after the rule-based
+parse. Instead the text is split on its section headings, every local
+candidate (see ResumeParserService.parse_with_confidence) is scored per
+section against that section's own text, and the best candidate is kept.
+Only sections still below CONFIDENCE_THRESHOLD that have text to work from are
+escalated: one compact request carries just those sections (each capped at
+ESCALATION_SECTION_CHARS) with a one-line schema per section, and the reply is
+merged back section by section.
+
+Scores are in [0, 1]:
+
+    1.0   nothing to extract (no heading, nothing found) or fully grounded
+    ~0.5  partly grounded: fields missing, entries missing or over-split
+    0.0   a heading with nothing extracted, or entries with no heading at all
+"""
+
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional
+
+CONFIDENCE_THRESHOLD = float(os.getenv('RESUME_PARSER_CONFIDENCE_THRESHOLD', 0.6))
+ESCALATION_SECTION_CHARS = int(os.getenv('RESUME_PARSER_SECTION_CHARS', 3000))
+ESCALATION_MAX_TOKENS = int(os.getenv('RESUME_PARSER_MAX_TOKENS', 1500))
+
+HEADER = 'header'
+
+# Heading aliases per section, compared after normalize_heading()
+HEADINGS = {
+    'summary': ['summary', 'professional summary', 'career summary', 'profile', 'professional profile',
+                'personal profile', 'objective', 'career objective', 'about me', 'about'],
+    'workExperience': ['experience', 'work experience', 'professional experience', 'relevant experience',
+                       'work history', 'employment', 'employment history', 'career history'],
+    'education': ['education', 'academic background', 'academic qualifications', 'qualifications',
+                  'education training', 'educational background'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'core competencies',
+               'competencies', 'expertise', 'areas of expertise', 'skills expertise'],
+    'projects': ['projects', 'key projects', 'personal projects', 'notable projects', 'portfolio'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'licences', 'licenses certifications',
+                       'certifications licenses', 'professional certifications', 'credentials'],
+    'achievements': ['achievements', 'key achievements', 'awards', 'honors', 'honours', 'awards recognition',
+                     'awards honors', 'honors awards', 'accomplishments', 'recognition'],
+    'languages': ['languages', 'language skills', 'spoken languages'],
+    'leadership': ['leadership', 'leadership experience', 'leadership roles'],
+    'volunteerWork': ['volunteer', 'volunteer work', 'volunteer experience', 'volunteering', 'community service'],
+    'referees': ['references', 'referees', 'professional references'],
+}
+
+SECTIONS = ['personalInfo', 'summary', 'workExperience', 'education', 'skills', 'projects',
+            'certifications', 'achievements', 'languages', 'leadership', 'volunteerWork', 'referees']
+
+# Fields that make an entry usable, per list section of dicts
+ENTRY_FIELDS = {
+    'workExperience': ('jobTitle', 'company', 'startDate'),
+    'education': ('institution', 'degree', 'graduationYear'),
+    'projects': ('name',),
+    'certifications': ('name',),
+    'leadership': ('title', 'organization'),
+    'volunteerWork': ('role', 'organization'),
+    'referees': ('name',),
+}
+STRING_LISTS = ('skills', 'achievements', 'languages')
+
+# Compact schemas for the escalation prompt
+SCHEMAS = {
+    'personalInfo': '{firstName,lastName,email,phone,city,country,linkedin,website}',
+    'summary': 'string',
+    'workExperience': '[{jobTitle,company,startDate,endDate,current,responsibilities,location}]',
+    'education': '[{institution,degree,field,graduationYear,gpa}]',
+    'skills': '[string]',
+    'projects': '[{name,description,technologies:[string]}]',
+    'certifications': '[{name,issuer,date}]',
+    'achievements': '[string]',
+    'languages': '[string]',
+    'leadership': '[{title,organization,duration,description}]',
+    'volunteerWork': '[{role,organization,duration,description}]',
+    'referees': '[{name,title,company,phone,email}]',
+}
+
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}(?:[-/.]\d{{1,2}})?)'
+DATE_RANGE = re.compile(rf'({_DATE})\s*(?:-|–|—|to)\s*({_DATE}|present|current|now)\b', re.IGNORECASE)
+DEGREE = re.compile(r'\b(?:bachelor|master|doctor|ph\.?d|mba|b\.?sc|m\.?sc|b\.?a|m\.?a|b\.?eng|m\.?eng|'
+                    r'diploma|certificate|associate|kcse|high school)\b', re.IGNORECASE)
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE = re.compile(r'\+?\d[\d\s().-]{6,}\d')
+
+_ALIASES: Dict[str, str] = {}
+
+
+def normalize_heading(line: str) -> str:
+    words = re.sub(r'[^a-z]+', ' ', line.lower()).split()
+    return ' '.join(word for word in words if word != 'and')
+
+
+for _section, _aliases in HEADINGS.items():
+    for _alias in _aliases:
+        _ALIASES[normalize_heading(_alias)] = _section
+
+
+def heading_section(line: str) -> Optional[str]:
+    """The section a line is the heading of, if it is one"""
+    stripped = line.strip().rstrip(':').strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    return _ALIASES.get(normalize_heading(stripped))
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Section name -> its text; whatever precedes the first heading is HEADER"""
+    lines: Dict[str, List[str]] = {HEADER: []}
+    current = HEADER
+    for line in text.split('\n'):
+        section = heading_section(line)
+        if section:
+            current = section
+            lines.setdefault(section, [])
+        else:
+            lines[current].append(line)
+    sections = {name: '\n'.join(body).strip() for name, body in lines.items()}
+    return {name: body for name, body in sections.items() if body}
+
+
+def source_text(name: str, sections: Dict[str, str]) -> str:
+    """The text a section is parsed from"""
+    return sections.get(HEADER if name == 'personalInfo' else name, '')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough OpenAI token count (about four characters per token for English)"""
+    return (len(text) + 3) // 4
+
+
+# ----- scoring -----
+
+def _squash(text: Any) -> str:
+    return re.sub(r'\s+', ' ', str(text or '')).strip().lower()
+
+
+def _grounded(value: Any, haystack: str) -> bool:
+    value = _squash(value)
+    return bool(value) and value in haystack
+
+
+def _score_personal_info(value: Dict, header: str, text: str) -> float:
+    value = value or {}
+    checks = []
+    email = EMAIL.search(text)
+    if email:
+        checks.append(value.get('email') == email.group(0))
+    phone = PHONE.search(header or text)
+    if phone:
+        checks.append(re.sub(r'\D', '', str(value.get('phone') or '')) == re.sub(r'\D', '', phone.group(0)))
+    first_line = next((line.strip() for line in (header or text).split('\n') if line.strip()), '')
+    checks.append(_grounded(value.get('firstName'), first_line.lower()))
+    city = value.get('city') or value.get('location')
+    if city:
+        names = {_squash(value.get('firstName')), _squash(value.get('lastName'))}
+        checks.append(_squash(city) not in names and _grounded(city, _squash(header)))
+    return sum(checks) / len(checks)
+
+
+def _score_summary(value: str, section: str) -> float:
+    if section:
+        return 1.0 if value and _grounded(value[:60], _squash(section)) else 0.3
+    return 1.0 if not value else 0.6   # guessed from the first long paragraph
+
+
+def _section_items(section: str) -> List[str]:
+    items = []
+    for part in re.split(r'[,;|•·▪\n]', section):
+        part = part.split(':', 1)[-1].strip(' -*\t')
+        if 0 < len(part) <= 40 and part.lower() not in (item.lower() for item in items):
+            items.append(part)
+    return items
+
+
+def _score_skills(value: List, section: str) -> float:
+    value = [str(skill) for skill in value or [] if skill]
+    if not section:
+        return 1.0 if not value else 0.8   # scanned from the whole text
+    if not value:
+        return 0.0
+    extracted = {skill.lower() for skill in value}
+    items = _section_items(section)
+    recall = sum(item.lower() in extracted for item in items) / len(items) if items else 1.0
+    precision = sum(bool(re.search(rf'(?<!\w){re.escape(skill.lower())}(?!\w)', section.lower()))
+                    for skill in value) / len(value)
+    return (recall + precision) / 2
+
+
+def _expected_entries(name: str, section: str) -> Optional[int]:
+    """Entries the section's text suggests (0: no recognizable entries), None when not countable"""
+    if name == 'workExperience':
+        return len(DATE_RANGE.findall(section))
+    if name == 'education':
+        return len({line for line in section.split('\n') if DEGREE.search(line)})
+    return None
+
+
+def _score_entries(name: str, value: List, section: str) -> float:
+    value = [item for item in value or [] if item]
+    if not section:
+        if not value:
+            return 1.0
+        # Languages are also spotted in running text; the other lists come from a heading only
+        return 0.7 if name == 'languages' else 0.0
+    if not value:
+        return 0.0
+    haystack = _squash(section)
+    if name in STRING_LISTS:
+        completeness = sum(_grounded(item, haystack) for item in value) / len(value)
+    else:
+        fields = ENTRY_FIELDS[name]
+        completeness = sum(
+            sum(_grounded(item.get(f), haystack) for f in fields) / len(fields) if isinstance(item, dict) else 0.0
+            for item in value
+        ) / len(value)
+    expected = _expected_entries(name, section)
+    coverage = 1.0
+    if expected == 0:
+        coverage = 0.5   # prose, or a layout we can't count entries in
+    elif expected:
+        ratio = len(value) / expected
+        coverage = min(ratio, 1 / ratio)
+    return coverage * completeness
+
+
+def score_section(name: str, value: Any, sections: Dict[str, str], text: str) -> float:
+    """Confidence in one section's locally parsed value, in [0, 1]"""
+    if name == 'personalInfo':
+        score = _score_personal_info(value, sections.get(HEADER, ''), text)
+    elif name == 'summary':
+        score = _score_summary(value if isinstance(value, str) else '', sections.get('summary', ''))
+    elif name == 'skills':
+        score = _score_skills(value, sections.get('skills', ''))
+    else:
+        score = _score_entries(name, value, sections.get(name, ''))
+    return round(score, 2)
+
+
+def pick_best(candidates: List[Dict[str, Any]], sections: Dict[str, str], text: str) -> tuple:
+    """
+    Per section, the best-scoring value among the local candidates (earlier
+    candidates win ties). Returns (parsed, confidence, dropped); entries found
+    without any heading to back them are dropped.
+    """
+    parsed, confidence, dropped = {}, {}, []
+    for name in SECTIONS:
+        best_value, best_score = None, -1.0
+        for candidate in candidates:
+            if name not in candidate:
+                continue
+            score = score_section(name, candidate[name], sections, text)
+            if score > best_score:
+                best_value, best_score = candidate[name], score
+        if best_value is None:
+            best_value = '' if name == 'summary' else {} if name == 'personalInfo' else []
+            best_score = score_section(name, best_value, sections, text)
+        if best_score == 0.0 and best_value and name in ENTRY_FIELDS and not sections.get(name):
+            best_value, best_score = [], 1.0
+            dropped.append(name)
+        parsed[name], confidence[name] = best_value, best_score
+    return parsed, confidence, dropped
+
+
+# ----- escalation -----
+
+def plan_escalation(confidence: Dict[str, float], sections: Dict[str, str],
+                    threshold: float = CONFIDENCE_THRESHOLD) -> List[str]:
+    """Sections to send to the AI: below the threshold and with text to parse, least confident first"""
+    ambiguous = [name for name, score in confidence.items() if score < threshold and source_text(name, sections)]
+    return sorted(ambiguous, key=lambda name: (confidence[name], SECTIONS.index(name)))
+
+
+def build_prompt(names: List[str], sections: Dict[str, str],
+                 max_chars: int = ESCALATION_SECTION_CHARS) -> str:
+    schema = '\n'.join(f"{name}: {SCHEMAS[name]}" for name in names)
+    parts = [f"Return one JSON object with only these keys:\n{schema}\n"
+             "Dates as YYYY-MM or YYYY; a current job has current true and endDate \"\". "
+             "Use \"\" or [] for anything not in the text."]
+    for name in names:
+        parts.append(f"### {name}\n{source_text(name, sections)[:max_chars]}")
+    return '\n\n'.join(parts)
+
+
+def max_tokens_for(prompt: str) -> int:
+    # The reply restates the sections as JSON: about the prompt's size plus keys
+    return min(ESCALATION_MAX_TOKENS, 100 + estimate_tokens(prompt) * 3 // 2)
+
+
+def _coerce(name: str, value: Any) -> Any:
+    """A reply value in the shape of the local parse, or None if unusable"""
+    if name == 'personalInfo':
+        if not isinstance(value, dict):
+            return None
+        return {k: str(v).strip() for k, v in value.items() if isinstance(v, (str, int)) and str(v).strip()} or None
+    if name == 'summary':
+        return value.strip() if isinstance(value, str) and value.strip() else None
+    if not isinstance(value, list):
+        return None
+    if name in STRING_LISTS:
+        items = [item.get('name', '') if isinstance(item, dict) else item for item in value]
+        return [str(item).strip() for item in items if str(item or '').strip()] or None
+    return [item for item in value if isinstance(item, dict) and any(item.values())] or None
+
+
+def merge_reply(parsed: Dict[str, Any], reply: str, names: List[str]) -> List[str]:
+    """Merge the escalated sections of a model reply into `parsed`; returns the sections merged"""
+    start, end = reply.find('{'), reply.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in reply")
+    data = json.loads(reply[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("reply is not a JSON object")
+    merged = []
+    for name in names:
+        value = _coerce(name, data.get(name))
+        if value is None:
+            continue   # keep the local parse
+        if name == 'personalInfo':
+            parsed[name] = {**(parsed.get(name) or {}), **value}
+        else:
+            parsed[name] = value
+        merged.append(name)
+    return merged
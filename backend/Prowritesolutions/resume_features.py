@@ -0,0 +1,202 @@
+"""
+Resume Features
+Text features of one resume version, computed once and read by every
+analytics, insight and ATS scoring engine.
+
+A version is its exact text: the features are keyed by a hash of the
+content, computed when the resume is saved (or on first analysis) and kept
+in the same LRU-over-SQLite store as the job description features. Scoring
+then reads counts and term hits instead of re-scanning the text:
+
+    word/char/token/sentence/paragraph counts, bullets, numbered items
+    section_headers, section_positions
+    metrics (quantified results), impact_statements
+    has_email / has_phone / has_complex_characters / has_numbers
+    syllables, readability (Flesch reading ease)
+    terms         {term: occurrences} for every term in the shared vocabulary
+
+Engines look terms up with found(); a term must belong to one of the
+vocabulary lists below to be tracked.
+"""
+
+import os
+import re
+import hashlib
+import logging
+from typing import Any, Dict, List
+
+from jd_features import JDFeatureStore
+
+logger = logging.getLogger(__name__)
+
+RESUME_FEATURES_DB_PATH = os.getenv('RESUME_FEATURES_DB', os.path.join('data', 'resume_features.db'))
+RESUME_FEATURES_TTL = int(os.getenv('RESUME_FEATURES_TTL_DAYS', 90)) * 86400
+RESUME_FEATURES_MEMORY_SIZE = int(os.getenv('RESUME_FEATURES_MEMORY_SIZE', 256))
+FEATURE_VERSION = 1         # bump when extraction or the vocabulary changes
+
+ACTION_VERBS = [
+    'developed', 'implemented', 'managed', 'achieved', 'created', 'designed', 'led', 'coordinated',
+    'improved', 'increased', 'launched', 'established', 'optimized', 'delivered', 'executed',
+    'generated', 'maintained', 'enhanced', 'built', 'constructed', 'facilitated', 'initiated',
+    'streamlined', 'transformed', 'accelerated', 'maximized', 'minimized', 'revolutionized',
+    'spearheaded', 'pioneered', 'engineered', 'architected'
+]
+ACHIEVEMENT_WORDS = [
+    'achieved', 'accomplished', 'delivered', 'generated', 'increased', 'improved', 'reduced',
+    'grew', 'developed', 'launched', 'saved', 'earned'
+]
+LEADERSHIP_WORDS = ['led', 'managed', 'supervised', 'directed', 'coordinated', 'orchestrated']
+WEAK_PHRASES = [
+    'responsible for', 'helped with', 'assisted in', 'worked on', 'participated in',
+    'involved in', 'contributed to', 'supported', 'helped', 'did'
+]
+UNPROFESSIONAL_WORDS = ['awesome', 'cool', 'amazing', 'super', 'really', 'very', 'totally', 'literally']
+SPELLING_ERRORS = ['recieve', 'seperate', 'occured', 'accomodate']
+IMAGE_WORDS = ['image', 'graphic', 'photo', 'picture']
+SECTION_NAMES = [
+    'experience', 'education', 'skills', 'summary', 'objective', 'achievements', 'projects',
+    'contact', 'work history', 'employment'
+]
+EXPERIENCE_WORDS = ['worked', 'job', 'position', 'role', 'responsibilities', 'achieved', 'managed']
+EDUCATION_WORDS = ['degree', 'university', 'college', 'bachelor', 'master', 'phd', 'graduated', 'gpa']
+
+# Profession -> keywords used for ATS keyword matching
+PROFESSION_KEYWORDS = {
+    'software_engineer': [
+        'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'aws', 'docker',
+        'kubernetes', 'git', 'agile', 'scrum', 'api', 'microservices', 'machine learning',
+        'data structures', 'algorithms', 'full stack', 'frontend', 'backend', 'devops',
+        'typescript', 'angular', 'vue', 'mongodb', 'postgresql', 'redis', 'elasticsearch'
+    ],
+    'data_scientist': [
+        'python', 'r', 'sql', 'machine learning', 'deep learning', 'tensorflow', 'pytorch',
+        'pandas', 'numpy', 'scikit-learn', 'jupyter', 'statistics', 'data analysis',
+        'data visualization', 'tableau', 'power bi', 'big data', 'hadoop', 'spark',
+        'neural networks', 'nlp', 'computer vision', 'reinforcement learning'
+    ],
+    'marketing_manager': [
+        'digital marketing', 'seo', 'sem', 'social media', 'content marketing', 'email marketing',
+        'campaign management', 'analytics', 'google ads', 'facebook ads', 'brand management',
+        'market research', 'lead generation', 'conversion optimization', 'crm', 'marketing automation',
+        'google analytics', 'adobe analytics', 'hubspot', 'salesforce', 'marketo'
+    ],
+    'sales_professional': [
+        'sales', 'business development', 'account management', 'lead generation', 'prospecting',
+        'negotiation', 'client relationship', 'crm', 'salesforce', 'quota', 'territory management',
+        'pipeline management', 'closing deals', 'customer acquisition', 'revenue growth',
+        'cold calling', 'inside sales', 'outside sales', 'b2b', 'b2c'
+    ],
+    'healthcare_professional': [
+        'patient care', 'clinical', 'medical', 'healthcare', 'nursing', 'diagnosis', 'treatment',
+        'patient assessment', 'medical records', 'healthcare technology', 'patient safety',
+        'clinical protocols', 'medical terminology', 'healthcare regulations', 'patient education'
+    ],
+    'finance_professional': [
+        'financial analysis', 'budgeting', 'forecasting', 'financial modeling', 'risk management',
+        'compliance', 'accounting', 'audit', 'tax', 'investment', 'portfolio management',
+        'financial reporting', 'excel', 'quickbooks', 'sap', 'financial planning'
+    ]
+}
+
+# Industry -> keywords used for optimization and analytics scoring
+INDUSTRY_KEYWORDS = {
+    'technology': ['software development', 'programming', 'agile', 'scrum', 'devops', 'cloud computing'],
+    'marketing': ['digital marketing', 'campaign management', 'brand awareness', 'lead generation'],
+    'finance': ['financial analysis', 'budgeting', 'risk management', 'compliance'],
+    'healthcare': ['patient care', 'clinical', 'healthcare technology', 'patient safety']
+}
+OPTIMIZATION_KEYWORDS = [
+    'software development', 'web applications', 'database design', 'cloud computing', 'agile methodology'
+]
+SEO_TERMS = ['python', 'javascript', 'react', 'node.js', 'sql', 'aws', 'docker']
+
+
+def _vocabulary() -> List[str]:
+    lists = [ACTION_VERBS, ACHIEVEMENT_WORDS, LEADERSHIP_WORDS, WEAK_PHRASES, UNPROFESSIONAL_WORDS,
+             SPELLING_ERRORS, IMAGE_WORDS, SECTION_NAMES, EXPERIENCE_WORDS, EDUCATION_WORDS,
+             OPTIMIZATION_KEYWORDS, SEO_TERMS, *PROFESSION_KEYWORDS.values(), *INDUSTRY_KEYWORDS.values()]
+    return sorted({term.lower() for terms in lists for term in terms})
+
+
+VOCABULARY = _vocabulary()
+
+METRIC_PATTERN = re.compile(
+    r'\d+(?:\.\d+)?\s*(?:%|percent)|\$\d[\d,]*|\d+\s*(?:million|thousand|k)\b|(?:increased|reduced|improved) by \d+',
+    re.IGNORECASE)
+NUMBERS_PATTERN = re.compile(r'\d+%|\d+\.\d+%|\$\d+|\d+\s*(?:million|thousand|k|m)')
+COMPLEX_CHARACTERS = re.compile(r'[^\w\s\-\.\,\;\:\!\?\(\)]')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+
+
+def extract_features(content: str) -> Dict[str, Any]:
+    """Counts, structure, term hits and readability of a resume's text"""
+    content = content or ''
+    lower = content.lower()
+    words = content.split()
+    tokens = re.findall(r'\b\w+\b', lower)
+    sentences = [s for s in re.split(r'[.!?]+', content) if s.strip()]
+    sentence_marks = len(re.findall(r'[.!?]+', content))
+    syllables = len(re.findall(r'[aeiouy]+', lower))
+
+    if sentence_marks and words:
+        readability = 206.835 - 1.015 * (len(words) / sentence_marks) - 84.6 * (syllables / len(words))
+        readability = max(0, min(100, readability))
+    else:
+        readability = 50
+
+    headers = [header.strip() for header in re.findall(r'^[A-Z][A-Z\s]+$', content, re.MULTILINE)]
+    return {
+        'word_count': len(words),
+        'char_count': len(content),
+        'token_count': len(tokens),
+        'unique_tokens': len(set(tokens)),
+        'sentence_count': len(sentences),
+        'sentence_marks': sentence_marks,
+        'paragraph_count': len([p for p in content.split('\n\n') if p.strip()]),
+        'bullet_marks': len(re.findall(r'[•\-\*]\s*', content)),
+        'bullet_lines': len(re.findall(r'^[\s]*[•\-\*]\s+', content, re.MULTILINE)),
+        'numbered_items': len(re.findall(r'\d+\.\s*', content)),
+        'section_headers': [header for header in headers if len(header) > 3],
+        'distinct_headers': len(set(headers)),
+        'section_positions': {name: lower.find(name) for name in SECTION_NAMES if name in lower},
+        'metrics': METRIC_PATTERN.findall(content),
+        'impact_statements': len(re.findall(r'•.*\d+.*|•.*%.*|•.*\$.*', content, re.IGNORECASE)),
+        'has_numbers': bool(NUMBERS_PATTERN.search(content)),
+        'has_complex_characters': bool(COMPLEX_CHARACTERS.search(content)),
+        'has_email': bool(EMAIL_PATTERN.search(content)),
+        'has_phone': bool(PHONE_PATTERN.search(content)),
+        'syllables': syllables,
+        'readability': round(readability, 1),
+        'terms': {term: lower.count(term) for term in VOCABULARY if term in lower},
+    }
+
+
+def found(features: Dict[str, Any], terms: List[str]) -> List[str]:
+    """The given vocabulary terms that appear in the resume, in list order"""
+    hits = features['terms']
+    return [term for term in terms if term.lower() in hits]
+
+
+class ResumeFeatureStore(JDFeatureStore):
+    """Resume features keyed by a hash of the exact content of the version"""
+
+    table = 'resume_features'
+
+    def __init__(self, db_path: str = RESUME_FEATURES_DB_PATH, ttl: float = RESUME_FEATURES_TTL,
+                 memory_size: int = RESUME_FEATURES_MEMORY_SIZE):
+        super().__init__(db_path=db_path, ttl=ttl, memory_size=memory_size)
+
+    def key(self, text: str, kind: str) -> str:
+        key = '\x1f'.join((kind, str(FEATURE_VERSION), text or ''))
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def features(self, resume_content: str) -> Dict[str, Any]:
+        """Features of this resume version; see the module docstring"""
+        if not (resume_content or '').strip():
+            return extract_features('')
+        return self.get_or_compute(resume_content, 'features', lambda: extract_features(resume_content))
+
+
+# Global instance
+resume_feature_store = ResumeFeatureStore()
@@ -14,8 +14,18 @@ import docx
 from docx import Document
 import openai
 
+from circuit_breaker import openai_breaker
+from resume_confidence import (
+    DATE_RANGE, DEGREE, HEADER, build_prompt, estimate_tokens, max_tokens_for, merge_reply,
+    pick_best, plan_escalation, split_sections,
+)
+
 logger = logging.getLogger(__name__)
 
+# escalate: AI for low-confidence sections only; full: whole-document AI pass; off: local only
+RESUME_PARSER_AI_MODE = os.getenv('RESUME_PARSER_AI_MODE', 'escalate').lower()
+RESUME_PARSER_AI_MODEL = os.getenv('RESUME_PARSER_AI_MODEL', 'gpt-3.5-turbo')
+
 class ResumeParserService:
     def __init__(self):
         """Initialize the resume parser service"""
@@ -57,16 +67,22 @@ class ResumeParserService:
             if not text.strip():
                 raise ValueError("No text content found in the file")
             
-            # Parse the extracted text
-            parsed_data = self._parse_resume_text(text)
-            
-            # Enhance with AI if available
-            if self.openai_api_key:
+            # Parse the extracted text locally, scoring each section
+            parsed_data, confidence, dropped = self.parse_with_confidence(text)
+
+            # Ask the AI only about the sections the local parse is unsure of
+            escalation = None
+            if self.openai_api_key and RESUME_PARSER_AI_MODE == 'escalate':
+                escalation = self._escalate_sections(parsed_data, text, confidence)
+            elif self.openai_api_key and RESUME_PARSER_AI_MODE == 'full':
                 parsed_data = self._enhance_with_ai(parsed_data, text)
-            
+
             return {
                 'success': True,
                 'parsed_data': parsed_data,
+                'confidence': confidence,
+                'dropped_sections': dropped,
+                'escalation': escalation,
                 'raw_text': text,
                 'file_type': file_type,
                 'parsed_at': datetime.now().isoformat()
@@ -114,6 +130,142 @@ class ResumeParserService:
             logger.error(f"Error in simple extraction: {str(e)}")
             return {}
 
+    def parse_with_confidence(self, text: str) -> tuple:
+        """
+        Local parse with a confidence score per section. Each section is taken
+        from whichever local parser scores best on it (see resume_confidence).
+        Returns (parsed_data, confidence, dropped).
+        """
+        sections = split_sections(text)
+        candidates = [self._sectioned_extraction(sections)]
+        for parse in (self._simple_reliable_extraction, self._advanced_regex_parse):
+            try:
+                candidate = parse(text)
+            except Exception as e:
+                logger.error(f"Error in {parse.__name__}: {str(e)}")
+                continue
+            personal_info = candidate.get('personalInfo') or {}
+            if personal_info.get('location') and not personal_info.get('city'):
+                personal_info['city'] = personal_info.pop('location')
+            candidate['personalInfo'] = {k: v for k, v in personal_info.items() if v}
+            candidates.append(candidate)
+        return pick_best(candidates, sections, text)
+
+    def _sectioned_extraction(self, sections: Dict[str, str]) -> Dict[str, Any]:
+        """Parse the sections found by their headings (the header, experience, education, skills)"""
+        extracted = {}
+        if sections.get(HEADER):
+            extracted['personalInfo'] = self._extract_header_personal_info(sections[HEADER])
+        if sections.get('summary'):
+            extracted['summary'] = ' '.join(sections['summary'].split())[:600]
+        if sections.get('workExperience'):
+            extracted['workExperience'] = self._extract_sectioned_experience(sections['workExperience'])
+        if sections.get('education'):
+            extracted['education'] = self._extract_sectioned_education(sections['education'])
+        if sections.get('skills'):
+            skills = [skill.split(':', 1)[-1].strip(' -*\t') for skill in re.split(r'[,;|•·▪\n]', sections['skills'])]
+            extracted['skills'] = [skill for skill in skills if skill][:30]
+        return extracted
+
+    def _extract_header_personal_info(self, header: str) -> Dict[str, str]:
+        """Contact details from the lines above the first section heading"""
+        personal_info = {}
+        lines = [line.strip() for line in header.split('\n') if line.strip()]
+        if lines and not re.search(r'[@\d]', lines[0]):
+            name_parts = lines[0].split()
+            personal_info['firstName'] = name_parts[0]
+            if len(name_parts) > 1:
+                personal_info['lastName'] = ' '.join(name_parts[1:])
+        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', header)
+        if email_match:
+            personal_info['email'] = email_match.group(0)
+        phone_match = re.search(r'\+?\d[\d\s().-]{6,}\d', header)
+        if phone_match:
+            personal_info['phone'] = phone_match.group(0).strip()
+        for line in lines[1:]:
+            location_match = re.match(r"^([A-Z][A-Za-z .'-]+),\s*([A-Z][A-Za-z .'-]+)$", line)
+            if location_match:
+                personal_info['city'] = location_match.group(1).strip()
+                personal_info['country'] = location_match.group(2).strip()
+                break
+        linkedin_match = re.search(r'linkedin\.com/in/[\w-]+', header, re.IGNORECASE)
+        if linkedin_match:
+            personal_info['linkedin'] = linkedin_match.group(0)
+        website_match = re.search(r'https?://[\w.-]+\.[a-zA-Z]{2,}\S*', header)
+        if website_match and 'linkedin' not in website_match.group(0).lower():
+            personal_info['website'] = website_match.group(0)
+        return personal_info
+
+    def _extract_sectioned_experience(self, section: str) -> List[Dict[str, Any]]:
+        """Jobs laid out as a title/company line, a date range and bullet points"""
+        experience = []
+        job = None
+        for line in section.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if re.match(r'^[•·▪*–-]\s*', line):
+                if job is not None:
+                    job['responsibilities'].append(re.sub(r'^[•·▪*–-]\s*', '', line))
+                continue
+            dates = DATE_RANGE.search(line)
+            header = (DATE_RANGE.sub('', line) if dates else line).strip(' |,()–-')
+            if job is None or (dates and job['startDate']) or (not dates and (job['responsibilities'] or
+                                                                              (job['jobTitle'] and job['startDate']))):
+                job = {'jobTitle': '', 'company': '', 'startDate': '', 'endDate': '', 'current': False,
+                       'responsibilities': [], 'location': ''}
+                experience.append(job)
+            if dates:
+                job['startDate'] = dates.group(1)
+                job['current'] = dates.group(2).lower() in ('present', 'current', 'now')
+                job['endDate'] = '' if job['current'] else dates.group(2)
+            if not header:
+                continue
+            if not job['jobTitle']:
+                title_company = re.match(r'^(.+?)\s+(?:at|@|\||–|—|-)\s+(.+)$', header) or \
+                    re.match(r'^(.+?),\s+(.+)$', header)
+                if title_company:
+                    job['jobTitle'], job['company'] = title_company.group(1).strip(), title_company.group(2).strip()
+                else:
+                    job['jobTitle'] = header
+            elif not job['company']:
+                job['company'] = header
+            else:
+                job['responsibilities'].append(header)
+        for job in experience:
+            job['responsibilities'] = '\n'.join(job['responsibilities'])
+        return [job for job in experience if job['jobTitle'] or job['company']]
+
+    def _extract_sectioned_education(self, section: str) -> List[Dict[str, str]]:
+        """Degrees laid out as degree, institution and year lines (blank lines between entries)"""
+        education = []
+        entry = None
+        for line in section.split('\n'):
+            line = line.strip()
+            if not line:
+                entry = None
+                continue
+            degree_match = DEGREE.search(line)
+            if entry is None or (degree_match and entry['degree']):
+                entry = {'institution': '', 'degree': '', 'field': '', 'graduationYear': '', 'gpa': ''}
+                education.append(entry)
+            years = re.findall(r'\b(?:19|20)\d{2}\b', line)
+            gpa_match = re.search(r'GPA[:\s]*(\d+\.?\d*)', line, re.IGNORECASE)
+            if years:
+                entry['graduationYear'] = years[-1]
+            if gpa_match:
+                entry['gpa'] = gpa_match.group(1)
+            text = re.sub(r'\b(?:19|20)\d{2}\b|GPA[:\s]*\d+\.?\d*|[–—-]', ' ', line).strip(' ,|()')
+            if not text:
+                continue
+            if degree_match and not entry['degree']:
+                degree_field = re.match(r'^(.+?)\s+in\s+(.+)$', text)
+                entry['degree'], entry['field'] = (degree_field.group(1), degree_field.group(2)) if degree_field \
+                    else (text, '')
+            elif not entry['institution']:
+                entry['institution'] = text
+        return [entry for entry in education if entry['degree'] or entry['institution']]
+
     def _simple_reliable_extraction(self, text: str) -> Dict[str, Any]:
         """SIMPLE and RELIABLE resume extraction that actually works"""
         try:
@@ -1682,14 +1834,45 @@ class ResumeParserService:
         
         return project_data if project_data else None
 
-    def _enhance_with_ai(self, parsed_data: Dict[str, Any], raw_text: str) -> Dict[str, Any]:
-        """Enhance parsed data using AI"""
+    def _escalate_sections(self, parsed_data: Dict[str, Any], raw_text: str,
+                           confidence: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Re-parse the low-confidence sections with one compact AI request and
+        merge them into parsed_data in place. Returns what was sent and merged.
+        """
+        sections = split_sections(raw_text)
+        names = plan_escalation(confidence, sections)
+        escalation = {'sections': names, 'merged': [], 'prompt_tokens': 0}
+        if not names:
+            return escalation
+        if openai_breaker.is_open():
+            escalation['error'] = 'OpenAI circuit is open; kept the local parse'
+            return escalation
+
+        prompt = build_prompt(names, sections)
+        escalation['prompt_tokens'] = estimate_tokens(prompt)
         try:
-            if not self.openai_api_key:
-                return parsed_data
-            
-            # Create a prompt for AI enhancement
-            prompt = f"""
+            with openai_breaker.guard():
+                response = openai.ChatCompletion.create(
+                    model=RESUME_PARSER_AI_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You extract resume sections into JSON. Reply with the JSON object only."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=max_tokens_for(prompt),
+                    temperature=0
+                )
+            escalation['merged'] = merge_reply(parsed_data, response.choices[0].message.content, names)
+            for name in escalation['merged']:
+                confidence[name] = 1.0
+        except Exception as e:
+            logger.warning(f"AI escalation of resume sections {names} failed, kept the local parse: {str(e)}")
+            escalation['error'] = str(e)
+        return escalation
+
+    def _full_enhancement_prompt(self, parsed_data: Dict[str, Any], raw_text: str) -> str:
+        """Prompt of the whole-document enhancement pass (RESUME_PARSER_AI_MODE=full)"""
+        return f"""
             Please enhance and structure this parsed resume data. The raw resume text is provided for context.
             
             Raw Resume Text:
@@ -1749,16 +1932,25 @@ class ResumeParserService:
             4. Improving descriptions and summaries
             5. Ensuring consistent formatting
             """
+
+    def _enhance_with_ai(self, parsed_data: Dict[str, Any], raw_text: str) -> Dict[str, Any]:
+        """Enhance parsed data using AI"""
+        try:
+            if not self.openai_api_key:
+                return parsed_data
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume parser. Extract and structure resume information accurately."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.1
-            )
+            prompt = self._full_enhancement_prompt(parsed_data, raw_text)
+
+            with openai_breaker.guard():
+                response = openai.ChatCompletion.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "You are an expert resume parser. Extract and structure resume information accurately."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=2000,
+                    temperature=0.1
+                )
             
             # Parse AI response
             ai_response = response.choices[0].message.content
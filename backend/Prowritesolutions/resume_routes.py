@@ -0,0 +1,592 @@
+"""
+Flask API routes for resume generation, storage and uploads
+"""
+
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+import random
+import base64
+from app_core import jwt_required_custom, logger, pdf_generator
+from resume_features import found, resume_feature_store
+
+resume_bp = Blueprint('resume', __name__)
+
+# Resume Generation Routes
+@resume_bp.route('/api/resumes/generate', methods=['POST'])
+@jwt_required_custom
+def generate_resume():
+    """Generate a professional resume PDF"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        # Validate required fields
+        if not data.get('name'):
+            return jsonify({
+                'success': False,
+                'message': 'Name is required'
+            }), 400
+
+        # Generate output path
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"resume_{data['name'].replace(' ', '_')}_{timestamp}.pdf"
+        output_path = f"static/templates/generated_resumes/{filename}"
+
+        # Generate PDF
+        success = pdf_generator.generate_resume_pdf(data, output_path)
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'Resume generated successfully',
+                'pdf_path': output_path,
+                'filename': filename,
+                'resume_id': f"resume_{timestamp}"
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to generate resume'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error generating resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/templates', methods=['GET'])
+def get_resume_templates():
+    """Get available resume templates"""
+    try:
+        templates = [
+            {
+                'id': 'professional',
+                'name': 'Professional',
+                'description': 'Clean and professional design',
+                'preview': '/static/templates/previews/professional.png'
+            },
+            {
+                'id': 'modern',
+                'name': 'Modern',
+                'description': 'Modern and creative design',
+                'preview': '/static/templates/previews/modern.png'
+            },
+            {
+                'id': 'executive',
+                'name': 'Executive',
+                'description': 'Executive-level design',
+                'preview': '/static/templates/previews/executive.png'
+            }
+        ]
+
+        return jsonify({
+            'success': True,
+            'data': templates
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting templates: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/analyze', methods=['POST'])
+@jwt_required_custom
+def analyze_resume():
+    """Analyze resume content and provide suggestions"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        resume_content = data.get('content', '')
+        target_job = data.get('target_job', '')
+
+        if not resume_content:
+            return jsonify({
+                'success': False,
+                'message': 'Resume content is required'
+            }), 400
+
+        features = resume_feature_store.features(resume_content)
+
+        # Basic analysis
+        analysis = {
+            'word_count': features['word_count'],
+            'sections_found': found(features, ['experience', 'education', 'skills', 'summary', 'contact']),
+            'suggestions': [],
+            'ats_score': random.randint(70, 95)
+        }
+
+        # Generate suggestions
+        if len(analysis['sections_found']) < 3:
+            analysis['suggestions'].append('Consider adding more sections like Skills or Summary')
+
+        if analysis['word_count'] < 200:
+            analysis['suggestions'].append('Resume might be too short - add more details')
+        elif analysis['word_count'] > 800:
+            analysis['suggestions'].append('Resume might be too long - consider condensing')
+
+        return jsonify({
+            'success': True,
+            'data': analysis
+        })
+
+    except Exception as e:
+        logger.error(f"Error analyzing resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Resume Management Routes (Missing from Frontend)
+@resume_bp.route('/api/resumes', methods=['GET'])
+@jwt_required_custom
+def get_user_resumes():
+    """Get all resumes for the current user"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Return empty array - no resumes exist yet
+        resumes = []
+
+        return jsonify({
+            'success': True,
+            'data': resumes
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting user resumes: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/<int:resume_id>', methods=['GET'])
+@jwt_required_custom
+def get_resume(resume_id):
+    """Get specific resume with sections"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Return 404 - resume not found
+        return jsonify({
+            'success': False,
+            'message': 'Resume not found'
+        }), 404
+
+    except Exception as e:
+        logger.error(f"Error getting resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes', methods=['POST'])
+@jwt_required_custom
+def create_resume():
+    """Create a new resume"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        title = data.get('title', 'Untitled Resume')
+        template_id = data.get('template_id')
+
+        # Mock creation - in production, this would save to database
+        resume_id = random.randint(1000, 9999)
+
+        # Compute this version's features now so the analyzers find them ready
+        if data.get('content'):
+            resume_feature_store.features(data['content'])
+
+        return jsonify({
+            'success': True,
+            'message': 'Resume created successfully',
+            'resume_id': resume_id
+        })
+
+    except Exception as e:
+        logger.error(f"Error creating resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/<int:resume_id>', methods=['PUT'])
+@jwt_required_custom
+def update_resume(resume_id):
+    """Update a resume"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        # Mock update - in production, this would update database
+        if data.get('content'):
+            resume_feature_store.features(data['content'])
+
+        return jsonify({
+            'success': True,
+            'message': 'Resume updated successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Error updating resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/<int:resume_id>/enhance', methods=['POST'])
+@jwt_required_custom
+def enhance_resume_section(resume_id):
+    """Enhance a specific resume section"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        section_id = data.get('section_id')
+        job_description = data.get('job_description', '')
+        tone = data.get('tone', 'formal')
+
+        # Mock enhancement - in production, this would use AI
+        enhancements = [
+            'Added quantifiable achievements',
+            'Improved action verbs',
+            'Enhanced industry keywords',
+            'Optimized for ATS compatibility'
+        ]
+
+        return jsonify({
+            'success': True,
+            'message': 'Resume section enhanced successfully',
+            'enhancements': enhancements
+        })
+
+    except Exception as e:
+        logger.error(f"Error enhancing resume section: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/<int:resume_id>/analyze', methods=['POST'])
+@jwt_required_custom
+def analyze_resume_detailed(resume_id):
+    """Analyze resume with detailed scoring"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        job_description = data.get('job_description', '')
+
+        # Mock analysis - in production, this would use AI
+        score = {
+            'overall_score': random.randint(75, 95),
+            'ats_compatibility': random.randint(70, 90),
+            'keyword_match': random.randint(60, 85),
+            'formatting': random.randint(80, 95),
+            'content_quality': random.randint(70, 90),
+            'suggestions': [
+                'Add more quantifiable achievements',
+                'Include industry-specific keywords',
+                'Improve action verb usage',
+                'Consider adding a skills section'
+            ]
+        }
+
+        return jsonify({
+            'success': True,
+            'message': 'Resume analyzed successfully',
+            'score': score
+        })
+
+    except Exception as e:
+        logger.error(f"Error analyzing resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/<int:resume_id>/cover-letter', methods=['POST'])
+@jwt_required_custom
+def generate_cover_letter_from_resume(resume_id):
+    """Generate cover letter from resume data"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        company = data.get('company', '')
+        position = data.get('position', '')
+        template_id = data.get('template_id')
+
+        # Mock generation - in production, this would use AI
+        cover_letter_id = random.randint(1000, 9999)
+        content = f"""
+Dear Hiring Manager,
+
+I am writing to express my strong interest in the {position} position at {company}.
+With my background in software development and passion for innovation, I am confident
+that I would be a valuable addition to your team.
+
+[Generated content based on resume data...]
+
+Thank you for considering my application. I look forward to hearing from you soon.
+
+Sincerely,
+[Your Name]
+        """
+
+        return jsonify({
+            'success': True,
+            'message': 'Cover letter generated successfully',
+            'cover_letter_id': cover_letter_id,
+            'content': content
+        })
+
+    except Exception as e:
+        logger.error(f"Error generating cover letter: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/upload', methods=['POST'])
+@jwt_required_custom
+def upload_resume_file():
+    """Upload and parse resume file"""
+    try:
+        user_id = request.current_user['user_id']
+
+        if 'file' not in request.files:
+            return jsonify({
+                'success': False,
+                'message': 'No file provided'
+            }), 400
+
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({
+                'success': False,
+                'message': 'No file selected'
+            }), 400
+
+        # Mock parsing - in production, this would use AI/ML parsing
+        parsed_resume_id = random.randint(1000, 9999)
+        parsed_data = {
+            'personal_info': {
+                'name': 'John Doe',
+                'email': 'john@example.com',
+                'phone': '+1234567890',
+                'address': '123 Main St, City, State',
+                'linkedin': 'linkedin.com/in/johndoe'
+            },
+            'summary': 'Experienced software engineer with 5+ years of experience...',
+            'experience': [
+                {
+                    'title': 'Senior Software Engineer',
+                    'company': 'Tech Corp',
+                    'duration': '2020-2024',
+                    'description': 'Led development of microservices architecture...'
+                }
+            ],
+            'education': [
+                {
+                    'degree': 'Bachelor of Computer Science',
+                    'institution': 'University of Technology',
+                    'year': '2020',
+                    'gpa': '3.8'
+                }
+            ],
+            'skills': ['Python', 'JavaScript', 'React', 'Node.js', 'AWS'],
+            'certifications': ['AWS Certified Developer', 'Google Cloud Professional'],
+            'languages': ['English', 'Spanish'],
+            'projects': [
+                {
+                    'name': 'E-commerce Platform',
+                    'description': 'Built a full-stack e-commerce platform...',
+                    'technologies': ['React', 'Node.js', 'MongoDB']
+                }
+            ]
+        }
+
+        return jsonify({
+            'success': True,
+            'message': 'Resume uploaded and parsed successfully',
+            'parsed_resume_id': parsed_resume_id,
+            'parsed_data': parsed_data,
+            'filename': file.filename
+        })
+
+    except Exception as e:
+        logger.error(f"Error uploading resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/parsed', methods=['GET'])
+@jwt_required_custom
+def get_parsed_resumes():
+    """Get all parsed resumes for the user"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Return empty array - no parsed resumes exist yet
+        parsed_resumes = []
+
+        return jsonify({
+            'success': True,
+            'data': parsed_resumes
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting parsed resumes: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/parsed/<int:resume_id>', methods=['GET'])
+@jwt_required_custom
+def get_parsed_resume(resume_id):
+    """Get specific parsed resume"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Return 404 - parsed resume not found
+        return jsonify({
+            'success': False,
+            'message': 'Parsed resume not found'
+        }), 404
+
+    except Exception as e:
+        logger.error(f"Error getting parsed resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/parsed/<int:resume_id>', methods=['DELETE'])
+@jwt_required_custom
+def delete_parsed_resume(resume_id):
+    """Delete parsed resume"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Mock deletion - in production, this would delete from database
+        return jsonify({
+            'success': True,
+            'message': 'Parsed resume deleted successfully'
+        })
+
+    except Exception as e:
+        logger.error(f"Error deleting parsed resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# PDF Generation Routes (Missing from Frontend)
+@resume_bp.route('/api/resume/generate-pdf', methods=['POST'])
+@jwt_required_custom
+def generate_pdf_with_form_data():
+    """Generate PDF with form data injected into template"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        # Use existing PDF generator
+        success = pdf_generator.generate_resume_pdf(data, f"static/templates/generated_resumes/resume_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'PDF generated successfully',
+                'pdf_path': f'/static/templates/generated_resumes/resume_{user_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to generate PDF'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error generating PDF: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resume/generate-advanced-pdf', methods=['POST'])
+@jwt_required_custom
+def generate_advanced_pdf():
+    """Generate advanced PDF with multiple options"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        # Use existing PDF generator with advanced options
+        success = pdf_generator.generate_resume_pdf(data, f"static/templates/generated_resumes/advanced_resume_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'Advanced PDF generated successfully',
+                'pdf_path': f'/static/templates/generated_resumes/advanced_resume_{user_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to generate advanced PDF'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error generating advanced PDF: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_bp.route('/api/resumes/generate-francisca', methods=['POST'])
+@jwt_required_custom
+def generate_francisca_resume():
+    """Generate resume using Francisca template"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        resume_data = data.get('resume_data', {})
+        use_ai = data.get('use_ai', False)
+        theme = data.get('theme', 'professional')
+        job_description = data.get('job_description', '')
+        industry = data.get('industry', '')
+
+        # Generate PDF in memory using Francisca template
+        pdf_data = pdf_generator.generate_resume_pdf_bytes(resume_data)
+
+        if pdf_data:
+            # Return PDF data as base64 for frontend to handle
+            pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
+            
+            return jsonify({
+                'success': True,
+                'message': 'Francisca resume generated successfully',
+                'pdf_data': pdf_base64,
+                'filename': f"francisca_resume_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                'resume_id': f"francisca_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to generate Francisca resume'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error generating Francisca resume: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
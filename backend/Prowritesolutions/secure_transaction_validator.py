@@ -8,6 +8,9 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 import os
 
+from http_sessions import get_session
+from token_cache import token_cache, make_cache_key
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -41,37 +44,47 @@ class SecureMpesaValidator:
         
         self.validated_transactions = set()  # Store validated transaction IDs
         
+    @property
+    def session(self):
+        """Pooled keep-alive session (re-created per process after a fork)"""
+        return get_session('mpesa')
+    
     def _get_access_token(self) -> Optional[str]:
-        """Get OAuth access token from M-Pesa API"""
+        """Get OAuth access token from M-Pesa API (shared with MpesaService)"""
         try:
             if not self.consumer_key or not self.consumer_secret:
                 logger.error("M-Pesa credentials not configured")
                 return None
-                
-            url = f"{self.base_url}/oauth/v1/generate?grant_type=client_credentials"
-            
-            # Create basic auth header
-            credentials = f"{self.consumer_key}:{self.consumer_secret}"
-            encoded_credentials = base64.b64encode(credentials.encode()).decode()
-            
-            headers = {
-                'Authorization': f'Basic {encoded_credentials}',
-                'Content-Type': 'application/json'
-            }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('access_token')
-            else:
-                logger.error(f"Failed to get access token: {response.status_code} - {response.text}")
-                return None
+            cache_key = make_cache_key('mpesa', self.base_url, self.consumer_key)
+            return token_cache.get_token(cache_key, self._fetch_access_token)
                 
         except Exception as e:
             logger.error(f"Error getting access token: {e}")
             return None
     
+    def _fetch_access_token(self):
+        """Request a new OAuth token, returns (token, expires_in)"""
+        url = f"{self.base_url}/oauth/v1/generate?grant_type=client_credentials"
+        
+        # Create basic auth header
+        credentials = f"{self.consumer_key}:{self.consumer_secret}"
+        encoded_credentials = base64.b64encode(credentials.encode()).decode()
+        
+        headers = {
+            'Authorization': f'Basic {encoded_credentials}',
+            'Content-Type': 'application/json'
+        }
+        
+        response = self.session.get(url, headers=headers, timeout=30)
+        
+        if response.status_code == 200:
+            data = response.json()
+            return data['access_token'], float(data.get('expires_in') or 3599)
+        
+        logger.error(f"Failed to get access token: {response.status_code} - {response.text}")
+        raise Exception(f"Failed to get access token: {response.status_code}")
+    
     def _query_transaction_status(self, transaction_id: str, amount: float) -> ValidationResult:
         """Query M-Pesa API to verify transaction"""
         try:
@@ -111,7 +124,7 @@ class SecureMpesaValidator:
                 "Occasion": "Payment Verification"
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self.session.post(url, json=payload, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -9,6 +9,7 @@ import re
 import openai
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from resume_features import found, resume_feature_store
 
 class SmartOptimizationEngine:
     def __init__(self):
@@ -87,7 +88,8 @@ class SmartOptimizationEngine:
             if not self.openai_api_key:
                 return self._mock_optimization_analysis(resume_content, profession, industry)
             
-            # Perform comprehensive analysis
+            # Perform comprehensive analysis on features computed once per resume version
+            features = resume_feature_store.features(resume_content)
             analysis_results = {}
             overall_score = 0
             
@@ -96,7 +98,7 @@ class SmartOptimizationEngine:
                 category_checks = []
                 
                 for check in config['checks']:
-                    check_result = self._perform_optimization_check(resume_content, check, profession, industry)
+                    check_result = self._perform_optimization_check(features, check, profession, industry)
                     category_checks.append(check_result)
                     category_score += check_result['score']
                 
@@ -259,13 +261,12 @@ Suggested keywords:"""
                 'content': self._mock_keyword_suggestions(resume_content, target_job, industry)
             }
 
-    def _perform_optimization_check(self, content: str, check_type: str, profession: str = None, industry: str = None) -> Dict[str, Any]:
+    def _perform_optimization_check(self, features: Dict[str, Any], check_type: str, profession: str = None, industry: str = None) -> Dict[str, Any]:
         """Perform a specific optimization check"""
-        content_lower = content.lower()
-        
+
         if check_type == 'action_verbs':
-            strong_verbs = sum(1 for verb in self.optimization_patterns['strong_phrases'] if verb in content_lower)
-            weak_phrases = sum(1 for phrase in self.optimization_patterns['weak_phrases'] if phrase in content_lower)
+            strong_verbs = len(found(features, self.optimization_patterns['strong_phrases']))
+            weak_phrases = len(found(features, self.optimization_patterns['weak_phrases']))
             score = min(100, (strong_verbs * 20) - (weak_phrases * 10))
             return {
                 'check': check_type,
@@ -274,8 +275,7 @@ Suggested keywords:"""
             }
         
         elif check_type == 'quantifiable_results':
-            quantifiable_count = sum(1 for pattern in self.optimization_patterns['quantifiable_indicators'] 
-                                   if re.search(pattern, content, re.IGNORECASE))
+            quantifiable_count = len(features['metrics'])
             score = min(100, quantifiable_count * 25)
             return {
                 'check': check_type,
@@ -286,7 +286,7 @@ Suggested keywords:"""
         elif check_type == 'relevant_keywords':
             if industry and industry in self.industry_rules:
                 industry_keywords = self.industry_rules[industry]['keywords']
-                found_keywords = sum(1 for keyword in industry_keywords if keyword in content_lower)
+                found_keywords = len(found(features, industry_keywords))
                 score = min(100, (found_keywords / len(industry_keywords)) * 100)
                 return {
                     'check': check_type,
@@ -0,0 +1,223 @@
+"""
+Step Enhancer
+Batched AI enhancement for the guided question flow.
+
+In batch mode `/api/francisca/questions/answer` stores the answer as typed and
+queues it here instead of making one OpenAI round-trip per field. Answers are
+grouped by (user, step); a step is enhanced with one multi-field request
+(`FranciscaEnhancedAI.enhance_answers`) on a small thread pool as soon as:
+
+    - every field of the step has been answered,
+    - the user answers a field of another step or asks for the next question, or
+    - `/api/francisca/questions/step-summary` asks for the step.
+
+so the call usually runs while the user is typing the next step. Results are
+written back into the question engine (unless the answer changed meanwhile)
+and reported per field by the step summary. Re-answering a field re-queues
+only that field.
+
+Batches are per process and expire after BATCH_TTL seconds of inactivity.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field as dataclass_field
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENHANCEMENT_DEFAULT = os.getenv('FRANCISCA_BATCH_ENHANCEMENT', 'false').lower() == 'true'
+STEP_ENHANCER_WORKERS = int(os.getenv('STEP_ENHANCER_WORKERS', 4))
+BATCH_TTL = 3600
+
+COLLECTING, RUNNING, DONE, FAILED = 'collecting', 'running', 'done', 'failed'
+
+
+@dataclass
+class StepBatch:
+    user_id: Any
+    step: str
+    answers: Dict[str, str] = dataclass_field(default_factory=dict)
+    dirty: Set[str] = dataclass_field(default_factory=set)     # answered but not enhanced yet
+    results: Dict[str, Dict] = dataclass_field(default_factory=dict)
+    context: Dict = dataclass_field(default_factory=dict)
+    status: str = COLLECTING
+    future: Optional[Future] = None
+    error: Optional[str] = None
+    updated_at: float = dataclass_field(default_factory=time.time)
+    requests: int = 0
+
+
+class StepEnhancer:
+    """Per-(user, step) answer queues enhanced with one AI request per step"""
+
+    def __init__(self, ai=None, engine=None, workers: int = STEP_ENHANCER_WORKERS):
+        self._ai = ai
+        self._engine = engine
+        self.workers = workers
+        self._batches: Dict[tuple, StepBatch] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self.stats = {'answers': 0, 'requests': 0, 'failures': 0}
+
+    @property
+    def ai(self):
+        if self._ai is None:
+            from francisca_enhanced_ai import francisca_enhanced_ai
+            self._ai = francisca_enhanced_ai
+        return self._ai
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from francisca_question_engine import francisca_question_engine
+            self._engine = francisca_question_engine
+        return self._engine
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created on first use and again in forked workers; importing starts no threads
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='step-enhancer')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    # ----- queueing -----
+
+    def add_answer(self, user_id, field: str, answer: str, context: Dict = None) -> Dict:
+        """Queue an answer; returns the state of its step's batch"""
+        step = self.engine.get_field_step(field) or field
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            # Answering another step means the user has moved on: enhance what they left
+            for batch in self._user_batches(user_id):
+                if batch.step != step and batch.status in (COLLECTING, FAILED):
+                    self._submit(batch)
+            batch = self._batches.get((user_id, step))
+            if batch is None:
+                batch = self._batches[(user_id, step)] = StepBatch(user_id, step)
+            if field not in batch.answers or batch.answers[field] != answer:
+                batch.answers[field] = answer
+                batch.results.pop(field, None)
+                batch.dirty.add(field)
+            if context:
+                batch.context.update(context)
+            batch.updated_at = now
+            self.stats['answers'] += 1
+            if batch.status != RUNNING:
+                batch.status = COLLECTING if batch.dirty else DONE
+            step_fields = self.engine.get_step_fields(step)
+            if batch.status == COLLECTING and step_fields and all(f in batch.answers for f in step_fields):
+                self._submit(batch)
+            return self._describe(batch)
+
+    def flush(self, user_id, step: Optional[str] = None) -> int:
+        """Start enhancing the user's queued answers now (one step or all); returns batches started"""
+        started = 0
+        with self._lock:
+            for batch in self._user_batches(user_id):
+                if (step is None or batch.step == step) and batch.status in (COLLECTING, FAILED) and batch.dirty:
+                    self._submit(batch)
+                    started += 1
+        return started
+
+    def reset(self, user_id):
+        """Forget a user's batches (a new question flow was started)"""
+        with self._lock:
+            for key in [key for key in self._batches if key[0] == user_id]:
+                del self._batches[key]
+
+    def _user_batches(self, user_id) -> List[StepBatch]:
+        return [batch for (owner, _), batch in self._batches.items() if owner == user_id]
+
+    def _prune(self, now: float):
+        for key in [key for key, batch in self._batches.items()
+                    if batch.status != RUNNING and now - batch.updated_at > BATCH_TTL]:
+            del self._batches[key]
+
+    # ----- enhancement -----
+
+    def _submit(self, batch: StepBatch):
+        """Enhance the batch's dirty answers in the background (caller holds the lock)"""
+        if batch.status == RUNNING or not batch.dirty:
+            return
+        answers = {f: batch.answers[f] for f in batch.dirty}
+        batch.dirty = set()
+        batch.status = RUNNING
+        batch.requests += 1
+        self.stats['requests'] += 1
+        batch.future = self._pool().submit(self._run, batch, answers, dict(batch.context))
+
+    def _run(self, batch: StepBatch, answers: Dict[str, str], context: Dict):
+        try:
+            results = self.ai.enhance_answers(answers, context)
+            error = None
+        except Exception as e:
+            logger.error(f"Batched enhancement of step {batch.step} failed: {e}")
+            results, error = {}, str(e)
+            self.stats['failures'] += 1
+
+        with self._lock:
+            for f, original in answers.items():
+                if batch.answers.get(f) != original:
+                    continue  # re-answered meanwhile; that version is queued
+                if f in results:
+                    batch.results[f] = results[f]
+                    self.engine.apply_enhancement(f, original, results[f]['enhanced'])
+                else:
+                    batch.dirty.add(f)
+            batch.error = error
+            batch.updated_at = time.time()
+            if error:
+                batch.status = FAILED
+            elif batch.dirty:
+                batch.status = COLLECTING
+                if all(f in batch.answers for f in self.engine.get_step_fields(batch.step)):
+                    self._submit(batch)
+            else:
+                batch.status = DONE
+
+    # ----- results -----
+
+    def _describe(self, batch: StepBatch) -> Dict:
+        return {
+            'step': batch.step,
+            'status': batch.status,
+            'queued_fields': sorted(batch.dirty),
+            'enhanced_fields': sorted(batch.results),
+        }
+
+    def summary(self, user_id, step: str, wait: float = 0.0) -> Optional[Dict]:
+        """
+        Enhancement state and per-field results of a step (None if nothing was
+        queued for it). With `wait`, queued answers are submitted and the call
+        blocks up to `wait` seconds for them.
+        """
+        deadline = time.monotonic() + wait
+        while True:
+            with self._lock:
+                batch = self._batches.get((user_id, step))
+                if batch is None:
+                    return None
+                if wait > 0 and batch.status in (COLLECTING, FAILED):
+                    self._submit(batch)
+                future = batch.future if batch.status == RUNNING else None
+                if future is None or time.monotonic() >= deadline:
+                    result = self._describe(batch)
+                    result['results'] = {f: dict(r) for f, r in batch.results.items()}
+                    result['requests'] = batch.requests
+                    if batch.error:
+                        result['error'] = batch.error
+                    return result
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception:
+                pass  # the state says what happened
+
+
+# Global instance
+step_enhancer = StepEnhancer()
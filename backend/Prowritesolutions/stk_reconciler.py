@@ -0,0 +1,308 @@
+"""
+STK Status Reconciler
+Server-side reconciliation of pending M-Pesa STK pushes.
+
+Instead of every browser poll calling Daraja's STK query, one reconciler (elected
+across workers with a MySQL named lock) periodically queries the pending checkouts
+that are due, with exponential backoff per checkout and a global query budget.
+Final results are fed into the callback inbox (mpesa_settlement) as synthetic
+callbacks, so they are settled by exactly the same idempotent path as real
+Daraja callbacks. The STK query carries no M-Pesa receipt, so a checkout settled
+here gets its receipt (and till ledger entry) when Daraja's own callback arrives.
+The status endpoint answers from the database plus a short in-process cache and
+never calls Daraja itself.
+
+Run one reconciliation pass, or a dedicated reconciler process, with:
+
+    python stk_reconciler.py run|worker
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_INTERVAL = int(os.getenv('STK_RECONCILE_INTERVAL', 15))          # seconds between passes
+QUERIES_PER_MINUTE = int(os.getenv('STK_RECONCILE_QUERIES_PER_MINUTE', 30))  # global Daraja budget
+FIRST_CHECK_DELAY = 20      # give the real callback a chance before querying
+BACKOFF_BASE = 15           # seconds before the second query of a checkout
+BACKOFF_MAX = 5 * 60
+MAX_CHECKOUT_AGE = 60 * 60  # stop querying checkouts older than this
+STATUS_CACHE_TTL = 2        # seconds a pending status is served from memory
+FINAL_STATUS_CACHE_TTL = 60
+LOCK_NAME = 'prowrite_stk_reconciler'
+
+
+class StkReconciler:
+    """Batches Daraja STK status queries for all pending checkouts"""
+
+    def __init__(self, interval: int = RECONCILE_INTERVAL, queries_per_minute: int = QUERIES_PER_MINUTE):
+        self.interval = interval
+        self.queries_per_minute = queries_per_minute
+        self._initialized = False
+        self._cache: Dict[str, tuple] = {}
+        self._cache_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = None
+        self._worker_pid = None
+
+    def _get_db_connection(self):
+        # Shares the settlement connection so mpesa_callbacks exists as well
+        from mpesa_settlement import mpesa_settlement
+        connection = mpesa_settlement._get_db_connection()
+        if not self._initialized:
+            self._init_database(connection)
+        return connection
+
+    def _init_database(self, connection):
+        cursor = connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stk_reconciliation (
+                checkout_request_id VARCHAR(100) PRIMARY KEY,
+                attempts INT NOT NULL DEFAULT 0,
+                next_check_at DATETIME,
+                last_checked_at DATETIME,
+                last_result_code VARCHAR(20),
+                last_result_description VARCHAR(255),
+                last_error TEXT,
+                INDEX idx_next_check (next_check_at)
+            )
+        """)
+        connection.commit()
+        cursor.close()
+        self._initialized = True
+        logger.info("STK reconciliation table initialized")
+
+    # ----- reconciliation -----
+
+    def _due_checkouts(self, connection, limit: int) -> List[Dict[str, Any]]:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT p.checkout_request_id, p.merchant_request_id, p.amount, COALESCE(r.attempts, 0) AS attempts
+            FROM payments p
+            LEFT JOIN stk_reconciliation r ON r.checkout_request_id = p.checkout_request_id
+            WHERE p.status = 'pending'
+              AND p.checkout_request_id IS NOT NULL
+              AND p.created_at >= NOW() - INTERVAL %s SECOND
+              AND p.created_at <= NOW() - INTERVAL %s SECOND
+              AND (r.next_check_at IS NULL OR r.next_check_at <= NOW())
+            ORDER BY COALESCE(r.next_check_at, p.created_at)
+            LIMIT %s
+        """, (MAX_CHECKOUT_AGE, FIRST_CHECK_DELAY, limit))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def _backoff(self, attempts: int) -> float:
+        return min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+
+    def _synthetic_callback(self, checkout: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape an STK query result like the Daraja callback it stands in for"""
+        items = []
+        for name, key in (('Amount', 'amount'), ('MpesaReceiptNumber', 'mpesa_receipt_number'),
+                          ('TransactionDate', 'transaction_date')):
+            if result.get(key) is not None:
+                items.append({'Name': name, 'Value': result[key]})
+        if not any(item['Name'] == 'Amount' for item in items) and checkout.get('amount') is not None:
+            items.append({'Name': 'Amount', 'Value': float(checkout['amount'])})
+
+        stk_callback = {
+            'MerchantRequestID': result.get('merchant_request_id') or checkout.get('merchant_request_id'),
+            'CheckoutRequestID': checkout['checkout_request_id'],
+            'ResultCode': int(result['result_code']),
+            'ResultDesc': result.get('result_description')
+        }
+        if items:
+            stk_callback['CallbackMetadata'] = {'Item': items}
+        return {'Body': {'stkCallback': stk_callback}, 'Source': 'stk_query'}
+
+    def _record_check(self, cursor, checkout_id: str, attempts: int, next_check_at: Optional[datetime],
+                      result_code: Optional[str], description: Optional[str], error: Optional[str]):
+        cursor.execute("""
+            INSERT INTO stk_reconciliation
+            (checkout_request_id, attempts, next_check_at, last_checked_at,
+             last_result_code, last_result_description, last_error)
+            VALUES (%s, %s, %s, NOW(), %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+            attempts = VALUES(attempts),
+            next_check_at = VALUES(next_check_at),
+            last_checked_at = VALUES(last_checked_at),
+            last_result_code = VALUES(last_result_code),
+            last_result_description = VALUES(last_result_description),
+            last_error = VALUES(last_error)
+        """, (checkout_id, attempts, next_check_at, result_code, (description or '')[:255] or None, error))
+
+    def reconcile_once(self) -> Dict[str, Any]:
+        """
+        Run one reconciliation pass. Only one worker on the database runs a pass
+        at a time; the others return immediately.
+        """
+        from mpesa_service import mpesa_service
+        from mpesa_settlement import mpesa_settlement
+
+        summary = {'ran': False, 'queried': 0, 'settled': 0, 'pending': 0, 'errors': 0}
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+            if cursor.fetchone()[0] != 1:
+                cursor.close()
+                return summary
+            summary['ran'] = True
+
+            try:
+                budget = max(1, int(self.queries_per_minute * self.interval / 60))
+                spacing = 60.0 / self.queries_per_minute if self.queries_per_minute else 0
+                for checkout in self._due_checkouts(connection, budget):
+                    if self._stop.is_set():
+                        break
+                    if summary['queried']:
+                        time.sleep(spacing)
+
+                    checkout_id = checkout['checkout_request_id']
+                    attempts = checkout['attempts'] + 1
+                    result = mpesa_service.query_stk_status(checkout_id)
+                    summary['queried'] += 1
+                    result_code = result.get('result_code')
+
+                    if result.get('success') and result_code not in (None, ''):
+                        # Final answer from Daraja - settle through the callback inbox
+                        mpesa_settlement.record_callback(self._synthetic_callback(checkout, result))
+                        self._record_check(cursor, checkout_id, attempts, None, str(result_code),
+                                           result.get('result_description'), None)
+                        summary['settled'] += 1
+                        self.invalidate(checkout_id)
+                    else:
+                        next_check = datetime.now() + timedelta(seconds=self._backoff(attempts))
+                        self._record_check(cursor, checkout_id, attempts, next_check, None, None,
+                                           result.get('error'))
+                        if 'Rate limited' in (result.get('error') or ''):
+                            connection.commit()
+                            logger.warning("Daraja rate limited the reconciler, ending this pass early")
+                            break
+                        if result.get('success') or result.get('status') == 'pending':
+                            summary['pending'] += 1
+                        else:
+                            summary['errors'] += 1
+                    connection.commit()
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                cursor.fetchone()
+                cursor.close()
+        finally:
+            connection.close()
+
+        if summary['queried']:
+            logger.info(f"STK reconciliation pass: {summary}")
+        return summary
+
+    # ----- status lookups (request path) -----
+
+    def invalidate(self, checkout_request_id: str):
+        with self._cache_lock:
+            self._cache.pop(checkout_request_id, None)
+
+    def get_checkout_status(self, checkout_request_id: str) -> Optional[Dict[str, Any]]:
+        """Payment status for a checkout, answered from the DB via a short TTL cache"""
+        now = time.time()
+        with self._cache_lock:
+            cached = self._cache.get(checkout_request_id)
+            if cached and cached[0] > now:
+                return cached[1]
+
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT p.payment_id, p.status, p.amount, p.payment_type, p.created_at,
+                       c.result_code AS callback_result_code, c.status AS callback_status,
+                       r.last_result_code, r.last_result_description, r.last_checked_at, r.attempts
+                FROM payments p
+                LEFT JOIN mpesa_callbacks c ON c.checkout_request_id = p.checkout_request_id
+                LEFT JOIN stk_reconciliation r ON r.checkout_request_id = p.checkout_request_id
+                WHERE p.checkout_request_id = %s
+            """, (checkout_request_id,))
+            row = cursor.fetchone()
+            cursor.close()
+        finally:
+            connection.close()
+
+        if row:
+            result_code = row['callback_result_code']
+            if result_code is None:
+                result_code = row['last_result_code']
+            row['result_code'] = str(result_code) if result_code is not None else None
+            row['amount'] = float(row['amount']) if row['amount'] is not None else None
+            for field in ('created_at', 'last_checked_at'):
+                if row[field]:
+                    row[field] = row[field].isoformat()
+
+        ttl = FINAL_STATUS_CACHE_TTL if row and row['status'] != 'pending' else STATUS_CACHE_TTL
+        with self._cache_lock:
+            if len(self._cache) > 5000:
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            self._cache[checkout_request_id] = (now + ttl, row)
+        return row
+
+    # ----- worker -----
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.reconcile_once()
+            except Exception as e:
+                logger.error(f"STK reconciler error: {e}")
+            self._stop.wait(self.interval)
+
+    def start_worker(self):
+        """Start the reconciler thread (once per process; passes are elected via GET_LOCK)"""
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name='stk-reconciler', daemon=True)
+        self._worker_pid = os.getpid()
+        self._worker.start()
+        logger.info(f"STK reconciler started (every {self.interval}s, {self.queries_per_minute} queries/min)")
+
+    def stop_worker(self, timeout: float = 5):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+
+stk_reconciler = StkReconciler()
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    command = argv[0] if argv else 'run'
+
+    if command == 'run':
+        print(json.dumps(stk_reconciler.reconcile_once(), indent=2))
+        return 0
+    if command == 'worker':
+        stk_reconciler.start_worker()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            stk_reconciler.stop_worker()
+        return 0
+
+    print("Usage: python stk_reconciler.py [run|worker]")
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
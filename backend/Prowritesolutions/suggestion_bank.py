@@ -0,0 +1,278 @@
+"""
+Suggestion Bank
+Precomputed Francisca field suggestions, answered from an in-memory index.
+
+Suggestions depend only on (profession, field_type), and both come from small
+fixed lists in the builder UI, so they are generated ahead of time by a batch
+job instead of per request:
+
+    python suggestion_bank.py build     # OpenAI when configured, else the fallback service
+    python suggestion_bank.py status
+
+The job writes one compact JSON file (SUGGESTION_BANK_PATH). Each worker loads
+it into a dict on startup and picks up a rebuilt file on its own (the file's
+mtime is checked every RELOAD_CHECK_INTERVAL seconds), so a lookup is a dict
+access. Professions and field types are normalized ("Software Engineer",
+"software_engineer" and "software-engineer" share an entry); combinations
+that are not in the bank are generated live as before.
+
+With SUGGESTION_BANK_REFRESH_HOURS > 0 a background thread rebuilds the file
+once it is older than that; one worker on the host does the rebuild (flock),
+the others reload the result.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import fcntl
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_BANK_PATH = os.getenv('SUGGESTION_BANK_PATH', os.path.join('data', 'suggestion_bank.json'))
+REFRESH_HOURS = float(os.getenv('SUGGESTION_BANK_REFRESH_HOURS', 0))
+RELOAD_CHECK_INTERVAL = 30  # seconds between mtime checks, per process
+FORMAT_VERSION = 1
+
+# The profession step of the question engine, plus "no profession given"
+PROFESSIONS = [
+    "Software Engineer", "Data Scientist", "Product Manager",
+    "Marketing Manager", "Sales Representative", "Designer",
+    "Project Manager", "Business Analyst", "Consultant", "",
+] + [p.strip() for p in os.getenv('SUGGESTION_BANK_EXTRA_PROFESSIONS', '').split(',') if p.strip()]
+
+# Field types the template editor asks suggestions for, and the free-text
+# fields of the guided question flow (see GuidancePrefetcher)
+FIELD_TYPES = [
+    "summary", "experience", "skills", "education", "projects", "jobTitle",
+    "activities", "responsibilities", "achievements",
+    "keyResponsibilities", "keyAchievements", "technicalSkills", "softSkills",
+    "certifications", "majorAchievements", "awards",
+]
+
+Generator = Callable[[str, str], List[str]]
+
+
+def normalize(value: Optional[str]) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', (value or '').lower()).strip('_')
+
+
+def bank_key(profession: Optional[str], field_type: Optional[str]) -> str:
+    return f"{normalize(profession)}|{normalize(field_type)}"
+
+
+def _default_generator() -> Tuple[Generator, str]:
+    from francisca_ai_service import francisca_ai_service
+    from fallback_ai_service import fallback_ai_service
+    if francisca_ai_service.api_key and francisca_ai_service.api_key != 'your-openai-api-key-here':
+        def generate(profession: str, field_type: str) -> List[str]:
+            # Don't bank fallback text under the OpenAI label; skipped entries are generated live
+            if francisca_ai_service._should_use_fallback():
+                raise RuntimeError("OpenAI circuit is open")
+            return francisca_ai_service.generate_francisca_suggestions(profession, field_type)
+        return generate, 'openai'
+    return fallback_ai_service.get_francisca_suggestions, 'fallback'
+
+
+class SuggestionBank:
+    """Read-mostly index of suggestions keyed by normalized profession and field type"""
+
+    def __init__(self, path: str = SUGGESTION_BANK_PATH, refresh_hours: float = REFRESH_HOURS,
+                 reload_interval: float = RELOAD_CHECK_INTERVAL, generator: Optional[Generator] = None,
+                 source: Optional[str] = None):
+        self.path = path
+        self.refresh_hours = refresh_hours
+        self.reload_interval = reload_interval
+        self.generator = generator  # None: OpenAI when configured, else the fallback service
+        self.source = source
+        self._entries: Dict[str, List[str]] = {}
+        self._meta: Dict = {}
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_pid: Optional[int] = None
+        self.stats = {'hits': 0, 'misses': 0, 'reloads': 0}
+
+    # ----- index -----
+
+    def load(self) -> bool:
+        """(Re)load the index file if it changed; returns whether an index is loaded"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return bool(self._entries)
+        if mtime == self._mtime:
+            return True
+        with self._reload_lock:
+            if mtime == self._mtime:
+                return True
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not load suggestion bank {self.path}: {e}")
+                return bool(self._entries)
+            if data.get('version') != FORMAT_VERSION:
+                logger.warning(f"Ignoring suggestion bank {self.path} with format version {data.get('version')}")
+                return bool(self._entries)
+            # Swap both references at once; lookups never see a half-built index
+            self._entries = data.get('entries', {})
+            self._meta = {k: v for k, v in data.items() if k != 'entries'}
+            self._mtime = mtime
+            self.stats['reloads'] += 1
+        logger.info(f"Suggestion bank loaded: {len(self._entries)} entries ({self._meta.get('source')})")
+        return True
+
+    def lookup(self, profession: Optional[str], field_type: Optional[str]) -> Optional[List[str]]:
+        """Precomputed suggestions, or None when the combination is not in the bank"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_interval
+            self.load()
+        suggestions = self._entries.get(bank_key(profession, field_type))
+        if suggestions is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return list(suggestions)
+
+    def status(self) -> Dict:
+        age = time.time() - self._mtime if self._mtime else None
+        return {
+            'path': self.path,
+            'entries': len(self._entries),
+            'source': self._meta.get('source'),
+            'generated_at': self._meta.get('generated_at'),
+            'age_seconds': round(age) if age is not None else None,
+            'stats': dict(self.stats),
+        }
+
+    # ----- batch job -----
+
+    def build(self, generator: Optional[Generator] = None, source: Optional[str] = None,
+              professions: Optional[List[str]] = None, field_types: Optional[List[str]] = None) -> Dict:
+        """Generate every profession x field type combination and atomically replace the index file"""
+        if generator is None:
+            generator, source = (self.generator, self.source) if self.generator else _default_generator()
+        started = time.time()
+        entries: Dict[str, List[str]] = {}
+        failures = 0
+        for profession in professions if professions is not None else PROFESSIONS:
+            for field_type in field_types or FIELD_TYPES:
+                key = bank_key(profession, field_type)
+                if key in entries:
+                    continue
+                try:
+                    suggestions = generator(profession, field_type)
+                except Exception as e:
+                    failures += 1
+                    logger.warning(f"Suggestion bank: no suggestions for {key}: {e}")
+                    continue
+                if suggestions:
+                    entries[key] = [str(s) for s in suggestions]
+
+        data = {
+            'version': FORMAT_VERSION,
+            'generated_at': datetime.utcnow().isoformat() + 'Z',
+            'source': source or 'custom',
+            'entries': entries,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.load()
+        result = {'entries': len(entries), 'failures': failures, 'source': data['source'],
+                  'seconds': round(time.time() - started, 2)}
+        logger.info(f"Suggestion bank built: {result}")
+        return result
+
+    # ----- background refresh -----
+
+    def _stale(self) -> bool:
+        try:
+            return time.time() - os.stat(self.path).st_mtime >= self.refresh_hours * 3600
+        except OSError:
+            return True
+
+    def refresh_if_stale(self) -> bool:
+        """Rebuild when the file is older than refresh_hours; one process on the host at a time"""
+        self.load()
+        if not self._stale():
+            return False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False  # another worker is rebuilding
+            try:
+                if not self._stale():  # rebuilt while we were waiting
+                    self.load()
+                    return False
+                self.build()
+                return True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_if_stale()
+            except Exception as e:
+                logger.error(f"Suggestion bank refresh error: {e}")
+            self._stop.wait(max(60.0, min(3600.0, self.refresh_hours * 360)))
+
+    def start_refresh_worker(self):
+        """Start the periodic refresh thread (once per process)"""
+        if self.refresh_hours <= 0:
+            return
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name='suggestion-bank-refresh', daemon=True)
+        self._worker_pid = os.getpid()
+        self._worker.start()
+        logger.info(f"Suggestion bank refresh worker started (every {self.refresh_hours}h)")
+
+    def stop_refresh_worker(self, timeout: float = 5):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+
+suggestion_bank = SuggestionBank()
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    command = argv[0] if argv else 'build'
+
+    if command == 'build':
+        result = suggestion_bank.build()
+        print(json.dumps(result, indent=2))
+        return 0 if result['entries'] else 1
+    if command == 'status':
+        suggestion_bank.load()
+        print(json.dumps(suggestion_bank.status(), indent=2))
+        return 0
+
+    print("Usage: python suggestion_bank.py [build|status]")
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
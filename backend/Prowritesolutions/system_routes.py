@@ -0,0 +1,616 @@
+"""
+Flask API routes for health checks, metrics, database setup and admin operations
+"""
+
+from flask import Blueprint, request, jsonify, make_response, Response
+from datetime import datetime
+import mysql.connector
+from werkzeug.security import generate_password_hash
+from email_outbox import email_outbox
+from till_ledger import till_ledger
+from mpesa_settlement import mpesa_settlement
+from request_profiler import request_profiler, parse_collapsed, hottest_frames
+from circuit_breaker import openai_breaker
+from app_core import admin_required_custom, auth_system, DB_CONFIG, logger
+
+system_bp = Blueprint('system', __name__)
+
+# CORS preflight handler
+@system_bp.before_app_request
+def handle_preflight():
+    if request.method == "OPTIONS":
+        response = make_response()
+        response.headers.add("Access-Control-Allow-Origin", "*")
+        response.headers.add('Access-Control-Allow-Headers', "*")
+        response.headers.add('Access-Control-Allow-Methods', "*")
+        return response
+
+# Index endpoint
+@system_bp.route("/")
+def index():
+    return "Flask is working on PythonAnywhere 🚀"
+
+# Database setup endpoint
+@system_bp.route('/api/setup/database', methods=['POST'])
+def setup_database():
+    """Setup database and tables"""
+    try:
+        connection = mysql.connector.connect(
+            host=DB_CONFIG['host'],
+            user=DB_CONFIG['user'],
+            password=DB_CONFIG['password'],
+            charset='utf8mb4'
+        )
+        cursor = connection.cursor()
+
+        # Create database
+        cursor.execute("CREATE DATABASE IF NOT EXISTS prowrite_db")
+        logger.info("Database 'prowrite_db' created or already exists")
+
+        # Use the database
+        cursor.execute("USE prowrite_db")
+
+        # Create users table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                email VARCHAR(255) UNIQUE NOT NULL,
+                password VARCHAR(255) NOT NULL,
+                first_name VARCHAR(100) NOT NULL,
+                last_name VARCHAR(100) NOT NULL,
+                is_premium BOOLEAN DEFAULT FALSE,
+                is_admin BOOLEAN DEFAULT FALSE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+        """)
+        logger.info("Users table created or already exists")
+
+        # Create password reset tokens table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS password_reset_tokens (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                user_id INT NOT NULL,
+                token VARCHAR(255) UNIQUE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )
+        """)
+        logger.info("Password reset tokens table created or already exists")
+
+        # Create form submissions table for M-Pesa integration
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS form_submissions (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                user_id INT NOT NULL,
+                form_data LONGBLOB NOT NULL,
+                document_type ENUM('Francisca Resume', 'Cover Letter') NOT NULL,
+                amount DECIMAL(10,2) NOT NULL,
+                payment_id INT,
+                pdf_path VARCHAR(500),
+                email_sent BOOLEAN DEFAULT FALSE,
+                status ENUM('pending_payment', 'paid', 'pdf_generated', 'email_sent', 'completed') DEFAULT 'pending_payment',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )
+        """)
+        logger.info("Form submissions table created or already exists")
+
+        # Create email deliveries table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS email_deliveries (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                submission_id INT NOT NULL,
+                recipient_email VARCHAR(255) NOT NULL,
+                sent_at TIMESTAMP,
+                status ENUM('pending', 'sent', 'failed') DEFAULT 'pending',
+                error_message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (submission_id) REFERENCES form_submissions(id) ON DELETE CASCADE
+            )
+        """)
+        logger.info("Email deliveries table created or already exists")
+
+        # Create payments table (if not exists)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS payments (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                user_id INT NOT NULL,
+                amount DECIMAL(10,2) NOT NULL,
+                currency VARCHAR(3) DEFAULT 'KES',
+                payment_method ENUM('mpesa', 'card', 'bank') DEFAULT 'mpesa',
+                status ENUM('pending', 'completed', 'failed', 'cancelled') DEFAULT 'pending',
+                mpesa_checkout_request_id VARCHAR(255),
+                mpesa_merchant_request_id VARCHAR(255),
+                mpesa_receipt_number VARCHAR(255),
+                transaction_reference VARCHAR(255),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+            )
+        """)
+        logger.info("Payments table created or already exists")
+
+        # Create a test admin user if it doesn't exist
+        cursor.execute("SELECT id FROM users WHERE email = %s", ('admin@prowrite.com',))
+        if not cursor.fetchone():
+            hashed_password = generate_password_hash('admin123')
+            cursor.execute("""
+                INSERT INTO users (email, password, first_name, last_name, is_admin)
+                VALUES (%s, %s, %s, %s, %s)
+            """, ('admin@prowrite.com', hashed_password, 'Admin', 'User', True))
+            logger.info("Test admin user created (email: admin@prowrite.com, password: admin123)")
+
+        connection.commit()
+        connection.close()
+
+        return jsonify({
+            "message": "Database setup completed successfully!",
+            "admin_user": {
+                "email": "admin@prowrite.com",
+                "password": "admin123"
+            }
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Database setup error: {e}")
+        return jsonify({"error": "Database setup failed"}), 500
+
+# Root endpoint
+@system_bp.route('/', methods=['GET'])
+def root():
+    return jsonify({
+        "message": "Welcome to ProWrite API",
+        "version": "1.0.0",
+        "endpoints": {
+            "auth": {
+                "register": "POST /api/auth/register",
+                "login": "POST /api/auth/login",
+                "me": "GET /api/auth/me",
+                "refresh": "POST /api/auth/refresh",
+                "logout": "POST /api/auth/logout"
+            },
+            "profile": {
+                "get_profile": "GET /api/profile",
+                "update_profile": "PUT /api/profile"
+            },
+            "ai_market": {
+                "global_market_data": "GET /api/advanced-ai/global-market-data",
+                "global_job_vacancies": "GET /api/advanced-ai/global-job-vacancies",
+                "global_salary_insights": "GET /api/advanced-ai/global-salary-insights",
+                "search_salary": "GET /api/advanced-ai/search-salary"
+            },
+            "job_search": {
+                "search_jobs": "GET /api/real-jobs/search",
+                "platforms": "GET /api/real-jobs/platforms",
+                "trending": "GET /api/real-jobs/trending"
+            },
+            "notifications": {
+                "get_notifications": "GET /api/notifications",
+                "unread_count": "GET /api/notifications/unread-count",
+                "mark_read": "POST /api/notifications/<id>/read",
+                "create": "POST /api/notifications/create"
+            },
+            "resumes": {
+                "generate": "POST /api/resumes/generate",
+                "templates": "GET /api/resumes/templates",
+                "analyze": "POST /api/resumes/analyze"
+            },
+            "cover_letters": {
+                "generate": "POST /api/cover-letters/generate",
+                "templates": "GET /api/cover-letters/templates",
+                "analyze": "POST /api/cover-letters/analyze"
+            },
+            "ai_enhancement": {
+                "enhance_resume": "POST /api/ai/enhance-resume",
+                "generate_content": "POST /api/ai/generate-content",
+                "analyze_job_match": "POST /api/ai/analyze-job-match",
+                "paragraph_suggestions": "POST /api/ai/paragraph-suggestions",
+                "paragraph_guidance": "POST /api/ai/paragraph-guidance"
+            },
+            "analytics": {
+                "user_analytics": "GET /api/analytics/user",
+                "resume_analytics": "GET /api/analytics/resume/<id>",
+                "global_analytics": "GET /api/analytics/global",
+                "export_analytics": "POST /api/analytics/export"
+            },
+            "payments": {
+                "initiate_mpesa": "POST /api/payments/mpesa/initiate",
+                "check_mpesa_status": "POST /api/payments/mpesa/status",
+                "mpesa_callback": "POST /api/payments/mpesa/callback",
+                "subscription_plans": "GET /api/payments/subscriptions"
+            },
+            "templates": {
+                "get_templates": "GET /api/templates",
+                "upload_template": "POST /api/templates/upload",
+                "analyze_template": "POST /api/templates/analyze",
+                "template_preview": "GET /api/templates/<id>/preview",
+                "download_template": "GET /api/templates/<id>/download"
+            },
+            "resume_management": {
+                "get_resumes": "GET /api/resumes",
+                "get_resume": "GET /api/resumes/<id>",
+                "create_resume": "POST /api/resumes",
+                "update_resume": "PUT /api/resumes/<id>",
+                "enhance_resume": "POST /api/resumes/<id>/enhance",
+                "analyze_resume": "POST /api/resumes/<id>/analyze",
+                "generate_cover_letter": "POST /api/resumes/<id>/cover-letter",
+                "upload_resume": "POST /api/resumes/upload",
+                "get_parsed_resumes": "GET /api/resumes/parsed",
+                "get_parsed_resume": "GET /api/resumes/parsed/<id>",
+                "delete_parsed_resume": "DELETE /api/resumes/parsed/<id>"
+            },
+            "cover_letter_management": {
+                "get_cover_letters": "GET /api/cover-letters",
+                "get_cover_letter": "GET /api/cover-letters/<id>",
+                "update_cover_letter": "PUT /api/cover-letters/<id>"
+            },
+            "pdf_generation": {
+                "generate_pdf": "POST /api/resume/generate-pdf",
+                "generate_advanced_pdf": "POST /api/resume/generate-advanced-pdf",
+                "generate_francisca": "POST /api/resumes/generate-francisca"
+            },
+            "market_data": {
+                "get_market_data": "GET /api/market-data",
+                "analyze_job_description": "POST /api/job-descriptions/analyze"
+            },
+            "advanced_ai_market": {
+                "analyze_skill": "POST /api/advanced-ai/analyze-skill",
+                "global_industry_analysis": "GET /api/advanced-ai/global-industry-analysis",
+                "skill_predictions": "GET /api/advanced-ai/skill-predictions"
+            },
+            "setup": {
+                "database": "POST /api/setup/database"
+            },
+            "health": "GET /api/health"
+        }
+    }), 200
+
+
+@system_bp.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint for monitoring"""
+    try:
+        # Check database connection
+        conn = mysql.connector.connect(**DB_CONFIG)
+        conn.close()
+        db_status = 'healthy'
+    except Exception as e:
+        db_status = f'unhealthy: {str(e)}'
+
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'version': '1.0.0',
+        'database': db_status,
+        'uptime': 'running'
+    }), 200
+
+@system_bp.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint"""
+    # Basic metrics for monitoring
+    metrics_data = f"""# HELP prowrite_requests_total Total number of requests
+# TYPE prowrite_requests_total counter
+prowrite_requests_total{{endpoint="/api/health"}} 1
+
+# HELP prowrite_database_connections Database connection status
+# TYPE prowrite_database_connections gauge
+prowrite_database_connections{{status="active"}} 1
+"""
+    try:
+        outbox_stats = email_outbox.get_stats()
+        metrics_data += "\n# HELP prowrite_email_outbox_messages Email outbox messages by delivery status\n"
+        metrics_data += "# TYPE prowrite_email_outbox_messages gauge\n"
+        for status, count in outbox_stats['counts'].items():
+            metrics_data += f'prowrite_email_outbox_messages{{status="{status}"}} {count}\n'
+        metrics_data += "# HELP prowrite_email_outbox_oldest_pending_seconds Age of the oldest undelivered email\n"
+        metrics_data += "# TYPE prowrite_email_outbox_oldest_pending_seconds gauge\n"
+        metrics_data += f"prowrite_email_outbox_oldest_pending_seconds {outbox_stats['oldest_pending_age_seconds']}\n"
+    except Exception as e:
+        logger.error(f"Failed to collect email outbox metrics: {e}")
+    try:
+        ledger_status = till_ledger.get_sync_status()
+        metrics_data += "# HELP prowrite_till_ledger_transactions Till transactions in the local ledger\n"
+        metrics_data += "# TYPE prowrite_till_ledger_transactions gauge\n"
+        metrics_data += f'prowrite_till_ledger_transactions{{state="unused"}} {ledger_status["unused_transactions"]}\n'
+        metrics_data += f'prowrite_till_ledger_transactions{{state="used"}} {ledger_status["transactions"] - ledger_status["unused_transactions"]}\n'
+        if ledger_status['sync_lag_seconds'] is not None:
+            metrics_data += "# HELP prowrite_till_ledger_sync_lag_seconds Time since the last successful till ledger sync\n"
+            metrics_data += "# TYPE prowrite_till_ledger_sync_lag_seconds gauge\n"
+            metrics_data += f"prowrite_till_ledger_sync_lag_seconds {ledger_status['sync_lag_seconds']}\n"
+    except Exception as e:
+        logger.error(f"Failed to collect till ledger metrics: {e}")
+    try:
+        settlement_stats = mpesa_settlement.get_stats()
+        metrics_data += "# HELP prowrite_mpesa_callbacks M-Pesa callbacks by settlement status\n"
+        metrics_data += "# TYPE prowrite_mpesa_callbacks gauge\n"
+        for status, count in settlement_stats['counts'].items():
+            metrics_data += f'prowrite_mpesa_callbacks{{status="{status}"}} {count}\n'
+        metrics_data += "# HELP prowrite_mpesa_callbacks_oldest_unsettled_seconds Age of the oldest unsettled callback\n"
+        metrics_data += "# TYPE prowrite_mpesa_callbacks_oldest_unsettled_seconds gauge\n"
+        metrics_data += f"prowrite_mpesa_callbacks_oldest_unsettled_seconds {settlement_stats['oldest_unsettled_age_seconds']}\n"
+    except Exception as e:
+        logger.error(f"Failed to collect M-Pesa settlement metrics: {e}")
+    try:
+        metrics_data += openai_breaker.prometheus_lines()
+    except Exception as e:
+        logger.error(f"Failed to collect circuit breaker metrics: {e}")
+    return metrics_data, 200, {'Content-Type': 'text/plain'}
+
+@system_bp.route('/api/admin/email-outbox', methods=['GET'])
+@admin_required_custom
+def get_email_outbox_stats():
+    """Email outbox delivery statistics"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': email_outbox.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error getting email outbox stats: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/email-outbox/<int:message_id>', methods=['GET'])
+@admin_required_custom
+def get_email_delivery_status(message_id):
+    """Delivery status of a single queued email"""
+    try:
+        status = email_outbox.get_status(message_id)
+        if not status:
+            return jsonify({
+                'success': False,
+                'error': 'Message not found'
+            }), 404
+        return jsonify({
+            'success': True,
+            'data': status
+        })
+    except Exception as e:
+        logger.error(f"Error getting email status {message_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/till-ledger', methods=['GET'])
+@admin_required_custom
+def get_till_ledger_status():
+    """Till ledger sync state and lag"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': till_ledger.get_sync_status()
+        })
+    except Exception as e:
+        logger.error(f"Error getting till ledger status: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/till-ledger/sync', methods=['POST'])
+@admin_required_custom
+def sync_till_ledger():
+    """Run a till ledger sync now"""
+    try:
+        result = till_ledger.sync()
+        return jsonify(result), 200 if result['success'] else 502
+    except Exception as e:
+        logger.error(f"Error syncing till ledger: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/mpesa-callbacks', methods=['GET'])
+@admin_required_custom
+def get_mpesa_callback_stats():
+    """M-Pesa callback settlement statistics"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': mpesa_settlement.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error getting M-Pesa callback stats: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/mpesa-callbacks/<int:callback_id>', methods=['GET'])
+@admin_required_custom
+def get_mpesa_callback(callback_id):
+    """A recorded M-Pesa callback with its raw payload"""
+    try:
+        callback = mpesa_settlement.get_callback(callback_id)
+        if not callback:
+            return jsonify({
+                'success': False,
+                'error': 'Callback not found'
+            }), 404
+        return jsonify({
+            'success': True,
+            'data': callback
+        })
+    except Exception as e:
+        logger.error(f"Error getting M-Pesa callback {callback_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/mpesa-callbacks/<int:callback_id>/replay', methods=['POST'])
+@admin_required_custom
+def replay_mpesa_callback(callback_id):
+    """Queue a recorded M-Pesa callback for settlement again (idempotent)"""
+    try:
+        queued = mpesa_settlement.replay([callback_id])
+        return jsonify({
+            'success': bool(queued),
+            'queued': queued
+        }), 200 if queued else 404
+    except Exception as e:
+        logger.error(f"Error replaying M-Pesa callback {callback_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/profiles', methods=['GET'])
+@admin_required_custom
+def list_request_profiles():
+    """Most recent request profiles (route, latency, trigger)"""
+    try:
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        return jsonify({
+            'success': True,
+            'enabled': request_profiler.enabled,
+            'sample_rate': request_profiler.sample_rate,
+            'data': request_profiler.list_profiles(limit)
+        })
+    except Exception as e:
+        logger.error(f"Error listing request profiles: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/profiles/<int:profile_id>', methods=['GET'])
+@admin_required_custom
+def get_request_profile(profile_id):
+    """A stored request profile with its hottest frames"""
+    try:
+        profile = request_profiler.get_profile(profile_id)
+        if not profile:
+            return jsonify({
+                'success': False,
+                'error': 'Profile not found'
+            }), 404
+        collapsed = profile.pop('collapsed')
+        profile['hottest_frames'] = hottest_frames(parse_collapsed(collapsed))
+        return jsonify({
+            'success': True,
+            'data': profile
+        })
+    except Exception as e:
+        logger.error(f"Error getting request profile {profile_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/admin/profiles/<int:profile_id>/download', methods=['GET'])
+@admin_required_custom
+def download_request_profile(profile_id):
+    """Download a request profile as collapsed stacks (?format=collapsed) or speedscope JSON"""
+    try:
+        fmt = request.args.get('format', 'speedscope')
+        if fmt not in ('collapsed', 'speedscope'):
+            return jsonify({
+                'success': False,
+                'error': 'format must be collapsed or speedscope'
+            }), 400
+        profile = request_profiler.get_profile(profile_id)
+        if not profile:
+            return jsonify({
+                'success': False,
+                'error': 'Profile not found'
+            }), 404
+        body, mimetype, filename = request_profiler.export(profile, fmt)
+        return Response(body, mimetype=mimetype,
+                        headers={'Content-Disposition': f'attachment; filename={filename}'})
+    except Exception as e:
+        logger.error(f"Error downloading request profile {profile_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@system_bp.route('/api/debug/payments', methods=['GET'])
+def debug_payments():
+    """Debug endpoint to see what payments exist in the database"""
+    try:
+        connection = auth_system.get_db_connection()
+        if not connection:
+            return jsonify({
+                'success': False,
+                'error': 'Database connection failed'
+            }), 500
+        
+        try:
+            cursor = connection.cursor()
+            
+            # Get all payment tables
+            cursor.execute("SHOW TABLES LIKE '%payment%'")
+            payment_tables = cursor.fetchall()
+            
+            result = {
+                'success': True,
+                'payment_tables': [table[0] for table in payment_tables],
+                'recent_payments': []
+            }
+            
+            # Check manual_payments table - first get the column structure
+            if ('manual_payments',) in payment_tables:
+                # Get column names first
+                cursor.execute("DESCRIBE manual_payments")
+                columns = cursor.fetchall()
+                column_names = [col[0] for col in columns]
+                result['manual_payments_columns'] = column_names
+                
+                # Build query based on available columns
+                select_columns = ['reference', 'status', 'created_at']
+                if 'user_email' in column_names:
+                    select_columns.append('user_email')
+                elif 'email' in column_names:
+                    select_columns.append('email')
+                elif 'user_id' in column_names:
+                    select_columns.append('user_id')
+                
+                query = f"SELECT {', '.join(select_columns)} FROM manual_payments ORDER BY created_at DESC LIMIT 10"
+                cursor.execute(query)
+                manual_payments = cursor.fetchall()
+                
+                result['manual_payments'] = []
+                for row in manual_payments:
+                    payment_dict = {
+                        'reference': row[0],
+                        'status': row[1], 
+                        'created_at': row[2].isoformat() if row[2] else None
+                    }
+                    if len(row) > 3:
+                        payment_dict['user_info'] = row[3]
+                    result['manual_payments'].append(payment_dict)
+            
+            # Check other possible payment tables (form_data is a LONGBLOB once migrated, so leave it out)
+            for table_name, in payment_tables:
+                if table_name != 'manual_payments':
+                    try:
+                        cursor.execute(f"DESCRIBE {table_name}")
+                        sample_columns = [col[0] for col in cursor.fetchall() if col[0] != 'form_data']
+                        result[f'{table_name}_columns'] = sample_columns
+                        cursor.execute(f"SELECT {', '.join(sample_columns)} FROM {table_name} "
+                                       f"ORDER BY created_at DESC LIMIT 5")
+                        table_data = cursor.fetchall()
+                        result[f'{table_name}_sample'] = table_data
+                    except Exception as e:
+                        result[f'{table_name}_error'] = str(e)
+            
+            return jsonify(result), 200
+                
+        finally:
+            if connection:
+                connection.close()
+            
+    except Exception as e:
+        logger.error(f"Debug payments failed: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'Debug failed: {str(e)}'
+        }), 500
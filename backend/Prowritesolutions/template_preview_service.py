@@ -0,0 +1,319 @@
+"""
+Template Preview Service
+Pre-renders first-page thumbnails of every resume / cover letter template using the
+real PDF generators and sample data, stores them under content-hashed filenames and
+keeps a manifest so previews are only rebuilt when a template or generator changes.
+
+Build (or refresh) the previews offline with:
+
+    python template_preview_service.py [--force]
+"""
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import inspect
+import importlib.util
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+# PyMuPDF is imported when the first preview is rasterized
+FITZ_AVAILABLE = importlib.util.find_spec('fitz') is not None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the rendering/rasterising logic itself changes
+PREVIEW_PIPELINE_VERSION = 1
+
+# Thumbnail widths in pixels (list cards, detail view, retina detail view)
+PREVIEW_WIDTHS = (200, 400, 800)
+
+PREVIEW_DIR = os.path.join('static', 'templates', 'previews', 'generated')
+PREVIEW_URL_PREFIX = '/api/templates/previews'
+PREVIEW_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+SAMPLE_RESUME_DATA = {
+    'firstName': 'Jane',
+    'lastName': 'Wanjiku',
+    'personalEmail': 'jane.wanjiku@example.com',
+    'phone': '+254 700 000 000',
+    'city': 'Nairobi',
+    'country': 'Kenya',
+    'summary': 'Results-driven operations analyst with five years of experience improving '
+               'processes, reporting and customer outcomes across finance and logistics.',
+    'education': [
+        {
+            'institution': 'University of Nairobi',
+            'degree': 'BSc Business Information Technology',
+            'startDate': '2014-09',
+            'endDate': '2018-06',
+            'gpa': '3.7'
+        }
+    ],
+    'workExperience': [
+        {
+            'company': 'Safari Logistics Ltd',
+            'jobTitle': 'Operations Analyst',
+            'location': 'Nairobi',
+            'startDate': '2020-01',
+            'endDate': '',
+            'current': True,
+            'responsibilities': [
+                'Reduced order processing time by 30% by automating weekly reporting',
+                'Led a team of 4 analysts delivering dashboards to senior management'
+            ]
+        },
+        {
+            'company': 'Mwangaza Bank',
+            'jobTitle': 'Business Analyst',
+            'location': 'Nairobi',
+            'startDate': '2018-07',
+            'endDate': '2019-12',
+            'responsibilities': [
+                'Gathered requirements for a mobile banking rollout serving 50,000 users'
+            ]
+        }
+    ],
+    'skills': ['Data Analysis', 'SQL', 'Process Improvement', 'Stakeholder Management'],
+    'languages': ['English', 'Swahili'],
+    'references': [
+        {'name': 'Peter Otieno', 'title': 'Head of Operations', 'company': 'Safari Logistics Ltd',
+         'email': 'peter.otieno@example.com'}
+    ]
+}
+
+SAMPLE_COVER_LETTER_DATA = {
+    'personal_name': 'Jane Wanjiku',
+    'personal_email': 'jane.wanjiku@example.com',
+    'personal_phone': '+254 700 000 000',
+    'personal_address': 'Nairobi, Kenya',
+    'employer_name': 'Hiring Manager',
+    'company_name': 'Acme Kenya Ltd',
+    'job_title': 'Operations Analyst',
+    'date': 'January 15, 2025',
+    'content': (
+        'I am writing to apply for the Operations Analyst position at Acme Kenya Ltd. '
+        'With five years of experience improving processes and reporting, I am confident '
+        'I can contribute from day one.\n\n'
+        'At Safari Logistics I reduced order processing time by 30% and led a team of four '
+        'analysts delivering dashboards to senior management.\n\n'
+        'I would welcome the opportunity to discuss how my experience aligns with your needs.'
+    )
+}
+
+# Templates listed by TemplateManager, mapped to the generator that renders them. The cover
+# letter generator has no themes, so only one cover letter preview is rendered; modern_cl
+# keeps its static preview until the generator can render it differently.
+PREVIEW_TEMPLATES = [
+    {'id': 'professional', 'type': 'resume', 'generator': 'francisca', 'theme': 'professional'},
+    {'id': 'professional_cl', 'type': 'cover_letter', 'generator': 'professional_cover_letter', 'theme': 'professional'},
+]
+
+# ProfessionalFranciscaPDFGenerator.apply_theme ignores the theme name, so every resume theme
+# renders the same PDF: these templates show the rendered preview of the one they map to.
+PREVIEW_ALIASES = {
+    'modern': 'professional',
+    'executive': 'professional',
+}
+
+
+def _generator_source(generator) -> str:
+    """Source of the generator's whole module, so module-level colours, fonts and helpers count"""
+    try:
+        return inspect.getsource(inspect.getmodule(type(generator)))
+    except (OSError, TypeError):
+        return type(generator).__qualname__
+
+
+def _load_generator(name: str, theme: str):
+    """Instantiate a PDF generator by name (imported lazily to keep startup cheap)"""
+    if name == 'francisca':
+        from francisca_pdf_generator import ProfessionalFranciscaPDFGenerator
+        return ProfessionalFranciscaPDFGenerator(theme_name=theme)
+    if name == 'professional_cover_letter':
+        from professional_cover_letter_generator import ProfessionalCoverLetterGenerator
+        return ProfessionalCoverLetterGenerator()
+    raise ValueError(f"Unknown preview generator: {name}")
+
+
+class TemplatePreviewService:
+    """Builds and serves pre-rendered template preview thumbnails"""
+
+    def __init__(self, preview_dir: str = PREVIEW_DIR):
+        self.preview_dir = preview_dir
+        self.manifest_path = os.path.join(preview_dir, 'manifest.json')
+        self._manifest = None
+        self._manifest_mtime = None
+
+    # ----- manifest -----
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the manifest, re-reading it only when the file changed on disk"""
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return {'templates': {}}
+
+        if self._manifest is None or mtime != self._manifest_mtime:
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self._manifest = json.load(f)
+                self._manifest_mtime = mtime
+            except Exception as e:
+                logger.error(f"Failed to read preview manifest: {e}")
+                return {'templates': {}}
+        return self._manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest = manifest
+        self._manifest_mtime = os.path.getmtime(self.manifest_path)
+
+    # ----- fingerprints -----
+
+    def _fingerprint(self, spec: Dict[str, Any]) -> str:
+        """Hash everything that affects a template's rendering"""
+        generator_source = _generator_source(_load_generator(spec['generator'], spec['theme']))
+        sample = SAMPLE_RESUME_DATA if spec['type'] == 'resume' else SAMPLE_COVER_LETTER_DATA
+        payload = json.dumps({
+            'pipeline': PREVIEW_PIPELINE_VERSION,
+            'widths': PREVIEW_WIDTHS,
+            'spec': spec,
+            'sample': sample,
+            'generator': hashlib.sha256(generator_source.encode('utf-8')).hexdigest()
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    # ----- rendering -----
+
+    def _render_pdf(self, spec: Dict[str, Any]) -> Optional[bytes]:
+        generator = _load_generator(spec['generator'], spec['theme'])
+        if spec['type'] == 'resume':
+            return generator.generate_resume_pdf_bytes(dict(SAMPLE_RESUME_DATA))
+        return generator.generate_cover_letter_pdf_bytes(dict(SAMPLE_COVER_LETTER_DATA))
+
+    def _rasterize_first_page(self, pdf_bytes: bytes, width: int) -> bytes:
+        """Render page one of a PDF to a PNG of the given pixel width"""
+        import fitz  # PyMuPDF
+        with fitz.open(stream=pdf_bytes, filetype='pdf') as document:
+            page = document[0]
+            zoom = width / page.rect.width
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return pixmap.tobytes('png')
+
+    def _store_image(self, template_id: str, width: int, png_bytes: bytes) -> str:
+        """Write a thumbnail under a content-hashed name and return that name"""
+        digest = hashlib.sha256(png_bytes).hexdigest()[:16]
+        filename = f"{template_id}.{width}w.{digest}.png"
+        path = os.path.join(self.preview_dir, filename)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(png_bytes)
+        return filename
+
+    def _is_current(self, entry: Optional[Dict[str, Any]], fingerprint: str) -> bool:
+        if not entry or entry.get('fingerprint') != fingerprint:
+            return False
+        return all(
+            os.path.exists(os.path.join(self.preview_dir, filename))
+            for filename in entry.get('images', {}).values()
+        )
+
+    def build_previews(self, force: bool = False) -> Dict[str, Any]:
+        """Render previews for every template whose fingerprint changed"""
+        if not FITZ_AVAILABLE:
+            logger.warning("PyMuPDF not available, skipping template preview build")
+            return {'built': [], 'skipped': [], 'failed': [spec['id'] for spec in PREVIEW_TEMPLATES]}
+
+        os.makedirs(self.preview_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        templates = dict(manifest.get('templates', {}))
+        result = {'built': [], 'skipped': [], 'failed': []}
+
+        # Drop templates that are no longer rendered so they fall back to their static preview
+        for template_id in set(templates) - {spec['id'] for spec in PREVIEW_TEMPLATES}:
+            self._remove_files(templates.pop(template_id).get('images', {}).values())
+
+        for spec in PREVIEW_TEMPLATES:
+            template_id = spec['id']
+            try:
+                fingerprint = self._fingerprint(spec)
+                if not force and self._is_current(templates.get(template_id), fingerprint):
+                    result['skipped'].append(template_id)
+                    continue
+
+                pdf_bytes = self._render_pdf(spec)
+                if not pdf_bytes:
+                    raise RuntimeError('generator returned no PDF')
+
+                images = {}
+                for width in PREVIEW_WIDTHS:
+                    png_bytes = self._rasterize_first_page(pdf_bytes, width)
+                    images[str(width)] = self._store_image(template_id, width, png_bytes)
+
+                stale = set(templates.get(template_id, {}).get('images', {}).values()) - set(images.values())
+                templates[template_id] = {
+                    'type': spec['type'],
+                    'fingerprint': fingerprint,
+                    'images': images,
+                    'generated_at': datetime.now().isoformat()
+                }
+                self._remove_files(stale)
+                result['built'].append(template_id)
+                logger.info(f"Built preview thumbnails for template {template_id}")
+
+            except Exception as e:
+                logger.error(f"Failed to build preview for template {template_id}: {e}")
+                result['failed'].append(template_id)
+
+        self._write_manifest({'version': PREVIEW_PIPELINE_VERSION, 'templates': templates})
+        return result
+
+    def _remove_files(self, filenames):
+        for filename in filenames:
+            try:
+                os.remove(os.path.join(self.preview_dir, filename))
+            except OSError:
+                pass
+
+    # ----- lookups used by the API -----
+
+    def get_preview_urls(self, template_id: str) -> Optional[Dict[str, str]]:
+        """Return {width: url} for a template, or None if no previews were built"""
+        template_id = PREVIEW_ALIASES.get(template_id, template_id)
+        entry = self._load_manifest().get('templates', {}).get(template_id)
+        if not entry:
+            return None
+        return {
+            width: f"{PREVIEW_URL_PREFIX}/{filename}"
+            for width, filename in entry.get('images', {}).items()
+        }
+
+    def get_default_preview_url(self, template_id: str) -> Optional[str]:
+        urls = self.get_preview_urls(template_id)
+        if not urls:
+            return None
+        return urls.get(str(PREVIEW_WIDTHS[1])) or next(iter(urls.values()))
+
+
+template_preview_service = TemplatePreviewService()
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    result = template_preview_service.build_previews(force='--force' in argv)
+    print(json.dumps(result, indent=2))
+    # Previews are an optimisation: templates that failed keep their static preview, so a
+    # partial build must not fail the image build
+    if result['failed']:
+        logger.warning(f"No previews built for: {', '.join(result['failed'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,341 @@
+"""
+Flask API routes for resume templates and previews
+"""
+
+from flask import Blueprint, request, jsonify, send_file, send_from_directory
+from datetime import datetime
+import os
+import random
+from template_preview_service import template_preview_service, PREVIEW_CACHE_MAX_AGE
+from app_core import jwt_required_custom, LazyService, logger
+
+template_bp = Blueprint('template', __name__)
+
+# Template Management System
+class TemplateManager:
+    def __init__(self):
+        self.templates_dir = 'static/templates'
+        self.upload_dir = 'static/templates/uploads'
+        self.processed_dir = 'static/templates/processed'
+
+        # Ensure directories exist
+        os.makedirs(self.templates_dir, exist_ok=True)
+        os.makedirs(self.upload_dir, exist_ok=True)
+        os.makedirs(self.processed_dir, exist_ok=True)
+
+    def get_available_templates(self):
+        """Get list of available templates"""
+        try:
+            templates = []
+
+            # Resume templates
+            resume_templates = [
+                {
+                    'id': 'professional',
+                    'name': 'Professional',
+                    'type': 'resume',
+                    'description': 'Clean and professional design',
+                    'preview': '/static/templates/previews/professional.png',
+                    'file_path': '/static/templates/resume_professional.pdf'
+                },
+                {
+                    'id': 'modern',
+                    'name': 'Modern',
+                    'type': 'resume',
+                    'description': 'Modern and creative design',
+                    'preview': '/static/templates/previews/modern.png',
+                    'file_path': '/static/templates/resume_modern.pdf'
+                },
+                {
+                    'id': 'executive',
+                    'name': 'Executive',
+                    'type': 'resume',
+                    'description': 'Executive-level design',
+                    'preview': '/static/templates/previews/executive.png',
+                    'file_path': '/static/templates/resume_executive.pdf'
+                }
+            ]
+
+            # Cover letter templates
+            cover_letter_templates = [
+                {
+                    'id': 'professional_cl',
+                    'name': 'Professional',
+                    'type': 'cover_letter',
+                    'description': 'Clean and professional design',
+                    'preview': '/static/templates/cover_letter_previews/professional.png',
+                    'file_path': '/static/templates/cover_letter_professional.pdf'
+                },
+                {
+                    'id': 'modern_cl',
+                    'name': 'Modern',
+                    'type': 'cover_letter',
+                    'description': 'Modern and creative design',
+                    'preview': '/static/templates/cover_letter_previews/modern.png',
+                    'file_path': '/static/templates/cover_letter_modern.pdf'
+                }
+            ]
+
+            templates.extend(resume_templates)
+            templates.extend(cover_letter_templates)
+
+            # Prefer pre-rendered, content-hashed thumbnails when they have been built
+            for template in templates:
+                preview_urls = template_preview_service.get_preview_urls(template['id'])
+                if preview_urls:
+                    template['preview'] = template_preview_service.get_default_preview_url(template['id'])
+                    template['previews'] = preview_urls
+
+            return templates
+
+        except Exception as e:
+            logger.error(f"Error getting templates: {e}")
+            return []
+
+    def process_uploaded_template(self, file_path, template_type, template_name):
+        """Process uploaded template file"""
+        try:
+            # Validate file type
+            allowed_extensions = ['.pdf', '.docx', '.doc']
+            file_ext = os.path.splitext(file_path)[1].lower()
+
+            if file_ext not in allowed_extensions:
+                return False, "Invalid file type. Only PDF, DOCX, and DOC files are allowed."
+
+            # Generate processed file path
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            processed_filename = f"{template_type}_{template_name}_{timestamp}{file_ext}"
+            processed_path = os.path.join(self.processed_dir, processed_filename)
+
+            # Copy file to processed directory
+            import shutil
+            shutil.copy2(file_path, processed_path)
+
+            # Generate preview (placeholder for now)
+            preview_path = f"/static/templates/previews/{template_name}.png"
+
+            return True, {
+                'processed_path': processed_path,
+                'preview_path': preview_path,
+                'template_id': f"{template_type}_{template_name}_{timestamp}"
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing template: {e}")
+            return False, str(e)
+
+    def analyze_template_structure(self, file_path):
+        """Analyze template structure and extract form fields"""
+        try:
+            # This would typically use PDF parsing libraries
+            # For now, return mock data
+            analysis = {
+                'form_fields': [
+                    {'name': 'name', 'type': 'text', 'required': True, 'position': {'x': 100, 'y': 200}},
+                    {'name': 'email', 'type': 'email', 'required': True, 'position': {'x': 100, 'y': 220}},
+                    {'name': 'phone', 'type': 'tel', 'required': False, 'position': {'x': 100, 'y': 240}},
+                    {'name': 'experience', 'type': 'textarea', 'required': True, 'position': {'x': 100, 'y': 300}},
+                    {'name': 'education', 'type': 'textarea', 'required': True, 'position': {'x': 100, 'y': 400}}
+                ],
+                'sections': [
+                    {'name': 'Header', 'fields': ['name', 'email', 'phone']},
+                    {'name': 'Experience', 'fields': ['experience']},
+                    {'name': 'Education', 'fields': ['education']}
+                ],
+                'compatibility_score': random.randint(80, 95),
+                'suggestions': [
+                    'Template has good structure',
+                    'Consider adding skills section',
+                    'Experience section could be expanded'
+                ]
+            }
+
+            return analysis
+
+        except Exception as e:
+            logger.error(f"Error analyzing template: {e}")
+            return None
+
+# Initialize template manager
+template_manager = LazyService(TemplateManager)
+
+# Template Management Routes
+@template_bp.route('/api/templates', methods=['GET'])
+def get_templates():
+    """Get available templates"""
+    try:
+        templates = template_manager.get_available_templates()
+
+        return jsonify({
+            'success': True,
+            'data': templates
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting templates: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@template_bp.route('/api/templates/upload', methods=['POST'])
+@jwt_required_custom
+def upload_template():
+    """Upload a new template"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Check if file is present
+        if 'file' not in request.files:
+            return jsonify({
+                'success': False,
+                'message': 'No file provided'
+            }), 400
+
+        file = request.files['file']
+        template_type = request.form.get('type', 'resume')
+        template_name = request.form.get('name', 'custom_template')
+
+        if file.filename == '':
+            return jsonify({
+                'success': False,
+                'message': 'No file selected'
+            }), 400
+
+        # Save uploaded file
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{template_type}_{template_name}_{timestamp}_{file.filename}"
+        file_path = os.path.join(template_manager.upload_dir, filename)
+        file.save(file_path)
+
+        # Process template
+        success, result = template_manager.process_uploaded_template(
+            file_path, template_type, template_name
+        )
+
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'Template uploaded successfully',
+                'data': result
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': result
+            }), 400
+
+    except Exception as e:
+        logger.error(f"Error uploading template: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@template_bp.route('/api/templates/analyze', methods=['POST'])
+@jwt_required_custom
+def analyze_template():
+    """Analyze template structure"""
+    try:
+        user_id = request.current_user['user_id']
+        data = request.get_json()
+
+        file_path = data.get('file_path', '')
+
+        if not file_path:
+            return jsonify({
+                'success': False,
+                'message': 'File path is required'
+            }), 400
+
+        # Analyze template
+        analysis = template_manager.analyze_template_structure(file_path)
+
+        if analysis:
+            return jsonify({
+                'success': True,
+                'data': analysis
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to analyze template'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"Error analyzing template: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@template_bp.route('/api/templates/<template_id>/preview', methods=['GET'])
+def get_template_preview(template_id):
+    """Get template preview URLs from the pre-rendered preview manifest"""
+    try:
+        preview_urls = template_preview_service.get_preview_urls(template_id)
+        if not preview_urls:
+            # Previews not built yet - fall back to the legacy static placeholder
+            return jsonify({
+                'success': True,
+                'data': {
+                    'preview_url': f'/static/templates/previews/{template_id}.png',
+                    'template_id': template_id
+                }
+            })
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'preview_url': template_preview_service.get_default_preview_url(template_id),
+                'previews': preview_urls,
+                'template_id': template_id
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting template preview: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@template_bp.route('/api/templates/previews/<path:filename>', methods=['GET'])
+def serve_template_preview(filename):
+    """Serve a pre-rendered preview thumbnail.
+
+    Filenames are content-hashed, so responses can be cached forever.
+    """
+    response = send_from_directory(
+        template_preview_service.preview_dir,
+        filename,
+        mimetype='image/png',
+        max_age=PREVIEW_CACHE_MAX_AGE
+    )
+    response.headers['Cache-Control'] = f'public, max-age={PREVIEW_CACHE_MAX_AGE}, immutable'
+    return response
+
+@template_bp.route('/api/templates/<template_id>/download', methods=['GET'])
+@jwt_required_custom
+def download_template(template_id):
+    """Download template file"""
+    try:
+        user_id = request.current_user['user_id']
+
+        # Find template file
+        template_path = f"static/templates/{template_id}.pdf"
+
+        if os.path.exists(template_path):
+            return send_file(template_path, as_attachment=True)
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Template not found'
+            }), 404
+
+    except Exception as e:
+        logger.error(f"Error downloading template: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,98 @@
+"""
+Tests for AI token streaming (SSE), driven by the fake model.
+
+    python -m pytest test_ai_streaming.py -q
+"""
+
+import json
+import time
+
+from flask import Flask, request
+
+from ai_streaming import (FakeStreamingModel, StreamingAIClient, SectionFilter,
+                          stream_events, stream_with_fallback, sse_response, wants_stream)
+
+
+def _parse_events(body):
+    events = []
+    for frame in body.strip().split('\n\n'):
+        if frame.startswith(':'):
+            continue
+        lines = dict(line.split(': ', 1) for line in frame.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def _make_app(client):
+    app = Flask(__name__)
+
+    @app.route('/chat', methods=['POST'])
+    def chat():
+        data = request.get_json()
+        messages = [{'role': 'user', 'content': data['message']}]
+        if wants_stream(request, data):
+            return sse_response(stream_events(
+                stream_with_fallback(client, messages, lambda: 'Fallback reply.'),
+                lambda text: {'success': True, 'message': text}
+            ))
+        return {'success': True, 'message': client.complete(messages)}
+
+    return app
+
+
+def test_tokens_are_relayed_then_done():
+    client = StreamingAIClient(fake=FakeStreamingModel(reply='I led a team of five engineers.'))
+    response = _make_app(client).test_client().post('/chat?stream=1', json={'message': 'hi'})
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['X-Accel-Buffering'] == 'no'
+
+    events = _parse_events(response.get_data(as_text=True))
+    tokens = [data['text'] for event, data in events if event == 'token']
+    assert len(tokens) == 7
+    assert ''.join(tokens) == 'I led a team of five engineers.'
+    assert events[-1] == ('done', {'success': True, 'message': 'I led a team of five engineers.'})
+
+
+def test_first_bytes_arrive_before_the_model_answers():
+    client = StreamingAIClient(fake=FakeStreamingModel(reply='slow answer', first_token_delay=0.5))
+    response = _make_app(client).test_client().post('/chat', json={'message': 'hi', 'stream': True},
+                                                     buffered=False)
+    started = time.perf_counter()
+    first_chunk = next(iter(response.response))
+    assert time.perf_counter() - started < 0.2
+    assert first_chunk.startswith(b':')
+    response.close()
+
+
+def test_failure_before_first_token_uses_fallback():
+    client = StreamingAIClient(fake=FakeStreamingModel(reply='never sent', fail_after=0))
+    response = _make_app(client).test_client().post('/chat', json={'message': 'hi'},
+                                                     headers={'Accept': 'text/event-stream'})
+    events = _parse_events(response.get_data(as_text=True))
+    assert events[0] == ('token', {'text': 'Fallback reply.'})
+    assert events[-1][1]['message'] == 'Fallback reply.'
+
+
+def test_failure_mid_stream_reports_error():
+    client = StreamingAIClient(fake=FakeStreamingModel(reply='one two three four', fail_after=2))
+    response = _make_app(client).test_client().post('/chat?stream=1', json={'message': 'hi'})
+    events = _parse_events(response.get_data(as_text=True))
+    assert [event for event, _ in events] == ['token', 'token', 'error']
+
+
+def test_json_mode_is_unchanged():
+    client = StreamingAIClient(fake=FakeStreamingModel(reply='Plain answer.'))
+    response = _make_app(client).test_client().post('/chat', json={'message': 'hi'})
+    assert response.get_json() == {'success': True, 'message': 'Plain answer.'}
+
+
+def test_section_filter_strips_markers_split_across_tokens():
+    completion = 'ENHANCED_PARAGRAPH: I grew revenue by 20%.\nSUGGESTIONS: Add a metric, Name the team'
+    tokens = [completion[i:i + 3] for i in range(0, len(completion), 3)]
+    section = SectionFilter('ENHANCED_PARAGRAPH:', 'SUGGESTIONS:')
+    relayed = ''.join(section.feed(token) for token in tokens) + section.flush()
+    assert relayed == 'I grew revenue by 20%.'
+
+    plain = SectionFilter('ENHANCED_PARAGRAPH:', 'SUGGESTIONS:')
+    text = 'The model ignored the requested format entirely.'
+    assert ''.join(plain.feed(word + ' ') for word in text.split()) + plain.flush() == text
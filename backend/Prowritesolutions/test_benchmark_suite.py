@@ -0,0 +1,49 @@
+"""
+Tests for the micro-benchmark fixtures and the baseline comparison.
+
+    python -m pytest test_benchmark_suite.py -q
+"""
+
+import benchmark_suite
+from benchmark_suite import build_resume, resume_text, compare
+
+
+def test_fixture_sizes_span_one_to_four_pages():
+    results = benchmark_suite.run(['robust_pdf'], ['small', 'medium', 'large'], rounds=1)
+    pages = [results[f'robust_pdf[{size}]']['pages'] for size in ('small', 'medium', 'large')]
+    assert pages == sorted(pages)
+    assert pages[0] == 1 and pages[-1] >= 4
+
+
+def test_fixture_text_carries_every_job():
+    text = resume_text(build_resume(20))
+    assert text.count(' at ') == 20
+    assert 'WORK EXPERIENCE' in text and 'SKILLS' in text
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = {
+        'a[small]': {'median_ms': 10.0, 'min_ms': 10.0, 'peak_kib': 100.0},
+        'b[small]': {'median_ms': 10.0, 'min_ms': 10.0, 'peak_kib': 100.0},
+        'c[small]': {'median_ms': 10.0, 'min_ms': 10.0, 'peak_kib': 100.0},
+    }
+    results = {
+        'a[small]': {'median_ms': 11.0, 'min_ms': 11.0, 'peak_kib': 100.0},
+        'b[small]': {'median_ms': 13.0, 'min_ms': 13.0, 'peak_kib': 100.0},
+        'c[small]': {'median_ms': 10.0, 'min_ms': 10.0, 'peak_kib': 200.0},
+        'd[small]': {'median_ms': 1.0, 'min_ms': 1.0, 'peak_kib': 1.0},
+        'e[small]': {'skipped': 'missing dependency: PyPDF2'},
+    }
+    statuses = {row['key']: row['status'] for row in compare(results, baseline, 20, 25)}
+    assert statuses == {'a[small]': 'ok', 'b[small]': 'regression', 'c[small]': 'regression',
+                        'd[small]': 'new', 'e[small]': 'skipped'}
+
+
+def test_save_baseline_merges_and_skips_missing_benchmarks(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    benchmark_suite.save_baseline({'a[small]': {'median_ms': 1.0, 'min_ms': 1.0, 'peak_kib': 1.0}}, path)
+    benchmark_suite.save_baseline({'b[small]': {'median_ms': 2.0, 'min_ms': 2.0, 'peak_kib': 2.0},
+                                   'e[small]': {'skipped': 'missing dependency: PyPDF2'}}, path)
+    baseline = benchmark_suite.load_baseline(path)
+    assert sorted(baseline['results']) == ['a[small]', 'b[small]']
+    assert baseline['environment'] == benchmark_suite.environment()
@@ -0,0 +1,127 @@
+"""
+Tests for the OpenAI circuit breaker shared by the AI services.
+
+    python -m pytest test_circuit_breaker.py -q
+"""
+
+import pytest
+from openai import error as openai_error
+
+from ai_streaming import FakeStreamingModel, StreamingAIClient, stream_with_fallback
+from circuit_breaker import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, classify_error)
+
+
+@pytest.fixture
+def make_breaker(tmp_path, clock):
+    def make(name='test', **kwargs):
+        kwargs.setdefault('state_ttl', 0.0)
+        return CircuitBreaker(name, db_path=str(tmp_path / 'circuit_breakers.db'), clock=clock, **kwargs)
+    return make
+
+
+def _call(breaker, error=None):
+    probe = breaker.acquire()
+    if probe is None:
+        return None
+    breaker.record(probe, error)
+    return probe
+
+
+def test_errors_are_classified_by_type_and_status():
+    quota = openai_error.RateLimitError("You exceeded your current quota", http_status=429, code='insufficient_quota')
+    assert classify_error(quota) == 'quota'
+    assert classify_error(openai_error.RateLimitError("Rate limit reached", http_status=429)) == 'rate_limit'
+    assert classify_error(openai_error.AuthenticationError("Incorrect API key", http_status=401)) == 'auth'
+    assert classify_error(openai_error.Timeout("Request timed out")) == 'timeout'
+    assert classify_error(openai_error.APIConnectionError("Connection reset")) == 'connection'
+    assert classify_error(openai_error.APIError("Bad gateway", http_status=502)) == 'server'
+    # Messages that merely mention "model" or "exceeded" are not upstream failures
+    assert classify_error(openai_error.InvalidRequestError("maximum context length exceeded", None,
+                                                           http_status=400)) == 'client'
+    assert classify_error(KeyError('choices')) == 'other'
+
+
+def test_breaker_opens_on_error_rate_and_ignores_client_errors(make_breaker):
+    breaker = make_breaker(min_calls=4, error_rate=0.5)
+    server_error = openai_error.APIError("Bad gateway", http_status=502)
+    bad_request = openai_error.InvalidRequestError("bad", None, http_status=400)
+    for error in (None, None, bad_request, bad_request, server_error):
+        _call(breaker, error)
+    assert breaker.snapshot()['state'] == CLOSED
+    _call(breaker, server_error)
+    snapshot = breaker.snapshot()
+    assert snapshot['state'] == OPEN and snapshot['last_error'] == 'server' and snapshot['retry_in'] == 30.0
+    assert breaker.acquire() is None and breaker.is_open()
+
+
+def test_failures_outside_the_window_are_forgotten(make_breaker, clock):
+    breaker = make_breaker(window=60, min_calls=3)
+    timeout = openai_error.Timeout("Request timed out")
+    _call(breaker, timeout)
+    _call(breaker, timeout)
+    clock.now += 61
+    _call(breaker, timeout)
+    _call(breaker)
+    _call(breaker)
+    assert breaker.snapshot()['state'] == CLOSED
+
+
+def test_quota_errors_trip_immediately_and_are_seen_by_other_workers(make_breaker, clock):
+    first = make_breaker()
+    second = CircuitBreaker('test', db_path=first.db_path, clock=clock, state_ttl=1.0)
+    assert _call(second) is False
+    _call(first, openai_error.RateLimitError("quota", http_status=429, code='insufficient_quota'))
+    clock.now += 1  # the other worker's cached state expires
+    assert second.acquire() is None
+    assert second.snapshot()['retry_in'] == 899.0
+    assert second.stats['short_circuits'] == 1
+
+
+def test_half_open_lets_one_probe_through_and_backs_off_on_failure(make_breaker, clock):
+    breaker = make_breaker(min_calls=1, cooldown=30, max_cooldown=100)
+    other = CircuitBreaker('test', db_path=breaker.db_path, clock=clock, state_ttl=0.0)
+    error = openai_error.APIConnectionError("Connection refused")
+    _call(breaker, error)
+    clock.now += 30
+    assert breaker.acquire() is True
+    assert other.acquire() is None and other.snapshot()['state'] == HALF_OPEN
+    breaker.record(True, error)
+    assert breaker.snapshot()['retry_in'] == 60.0
+    clock.now += 60
+    _call(breaker, error)
+    assert breaker.snapshot()['retry_in'] == 100.0
+    clock.now += 100
+    assert _call(breaker) is True
+    assert breaker.snapshot()['state'] == CLOSED and breaker.snapshot()['trips'] == 0
+    assert other.acquire() is False
+
+
+def test_guard_short_circuits_without_calling_upstream(make_breaker):
+    breaker = make_breaker(min_calls=1)
+    with pytest.raises(openai_error.APIError):
+        with breaker.guard():
+            raise openai_error.APIError("Service unavailable", http_status=503)
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            calls.append('upstream')
+    assert calls == []
+    assert 'prowrite_circuit_breaker_state{breaker="test"} 2' in breaker.prometheus_lines()
+
+
+def test_stream_serves_fallback_while_open_and_records_outcomes(make_breaker):
+    breaker = make_breaker(min_calls=2)
+    failing = FakeStreamingModel(reply='never sent', fail_after=0)
+    client = StreamingAIClient(fake=failing)
+    messages = [{'role': 'user', 'content': 'hi'}]
+    for _ in range(2):
+        assert list(stream_with_fallback(client, messages, lambda: 'fallback', on_error=lambda e: None,
+                                         breaker=breaker)) == ['fallback']
+    assert breaker.snapshot()['state'] == OPEN and failing.calls == 2
+    assert list(stream_with_fallback(client, messages, lambda: 'fallback', breaker=breaker)) == ['fallback']
+    assert failing.calls == 2
+
+    healthy = make_breaker('healthy')
+    client = StreamingAIClient(fake=FakeStreamingModel(reply='hello there'))
+    assert ''.join(stream_with_fallback(client, messages, lambda: 'fallback', breaker=healthy)) == 'hello there'
+    assert healthy.snapshot()['window_calls'] == 1
@@ -0,0 +1,138 @@
+"""
+Tests for diff-and-batch whole-document ATS enhancement, with a recording
+stand-in for the OpenAI call.
+
+    python -m pytest test_document_enhancer.py -q
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from document_enhancer import CACHED, ENHANCED, FALLBACK, UNCHANGED, DocumentEnhancer, flatten
+from francisca_ai_service import FranciscaAIService
+
+RESUME = {
+    'personalInfo': {'firstName': 'Amina', 'lastName': 'Odhiambo', 'email': 'amina@example.com',
+                     'phone': '+254700000000', 'city': 'Kisumu'},
+    'professionalSummary': 'Accountant with six years in audit and tax',
+    'workExperience': [{
+        'jobTitle': 'Senior Accountant', 'company': 'Lakeside Sugar Ltd', 'startDate': '2020-01',
+        'responsibilities': ['prepared monthly management accounts', 'handled VAT returns for three entities'],
+    }],
+    'skills': [{'name': 'IFRS reporting'}],
+}
+
+
+class RecordingAI:
+    """enhance_fields_ats_batch stand-in: upper-cases each field"""
+
+    def __init__(self, reply=None):
+        self.calls = []
+        self.reply = reply
+
+    def enhance_fields_ats_batch(self, fields, profession=None, job_title=None):
+        self.calls.append(dict(fields))
+        if self.reply is not None:
+            return self.reply(fields)
+        return {path: content.upper() for path, (kind, content) in fields.items()}
+
+    def _fallback_ats_enhancement(self, content, field_type, profession=None):
+        return f"Successfully {content.lower()}"
+
+
+@pytest.fixture
+def make_enhancer(tmp_path):
+    def make(ai, **kwargs):
+        return DocumentEnhancer(db_path=str(tmp_path / 'enhancer.db'), ai=ai, **kwargs)
+    return make
+
+
+def test_only_prose_fields_go_out_in_one_request(make_enhancer):
+    ai = RecordingAI()
+    result = make_enhancer(ai).enhance(RESUME, 'Accountant', 'Finance Manager', user_id=1)
+    assert len(ai.calls) == 1
+    assert set(ai.calls[0]) == {'professionalSummary', 'workExperience.0.jobTitle',
+                                'workExperience.0.responsibilities.0', 'workExperience.0.responsibilities.1'}
+    assert ai.calls[0]['workExperience.0.responsibilities.1'] == ('responsibilities',
+                                                                   'handled VAT returns for three entities')
+    enhanced = result['enhanced_data']
+    assert enhanced['workExperience'][0]['responsibilities'][1] == 'HANDLED VAT RETURNS FOR THREE ENTITIES'
+    assert enhanced['personalInfo'] == RESUME['personalInfo'] and enhanced['skills'] == RESUME['skills']
+    assert RESUME['professionalSummary'] == 'Accountant with six years in audit and tax'   # input untouched
+    assert result['stats'] == {'fields': 4, 'requests': 1, UNCHANGED: 0, CACHED: 0, ENHANCED: 4, FALLBACK: 0}
+
+
+def test_only_fields_changed_since_the_last_enhancement_are_sent(make_enhancer):
+    ai = RecordingAI()
+    enhancer = make_enhancer(ai)
+    applied = enhancer.enhance(RESUME, 'Accountant', '', user_id=1)['enhanced_data']
+    # The user applied the result and then edited one bullet
+    applied['workExperience'][0]['responsibilities'][0] = 'closed the books in four days'
+    result = enhancer.enhance(applied, 'Accountant', '', user_id=1)
+    assert ai.calls[1] == {'workExperience.0.responsibilities.0': ('responsibilities', 'closed the books in four days')}
+    assert result['fields']['professionalSummary'] == UNCHANGED
+    assert result['enhanced_data']['workExperience'][0]['responsibilities'][0] == 'CLOSED THE BOOKS IN FOUR DAYS'
+    # Nothing changed: no request at all
+    assert enhancer.enhance(result['enhanced_data'], 'Accountant', '', user_id=1)['stats']['requests'] == 0
+    assert len(ai.calls) == 2
+
+
+def test_results_are_cached_by_content_across_documents(make_enhancer):
+    ai = RecordingAI()
+    enhancer = make_enhancer(ai)
+    enhancer.enhance(RESUME, 'Accountant', '', user_id=1)
+    result = enhancer.enhance(RESUME, 'Accountant', '', user_id=2, document_id='cv-2')
+    assert len(ai.calls) == 1 and set(result['fields'].values()) == {CACHED}
+    # A different profession is a different prompt
+    enhancer.enhance(RESUME, 'Auditor', '', user_id=2, document_id='cv-2')
+    assert len(ai.calls) == 2
+    text, source = enhancer.enhance_field('Accountant with six years in audit and tax', 'professionalSummary',
+                                          'Accountant')
+    assert source == CACHED and text == 'ACCOUNTANT WITH SIX YEARS IN AUDIT AND TAX'
+
+
+def test_unusable_values_fall_back_per_field_and_are_retried(make_enhancer):
+    def partial(fields):
+        reply = {path: content.upper() for path, (_, content) in fields.items()}
+        reply['professionalSummary'] = {'text': 'nested'}
+        reply['workExperience.0.jobTitle'] = 'x' * 1000
+        reply['personalInfo.email'] = 'HACKED@EXAMPLE.COM'
+        return reply
+    ai = RecordingAI(reply=partial)
+    enhancer = make_enhancer(ai)
+    result = enhancer.enhance(RESUME, 'Accountant', '', user_id=1)
+    assert result['fields']['professionalSummary'] == FALLBACK
+    assert result['enhanced_data']['professionalSummary'] == 'Successfully accountant with six years in audit and tax'
+    assert result['fields']['workExperience.0.jobTitle'] == FALLBACK
+    assert result['enhanced_data']['personalInfo']['email'] == 'amina@example.com'
+    assert result['stats'][ENHANCED] == 2
+    ai.reply = None
+    enhancer.enhance(RESUME, 'Accountant', '', user_id=1)
+    assert set(ai.calls[1]) == {'professionalSummary', 'workExperience.0.jobTitle'}
+
+
+def test_a_failed_request_serves_the_fallback(make_enhancer):
+    def down(fields):
+        raise ConnectionResetError('upstream down')
+    result = make_enhancer(RecordingAI(reply=down)).enhance(RESUME, 'Accountant', '')
+    assert set(result['fields'].values()) == {FALLBACK} and result['stats']['requests'] == 1
+
+
+def test_batch_prompt_is_compact_json_and_reply_is_parsed():
+    class ScriptedService(FranciscaAIService):
+        def __init__(self):
+            super().__init__()
+            self.messages = None
+
+        def _chat_completion(self, messages, max_tokens=300, temperature=0.7, model="gpt-3.5-turbo"):
+            self.messages = messages
+            content = 'Here you go:\n```json\n{"summary": "Chartered accountant"}\n```'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    service = ScriptedService()
+    fields = {path: ('summary', text) for path, text in flatten({'summary': 'accountant, 6 yrs'}).items()}
+    assert service.enhance_fields_ats_batch(fields, 'Accountant') == {'summary': 'Chartered accountant'}
+    prompt = service.messages[-1]['content']
+    assert json.loads(prompt.split('Fields: ', 1)[1]) == {'summary': {'type': 'summary', 'text': 'accountant, 6 yrs'}}
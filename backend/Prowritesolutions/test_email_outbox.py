@@ -0,0 +1,147 @@
+"""
+Tests for the email outbox. The local debugging SMTP server stands in for
+Gmail/SendGrid.
+
+    python -m pytest test_email_outbox.py -q
+"""
+
+import os
+import time
+import tempfile
+
+from email_outbox import EmailOutbox, SMTPTransport, PermanentEmailError
+from local_smtp_server import LocalSMTPServer
+
+
+def _make_outbox(tmpdir, transport, **kwargs):
+    return EmailOutbox(db_path=os.path.join(tmpdir, 'outbox.db'), transport=transport, **kwargs)
+
+
+def test_batch_is_sent_over_one_smtp_session():
+    server = LocalSMTPServer().start()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            transport = SMTPTransport('127.0.0.1', server.port, 'sender@prowrite.test', 'secret', use_tls=False)
+            outbox = _make_outbox(tmpdir, transport)
+
+            ids = [outbox.enqueue(f"user{i}@example.com", f"Subject {i}", body_text="Hello") for i in range(3)]
+            ids.append(outbox.enqueue(
+                "pdf@example.com", "Your resume", body_text="Attached",
+                attachments=[("resume.pdf", b"%PDF-1.4 test", "application/pdf")],
+                category='pdf_delivery'
+            ))
+
+            assert outbox.flush() == 4
+            transport.close()
+
+            assert server.connections == 1
+            assert [m['recipients'] for m in server.messages] == [
+                ['user0@example.com'], ['user1@example.com'], ['user2@example.com'], ['pdf@example.com']
+            ]
+            attachment = [p for p in server.messages[-1]['message'].walk() if p.get_filename()][0]
+            assert attachment.get_filename() == 'resume.pdf'
+            assert attachment.get_payload(decode=True) == b"%PDF-1.4 test"
+
+            for message_id in ids:
+                assert outbox.get_status(message_id)['status'] == 'sent'
+            assert outbox.get_stats()['counts'] == {'sent': 4}
+    finally:
+        server.stop()
+
+
+def test_session_is_reopened_after_server_disconnect():
+    server = LocalSMTPServer().start()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            transport = SMTPTransport('127.0.0.1', server.port, None, None, use_tls=False)
+            outbox = _make_outbox(tmpdir, transport)
+
+            outbox.enqueue("a@example.com", "First", body_text="1")
+            outbox.flush()
+            transport._conn.close()  # simulate the server dropping an idle session
+
+            message_id = outbox.enqueue("b@example.com", "Second", body_text="2")
+            outbox.flush()
+
+            assert outbox.get_status(message_id)['status'] == 'sent'
+            assert server.connections == 2
+            assert len(server.messages) == 2
+    finally:
+        server.stop()
+
+
+class _FlakyTransport:
+    name = 'flaky'
+
+    def __init__(self, failures, error=RuntimeError("connection reset")):
+        self.failures = failures
+        self.error = error
+        self.sent = []
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.sent.append(message['recipient'])
+
+    def close(self):
+        pass
+
+
+def test_transient_failure_is_retried_with_backoff():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        transport = _FlakyTransport(failures=1)
+        outbox = _make_outbox(tmpdir, transport)
+        message_id = outbox.enqueue("retry@example.com", "Retry me", body_text="x")
+
+        outbox.flush()
+        status = outbox.get_status(message_id)
+        assert status['status'] == 'pending'
+        assert status['attempts'] == 1
+        assert status['next_attempt_at'] > time.time()
+
+        # Not due yet - nothing is sent
+        assert outbox.flush() == 0
+
+        conn = outbox._connect()
+        conn.execute("UPDATE email_outbox SET next_attempt_at = 0 WHERE id = ?", (message_id,))
+        conn.close()
+
+        outbox.flush()
+        assert outbox.get_status(message_id)['status'] == 'sent'
+        assert transport.sent == ["retry@example.com"]
+
+
+def test_gives_up_after_max_attempts_and_on_permanent_errors():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outbox = _make_outbox(tmpdir, _FlakyTransport(failures=10), max_attempts=1)
+        message_id = outbox.enqueue("down@example.com", "Never", body_text="x")
+        outbox.flush()
+        assert outbox.get_status(message_id)['status'] == 'failed'
+
+        outbox = _make_outbox(tmpdir, _FlakyTransport(failures=1, error=PermanentEmailError("bad address")))
+        message_id = outbox.enqueue("bad@example", "Never", body_text="x")
+        outbox.flush()
+        status = outbox.get_status(message_id)
+        assert status['status'] == 'failed'
+        assert status['last_error'] == 'bad address'
+
+
+def test_background_worker_delivers_enqueued_mail():
+    server = LocalSMTPServer().start()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            transport = SMTPTransport('127.0.0.1', server.port, None, None, use_tls=False)
+            outbox = _make_outbox(tmpdir, transport, poll_interval=0.05)
+            outbox.start_worker()
+            message_id = outbox.enqueue("async@example.com", "Async", body_text="x")
+
+            deadline = time.time() + 5
+            while time.time() < deadline and outbox.get_status(message_id)['status'] != 'sent':
+                time.sleep(0.02)
+            outbox.stop_worker()
+
+            assert outbox.get_status(message_id)['status'] == 'sent'
+            assert server.messages[0]['recipients'] == ['async@example.com']
+    finally:
+        server.stop()
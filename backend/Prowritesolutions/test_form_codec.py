@@ -0,0 +1,84 @@
+"""
+Tests for the form_data storage codec.
+
+    python -m pytest test_form_codec.py -q
+"""
+
+import json
+
+import mysql.connector
+from flask import Flask
+
+import form_codec
+import mysql_sqlite_shim
+from form_codec import encode_form_data, decode_form_data, is_encoded, canonical_json
+from load_test_harness import create_schema
+
+FORM = {
+    'personalName': 'Wanjiru Kamau',
+    'personalEmail': 'wanjiru@example.com',
+    'personalPhone': '254712345678',
+    'professionalSummary': 'Operations lead with eight years in logistics. ' * 20,
+    'workExperience': [{'title': 'Operations Lead', 'company': 'Acme', 'description': 'Ran dispatch. ' * 10}],
+    'skills': ['Planning', 'Excel', 'Negotiation'],
+}
+
+
+def test_round_trip_is_compressed_and_smaller():
+    stored = encode_form_data(FORM)
+    assert is_encoded(stored)
+    assert stored[4:5] in (form_codec.CODEC_ZLIB, form_codec.CODEC_ZSTD)
+    assert len(stored) < len(json.dumps(FORM, indent=2))
+    assert decode_form_data(stored) == FORM
+    # mysql.connector hands BLOB values back as bytearray
+    assert decode_form_data(bytearray(stored)) == FORM
+
+
+def test_small_payloads_are_not_compressed():
+    stored = encode_form_data({'a': 1})
+    assert stored[4:5] == form_codec.CODEC_NONE
+    assert decode_form_data(stored) == {'a': 1}
+
+
+def test_zlib_codec_and_canonical_output():
+    assert decode_form_data(encode_form_data(FORM, codec='zlib')) == FORM
+    reordered = dict(reversed(list(FORM.items())))
+    assert canonical_json(reordered) == canonical_json(FORM)
+
+
+def test_legacy_json_values_still_decode():
+    assert decode_form_data(json.dumps(FORM, indent=2)) == FORM
+    assert decode_form_data(json.dumps(FORM).encode('utf-8')) == FORM
+    assert decode_form_data(FORM) == FORM
+    assert decode_form_data(None) == {}
+    assert encode_form_data(None) is None
+
+
+def test_unknown_version_is_rejected():
+    stored = bytearray(encode_form_data(FORM))
+    stored[3] = form_codec.VERSION + 1
+    try:
+        decode_form_data(bytes(stored))
+        raise AssertionError("expected an unsupported version error")
+    except ValueError:
+        pass
+
+
+def test_debug_payments_listing_leaves_out_encoded_form_data(tmp_path, monkeypatch):
+    from system_routes import system_bp
+
+    path = str(tmp_path / 'prowrite.db')
+    create_schema(path)
+    monkeypatch.setattr(mysql.connector, 'connect', lambda *args, **kwargs: mysql_sqlite_shim.connect(path, **kwargs))
+    connection = mysql.connector.connect()
+    connection.cursor().execute("INSERT INTO payments (user_id, amount, payment_type, checkout_request_id, form_data) "
+                                "VALUES (1, 500, 'Francisca Resume', 'ws_CO_1', %s)", (encode_form_data(FORM),))
+    connection.commit()
+    connection.close()
+
+    app = Flask(__name__)
+    app.register_blueprint(system_bp)
+    response = app.test_client().get('/api/debug/payments')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert 'form_data' not in body['payments_columns'] and len(body['payments_sample']) == 1
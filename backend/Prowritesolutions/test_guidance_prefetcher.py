@@ -0,0 +1,117 @@
+"""
+Tests for speculative next-step guidance in the guided question flow.
+
+    python -m pytest test_guidance_prefetcher.py -q
+"""
+
+import threading
+import time
+
+from fallback_ai_service import fallback_ai_service
+from francisca_ai_service import francisca_ai_service
+from suggestion_bank import suggestion_bank
+from francisca_enhanced_ai import FranciscaEnhancedAI
+from francisca_question_engine import FranciscaQuestionEngine
+from guidance_prefetcher import GuidancePrefetcher
+
+
+class SlowGuidanceAI:
+    """generate_step_guidance stand-in that can be held until released"""
+
+    def __init__(self, hold=False):
+        self.calls = []
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def generate_step_guidance(self, step, fields, context=None):
+        self.calls.append((step, context['profession']))
+        self.release.wait(5)
+        return {'step': step, 'profession': context['profession']}
+
+
+def _wait_for(prefetcher, session, step, profession=''):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        guidance = prefetcher.get(session, step, profession)
+        if guidance is not None:
+            return guidance
+        time.sleep(0.01)
+    return None
+
+
+def test_next_step_guidance_is_ready_when_the_user_gets_there():
+    ai, engine = SlowGuidanceAI(), FranciscaQuestionEngine()
+    prefetcher = GuidancePrefetcher(ai=ai, engine=engine, enabled=True)
+    assert prefetcher.prefetch_after(1, 'personal_info', 'Designer')
+    assert not prefetcher.prefetch_after(1, 'personal_info', 'Designer')  # already in flight
+    assert _wait_for(prefetcher, 1, 'profession', 'Designer') == {'step': 'profession', 'profession': 'Designer'}
+    question = prefetcher.attach(1, engine.question_flow[1], 'Designer')
+    assert question['guidance']['step'] == 'profession' and 'guidance' not in engine.question_flow[1]
+    assert prefetcher.get(2, 'profession', 'Designer') is None
+    assert not prefetcher.prefetch_after(1, 'summary')  # last step
+    assert ai.calls == [('profession', 'Designer')]
+
+
+def test_attach_never_waits_for_guidance_in_flight():
+    ai = SlowGuidanceAI(hold=True)
+    prefetcher = GuidancePrefetcher(ai=ai, engine=FranciscaQuestionEngine(), enabled=True)
+    prefetcher.prefetch_after(1, 'profession')
+    started = time.perf_counter()
+    question = prefetcher.attach(1, {'step': 'education', 'fields': []})
+    assert question['guidance'] is None and time.perf_counter() - started < 0.05
+    ai.release.set()
+    assert _wait_for(prefetcher, 1, 'education') is not None
+
+
+def test_a_new_profession_regenerates_guidance():
+    ai = SlowGuidanceAI()
+    prefetcher = GuidancePrefetcher(ai=ai, engine=FranciscaQuestionEngine(), enabled=True)
+    prefetcher.prefetch_after(1, 'experience', '')
+    _wait_for(prefetcher, 1, 'skills')
+    assert prefetcher.get(1, 'skills', 'Data Scientist') is None
+    assert prefetcher.prefetch_after(1, 'experience', 'Data Scientist')
+    assert _wait_for(prefetcher, 1, 'skills', 'Data Scientist')['profession'] == 'Data Scientist'
+
+
+def test_jumping_cancels_prefetches_for_skipped_steps():
+    ai = SlowGuidanceAI(hold=True)
+    prefetcher = GuidancePrefetcher(ai=ai, engine=FranciscaQuestionEngine(), workers=1, enabled=True)
+    prefetcher.prefetch_after(1, 'personal_info')   # running, holds the only worker
+    prefetcher.prefetch_after(1, 'profession')      # queued behind it
+    prefetcher.prefetch_after(1, 'skills')
+    assert prefetcher.cancel(1, keep=['achievements']) == 2
+    ai.release.set()
+    assert _wait_for(prefetcher, 1, 'achievements') is not None
+    assert prefetcher.get(1, 'profession') is None and prefetcher.get(1, 'education') is None
+    assert ('education', '') not in ai.calls   # never started
+    assert prefetcher.stats['cancelled'] == 2
+
+
+def test_step_guidance_has_tips_for_every_field_and_examples_for_free_text(tmp_path, monkeypatch):
+    engine = FranciscaQuestionEngine()
+    experience = next(step for step in engine.question_flow if step['step'] == 'experience')
+    # Examples come from the suggestion bank, as in production
+    monkeypatch.setattr(suggestion_bank, 'path', str(tmp_path / 'suggestion_bank.json'))
+    suggestion_bank.build(fallback_ai_service.get_francisca_suggestions, 'fallback', professions=[''])
+    guidance = FranciscaEnhancedAI().generate_step_guidance('experience', experience['fields'], {})
+    assert set(guidance['fields']) == {f['field'] for f in experience['fields']}
+    assert guidance['fields']['keyAchievements']['suggestions'] == \
+        fallback_ai_service.get_francisca_suggestions('', 'keyAchievements')
+    assert 'suggestions' not in guidance['fields']['currentCompany']
+    assert guidance['next_steps'] == ["Detail your responsibilities", "Highlight your achievements"]
+
+
+def test_step_guidance_never_generates_suggestions_live(tmp_path, monkeypatch):
+    def live(profession, field_type):
+        raise AssertionError("speculative guidance must not call OpenAI")
+
+    monkeypatch.setattr(francisca_ai_service, 'generate_francisca_suggestions', live)
+    monkeypatch.setattr(suggestion_bank, 'path', str(tmp_path / 'suggestion_bank.json'))
+    suggestion_bank.build(fallback_ai_service.get_francisca_suggestions, 'fallback', professions=['nurse'],
+                          field_types=['keyAchievements'])
+    fields = [{'field': 'keyAchievements', 'type': 'textarea'}, {'field': 'languages', 'type': 'tags'}]
+    guidance = FranciscaEnhancedAI().generate_step_guidance('experience', fields, {'profession': 'Nurse'})
+    assert guidance['fields']['keyAchievements']['suggestions'] == \
+        fallback_ai_service.get_francisca_suggestions('nurse', 'keyAchievements')
+    assert guidance['fields']['languages']['suggestions'] == []           # not banked: no examples
@@ -0,0 +1,91 @@
+"""
+Import-time checks for the application factory. Each check imports the app in
+a fresh interpreter (as a gunicorn worker would) and needs no database:
+
+    python -m pytest test_import_time.py -q
+
+IMPORT_TIME_BUDGET_MS overrides the budget for `import app` (cumulative
+`python -X importtime` figure).
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_TIME_BUDGET_MS = int(os.getenv('IMPORT_TIME_BUDGET_MS', 2000))
+
+# Imported on first use only: PDF generation, AI and email delivery, previews
+DEFERRED_MODULES = ['openai', 'reportlab', 'sendgrid', 'fitz',
+                    'francisca_ai_service', 'francisca_pdf_generator_robust', 'cover_letter_pdf_generator']
+
+PROBE = """
+import sys, json, threading
+import mysql.connector
+connects = []
+def refuse(*args, **kwargs):
+    connects.append(kwargs.get('host'))
+    raise mysql.connector.Error('database is down')
+mysql.connector.connect = refuse
+import app, app_core
+print(json.dumps({
+    'modules': sorted(sys.modules),
+    'connects': connects,
+    'threads': [thread.name for thread in threading.enumerate()],
+    'rules': len(list(app.app.url_map.iter_rules())),
+    'blueprints': sorted(app.app.blueprints),
+    'services_built': [name for name in ('pdf_generator', 'cover_letter_generator', 'francisca_ai_service')
+                       if getattr(app_core, name)._instance is not None],
+}))
+"""
+
+
+def _run(args):
+    # Run outside the source tree so logs/ and other runtime files land in a temp dir
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+        return subprocess.run([sys.executable] + args, cwd=workdir, env=env,
+                              capture_output=True, text=True, timeout=300)
+
+
+def _probe():
+    result = _run(['-c', PROBE])
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_defers_heavy_modules():
+    modules = _probe()['modules']
+    loaded = [name for name in DEFERRED_MODULES
+              if name in modules or any(module.startswith(name + '.') for module in modules)]
+    assert loaded == [], f"imported at startup: {loaded}"
+
+
+def test_import_needs_no_database_and_starts_no_threads():
+    report = _probe()
+    assert report['connects'] == []
+    assert report['threads'] == ['MainThread']
+    assert report['services_built'] == []
+
+
+def test_factory_registers_every_domain_blueprint():
+    report = _probe()
+    for name in ('system', 'account', 'francisca', 'market', 'resume', 'cover_letter', 'ai',
+                 'analytics', 'payment', 'form', 'template', 'ats', 'document', 'mpesa', 'manual_payment'):
+        assert name in report['blueprints'], name
+    assert report['rules'] > 150
+
+
+def test_import_time_budget():
+    result = _run(['-X', 'importtime', '-c', 'import app'])
+    assert result.returncode == 0, result.stderr[-2000:]
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, module = line.split('|')
+            if cumulative.strip().isdigit():
+                timings[module.strip()] = int(cumulative) / 1000
+    slowest = sorted(((ms, name) for name, ms in timings.items() if name != 'app'), reverse=True)[:5]
+    assert timings['app'] < IMPORT_TIME_BUDGET_MS, f"import app took {timings['app']:.0f}ms; slowest: {slowest}"
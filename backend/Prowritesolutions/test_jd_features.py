@@ -0,0 +1,142 @@
+"""
+Tests for the shared job description feature cache.
+
+    python -m pytest test_jd_features.py -q
+"""
+
+import threading
+import uuid
+
+import pytest
+
+from ai_service import RealAIService
+from cover_letter_enhancement_engine import CoverLetterEnhancementEngine
+from francisca_ai_service import FranciscaAIService
+from jd_features import JDFeatureStore, extract_features, jd_feature_store, posting_key
+from job_description_analyzer import JobDescriptionAnalyzer
+
+POSTING = """Senior Backend Engineer - Nairobi
+We are seeking a Senior Backend Engineer to join Twiga Foods.
+
+Requirements:
+• 5+ years of professional experience building APIs in Python and Django
+• Strong SQL (PostgreSQL) and Docker, Kubernetes
+• Bachelor's degree in Computer Science
+• Excellent communication and problem-solving skills
+
+Nice to have: Terraform and AWS Certified Solutions Architect.
+We use Jira and Slack. Experience with digital payments is a plus."""
+
+RESUME = {
+    'professionalSummary': 'Backend developer building payment APIs',
+    'workExperience': [{'jobTitle': 'Backend Developer', 'company': 'Safaricom',
+                        'responsibilities': ['Built M-Pesa integrations in Python with PostgreSQL',
+                                             'Led a team of four, owning communication with partners']}],
+    'skills': [{'name': 'Python'}, {'name': 'Django'}, {'name': 'Kubernetes'}],
+}
+
+
+@pytest.fixture(autouse=True)
+def shared_store(tmp_path, monkeypatch):
+    """Point the store the services import at a throwaway database instead of data/jd_features.db"""
+    monkeypatch.setattr(jd_feature_store, 'db_path', str(tmp_path / 'jd_features.db'))
+    monkeypatch.setattr(jd_feature_store, '_initialized', False)
+    monkeypatch.setattr(jd_feature_store, '_local', threading.local())
+    return jd_feature_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JDFeatureStore(db_path=str(tmp_path / 'jd.db'))
+
+
+def test_features_of_a_posting():
+    features = extract_features(POSTING)
+    assert features['skills'] == ['Python', 'Django', 'SQL', 'PostgreSQL', 'Docker', 'Kubernetes', 'Terraform']
+    assert features['tools'] == ['Jira', 'Slack'] and features['certifications'] == ['AWS Certified']
+    assert features['soft_skills'] == ['Communication', 'Problem Solving']
+    assert features['preferred'] == ['Terraform', 'AWS Certified']
+    assert features['experience'] == {'years': 5, 'text': '5+ years of professional experience'}
+    assert features['education']['level'] == 'bachelor' and features['experience_level'] == 'Senior'
+    keywords = features['keywords']
+    assert keywords['python'] == 1.0 and keywords['python'] > keywords['nairobi'] > 0
+    assert 'with' not in keywords and 'experience' not in keywords
+    # No substring matches: "git" in "digital", "java" in "javascript"
+    assert 'Git' not in extract_features('Digital payments team')['skills']
+    assert extract_features('JavaScript and TypeScript')['skills'] == ['JavaScript', 'TypeScript']
+
+
+def test_reformatted_copies_share_one_entry_across_workers(store):
+    reformatted = POSTING.upper().replace('•', '-').replace('\n', '\n\n  ')
+    assert posting_key(reformatted) == posting_key(POSTING)
+    first = store.features(POSTING)
+    first['skills'].append('Mutated by a caller')
+    assert store.features(reformatted) == extract_features(POSTING)
+    assert store.stats == {'memory_hits': 1, 'shared_hits': 0, 'computed': 1}
+    # Another worker on the same host
+    other = JDFeatureStore(db_path=store.db_path)
+    assert other.features(POSTING)['skills'][0] == 'Python'
+    assert other.stats == {'memory_hits': 0, 'shared_hits': 1, 'computed': 0}
+
+
+def test_get_or_compute_does_not_store_failures(store):
+    calls = []
+
+    def ask():
+        calls.append(1)
+        return None if len(calls) == 1 else {'technical_skills': ['Python']}
+    assert store.get_or_compute(POSTING, 'ai_keywords:technology', ask) is None
+    assert store.get_or_compute(POSTING, 'ai_keywords:technology', ask) == {'technical_skills': ['Python']}
+    assert store.get_or_compute(POSTING, 'ai_keywords:technology', ask) == {'technical_skills': ['Python']}
+    assert len(calls) == 2
+
+
+def test_services_read_the_same_features_without_ai_calls():
+    class NoAIService(FranciscaAIService):
+        def _chat_completion(self, messages, max_tokens=300, temperature=0.7, model="gpt-3.5-turbo"):
+            raise AssertionError('no AI call expected')
+
+    service = NoAIService()
+    keywords = service.extract_keywords(POSTING)
+    assert keywords['technical_skills'][:3] == ['Python', 'Django', 'SQL'] and keywords['experience_level'] == 'Senior'
+    gap = service.analyze_skills_gap(RESUME, POSTING)
+    assert gap['missing_skills'] == ['SQL', 'Docker', 'Jira', 'Slack', 'Terraform', 'AWS Certified']
+    assert gap['strengths'] == ['Python', 'Django', 'PostgreSQL', 'Kubernetes', 'Communication']
+    assert 'Add PostgreSQL to your skills section' in gap['highlight_suggestions']
+    assert 'Show where you used Django in your experience' in gap['highlight_suggestions']
+    assert gap['recommendations'][0] == 'Add evidence of SQL, Docker, Jira if you have used them'
+
+    requirements = JobDescriptionAnalyzer()._extract_job_requirements(POSTING)
+    assert requirements['preferred_skills'] == ['Terraform', 'AWS Certified']
+    assert 'Docker' in requirements['required_skills'] and 'Terraform' not in requirements['required_skills']
+    assert requirements['experience_requirements']['years'] == 5 and requirements['industry'] == 'general'
+
+
+def test_ai_keyword_extraction_runs_once_per_posting():
+    class ScriptedService(RealAIService):
+        def __init__(self, reply):
+            super().__init__()
+            self.reply, self.calls = reply, 0
+
+        def _call_openai(self, prompt, system_prompt=None, max_tokens=1000, temperature=0.7):
+            self.calls += 1
+            return self.reply
+
+    posting = f"{POSTING}\nReference: {uuid.uuid4().hex}"
+    down = ScriptedService('')
+    assert down.extract_keywords(posting)['technical_skills'][0] == 'Python'   # local fallback
+    service = ScriptedService('{"technical_skills": ["Python", "Django"], "experience_level": "Senior"}')
+    assert service.extract_keywords(posting)['technical_skills'] == ['Python', 'Django']
+    assert ScriptedService('{}').extract_keywords(posting.upper())['technical_skills'] == ['Python', 'Django']
+    assert service.extract_keywords(posting, industry='Finance') == service.extract_keywords(posting, 'finance')
+    assert down.calls == 1 and service.calls == 2
+
+
+def test_cover_letter_score_weighs_the_skills_the_posting_stresses():
+    engine = CoverLetterEnhancementEngine()
+    skilled = engine.analyze_ats_compatibility(
+        'I have built APIs in Python and Django on Kubernetes with PostgreSQL for five years.', POSTING)
+    generic = engine.analyze_ats_compatibility(
+        'I am a professional engineer based in Nairobi and would love to join Twiga Foods.', POSTING)
+    assert {'python', 'django', 'kubernetes', 'postgresql'} <= set(skilled.keyword_matches)
+    assert skilled.keyword_score > generic.keyword_score > 0
@@ -0,0 +1,129 @@
+"""
+Tests for the queued structured logging pipeline and access-log sampling.
+
+    python -m pytest test_logging_config.py -q
+"""
+
+import json
+import logging
+
+from flask import Flask, g
+
+import logging_config
+from logging_config import AccessLogSampler, JsonFormatter, RequestContextFilter, RequestQueueHandler, new_request_id
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_request_ids_are_reused_only_when_well_formed():
+    assert new_request_id('abc-123_x.y') == 'abc-123_x.y'
+    assert len(new_request_id('bad id; drop table')) == 32
+    assert new_request_id(None) != new_request_id(None)
+
+
+def test_queue_pipeline_keeps_request_id_extras_and_traceback():
+    capture = CaptureHandler()
+    handler = RequestQueueHandler([capture])
+    handler.addFilter(RequestContextFilter())
+    logger = logging.getLogger('test_logging_config.pipeline')
+    logger.propagate = False
+    logger.addHandler(handler)
+    handler.start()
+    try:
+        with Flask(__name__).test_request_context('/x'):
+            g.request_id = 'req-1'
+            logger.warning("charged %s", 'KES 500', extra={'user_id': 7})
+            try:
+                raise ValueError('boom')
+            except ValueError:
+                logger.exception("failed")
+        logger.warning("outside a request")
+    finally:
+        handler.stop()
+        logger.removeHandler(handler)
+
+    charged, failed, outside = capture.records
+    entry = json.loads(JsonFormatter().format(charged))
+    assert entry['message'] == 'charged KES 500' and entry['request_id'] == 'req-1'
+    assert entry['user_id'] == 7 and entry['level'] == 'WARNING'
+    entry = json.loads(JsonFormatter().format(failed))
+    assert 'ValueError: boom' in entry['exc'] and failed.exc_info is None
+    assert outside.request_id == '-'
+    assert logging.Formatter(logging_config.TEXT_FORMAT).format(failed).count('ValueError: boom') == 1
+
+
+def test_records_are_written_synchronously_until_the_listener_starts():
+    capture = CaptureHandler()
+    handler = RequestQueueHandler([capture])
+    logger = logging.getLogger('test_logging_config.sync')
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.warning("before start")
+        assert [r.msg for r in capture.records] == ['before start'] and handler.listener is None
+        handler.start()
+        logger.warning("queued")
+    finally:
+        handler.stop()
+        logger.removeHandler(handler)
+    assert [r.msg for r in capture.records] == ['before start', 'queued']
+    logger.addHandler(handler)
+    logger.warning("after stop")
+    logger.removeHandler(handler)
+    assert capture.records[-1].msg == 'after stop'
+
+
+def test_access_sampler_route_rates_and_always_logged_responses():
+    sampler = AccessLogSampler(default_rate=1.0, route_rates='/api/health=0, /api/admin=0.5, /api/admin/profiles=1',
+                               slow_ms=500)
+    assert sampler.rate_for('/api/health') == 0.0
+    assert sampler.rate_for('/api/admin/users') == 0.5
+    assert sampler.rate_for('/api/admin/profiles/3') == 1.0
+    assert sampler.rate_for('/api/resumes') == 1.0
+    assert sampler.should_log('/api/health', 200, 5) is None
+    assert sampler.should_log('/api/health', 503, 5) == 1.0
+    assert sampler.should_log('/api/health', 200, 800) == 1.0
+    assert sampler.should_log('/api/resumes', 200, 5) == 1.0
+
+
+def test_one_sampled_access_line_per_request_with_request_id_header(tmp_path, monkeypatch):
+    monkeypatch.setattr(logging_config, 'LOG_FILE', str(tmp_path / 'app.log'))      # importing app_core sets up logging
+    from app_core import register_error_handlers
+
+    app = Flask(__name__)
+
+    @app.route('/api/health')
+    def health():
+        return 'ok'
+
+    @app.route('/api/resumes/<int:resume_id>')
+    def resume(resume_id):
+        return 'resume'
+
+    register_error_handlers(app)
+    capture = CaptureHandler()
+    capture.addFilter(RequestContextFilter())
+    access_logger = logging.getLogger('prowrite.access')
+    access_logger.addHandler(capture)
+    original = logging_config.access_log_sampler.route_rates
+    logging_config.access_log_sampler.route_rates = {'/api/health': 0.0}
+    try:
+        client = app.test_client()
+        response = client.get('/api/resumes/4', headers={'X-Request-ID': 'from-proxy'})
+        assert response.headers['X-Request-ID'] == 'from-proxy'
+        assert len(client.get('/api/health').headers['X-Request-ID']) == 32
+        client.get('/api/missing')
+    finally:
+        logging_config.access_log_sampler.route_rates = original
+        access_logger.removeHandler(capture)
+
+    assert [(r.path, r.status) for r in capture.records] == [('/api/resumes/4', 200), ('/api/missing', 404)]
+    assert capture.records[0].route == '/api/resumes/<int:resume_id>'
+    assert capture.records[0].request_id == 'from-proxy' and capture.records[0].sample_rate == 1.0
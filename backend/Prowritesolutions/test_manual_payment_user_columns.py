@@ -0,0 +1,161 @@
+"""
+Tests for the indexed user columns on manual_payments: the form_data backfill
+and the per-user payment history and stats, on the MySQL-on-SQLite shim:
+
+    python -m pytest test_manual_payment_user_columns.py -q
+"""
+
+import json
+
+import mysql.connector
+import pytest
+from flask import Flask
+
+import mysql_sqlite_shim
+from app_core import auth_system
+from fast_manual_payment_service import FastManualPaymentService, PaymentSubmission
+from form_codec import encode_form_data
+from migrate_manual_payments_user_columns import backfill, ensure_user_columns
+from payment_routes import payment_bp
+
+SCHEMA = [
+    """CREATE TABLE users (
+        user_id INT AUTO_INCREMENT PRIMARY KEY,
+        email VARCHAR(255) UNIQUE NOT NULL
+    )""",
+    """CREATE TABLE payments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        amount DECIMAL(10,2) NOT NULL,
+        currency VARCHAR(3) DEFAULT 'KES',
+        payment_method VARCHAR(20) DEFAULT 'mpesa',
+        status VARCHAR(20) DEFAULT 'pending',
+        mpesa_checkout_request_id VARCHAR(255),
+        mpesa_merchant_request_id VARCHAR(255),
+        mpesa_receipt_number VARCHAR(255),
+        transaction_reference VARCHAR(255),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )""",
+    # manual_payments as it was before the user columns
+    """CREATE TABLE manual_payments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        reference VARCHAR(50) UNIQUE NOT NULL,
+        form_data LONGBLOB,
+        document_type VARCHAR(100),
+        amount INT,
+        status VARCHAR(50) DEFAULT 'pending_payment',
+        payment_method VARCHAR(50) DEFAULT 'manual',
+        transaction_code VARCHAR(100),
+        validation_method VARCHAR(50),
+        pdf_path VARCHAR(500),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        INDEX idx_reference (reference),
+        INDEX idx_status (status)
+    )""",
+]
+
+# reference -> stored form_data: legacy JSON text and form_codec-encoded rows side by side
+MANUAL_PAYMENTS = {
+    'PW-JANE': json.dumps({'user_id': '1', 'personalEmail': 'jane@example.com', 'personalPhone': '254700000001'}),
+    'PW-JOHN': encode_form_data({'personalEmail': 'john@example.com', 'personalPhone': '254700000002'}),
+    'PW-GUEST': encode_form_data({'personalEmail': 'guest@example.com'}),
+    'PW-BLANK': json.dumps({'user_id': 'abc', 'personalEmail': ''}),
+}
+TOKENS = {'jane': {'user_id': 1, 'email': 'jane@example.com'}, 'john': {'user_id': 2, 'email': 'john@example.com'}}
+
+
+def _execute(sql, params=()):
+    connection = mysql.connector.connect()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall() if cursor.description else cursor.rowcount
+        connection.commit()
+        return rows
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    path = str(tmp_path / 'prowrite.db')
+    monkeypatch.setattr(mysql.connector, 'connect',
+                        lambda *args, **kwargs: mysql_sqlite_shim.connect(path, database='prowrite'))
+    for statement in SCHEMA:
+        _execute(statement)
+    _execute("INSERT INTO users (email) VALUES ('jane@example.com'), ('john@example.com')")
+    for reference, form_data in MANUAL_PAYMENTS.items():
+        _execute("""INSERT INTO manual_payments (reference, form_data, document_type, amount, status)
+                    VALUES (%s, %s, 'Francisca Resume', 500, 'completed')""", (reference, form_data))
+    connection = mysql.connector.connect()
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def migrated(database, capsys):
+    cursor = database.cursor()
+    ensure_user_columns(cursor, 'prowrite')
+    backfill(database, cursor, 'prowrite')
+    return database
+
+
+def _user_columns():
+    rows = _execute("SELECT reference, user_id, user_email, phone_number FROM manual_payments")
+    return {row['reference']: (row['user_id'], row['user_email'], row['phone_number']) for row in rows}
+
+
+def test_backfill_reads_json_and_encoded_form_data_and_links_users_by_email(database, capsys):
+    cursor = database.cursor()
+    assert ensure_user_columns(cursor, 'prowrite') == [
+        'user_id', 'user_email', 'phone_number', 'idx_manual_payments_user_id', 'idx_manual_payments_user_email']
+    assert backfill(database, cursor, 'prowrite') == 3
+    assert _user_columns() == {
+        'PW-JANE': (1, 'jane@example.com', '254700000001'),
+        'PW-JOHN': (2, 'john@example.com', '254700000002'),        # linked through users.email
+        'PW-GUEST': (None, 'guest@example.com', None),
+        'PW-BLANK': (None, None, None),
+    }
+
+    # Re-running is a no-op
+    assert ensure_user_columns(cursor, 'prowrite') == []
+    assert backfill(database, cursor, 'prowrite') == 0
+
+
+def test_new_submissions_add_the_columns_and_write_them_directly(database, monkeypatch):
+    monkeypatch.setenv('DB_NAME', 'prowrite')
+    submission = PaymentSubmission(id=0, reference='PW-NEW', form_data={'user_id': 2, 'personalPhone': '254700000002'},
+                                   document_type='Francisca Resume', amount=500, user_email='john@example.com',
+                                   phone_number=None, status='pending_payment', payment_method='manual',
+                                   transaction_code=None, validation_method=None)
+    FastManualPaymentService()._save_submission_to_db(submission)
+    assert _user_columns()['PW-NEW'] == (2, 'john@example.com', '254700000002')
+    assert _user_columns()['PW-JANE'] == (None, None, None)       # older rows wait for the backfill
+
+
+@pytest.fixture
+def client(migrated, monkeypatch):
+    monkeypatch.setattr(auth_system, 'verify_token', lambda token: TOKENS.get(token, {'error': 'Invalid token'}))
+    _execute("""INSERT INTO payments (user_id, amount, status, mpesa_receipt_number)
+                VALUES (1, 300, 'completed', 'TJD4JANE01'), (2, 300, 'failed', NULL)""")
+    app = Flask(__name__)
+    app.register_blueprint(payment_bp)
+    return app.test_client()
+
+
+def test_history_and_stats_only_return_the_callers_payments(client):
+    history = client.get('/api/payments/history', headers={'Authorization': 'Bearer jane'}).get_json()
+    assert history['success'] and history['total'] == 2
+    assert {payment['transaction_reference'] for payment in history['data']} == {None, 'PW-JANE'}
+    manual = next(payment for payment in history['data'] if payment['transaction_reference'] == 'PW-JANE')
+    assert manual['phone_number'] == '254700000001'
+
+    history = client.get('/api/payments/history', headers={'Authorization': 'Bearer john'}).get_json()
+    assert [payment['item_id'] for payment in history['data'] if payment['payment_type'] != 'regular'] == \
+        ['PW-JOHN']
+
+    stats = client.get('/api/payments/stats', headers={'Authorization': 'Bearer jane'}).get_json()['data']
+    assert stats['totalPayments'] == 2 and stats['totalRevenue'] == 800
+    assert stats['paymentStatusStats'] == {'completed': 2, 'pending': 0, 'failed': 0}
@@ -0,0 +1,165 @@
+"""
+Tests for the M-Pesa callback inbox and its settlement worker, on the
+MySQL-on-SQLite shim with document generation recorded instead of run:
+
+    python -m pytest test_mpesa_settlement.py -q
+"""
+
+import mysql.connector
+import pytest
+
+import africas_talking_validator
+import mpesa_routes
+import mysql_sqlite_shim
+import till_ledger
+from africas_talking_validator import AfricasTalkingValidator
+from form_codec import encode_form_data
+from load_test_harness import create_schema
+from mpesa_settlement import (
+    STATUS_DUPLICATE, STATUS_ORPHAN, STATUS_PENDING, STATUS_PROCESSING, STATUS_SETTLED, STK_SHORT_CODE,
+    MpesaSettlementService,
+)
+
+TILL = '6340351'
+
+
+def _callback(checkout, receipt='TJD4ABC12X', result_code=0, amount=500):
+    stk_callback = {'MerchantRequestID': f"m-{checkout}", 'CheckoutRequestID': checkout,
+                    'ResultCode': result_code, 'ResultDesc': 'The service request is processed successfully.'}
+    if result_code == 0:
+        stk_callback['CallbackMetadata'] = {'Item': [
+            {'Name': 'Amount', 'Value': amount},
+            {'Name': 'MpesaReceiptNumber', 'Value': receipt},
+            {'Name': 'TransactionDate', 'Value': 20250113100000},
+            {'Name': 'PhoneNumber', 'Value': 254700000001},
+        ]}
+    return {'Body': {'stkCallback': stk_callback}}
+
+
+def _execute(sql, params=()):
+    connection = mysql.connector.connect()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall() if cursor.description else cursor.rowcount
+        connection.commit()
+        return rows
+    finally:
+        connection.close()
+
+
+def _payment(checkout, email='amina@example.com'):
+    _execute("INSERT INTO users (email, password_hash, first_name, last_name) VALUES (%s, 'x', 'Amina', 'Odhiambo')",
+             (email,))
+    user_id = _execute("SELECT user_id FROM users WHERE email = %s", (email,))[0]['user_id']
+    _execute("""INSERT INTO payments (user_id, amount, payment_type, checkout_request_id, form_data)
+                VALUES (%s, 500, 'Francisca Resume', %s, %s)""",
+             (user_id, checkout, encode_form_data({'firstName': 'Amina'})))
+    return _execute("SELECT payment_id FROM payments WHERE checkout_request_id = %s", (checkout,))[0]['payment_id']
+
+
+def _callback_row(callback_id):
+    return _execute("SELECT * FROM mpesa_callbacks WHERE id = %s", (callback_id,))[0]
+
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    path = str(tmp_path / 'prowrite.db')
+    create_schema(path)
+    monkeypatch.setattr(mysql.connector, 'connect', lambda *args, **kwargs: mysql_sqlite_shim.connect(path, **kwargs))
+    monkeypatch.setattr(till_ledger, 'till_ledger', till_ledger.TillLedger(till_number=TILL))
+    generated = []
+    monkeypatch.setattr(mpesa_routes, 'trigger_pdf_generation',
+                        lambda payment_id, form_data, document_type, user_email:
+                        generated.append((payment_id, form_data, document_type, user_email)))
+    return generated
+
+
+@pytest.fixture
+def settlement(documents):
+    return MpesaSettlementService(batch_size=10)
+
+
+def test_redeliveries_settle_once_and_mail_the_payer(settlement, documents):
+    payment_id = _payment('ws_CO_1')
+    first = settlement.record_callback(_callback('ws_CO_1'))
+    assert settlement.record_callback(_callback('ws_CO_1')) == first
+    assert _callback_row(first)['deliveries'] == 2
+
+    assert settlement.flush() == 1
+    assert _callback_row(first)['status'] == STATUS_SETTLED
+    payment = _execute("SELECT status, mpesa_code FROM payments WHERE payment_id = %s", (payment_id,))[0]
+    assert payment == {'status': 'completed', 'mpesa_code': 'TJD4ABC12X'}
+    assert documents == [(payment_id, {'firstName': 'Amina'}, 'Francisca Resume', 'amina@example.com')]
+    assert settlement.get_stats()['redeliveries'] == 1
+
+
+def test_a_settled_stk_receipt_cannot_be_used_again_as_a_till_code(settlement, monkeypatch):
+    payment_id = _payment('ws_CO_2')
+    settlement.record_callback(_callback('ws_CO_2', receipt='TJD4ABC99Z'))
+    settlement.flush()
+    entry = till_ledger.till_ledger.lookup('TJD4ABC99Z')
+    assert entry['used_by_reference'] == f"stk:{payment_id}" and entry['till_number'] == STK_SHORT_CODE
+
+    # /api/payments/manual/validate with the same receipt
+    monkeypatch.setattr(africas_talking_validator, 'till_ledger', till_ledger.till_ledger)
+    monkeypatch.setattr(africas_talking_validator, 'transaction_validator',
+                        type('NoTillPayments', (), {'fetch_till_transactions': lambda self, till, days_back=7: []})())
+    result = AfricasTalkingValidator().verify_with_ledger('TJD4ABC99Z', TILL, 500, 'PW-MANUAL-1')
+    assert not result.valid
+    assert not till_ledger.till_ledger.claim('TJD4ABC99Z', 'PW-MANUAL-1')
+
+
+def test_an_orphan_is_requeued_when_daraja_redelivers(settlement, documents):
+    callback_id = settlement.record_callback(_callback('ws_CO_3', receipt='TJD4ABC33C'))
+    settlement.flush()
+    assert _callback_row(callback_id)['status'] == STATUS_ORPHAN and documents == []
+    # The receipt is spent even though its payment row was not there yet
+    assert till_ledger.till_ledger.lookup('TJD4ABC33C')['used_by_reference'] == 'stk:ws_CO_3'
+
+    payment_id = _payment('ws_CO_3')
+    assert settlement.record_callback(_callback('ws_CO_3', receipt='TJD4ABC33C')) == callback_id
+    assert _callback_row(callback_id)['status'] == STATUS_PENDING
+    settlement.flush()
+    assert _callback_row(callback_id)['status'] == STATUS_SETTLED and documents[0][0] == payment_id
+
+
+def test_a_claimed_batch_belongs_to_one_worker_until_its_lease_expires(settlement):
+    _payment('ws_CO_4')
+    callback_id = settlement.record_callback(_callback('ws_CO_4'))
+    first, second = mysql.connector.connect(), mysql.connector.connect()
+    try:
+        claimed = settlement._claim_batch(first)
+        assert [row['id'] for row in claimed] == [callback_id] and claimed[0]['attempts'] == 1
+        assert MpesaSettlementService()._claim_batch(second) == []
+        token = _callback_row(callback_id)['claim_token']
+        assert _callback_row(callback_id)['status'] == STATUS_PROCESSING and token
+
+        # The first worker died: after the lease another worker reclaims it
+        _execute("UPDATE mpesa_callbacks SET claimed_at = NOW() - INTERVAL 10 MINUTE WHERE id = %s", (callback_id,))
+        reclaimed = MpesaSettlementService()._claim_batch(second)
+        assert reclaimed[0]['attempts'] == 2 and _callback_row(callback_id)['claim_token'] != token
+    finally:
+        first.close()
+        second.close()
+
+
+def test_replay_never_generates_a_second_document(settlement, documents):
+    _payment('ws_CO_5')
+    callback_id = settlement.record_callback(_callback('ws_CO_5'))
+    settlement.flush()
+    assert settlement.replay([callback_id]) == 1
+    assert _callback_row(callback_id)['status'] == STATUS_PENDING
+    assert settlement.flush() == 1
+    assert _callback_row(callback_id)['status'] == STATUS_DUPLICATE and len(documents) == 1
+    assert settlement.replay(status=STATUS_DUPLICATE) == 1
+    with pytest.raises(ValueError):
+        settlement.replay()
+
+
+def test_a_failed_callback_fails_the_payment_without_a_document(settlement, documents):
+    payment_id = _payment('ws_CO_6')
+    settlement.record_callback(_callback('ws_CO_6', result_code=1032))
+    settlement.flush()
+    payment = _execute("SELECT status FROM payments WHERE payment_id = %s", (payment_id,))[0]
+    assert payment['status'] == 'failed' and documents == []
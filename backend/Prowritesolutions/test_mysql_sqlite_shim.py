@@ -0,0 +1,147 @@
+"""
+Tests for the MySQL-on-SQLite shim used by the load-test harness.
+
+    python -m pytest test_mysql_sqlite_shim.py -q
+"""
+
+from datetime import datetime, timedelta
+
+import mysql.connector
+import pytest
+
+import mysql_sqlite_shim
+from mysql_sqlite_shim import translate
+
+TABLE = """
+    CREATE TABLE IF NOT EXISTS ledger (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        code VARCHAR(32) NOT NULL,
+        amount DECIMAL(10, 2),
+        status ENUM('new', 'claimed') DEFAULT 'new',
+        claimed_by VARCHAR(50) NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        UNIQUE KEY uniq_code (code),
+        INDEX idx_status (status, id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+@pytest.fixture
+def shim(tmp_path):
+    connection = mysql_sqlite_shim.connect(str(tmp_path / 'shim.db'), database='prowrite')
+    cursor = connection.cursor()
+    cursor.execute(TABLE)
+    connection.commit()
+    return connection, cursor
+
+
+def test_create_table_translation():
+    statements = translate(TABLE)
+    assert 'INTEGER PRIMARY KEY AUTOINCREMENT' in statements[0]
+    assert 'ENGINE' not in statements[0] and 'ENUM' not in statements[0]
+    assert 'UNIQUE (code)' in statements[0]
+    assert statements[1] == 'CREATE INDEX IF NOT EXISTS ledger_idx_status ON ledger (status, id)'
+
+
+def test_placeholders_skip_string_literals():
+    assert translate("SELECT * FROM t WHERE a = %s AND b LIKE '%s%%'") == \
+        ["SELECT * FROM t WHERE a = ? AND b LIKE '%s%%'"]
+
+
+def test_insert_select_and_dictionary_cursor(shim):
+    connection, cursor = shim
+    cursor.execute("INSERT INTO ledger (code, amount) VALUES (%s, %s)", ('TJ1', 500))
+    assert cursor.lastrowid == 1 and cursor.rowcount == 1
+    connection.commit()
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute("SELECT id, code, status, created_at FROM ledger WHERE code = %s", ('TJ1',))
+    row = cursor.fetchone()
+    assert row['code'] == 'TJ1' and row['status'] == 'new'
+    assert isinstance(row['created_at'], datetime)
+    assert cursor.fetchone() is None
+
+
+def test_duplicate_key_raises_mysql_integrity_error(shim):
+    connection, cursor = shim
+    cursor.execute("INSERT INTO ledger (code) VALUES (%s)", ('TJ1',))
+    try:
+        cursor.execute("INSERT INTO ledger (code) VALUES (%s)", ('TJ1',))
+        raise AssertionError("expected a duplicate key error")
+    except mysql.connector.IntegrityError as e:
+        assert e.errno == mysql_sqlite_shim.ER_DUP_ENTRY
+    cursor.execute("INSERT IGNORE INTO ledger (code) VALUES (%s)", ('TJ1',))
+    assert cursor.rowcount == 0
+
+
+def test_upsert_with_last_insert_id(shim):
+    connection, cursor = shim
+    upsert = """
+        INSERT INTO ledger (code, amount) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), amount = VALUES(amount)
+    """
+    cursor.execute(upsert, ('TJ1', 100))
+    first = cursor.lastrowid
+    cursor.execute("INSERT INTO ledger (code) VALUES (%s)", ('TJ2',))
+    cursor.execute(upsert, ('TJ1', 250))
+    assert cursor.lastrowid == first
+    cursor.execute("SELECT amount FROM ledger WHERE code = 'TJ1'")
+    assert cursor.fetchone()[0] == 250
+
+
+def test_intervals_and_timestampdiff(shim):
+    connection, cursor = shim
+    old = datetime.now() - timedelta(minutes=30)
+    cursor.execute("INSERT INTO ledger (code, created_at) VALUES (%s, %s)", ('OLD', old))
+    cursor.execute("INSERT INTO ledger (code) VALUES (%s)", ('NEW',))
+    cursor.execute("SELECT code FROM ledger WHERE created_at < NOW() - INTERVAL %s MINUTE", (10,))
+    assert cursor.fetchall() == [('OLD',)]
+    cursor.execute("SELECT TIMESTAMPDIFF(MINUTE, created_at, NOW()) FROM ledger WHERE code = 'OLD'")
+    assert cursor.fetchone()[0] in (29, 30)
+    cursor.execute("SELECT IF(amount IS NULL, 'none', 'some') FROM ledger WHERE code = 'NEW'")
+    assert cursor.fetchone()[0] == 'none'
+
+
+def test_update_with_order_by_and_limit(shim):
+    connection, cursor = shim
+    cursor.executemany("INSERT INTO ledger (code) VALUES (%s)", [('A',), ('B',), ('C',)])
+    cursor.execute("""
+        UPDATE ledger SET status = 'claimed', claimed_by = %s
+        WHERE status = 'new' ORDER BY id LIMIT %s
+    """, ('worker-1', 2))
+    assert cursor.rowcount == 2
+    cursor.execute("SELECT code FROM ledger WHERE claimed_by = %s ORDER BY id", ('worker-1',))
+    assert cursor.fetchall() == [('A',), ('B',)]
+
+
+def test_information_schema_and_alter_table(shim):
+    connection, cursor = shim
+    cursor.execute("ALTER TABLE ledger ADD COLUMN user_id INT NULL AFTER code, ADD INDEX idx_user (user_id)")
+    cursor.execute("""
+        SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, ('ledger',))
+    columns = dict(cursor.fetchall())
+    assert columns['user_id'] == 'int' and columns['amount'] == 'decimal'
+    cursor.execute("""
+        SELECT DISTINCT INDEX_NAME FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'ledger'
+    """, ('prowrite',))
+    indexes = {row[0] for row in cursor.fetchall()}
+    assert {'idx_status', 'idx_user'} <= indexes
+
+
+def test_install_routes_mysql_connect(tmp_path):
+    original = mysql.connector.connect
+    path = str(tmp_path / 'shim.db')
+    try:
+        mysql_sqlite_shim.install(path)
+        connection = mysql.connector.connect(host='db.example.com', user='prowrite', password='x', database='prowrite')
+        assert isinstance(connection, mysql_sqlite_shim.ShimConnection)
+        cursor = connection.cursor()
+        cursor.execute("SELECT GET_LOCK('stk_reconciler', 0), DATABASE()")
+        assert cursor.fetchone() == (1, 'prowrite')
+        cursor.execute("SELECT RELEASE_LOCK('stk_reconciler')")
+        connection.close()
+    finally:
+        mysql.connector.connect = original
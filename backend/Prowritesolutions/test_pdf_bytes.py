@@ -0,0 +1,59 @@
+"""
+Tests for rendering resumes and cover letters into memory and streaming them
+from the download routes without touching the disk:
+
+    python -m pytest test_pdf_bytes.py -q
+"""
+
+import tempfile
+
+import pytest
+from flask import Flask
+
+from cover_letter_pdf_generator import CoverLetterPDFGenerator, ProfessionalCoverLetterPDFGenerator
+from fast_manual_payment_service import PaymentSubmission, manual_payment_service
+from francisca_pdf_generator import ProfessionalFranciscaPDFGenerator
+from francisca_pdf_generator_robust import RobustFranciscaPDFGenerator
+from manual_payment_routes import manual_payment_bp
+from professional_cover_letter_generator import ProfessionalCoverLetterGenerator
+from template_preview_service import SAMPLE_COVER_LETTER_DATA, SAMPLE_RESUME_DATA
+
+
+@pytest.fixture
+def empty_dirs(tmp_path, monkeypatch):
+    """Run from an empty working directory with an empty temp dir; both must stay empty"""
+    cwd, tmp = tmp_path / 'cwd', tmp_path / 'tmp'
+    cwd.mkdir()
+    tmp.mkdir()
+    monkeypatch.chdir(cwd)
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp))
+    yield cwd, tmp
+    assert list(cwd.iterdir()) == [] and list(tmp.iterdir()) == []
+
+
+@pytest.mark.parametrize('generator', [ProfessionalFranciscaPDFGenerator, RobustFranciscaPDFGenerator])
+def test_resume_pdf_bytes_are_a_pdf_rendered_in_memory(generator, empty_dirs):
+    pdf = generator().generate_resume_pdf_bytes(dict(SAMPLE_RESUME_DATA))
+    assert pdf.startswith(b'%PDF') and pdf.rstrip().endswith(b'%%EOF')
+
+
+@pytest.mark.parametrize('generator', [ProfessionalCoverLetterPDFGenerator, CoverLetterPDFGenerator,
+                                       ProfessionalCoverLetterGenerator])
+def test_cover_letter_pdf_bytes_are_a_pdf_rendered_in_memory(generator, empty_dirs):
+    pdf = generator().generate_cover_letter_pdf_bytes(dict(SAMPLE_COVER_LETTER_DATA))
+    assert pdf.startswith(b'%PDF') and pdf.rstrip().endswith(b'%%EOF')
+
+
+def test_manual_payment_download_streams_the_rendered_buffer(empty_dirs, monkeypatch):
+    submission = PaymentSubmission(id=1, reference='PW-BYTES-1', form_data=dict(SAMPLE_RESUME_DATA),
+                                   document_type='Francisca Resume', amount=500, user_email='jane@example.com',
+                                   phone_number=None, status='completed', payment_method='manual',
+                                   transaction_code='TJD4BYTES1', validation_method='ledger')
+    monkeypatch.setitem(manual_payment_service.submissions, submission.reference, submission)
+    app = Flask(__name__)
+    app.register_blueprint(manual_payment_bp)
+
+    response = app.test_client().get('/api/payments/manual/download/PW-BYTES-1')
+    assert response.status_code == 200 and response.mimetype == 'application/pdf'
+    assert 'resume_PW-BYTES-1.pdf' in response.headers['Content-Disposition']
+    assert response.data.startswith(b'%PDF')
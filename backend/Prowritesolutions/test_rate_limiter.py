@@ -0,0 +1,96 @@
+"""
+Tests for the token-bucket rate limiter against a minimal Flask app.
+
+    python -m pytest test_rate_limiter.py -q
+"""
+
+import inspect
+import os
+
+import pytest
+from flask import Flask, jsonify, request
+
+from rate_limiter import RateLimiter, RateLimitPolicy, POLICIES, rate_limit
+
+POLICY = RateLimitPolicy('test', capacity=3, period=30, key='ip')
+
+
+@pytest.fixture
+def limiter(tmp_path, clock):
+    return RateLimiter(db_path=str(tmp_path / 'rate_limits.db'), enabled=True, clock=clock)
+
+
+def test_bucket_allows_a_burst_then_refills_over_time(limiter, clock):
+    assert [limiter.consume(POLICY, 'ip:1')[0] for _ in range(4)] == [True, True, True, False]
+    allowed, remaining, retry_after = limiter.consume(POLICY, 'ip:1')
+    assert not allowed and retry_after == 10.0
+    clock.now += 10
+    assert limiter.consume(POLICY, 'ip:1')[0]
+    assert not limiter.consume(POLICY, 'ip:1')[0]
+    assert limiter.consume(POLICY, 'ip:2')[0]
+
+
+def test_buckets_are_shared_between_workers(limiter, clock):
+    first = limiter
+    second = RateLimiter(db_path=first.db_path, enabled=True, clock=clock)
+    assert first.consume(POLICY, 'user:7')[0] and second.consume(POLICY, 'user:7')[0]
+    assert first.consume(POLICY, 'user:7')[0]
+    assert not second.consume(POLICY, 'user:7')[0]
+
+
+def test_idle_buckets_expire_from_storage(limiter, clock):
+    for client in range(50):
+        limiter.consume(POLICY, f'ip:{client}')
+    assert limiter.bucket_count() == 50
+    clock.now += POLICY.period + 60
+    limiter.consume(POLICY, 'ip:new')
+    assert limiter.bucket_count() == 1
+
+
+def test_decorator_answers_429_with_retry_after_per_client(limiter, monkeypatch):
+    monkeypatch.setitem(POLICIES, 'test', POLICY)
+    app = Flask(__name__)
+
+    @app.route('/api/francisca/ai/enhance-field', methods=['POST', 'OPTIONS'])
+    @rate_limit('test', limiter=limiter)
+    def enhance_field():
+        return jsonify({'success': True, 'client': request.remote_addr})
+
+    client = app.test_client()
+    statuses = [client.post('/api/francisca/ai/enhance-field').status_code for _ in range(3)]
+    limited = client.post('/api/francisca/ai/enhance-field')
+    assert statuses == [200, 200, 200] and limited.status_code == 429
+    assert limited.headers['Retry-After'] == '10'
+    assert limited.get_json() == {'success': False, 'error': 'Too many requests. Please try again later.',
+                                  'retry_after': 10}
+    assert client.options('/api/francisca/ai/enhance-field').status_code == 200
+    other = client.post('/api/francisca/ai/enhance-field', environ_base={'REMOTE_ADDR': '10.0.0.9'})
+    assert other.status_code == 200
+
+
+def test_disabled_limiter_allows_everything(tmp_path):
+    limiter = RateLimiter(db_path=str(tmp_path / 'rate_limits.db'), enabled=False)
+    assert all(limiter.consume(POLICY, 'ip:1')[0] for _ in range(10))
+    assert not os.path.exists(limiter.db_path)
+
+
+def _policies(view):
+    """Names of the rate_limit policies wrapped around a view function"""
+    names = []
+    while view is not None:
+        policy = inspect.getclosurevars(view).nonlocals.get('policy')
+        if isinstance(policy, RateLimitPolicy):
+            names.append(policy.name)
+        view = getattr(view, '__wrapped__', None)
+    return names
+
+
+def test_login_and_stk_push_routes_the_app_dispatches_to_are_limited():
+    from app import app
+
+    adapter = app.url_map.bind('localhost')
+    for path, policy in (('/api/auth/login', 'auth'), ('/api/admin/login', 'auth'),
+                         ('/api/payments/mpesa/initiate', 'payment'), ('/api/forms/submit-with-payment', 'payment'),
+                         ('/api/payments/manual/initiate', 'payment')):
+        endpoint, _ = adapter.match(path, method='POST')
+        assert _policies(app.view_functions[endpoint]) == [policy], path
@@ -0,0 +1,97 @@
+"""
+Tests for the opt-in request profiler against a minimal Flask app.
+
+    python -m pytest test_request_profiler.py -q
+"""
+
+import json
+import time
+
+import pytest
+from flask import Flask
+
+from request_profiler import RequestProfiler, parse_collapsed, to_collapsed, to_speedscope, hottest_frames
+
+
+def slow_helper():
+    time.sleep(0.06)
+    return 'done'
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    def make(**kwargs):
+        options = dict(db_path=str(tmp_path / 'profiles.db'), interval_ms=2, enabled=True)
+        options.update(kwargs)
+        profiler = RequestProfiler(**options)
+        app = Flask(__name__)
+
+        @app.route('/slow/<int:item>')
+        def slow(item):
+            return slow_helper()
+
+        profiler.init_app(app)
+        return app.test_client(), profiler
+    return make
+
+
+def test_sampled_request_is_stored_with_route_and_stacks(make_app):
+    client, profiler = make_app(sample_rate=1.0)
+    response = client.get('/slow/1')
+    assert response.status_code == 200
+    profile_id = int(response.headers['X-Profile-Id'])
+
+    listed = profiler.list_profiles()
+    assert [p['id'] for p in listed] == [profile_id]
+    assert listed[0]['route'] == '/slow/<int:item>' and listed[0]['status'] == 200
+    assert listed[0]['triggered_by'] == 'sample' and listed[0]['duration_ms'] >= 60
+
+    stacks = parse_collapsed(profiler.get_profile(profile_id)['collapsed'])
+    assert any(stack[-1].startswith('slow_helper') for stack in stacks)
+    assert hottest_frames(stacks)[0]['frame'].startswith('slow_helper')
+
+
+def test_not_profiled_without_trigger_or_when_disabled(make_app):
+    client, profiler = make_app(sample_rate=0.0)
+    assert 'X-Profile-Id' not in client.get('/slow/1', headers={'X-Profile': '1'}).headers
+    client, profiler = make_app(sample_rate=1.0, enabled=False)
+    assert 'X-Profile-Id' not in client.get('/slow/1').headers
+    assert profiler.list_profiles() == []
+
+
+def test_header_trigger_requires_admin(make_app):
+    client, profiler = make_app(sample_rate=0.0)
+    profiler._admin_user_id = lambda: 7
+    response = client.get('/slow/2', headers={'X-Profile': '1'})
+    profile = profiler.get_profile(int(response.headers['X-Profile-Id']))
+    assert profile['triggered_by'] == 'header' and profile['user_id'] == 7
+
+
+def test_fast_sampled_requests_below_min_duration_are_dropped(make_app):
+    client, profiler = make_app(sample_rate=1.0, min_duration_ms=500)
+    assert 'X-Profile-Id' not in client.get('/slow/1').headers
+
+
+def test_only_the_newest_profiles_are_kept(make_app):
+    client, profiler = make_app(sample_rate=1.0, keep=2)
+    ids = [int(client.get(f'/slow/{i}').headers['X-Profile-Id']) for i in range(3)]
+    assert [p['id'] for p in profiler.list_profiles()] == ids[:0:-1]
+    assert profiler.get_profile(ids[0]) is None
+
+
+def test_collapsed_and_speedscope_exports(make_app):
+    stacks = {('main (app.py:1)', 'view (routes.py:10)'): 3, ('main (app.py:1)',): 1}
+    assert parse_collapsed(to_collapsed(stacks)) == stacks
+    document = to_speedscope(stacks, 'GET /x', interval_ms=5)
+    profile = document['profiles'][0]
+    names = [frame['name'] for frame in document['shared']['frames']]
+    assert profile['type'] == 'sampled' and profile['endValue'] == 20
+    assert [[names[i] for i in sample] for sample in profile['samples']] == [list(s) for s in sorted(stacks)]
+
+    client, profiler = make_app(sample_rate=1.0)
+    profile = profiler.get_profile(int(client.get('/slow/1').headers['X-Profile-Id']))
+    body, mimetype, filename = profiler.export(profile, 'speedscope')
+    assert mimetype == 'application/json' and filename.endswith('.speedscope.json')
+    assert json.loads(body)['profiles'][0]['samples']
+    body, mimetype, filename = profiler.export(profile, 'collapsed')
+    assert mimetype == 'text/plain' and 'slow_helper' in body
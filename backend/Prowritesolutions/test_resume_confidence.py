@@ -0,0 +1,108 @@
+"""
+Tests for the confidence-scored local resume parse and the AI escalation
+policy.
+
+    python -m pytest test_resume_confidence.py -q
+"""
+
+import json
+
+from docx import Document
+
+from benchmark_suite import build_resume, resume_text
+from resume_confidence import (
+    build_prompt, estimate_tokens, merge_reply, pick_best, plan_escalation, split_sections,
+)
+from resume_parser_service import ResumeParserService
+
+# Clean header, summary, education and skills; experience written as prose
+MESSY_RESUME = """JOHN MWANGI
+Backend Developer | john.mwangi@example.com | +254 712 345 678
+Mombasa, Kenya
+
+Profile
+Backend developer building payment APIs for East African fintechs.
+
+Experience
+Spent three years at Safaricom on M-Pesa integrations, then joined Twiga Foods
+as lead engineer running the logistics platform team since early 2021.
+
+Education
+Bachelor of Science in Computer Science
+Jomo Kenyatta University
+2016
+
+Skills
+Python, Django, PostgreSQL, Kubernetes, Terraform
+"""
+
+
+def test_a_well_structured_resume_needs_no_ai():
+    text = resume_text(build_resume(5))
+    parsed, confidence, dropped = ResumeParserService().parse_with_confidence(text)
+    assert set(confidence.values()) == {1.0} and dropped == []
+    assert plan_escalation(confidence, split_sections(text)) == []
+    assert [job['company'] for job in parsed['workExperience']][:2] == ['Acme Logistics', 'Swift Couriers']
+    assert parsed['workExperience'][0]['startDate'] == '2022-01' and len(parsed['workExperience']) == 5
+    assert parsed['personalInfo']['city'] == 'Nairobi' and parsed['personalInfo']['phone'] == '+254712345678'
+    assert parsed['education'][0]['field'] == 'Supply Chain Management'
+    assert 'Fleet management' in parsed['skills']
+
+
+def test_only_the_ambiguous_section_is_escalated():
+    parser = ResumeParserService()
+    parsed, confidence, _ = parser.parse_with_confidence(MESSY_RESUME)
+    sections = split_sections(MESSY_RESUME)
+    names = plan_escalation(confidence, sections)
+    assert names == ['workExperience']
+    assert confidence['education'] == 1.0 and confidence['skills'] == 1.0
+    prompt = build_prompt(names, sections)
+    assert 'Twiga Foods' in prompt and 'Jomo Kenyatta' not in prompt and 'Kubernetes' not in prompt
+    assert estimate_tokens(prompt) * 5 < estimate_tokens(parser._full_enhancement_prompt(parsed, MESSY_RESUME))
+
+
+def test_entries_without_a_heading_are_dropped():
+    # "leadership" in a bullet used to turn into a leadership entry
+    text = resume_text(build_resume(1)).replace('Managed a team', 'Showed leadership managing a team')
+    parser = ResumeParserService()
+    assert parser._simple_reliable_extraction(text)['leadership']
+    parsed, confidence, _ = parser.parse_with_confidence(text)
+    assert parsed['leadership'] == [] and confidence['leadership'] == 1.0
+    # Even when no other candidate has the section
+    parsed, confidence, dropped = pick_best([parser._simple_reliable_extraction(text)], split_sections(text), text)
+    assert parsed['leadership'] == [] and dropped == ['leadership']
+
+
+def test_reply_is_merged_per_section_and_bad_values_keep_the_local_parse():
+    parsed, _, _ = ResumeParserService().parse_with_confidence(MESSY_RESUME)
+    local_skills = list(parsed['skills'])
+    reply = '```json\n' + json.dumps({
+        'workExperience': [
+            {'jobTitle': 'Software Engineer', 'company': 'Safaricom', 'startDate': '2018', 'endDate': '2021'},
+            {'jobTitle': 'Lead Engineer', 'company': 'Twiga Foods', 'startDate': '2021', 'current': True},
+        ],
+        'personalInfo': {'linkedin': 'linkedin.com/in/jmwangi', 'city': ''},
+        'skills': 'Python',
+    }) + '\n```'
+    merged = merge_reply(parsed, reply, ['workExperience', 'personalInfo', 'skills'])
+    assert merged == ['workExperience', 'personalInfo']
+    assert [job['company'] for job in parsed['workExperience']] == ['Safaricom', 'Twiga Foods']
+    assert parsed['personalInfo']['linkedin'] == 'linkedin.com/in/jmwangi'
+    assert parsed['personalInfo']['city'] == 'Mombasa'
+    assert parsed['skills'] == local_skills
+
+
+def test_docx_import_reports_confidence_without_an_api_key(tmp_path):
+    path = str(tmp_path / 'resume.docx')
+    document = Document()
+    for line in MESSY_RESUME.split('\n'):
+        document.add_paragraph(line)
+    document.save(path)
+    parser = ResumeParserService()
+    parser.openai_api_key = None
+    result = parser.parse_resume_file(path, 'docx')
+    assert result['success'] and result['escalation'] is None
+    assert result['confidence']['workExperience'] < 0.6
+    assert result['parsed_data']['personalInfo']['firstName'] == 'JOHN'
+    assert parser.map_to_francisca_format(result['parsed_data'])['education'][0]['institution'] == \
+        'Jomo Kenyatta University'
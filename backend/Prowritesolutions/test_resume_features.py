@@ -0,0 +1,131 @@
+"""
+Tests for the per-version resume feature store shared by the ATS, analytics
+and insight engines.
+
+    python -m pytest test_resume_features.py -q
+"""
+
+import threading
+import uuid
+
+import pytest
+
+from advanced_insights_engine import AdvancedInsightsEngine
+from ats_analysis_service import ATSAnalysisService
+from ats_routes import analyze_content_quality, analyze_keywords, analyze_optimization
+from resume_analytics_engine import ResumeAnalyticsEngine
+from resume_features import VOCABULARY, ResumeFeatureStore, extract_features, found, resume_feature_store
+from smart_optimization_engine import SmartOptimizationEngine
+
+RESUME = """WANJIKU KAMAU
+wanjiku@example.com (254) 700-1234
+
+SUMMARY
+Backend engineer with agile and scrum delivery experience.
+
+EXPERIENCE
+• Led a team of 5 engineers and increased throughput by 30%
+• Developed Python APIs on AWS with Docker, saving $20,000 a year
+• Responsible for software development and cloud computing
+
+EDUCATION
+Bachelor degree, University of Nairobi
+
+SKILLS
+Python, SQL, React, git
+"""
+
+
+@pytest.fixture(autouse=True)
+def shared_store(tmp_path, monkeypatch):
+    """Point the store the services import at a throwaway database instead of data/resume_features.db"""
+    monkeypatch.setattr(resume_feature_store, 'db_path', str(tmp_path / 'resume_features.db'))
+    monkeypatch.setattr(resume_feature_store, '_initialized', False)
+    monkeypatch.setattr(resume_feature_store, '_local', threading.local())
+    return resume_feature_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResumeFeatureStore(db_path=str(tmp_path / 'resume.db'))
+
+
+def test_features_of_a_resume():
+    features = extract_features(RESUME)
+    assert features['word_count'] == len(RESUME.split()) and features['bullet_lines'] == 3
+    assert features['section_headers'] == ['WANJIKU KAMAU', 'SUMMARY', 'EXPERIENCE', 'EDUCATION', 'SKILLS']
+    assert features['metrics'] == ['30%', '$20,000']
+    assert features['has_email'] and features['has_phone'] and features['has_numbers']
+    assert found(features, ['docker', 'kubernetes', 'python', 'led']) == ['docker', 'python', 'led']
+    assert features['terms']['python'] == 2
+    assert extract_features('')['terms'] == {} and extract_features('')['readability'] == 50
+
+
+def test_engine_term_lists_are_tracked_by_the_vocabulary():
+    vocabulary = set(VOCABULARY)
+    ats = ATSAnalysisService()
+    lists = list(ats.industry_keywords.values())
+    smart = SmartOptimizationEngine()
+    lists += [smart.optimization_patterns['strong_phrases'], smart.optimization_patterns['weak_phrases']]
+    lists += [rules['keywords'] for rules in smart.industry_rules.values()]
+    for terms in lists:
+        assert {term.lower() for term in terms} <= vocabulary, terms
+
+
+def test_one_version_is_computed_once_and_shared_across_workers(store):
+    first = store.features(RESUME)
+    first['metrics'].append('Mutated by a caller')
+    assert store.features(RESUME) == extract_features(RESUME)
+    assert store.stats == {'memory_hits': 1, 'shared_hits': 0, 'computed': 1}
+    # An edit is a new version, even one that only changes whitespace
+    store.features(RESUME + ' ')
+    assert store.stats['computed'] == 2
+    other = ResumeFeatureStore(db_path=store.db_path)
+    assert other.features(RESUME)['word_count'] == first['word_count']
+    assert other.stats == {'memory_hits': 0, 'shared_hits': 1, 'computed': 0}
+    assert store.features('   ')['word_count'] == 0 and store.stats['computed'] == 2
+
+
+def test_ats_scoring_reads_the_features():
+    features = extract_features(RESUME)
+    keywords = analyze_keywords(features, 'software_engineer', 'Backend Engineer')
+    assert keywords['found_keywords'] == ['python', 'react', 'sql', 'aws', 'docker', 'git', 'agile', 'scrum',
+                                          'api', 'backend']
+    quality = analyze_content_quality(features)
+    assert set(quality['action_verbs']) == {'developed', 'led', 'increased'} and quality['has_quantifiable_results']
+    assert analyze_optimization(extract_features('Cooking and gardening.'), 'software_engineer')['seo_score'] == 0
+
+    service = ATSAnalysisService()
+    score, details = service._perform_check(features, 'contact_information', None, None)
+    assert score == 1 and details == 'Contact info: Complete'
+    score, _ = service._perform_check(features, 'no_images_or_graphics', None, None)
+    assert score == 1
+
+
+def test_analytics_and_optimization_read_the_features():
+    features = extract_features(RESUME)
+    analytics = ResumeAnalyticsEngine()
+    keyword_metrics = analytics._analyze_keyword_metrics(features, 'technology')
+    assert keyword_metrics['action_verb_count'] == 3 and keyword_metrics['industry_keyword_count'] == 4
+    assert analytics._analyze_impact_metrics(features)['quantifiable_results'] == len(features['metrics'])
+
+    smart = SmartOptimizationEngine()
+    check = smart._perform_optimization_check(features, 'relevant_keywords', industry='technology')
+    assert check['details'] == 'Found 4/6 industry keywords'
+    check = smart._perform_optimization_check(features, 'quantifiable_results')
+    assert check['details'] == f"Found {len(features['metrics'])} quantifiable results"
+
+
+def test_insight_engines_share_one_computation():
+    resume = f"{RESUME}\nReference {uuid.uuid4().hex}"
+    computed = resume_feature_store.stats['computed']
+    insights = AdvancedInsightsEngine()
+    insights.openai_api_key = 'offline'      # take the feature path; no request is made
+    analysis = insights.generate_strategic_insights(resume, 'software_engineer', 6, 'technology')['strategic_analysis']
+    assert analysis['career_strategy']['skill_gaps'] == ['programming', 'devops']
+    assert analysis['career_strategy']['market_positioning'] == 'Covers 4 of 6 technology keywords'
+    assert analysis['personal_branding']['unique_value_proposition'] == 'python, react, sql'
+    analytics = ResumeAnalyticsEngine()
+    analytics.openai_api_key = 'offline'
+    assert analytics.generate_comprehensive_analytics(resume, 'software_engineer', 'technology')['success']
+    assert resume_feature_store.stats['computed'] == computed + 1
@@ -0,0 +1,114 @@
+"""
+Tests for batched step enhancement in the guided question flow, with a
+recording stand-in for the OpenAI call.
+
+    python -m pytest test_step_enhancer.py -q
+"""
+
+import json
+import threading
+
+from francisca_enhanced_ai import FranciscaEnhancedAI
+from francisca_question_engine import FranciscaQuestionEngine
+from step_enhancer import DONE, StepEnhancer
+
+PROFESSION_STEP = {'profession': 'Data Scientist', 'experienceLevel': 'Senior Level', 'targetRole': 'ml lead'}
+
+
+class RecordingAI:
+    """enhance_answers stand-in: upper-cases answers, optionally held until released"""
+
+    def __init__(self, hold=False):
+        self.calls = []
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def enhance_answers(self, answers, context=None):
+        self.calls.append(dict(answers))
+        self.release.wait(5)
+        return {field: {'enhanced': answer.upper(), 'quality_score': 80} for field, answer in answers.items()}
+
+
+class ScriptedChatAI(FranciscaEnhancedAI):
+    """The real multi-field prompt and parsing, with a scripted model reply"""
+
+    def __init__(self, reply):
+        super().__init__()
+        self.reply = reply
+        self.prompts = []
+
+    def _should_use_fallback(self):
+        return False
+
+    def _chat(self, messages, max_tokens):
+        self.prompts.append(messages[-1]['content'])
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply
+
+
+def _answer_all(enhancer, engine, answers, user_id=1):
+    states = []
+    for field, answer in answers.items():
+        engine.submit_answer(field, answer)
+        states.append(enhancer.add_answer(user_id, field, answer, {'profession': 'Data Scientist'}))
+    return states
+
+
+def test_a_step_is_enhanced_with_one_request_once_complete():
+    ai, engine = RecordingAI(), FranciscaQuestionEngine()
+    enhancer = StepEnhancer(ai=ai, engine=engine)
+    states = _answer_all(enhancer, engine, PROFESSION_STEP)
+    assert [s['status'] for s in states[:-1]] == ['collecting', 'collecting']
+    summary = enhancer.summary(1, 'profession', wait=5)
+    assert summary['status'] == DONE and summary['requests'] == 1
+    assert ai.calls == [PROFESSION_STEP]
+    assert summary['results']['targetRole']['enhanced'] == 'ML LEAD'
+    assert engine.get_step_summary('profession')['responses']['targetRole'] == 'ML LEAD'
+
+
+def test_moving_to_another_step_enhances_the_partial_step():
+    ai, engine = RecordingAI(), FranciscaQuestionEngine()
+    enhancer = StepEnhancer(ai=ai, engine=engine)
+    _answer_all(enhancer, engine, {'firstName': 'ada', 'email': 'ada@example.com'})
+    assert ai.calls == []
+    _answer_all(enhancer, engine, {'profession': 'Data Scientist'})
+    assert enhancer.summary(1, 'personal_info', wait=5)['status'] == DONE
+    assert ai.calls == [{'firstName': 'ada', 'email': 'ada@example.com'}]
+    assert enhancer.summary(1, 'profession')['status'] == 'collecting'
+    assert enhancer.summary(2, 'profession') is None
+
+
+def test_reanswering_during_a_request_requeues_only_that_field():
+    ai, engine = RecordingAI(hold=True), FranciscaQuestionEngine()
+    enhancer = StepEnhancer(ai=ai, engine=engine)
+    _answer_all(enhancer, engine, PROFESSION_STEP)
+    _answer_all(enhancer, engine, {'targetRole': 'head of data'})
+    ai.release.set()
+    summary = enhancer.summary(1, 'profession', wait=5)
+    assert summary['status'] == DONE and summary['requests'] == 2
+    assert ai.calls[1] == {'targetRole': 'head of data'}
+    assert engine.get_step_summary('profession')['responses']['targetRole'] == 'HEAD OF DATA'
+
+
+def test_enhance_answers_makes_one_structured_request():
+    reply = '```json\n' + json.dumps({'targetRole': 'Senior Machine Learning Lead',
+                                      'profession': 'Data Scientist'}) + '\n```'
+    ai = ScriptedChatAI(reply)
+    results = ai.enhance_answers({'targetRole': 'ml lead', 'profession': 'data scientist',
+                                  'experienceLevel': 'Senior Level', 'linkedin': ''},
+                                 {'profession': 'Data Scientist'})
+    assert len(ai.prompts) == 1 and 'targetRole' in ai.prompts[0] and 'linkedin' not in ai.prompts[0]
+    assert results['targetRole']['enhanced'] == 'Senior Machine Learning Lead'
+    assert results['targetRole']['quality_score'] == 85
+    # Left out by the model: per-field fallback, no extra round-trip
+    assert results['experienceLevel']['quality_score'] == 75
+    assert results['linkedin']['improvements'] == ["Please provide an answer to enhance"]
+
+
+def test_enhance_answers_falls_back_when_the_reply_is_unusable():
+    for reply in ('Sure! Here are your answers.', RuntimeError('upstream down')):
+        ai = ScriptedChatAI(reply)
+        results = ai.enhance_answers({'summary': 'I analyse data'}, {'profession': 'Data Scientist'})
+        assert results['summary']['quality_score'] == 75 and results['summary']['enhanced']
@@ -0,0 +1,199 @@
+"""
+Tests for the server-side STK status reconciler, on the MySQL-on-SQLite shim
+with a scripted stand-in for Daraja's STK query:
+
+    python -m pytest test_stk_reconciler.py -q
+"""
+
+import json
+
+import mysql.connector
+import pytest
+
+import mpesa_routes
+import mpesa_settlement
+import mysql_sqlite_shim
+import stk_reconciler
+import till_ledger
+from load_test_harness import create_schema
+from mpesa_service import mpesa_service
+from mpesa_settlement import MpesaSettlementService, _extract_keys
+from stk_reconciler import BACKOFF_MAX, STATUS_CACHE_TTL, StkReconciler
+
+RATE_LIMITED = {'success': False, 'error': 'Rate limited. Please wait before checking again.', 'status': 'pending'}
+STILL_PROCESSING = {'success': False, 'error': 'STK query failed: 500', 'status': 'pending'}
+
+
+def _completed(checkout_id):
+    """A successful STK query answer; unlike the callback it carries no receipt"""
+    return {'success': True, 'status': 'completed', 'result_code': '0',
+            'result_description': 'The service request is processed successfully.',
+            'merchant_request_id': f"m-{checkout_id}", 'checkout_request_id': checkout_id,
+            'amount': None, 'mpesa_receipt_number': None, 'transaction_date': None}
+
+
+def _daraja_callback(checkout_id, receipt):
+    return {'Body': {'stkCallback': {
+        'MerchantRequestID': f"m-{checkout_id}", 'CheckoutRequestID': checkout_id, 'ResultCode': 0,
+        'ResultDesc': 'The service request is processed successfully.',
+        'CallbackMetadata': {'Item': [{'Name': 'Amount', 'Value': 500}, {'Name': 'MpesaReceiptNumber', 'Value': receipt},
+                                      {'Name': 'TransactionDate', 'Value': 20250113100000},
+                                      {'Name': 'PhoneNumber', 'Value': 254700000001}]}}}}
+
+
+def _execute(sql, params=()):
+    connection = mysql.connector.connect()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall() if cursor.description else cursor.rowcount
+        connection.commit()
+        return rows
+    finally:
+        connection.close()
+
+
+def _pending_payment(checkout_id, age_seconds=60):
+    _execute("""INSERT INTO payments (user_id, amount, payment_type, checkout_request_id, status, created_at)
+                VALUES (1, 500, 'Francisca Resume', %s, 'pending', NOW() - INTERVAL %s SECOND)""",
+             (checkout_id, age_seconds))
+
+
+class ScriptedDaraja:
+    """query_stk_status stand-in answering from a {checkout_id: result} script"""
+
+    def __init__(self):
+        self.script = {}
+        self.queried = []
+
+    def __call__(self, checkout_id):
+        self.queried.append(checkout_id)
+        return self.script.get(checkout_id, STILL_PROCESSING)
+
+
+@pytest.fixture
+def daraja(tmp_path, monkeypatch):
+    path = str(tmp_path / 'prowrite.db')
+    create_schema(path)
+    monkeypatch.setattr(mysql.connector, 'connect', lambda *args, **kwargs: mysql_sqlite_shim.connect(path, **kwargs))
+    monkeypatch.setattr(mpesa_settlement, 'mpesa_settlement', MpesaSettlementService())
+    monkeypatch.setattr(till_ledger, 'till_ledger', till_ledger.TillLedger())
+    monkeypatch.setattr(mpesa_routes, 'trigger_pdf_generation', lambda *args: None)
+    monkeypatch.setattr(stk_reconciler.time, 'sleep', lambda seconds: None)
+    scripted = ScriptedDaraja()
+    monkeypatch.setattr(mpesa_service, 'query_stk_status', scripted)
+    return scripted
+
+
+@pytest.fixture
+def reconciler(daraja):
+    return StkReconciler(interval=15, queries_per_minute=60)
+
+
+def test_backoff_doubles_per_attempt_up_to_the_cap():
+    backoff = StkReconciler()._backoff
+    assert [backoff(attempt) for attempt in range(1, 6)] == [15, 30, 60, 120, 240]
+    assert backoff(7) == BACKOFF_MAX and backoff(0) == 15
+
+
+def test_synthetic_callback_has_the_shape_of_a_daraja_callback():
+    checkout = {'checkout_request_id': 'ws_CO_1', 'merchant_request_id': 'm-1', 'amount': 500}
+    callback = StkReconciler()._synthetic_callback(checkout, _completed('ws_CO_1'))
+    assert callback['Source'] == 'stk_query'
+    assert _extract_keys(callback) == {'checkout_request_id': 'ws_CO_1', 'merchant_request_id': 'm-ws_CO_1',
+                                       'result_code': 0, 'mpesa_receipt': None}
+    parsed = mpesa_service.process_callback(callback)
+    assert parsed['status'] == 'completed' and parsed['amount'] == 500.0      # amount from the payment row
+
+    failed = StkReconciler()._synthetic_callback(checkout, {'success': True, 'result_code': '1032',
+                                                           'result_description': 'Request cancelled by user'})
+    stk_callback = failed['Body']['stkCallback']
+    assert stk_callback['ResultCode'] == 1032 and stk_callback['MerchantRequestID'] == 'm-1'
+    assert stk_callback['CallbackMetadata'] == {'Item': [{'Name': 'Amount', 'Value': 500.0}]}
+    assert mpesa_service.process_callback(failed)['status'] == 'failed'
+
+
+def test_final_results_settle_through_the_callback_inbox(reconciler, daraja):
+    _pending_payment('ws_CO_1')
+    _pending_payment('ws_CO_2')
+    _pending_payment('ws_CO_new', age_seconds=5)           # the real callback may still arrive
+    daraja.script['ws_CO_1'] = _completed('ws_CO_1')
+    summary = reconciler.reconcile_once()
+    assert summary == {'ran': True, 'queried': 2, 'settled': 1, 'pending': 1, 'errors': 0}
+    assert sorted(daraja.queried) == ['ws_CO_1', 'ws_CO_2']
+
+    mpesa_settlement.mpesa_settlement.flush()
+    statuses = {row['checkout_request_id']: row['status'] for row in _execute(
+        "SELECT checkout_request_id, status FROM payments")}
+    assert statuses == {'ws_CO_1': 'completed', 'ws_CO_2': 'pending', 'ws_CO_new': 'pending'}
+
+    # ws_CO_2 is not due again until its backoff has passed
+    assert reconciler.reconcile_once()['queried'] == 0
+    row = _execute("SELECT attempts, last_error FROM stk_reconciliation WHERE checkout_request_id = 'ws_CO_2'")[0]
+    assert row == {'attempts': 1, 'last_error': STILL_PROCESSING['error']}
+
+
+def test_a_pass_ends_when_daraja_rate_limits(reconciler, daraja):
+    for checkout_id in ('ws_CO_1', 'ws_CO_2', 'ws_CO_3'):
+        _pending_payment(checkout_id)
+    daraja.script = {'ws_CO_1': RATE_LIMITED, 'ws_CO_2': RATE_LIMITED, 'ws_CO_3': RATE_LIMITED}
+    summary = reconciler.reconcile_once()
+    assert summary['queried'] == 1 and summary['pending'] == 0 and len(daraja.queried) == 1
+    checked = _execute("SELECT checkout_request_id, next_check_at FROM stk_reconciliation")
+    assert [row['checkout_request_id'] for row in checked] == daraja.queried and checked[0]['next_check_at']
+
+
+def test_only_one_worker_runs_a_pass(reconciler, daraja):
+    _pending_payment('ws_CO_1')
+    holder = mysql.connector.connect()
+    cursor = holder.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, 0)", (stk_reconciler.LOCK_NAME,))
+    try:
+        assert reconciler.reconcile_once() == {'ran': False, 'queried': 0, 'settled': 0, 'pending': 0, 'errors': 0}
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (stk_reconciler.LOCK_NAME,))
+        holder.close()
+    assert daraja.queried == []
+
+
+def test_status_is_served_from_a_short_cache(reconciler, daraja, monkeypatch):
+    _pending_payment('ws_CO_1')
+    clock = [1000.0]
+    monkeypatch.setattr(stk_reconciler.time, 'time', lambda: clock[0])
+    assert reconciler.get_checkout_status('ws_CO_1')['status'] == 'pending'
+
+    _execute("UPDATE payments SET status = 'completed' WHERE checkout_request_id = 'ws_CO_1'")
+    assert reconciler.get_checkout_status('ws_CO_1')['status'] == 'pending'        # cached
+    clock[0] += STATUS_CACHE_TTL + 0.1
+    assert reconciler.get_checkout_status('ws_CO_1')['status'] == 'completed'
+
+    _execute("UPDATE payments SET status = 'failed' WHERE checkout_request_id = 'ws_CO_1'")
+    clock[0] += STATUS_CACHE_TTL + 0.1
+    assert reconciler.get_checkout_status('ws_CO_1')['status'] == 'completed'      # final: cached longer
+    reconciler.invalidate('ws_CO_1')
+    assert reconciler.get_checkout_status('ws_CO_1')['status'] == 'failed'
+    assert reconciler.get_checkout_status('ws_CO_unknown') is None
+
+
+def test_daraja_callback_after_a_query_settlement_backfills_the_receipt(reconciler, daraja):
+    _pending_payment('ws_CO_1')
+    daraja.script['ws_CO_1'] = _completed('ws_CO_1')
+    reconciler.reconcile_once()
+    settlement = mpesa_settlement.mpesa_settlement
+    settlement.flush()
+    assert _execute("SELECT status, mpesa_code FROM payments")[0] == {'status': 'completed', 'mpesa_code': ''}
+
+    callback_id = settlement.record_callback(_daraja_callback('ws_CO_1', 'TJD4STK001'))
+    row = _execute("SELECT status, mpesa_receipt, deliveries, payload FROM mpesa_callbacks WHERE id = %s",
+                   (callback_id,))[0]
+    assert (row['status'], row['mpesa_receipt'], row['deliveries']) == ('pending', 'TJD4STK001', 2)
+    assert 'Source' not in json.loads(row['payload'])
+    assert settlement.flush() == 1
+    payment = _execute("SELECT payment_id, status, mpesa_code FROM payments")[0]
+    assert (payment['status'], payment['mpesa_code']) == ('completed', 'TJD4STK001')
+    assert till_ledger.till_ledger.lookup('TJD4STK001')['used_by_reference'] == f"stk:{payment['payment_id']}"
+
+    # A further redelivery is only counted
+    assert settlement.record_callback(_daraja_callback('ws_CO_1', 'TJD4STK001')) == callback_id
+    assert settlement.flush() == 0
+    assert _execute("SELECT status FROM mpesa_callbacks WHERE id = %s", (callback_id,))[0]['status'] == 'settled'
@@ -0,0 +1,89 @@
+"""
+Tests for the precomputed Francisca suggestion bank, built here from the
+fallback service.
+
+    python -m pytest test_suggestion_bank.py -q
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from fallback_ai_service import fallback_ai_service
+from suggestion_bank import FIELD_TYPES, PROFESSIONS, SuggestionBank, bank_key
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    return str(tmp_path / 'suggestion_bank.json')
+
+
+@pytest.fixture
+def bank(bank_path):
+    return SuggestionBank(path=bank_path)
+
+
+def test_keys_are_normalized():
+    assert bank_key('Software Engineer', 'jobTitle') == bank_key('software_engineer', 'JobTitle')
+    assert bank_key(' software-engineer ', 'job title') == 'software_engineer|job_title'
+    assert bank_key(None, 'summary') == bank_key('', 'summary') == '|summary'
+
+
+def test_build_covers_every_combination_and_lookups_hit_the_index(bank):
+    result = bank.build(fallback_ai_service.get_francisca_suggestions, 'fallback')
+    assert result['entries'] == len(PROFESSIONS) * len(FIELD_TYPES) and result['failures'] == 0
+    with open(bank.path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['source'] == 'fallback' and ': ' not in open(bank.path, encoding='utf-8').read(200)
+
+    expected = fallback_ai_service.get_francisca_suggestions('Data Scientist', 'jobTitle')
+    assert bank.lookup('data_scientist', 'jobTitle') == expected
+    assert bank.lookup('Underwater Basket Weaver', 'summary') is None
+    started = time.perf_counter()
+    for _ in range(1000):
+        bank.lookup('Data Scientist', 'summary')
+    assert (time.perf_counter() - started) / 1000 < 0.001
+    assert bank.stats['hits'] == 1001 and bank.stats['misses'] == 1
+
+
+def test_lookup_results_cannot_modify_the_index(bank):
+    bank.build(lambda profession, field_type: ['one', 'two'], professions=['Designer'], field_types=['skills'])
+    bank.lookup('Designer', 'skills').append('three')
+    assert bank.lookup('Designer', 'skills') == ['one', 'two']
+
+
+def test_failed_combinations_are_skipped(bank):
+    def generator(profession, field_type):
+        if field_type == 'projects':
+            raise RuntimeError('upstream down')
+        return [f'{field_type} tip']
+
+    result = bank.build(generator, professions=['Consultant'], field_types=['summary', 'projects'])
+    assert result['entries'] == 1 and result['failures'] == 1
+    assert bank.lookup('Consultant', 'projects') is None
+
+
+def test_workers_pick_up_a_rebuilt_file(bank):
+    builder = bank
+    builder.build(lambda p, f: ['old'], professions=['Designer'], field_types=['summary'])
+    worker = SuggestionBank(path=builder.path, reload_interval=3600)
+    assert worker.lookup('Designer', 'summary') == ['old']
+
+    builder.build(lambda p, f: ['new'], professions=['Designer'], field_types=['summary'])
+    os.utime(builder.path, (time.time() + 5, time.time() + 5))
+    assert worker.lookup('Designer', 'summary') == ['old']  # until the next mtime check
+    worker._next_check = 0
+    assert worker.lookup('Designer', 'summary') == ['new'] and worker.stats['reloads'] == 2
+
+
+def test_refresh_rebuilds_only_stale_banks(bank_path):
+    calls = []
+    bank = SuggestionBank(path=bank_path, refresh_hours=1, generator=lambda p, f: calls.append((p, f)) or ['tip'],
+                          source='fallback')
+    assert bank.refresh_if_stale() and len(calls) == len(PROFESSIONS) * len(FIELD_TYPES)
+    assert not bank.refresh_if_stale() and len(calls) == len(PROFESSIONS) * len(FIELD_TYPES)
+    os.utime(bank.path, (time.time() - 7200, time.time() - 7200))
+    assert bank.refresh_if_stale() and len(calls) == 2 * len(PROFESSIONS) * len(FIELD_TYPES)
+    assert bank.status()['source'] == 'fallback' and bank.status()['entries'] == len(PROFESSIONS) * len(FIELD_TYPES)
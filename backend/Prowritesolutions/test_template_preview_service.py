@@ -0,0 +1,118 @@
+"""
+Tests for the pre-rendered template preview thumbnails, with a stand-in PDF
+generator and rasteriser so neither ReportLab nor PyMuPDF is needed:
+
+    python -m pytest test_template_preview_service.py -q
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import pytest
+
+import template_preview_service as previews
+from template_preview_service import (
+    PREVIEW_ALIASES, PREVIEW_TEMPLATES, PREVIEW_URL_PREFIX, PREVIEW_WIDTHS, TemplatePreviewService,
+)
+
+
+class StubGenerator:
+    renders = []
+
+    def __init__(self, theme):
+        self.theme = theme
+
+    def generate_resume_pdf_bytes(self, data):
+        StubGenerator.renders.append(self.theme)
+        return f"resume:{self.theme}".encode()
+
+    def generate_cover_letter_pdf_bytes(self, data):
+        StubGenerator.renders.append('cover_letter')
+        return b"cover_letter"
+
+
+class StubPreviewService(TemplatePreviewService):
+    def _rasterize_first_page(self, pdf_bytes, width):
+        return pdf_bytes + f":{width}".encode()
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(previews, 'FITZ_AVAILABLE', True)
+    monkeypatch.setattr(previews, '_load_generator', lambda name, theme: StubGenerator(theme))
+    StubGenerator.renders = []
+    return StubPreviewService(preview_dir=str(tmp_path))
+
+
+def test_images_are_named_by_content_hash_and_listed_in_the_manifest(service, tmp_path):
+    result = service.build_previews()
+    assert result == {'built': [spec['id'] for spec in PREVIEW_TEMPLATES], 'skipped': [], 'failed': []}
+
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    entry = manifest['templates']['professional']
+    for width in PREVIEW_WIDTHS:
+        digest = hashlib.sha256(f"resume:professional:{width}".encode()).hexdigest()[:16]
+        assert entry['images'][str(width)] == f"professional.{width}w.{digest}.png"
+        assert (tmp_path / entry['images'][str(width)]).read_bytes() == f"resume:professional:{width}".encode()
+    assert service.get_preview_urls('professional')['400'] == f"{PREVIEW_URL_PREFIX}/{entry['images']['400']}"
+    assert service.get_default_preview_url('professional') == service.get_preview_urls('professional')['400']
+    assert service.get_preview_urls('modern_cl') is None
+
+
+def test_resume_themes_share_one_rendered_preview(service, tmp_path):
+    service.build_previews()
+    assert StubGenerator.renders.count('professional') == 1 and len(StubGenerator.renders) == len(PREVIEW_TEMPLATES)
+    for template_id in ('modern', 'executive'):
+        assert PREVIEW_ALIASES[template_id] == 'professional'
+        assert service.get_preview_urls(template_id) == service.get_preview_urls('professional')
+    assert set(json.loads((tmp_path / 'manifest.json').read_text())['templates']) == {
+        spec['id'] for spec in PREVIEW_TEMPLATES}
+
+
+def test_fingerprint_covers_the_generator_module(service):
+    with open(sys.modules[__name__].__file__) as f:
+        assert previews._generator_source(StubGenerator('professional')) == f.read()
+
+
+def test_unchanged_templates_are_skipped_by_fingerprint(service, tmp_path, monkeypatch):
+    service.build_previews()
+    renders = len(StubGenerator.renders)
+    assert service.build_previews()['skipped'] == [spec['id'] for spec in PREVIEW_TEMPLATES]
+    assert len(StubGenerator.renders) == renders
+
+    # A missing image rebuilds only its template
+    os.remove(tmp_path / service.get_preview_urls('professional_cl')['200'].rsplit('/', 1)[1])
+    assert service.build_previews()['built'] == ['professional_cl']
+
+    # A pipeline change rebuilds everything and removes superseded images
+    old = set(os.listdir(tmp_path))
+    monkeypatch.setattr(previews, 'PREVIEW_PIPELINE_VERSION', previews.PREVIEW_PIPELINE_VERSION + 1)
+    monkeypatch.setattr(StubPreviewService, '_rasterize_first_page', lambda self, pdf, width: pdf + f"@{width}".encode())
+    assert len(service.build_previews()['built']) == len(PREVIEW_TEMPLATES)
+    assert not (old - {'manifest.json'}) & set(os.listdir(tmp_path))
+
+
+def test_partial_failures_do_not_fail_the_build(service, monkeypatch):
+    def broken(self, spec):
+        if spec['id'] == 'professional_cl':
+            raise RuntimeError('font missing')
+        return TemplatePreviewService._render_pdf(self, spec)
+    monkeypatch.setattr(StubPreviewService, '_render_pdf', broken)
+    monkeypatch.setattr(previews, 'template_preview_service', service)
+    assert previews.main([]) == 0
+    assert service.get_preview_urls('professional_cl') is None and service.get_preview_urls('modern')
+
+
+def test_templates_no_longer_rendered_fall_back_to_static_previews(service, tmp_path):
+    (tmp_path / 'modern_cl.400w.abc.png').write_bytes(b'old')
+    (tmp_path / 'modern.400w.def.png').write_bytes(b'old')
+    (tmp_path / 'manifest.json').write_text(json.dumps({'templates': {
+        'modern_cl': {'fingerprint': 'x', 'images': {'400': 'modern_cl.400w.abc.png'}},
+        'modern': {'fingerprint': 'y', 'images': {'400': 'modern.400w.def.png'}}}}))
+    service.build_previews()
+    assert service.get_preview_urls('modern_cl') is None
+    assert not (tmp_path / 'modern_cl.400w.abc.png').exists()
+    # Templates now shown through an alias drop their own earlier renders
+    assert not (tmp_path / 'modern.400w.def.png').exists() and service.get_preview_urls('modern')
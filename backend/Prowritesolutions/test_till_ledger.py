@@ -0,0 +1,146 @@
+"""
+Tests for the till transaction ledger and the payment code validation that
+reads it, on the MySQL-on-SQLite shim with a stand-in for Africa's Talking:
+
+    python -m pytest test_till_ledger.py -q
+"""
+
+import mysql.connector
+import pytest
+
+import africas_talking_validator
+import mysql_sqlite_shim
+from africas_talking_validator import AfricasTalkingValidator
+from till_ledger import LOCK_NAME, SOURCE_CALLBACK, SOURCE_WHITELIST, TillLedger
+
+TILL = '6340351'
+STK_SHORTCODE = '174379'
+
+
+class StandInAfricasTalking:
+    """fetch_till_transactions stand-in; transactions=None means the API is down"""
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.calls = 0
+
+    def fetch_till_transactions(self, till_number, days_back=7):
+        self.calls += 1
+        return self.transactions
+
+
+def _transaction(code, value='KES 500.0000'):
+    return {'transactionId': code, 'value': value, 'sourceAccount': '+254700000001',
+            'transactionDate': '2025-01-13 10:00:00'}
+
+
+def _sync_state():
+    connection = mysql.connector.connect()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT last_error, last_fetched, last_inserted FROM till_ledger_sync WHERE till_number = %s",
+                       (TILL,))
+        return cursor.fetchone()
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    stand_in = StandInAfricasTalking([_transaction('TJ1AAA0001'), _transaction('TJ1AAA0002', 'KES 1,000.00')])
+    monkeypatch.setattr(africas_talking_validator, 'transaction_validator', stand_in)
+    return stand_in
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch, remote):
+    path = str(tmp_path / 'prowrite.db')
+    monkeypatch.setattr(mysql.connector, 'connect', lambda *args, **kwargs: mysql_sqlite_shim.connect(path, **kwargs))
+    ledger = TillLedger(till_number=TILL)
+    monkeypatch.setattr(africas_talking_validator, 'till_ledger', ledger)
+    return ledger
+
+
+def test_sync_records_transactions_and_never_frees_a_claimed_code(ledger):
+    assert ledger.sync()['inserted'] == 2
+    entry = ledger.lookup(' tj1aaa0002 ')
+    assert entry['amount'] == 1000.0 and entry['till_number'] == TILL and entry['phone_number'] == '+254700000001'
+
+    assert ledger.claim('TJ1AAA0001', 'REF-1')
+    assert ledger.claim('TJ1AAA0001', 'REF-1')        # a retried validation is idempotent
+    assert not ledger.claim('TJ1AAA0001', 'REF-2')
+    assert ledger.sync()['inserted'] == 0
+    assert ledger.lookup('TJ1AAA0001')['used_by_reference'] == 'REF-1'
+    assert ledger.lookup('TJ1AAA0002')['used_by_reference'] is None
+    assert _sync_state() == (None, 2, 0)
+
+
+def test_lookup_only_matches_the_requested_till(ledger):
+    ledger.record_transaction('SKL0000001', 500, SOURCE_CALLBACK, till_number=STK_SHORTCODE)
+    assert ledger.lookup('SKL0000001', TILL) is None
+    assert ledger.lookup('SKL0000001', STK_SHORTCODE)['source'] == SOURCE_CALLBACK
+    assert ledger.lookup('SKL0000001')['till_number'] == STK_SHORTCODE
+
+
+def test_rows_recorded_as_used_stay_with_their_first_reference(ledger):
+    ledger.record_transactions([{'transaction_code': 'SKL0000002', 'amount': 500, 'source': SOURCE_CALLBACK,
+                                 'till_number': STK_SHORTCODE, 'used_by_reference': 'stk:7'}])
+    entry = ledger.lookup('SKL0000002')
+    assert entry['used_by_reference'] == 'stk:7' and entry['used_at'] is not None
+    assert not ledger.claim('SKL0000002', 'REF-1')
+    ledger.record_transactions([{'transaction_code': 'SKL0000002', 'amount': 500, 'source': SOURCE_CALLBACK,
+                                 'used_by_reference': 'stk:8'}])
+    assert ledger.lookup('SKL0000002')['used_by_reference'] == 'stk:7'
+
+
+def test_codes_are_verified_once_per_reference(ledger):
+    validator = AfricasTalkingValidator()
+    result = validator.verify_with_ledger('TJ1AAA0001', TILL, 500, 'REF-1')     # miss, synced on demand
+    assert result.valid and result.amount_verified == 500.0 and result.phone_number == '+254700000001'
+    assert validator.verify_with_ledger('TJ1AAA0001', TILL, 500, 'REF-1').valid
+    assert validator.verify_with_ledger('TJ1AAA0001', TILL, 500, 'REF-2').error_code == 'ALREADY_USED'
+    assert validator.verify_with_ledger('TJ1AAA0002', TILL, 500, 'REF-3').error_code == 'AMOUNT_MISMATCH'
+    assert validator.verify_with_ledger('TJ1AAA0009', TILL, 500, 'REF-4').error_code == 'TRANSACTION_NOT_FOUND'
+
+
+def test_receipts_for_another_shortcode_are_not_till_payments(ledger, remote):
+    ledger.record_transaction('SKL0000003', 500, SOURCE_CALLBACK, till_number=STK_SHORTCODE)
+    validator = AfricasTalkingValidator()
+    for _ in range(2):
+        result = validator.verify_with_ledger('SKL0000003', TILL, 500, 'REF-1')
+        assert not result.valid and result.error_code == 'WRONG_TILL'
+    assert remote.calls == 0                   # a hit for another till never syncs
+    assert ledger.lookup('SKL0000003')['used_by_reference'] is None
+
+
+def test_whitelist_is_the_only_fallback_when_the_api_is_down(ledger, remote):
+    remote.transactions = None
+    validator = AfricasTalkingValidator()
+    assert not validator.verify_with_ledger('TJ1AAA0001', TILL, 500, 'REF-1').valid
+    result = validator.verify_with_ledger('TJBL87609U', TILL, 500, 'REF-1')
+    assert result.valid
+    assert ledger.lookup('TJBL87609U')['source'] == SOURCE_WHITELIST
+    assert AfricasTalkingValidator().verify_with_ledger('TJBL87609U', TILL, 500, 'REF-2').error_code == 'ALREADY_USED'
+    assert _sync_state()[0] == 'fetch failed'
+    # Another worker that finds the failed attempt also falls back instead of waiting for the interval
+    assert TillLedger(till_number=TILL).sync_if_stale() is False and remote.calls == 1
+
+
+def test_one_sync_per_interval_across_workers(ledger, remote):
+    other_worker = TillLedger(till_number=TILL)
+    assert ledger.sync_elected(60)['success']
+    assert other_worker.sync_elected(60) == {'success': True, 'skipped': True}
+    assert other_worker.sync_if_stale() is None            # a lookup miss relies on that sync too
+    assert remote.calls == 1
+
+    # While another worker holds the lock nobody else syncs
+    holder = mysql.connector.connect()
+    cursor = holder.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+    assert cursor.fetchone()[0] == 1
+    try:
+        assert other_worker.sync_elected(0) is None
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+        holder.close()
+    assert other_worker.sync_elected(0)['success'] and remote.calls == 2
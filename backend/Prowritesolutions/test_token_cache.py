@@ -0,0 +1,84 @@
+"""
+Tests for the OAuth token cache shared across workers.
+
+    python -m pytest test_token_cache.py -q
+"""
+
+import os
+import time
+import tempfile
+import threading
+
+from token_cache import TokenCache
+
+
+class _CountingFetcher:
+    def __init__(self, expires_in=3600, delay=0.0, fail=False):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            number = self.calls
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("oauth endpoint down")
+        return f"token-{number}", self.expires_in
+
+
+def test_concurrent_callers_share_one_refresh():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, 'tokens.db')
+        # Two caches on one database stand in for two gunicorn workers
+        workers = [TokenCache(db_path=db_path), TokenCache(db_path=db_path)]
+        fetcher = _CountingFetcher(delay=0.2)
+        results = []
+
+        def call(cache):
+            results.append(cache.get_token('mpesa:test', fetcher))
+
+        threads = [threading.Thread(target=call, args=(workers[i % 2],)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert fetcher.calls == 1
+        assert results == ['token-1'] * 8
+
+
+def test_token_is_refreshed_ahead_of_expiry():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = TokenCache(db_path=os.path.join(tmpdir, 'tokens.db'), refresh_ahead=300)
+        fetcher = _CountingFetcher(expires_in=3600)
+        assert cache.get_token('k', fetcher) == 'token-1'
+        assert cache.get_token('k', fetcher) == 'token-1'
+        assert fetcher.calls == 1
+
+        # Inside the refresh-ahead window the token is replaced before it expires
+        fetcher.expires_in = 200
+        cache.invalidate('k')
+        assert cache.get_token('k', fetcher) == 'token-2'
+        assert cache.get_token('k', fetcher) == 'token-3'
+
+
+def test_failed_refresh_keeps_unexpired_token():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = TokenCache(db_path=os.path.join(tmpdir, 'tokens.db'), refresh_ahead=300)
+        assert cache.get_token('k', _CountingFetcher(expires_in=120)) == 'token-1'
+
+        failing = _CountingFetcher(fail=True)
+        assert cache.get_token('k', failing) == 'token-1'
+        assert failing.calls == 1
+        assert cache.stats['refresh_failures'] == 1
+
+        cache.invalidate('k')
+        try:
+            cache.get_token('k', failing)
+            raise AssertionError("expected the fetch error to propagate")
+        except RuntimeError:
+            pass
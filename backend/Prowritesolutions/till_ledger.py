@@ -0,0 +1,473 @@
+"""
+Till Transaction Ledger
+Local, indexed copy of the payments received on our M-Pesa till.
+
+The ledger is fed by a periodic sync job that pulls recent transactions from
+Africa's Talking and by M-Pesa STK callbacks. Payment code validation then becomes
+one primary-key lookup, and a code is marked as used with a conditional UPDATE,
+so used-code tracking survives restarts and is shared by every worker. STK
+receipts are recorded as already used by the checkout they paid for.
+
+Every worker may run the sync thread: a pass is elected with a MySQL named lock
+and skipped when another worker synced within the interval, so Africa's Talking
+sees one sync per interval however many workers run.
+
+Run a sync by hand, or a dedicated sync process, with:
+
+    python till_ledger.py sync|status|worker
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import mysql.connector
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TILL_NUMBER = os.getenv('MPESA_TILL_NUMBER', '6340351')
+SYNC_INTERVAL = int(os.getenv('TILL_LEDGER_SYNC_INTERVAL', 60))        # background sync period
+SYNC_DAYS_BACK = int(os.getenv('TILL_LEDGER_SYNC_DAYS', 2))            # window pulled per sync
+ON_DEMAND_MIN_INTERVAL = int(os.getenv('TILL_LEDGER_ON_DEMAND_INTERVAL', 15))
+ON_DEMAND_LOCK_WAIT = 10    # seconds a lookup miss waits for a sync another worker is running
+LOCK_NAME = 'prowrite_till_ledger_sync'
+
+SOURCE_SYNC = 'africastalking'
+SOURCE_CALLBACK = 'stk_callback'
+SOURCE_WHITELIST = 'whitelist'
+
+
+class LedgerUnavailable(Exception):
+    """The ledger database cannot be reached; callers fall back to the live API"""
+
+
+def parse_transaction_amount(value) -> float:
+    """Africa's Talking reports values like 'KES 500.0000'"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value or '0').strip()
+    for prefix in ('KES', 'KSH', 'Ksh'):
+        if text.upper().startswith(prefix.upper()):
+            text = text[len(prefix):]
+    return float(text.replace(',', '').strip() or 0)
+
+
+def parse_transaction_time(value) -> Optional[datetime]:
+    if not value:
+        return None
+    text = str(value).replace('T', ' ')[:19]
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y%m%d%H%M%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class TillLedger:
+    """MySQL-backed ledger of till transactions keyed by transaction code"""
+
+    def __init__(self, till_number: str = TILL_NUMBER, sync_interval: int = SYNC_INTERVAL):
+        self.till_number = till_number
+        self.sync_interval = sync_interval
+        self._initialized = False
+        self._sync_lock = threading.Lock()
+        self._last_sync_attempt = 0.0
+        self._last_sync_ok = True
+        self._stop = threading.Event()
+        self._worker = None
+        self._worker_pid = None
+
+    def _get_db_connection(self):
+        try:
+            connection = mysql.connector.connect(
+                host=os.getenv('DB_HOST', 'localhost'),
+                user=os.getenv('DB_USER', 'root'),
+                password=os.getenv('DB_PASSWORD', ''),
+                database=os.getenv('DB_NAME', 'prowrite'),
+                charset='utf8mb4',
+                collation='utf8mb4_unicode_ci'
+            )
+        except Exception as e:
+            raise LedgerUnavailable(str(e))
+        if not self._initialized:
+            self._init_database(connection)
+        return connection
+
+    def _init_database(self, connection):
+        cursor = connection.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS till_transactions (
+                transaction_code VARCHAR(32) PRIMARY KEY,
+                till_number VARCHAR(20),
+                amount DECIMAL(10, 2) NOT NULL,
+                phone_number VARCHAR(20),
+                transaction_time DATETIME,
+                source VARCHAR(30) NOT NULL,
+                raw_data JSON,
+                used_by_reference VARCHAR(50),
+                used_at TIMESTAMP NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_till_time (till_number, transaction_time),
+                INDEX idx_used_by (used_by_reference)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS till_ledger_sync (
+                till_number VARCHAR(20) PRIMARY KEY,
+                last_attempt_at DATETIME,
+                last_success_at DATETIME,
+                last_error TEXT,
+                last_fetched INT DEFAULT 0,
+                last_inserted INT DEFAULT 0
+            )
+        """)
+        connection.commit()
+        cursor.close()
+        self._initialized = True
+        logger.info("Till ledger tables initialized")
+
+    # ----- writes -----
+
+    def record_transactions(self, transactions: List[Dict[str, Any]]) -> int:
+        """
+        Upsert normalised transactions, returns how many were new.
+
+        Each item needs transaction_code, amount and source; till_number,
+        phone_number, transaction_time, raw_data and used_by_reference are
+        optional. Existing rows keep their used_by_reference so a re-sync never
+        "frees" a used code; an unused row takes the new one.
+        """
+        by_code = {}
+        for trans in transactions:
+            code = (trans.get('transaction_code') or '').strip().upper()
+            if not code:
+                continue
+            by_code[code] = (
+                code,
+                trans.get('till_number') or self.till_number,
+                trans.get('amount') or 0,
+                trans.get('phone_number'),
+                trans.get('transaction_time'),
+                trans.get('source') or SOURCE_SYNC,
+                json.dumps(trans.get('raw_data'), default=str) if trans.get('raw_data') is not None else None,
+                trans.get('used_by_reference'),
+                datetime.now() if trans.get('used_by_reference') else None
+            )
+        rows = list(by_code.values())
+        if not rows:
+            return 0
+
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor()
+            placeholders = ', '.join(['%s'] * len(rows))
+            cursor.execute(
+                f"SELECT COUNT(*) FROM till_transactions WHERE transaction_code IN ({placeholders})",
+                [row[0] for row in rows]
+            )
+            existing = cursor.fetchone()[0]
+            cursor.executemany("""
+                INSERT INTO till_transactions
+                (transaction_code, till_number, amount, phone_number, transaction_time, source, raw_data,
+                 used_by_reference, used_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                phone_number = COALESCE(phone_number, VALUES(phone_number)),
+                transaction_time = COALESCE(transaction_time, VALUES(transaction_time)),
+                used_at = IF(used_by_reference IS NULL, VALUES(used_at), used_at),
+                used_by_reference = COALESCE(used_by_reference, VALUES(used_by_reference))
+            """, rows)
+            connection.commit()
+            cursor.close()
+            return len(rows) - existing
+        finally:
+            connection.close()
+
+    def record_transaction(self, transaction_code: str, amount: float, source: str,
+                           phone_number: Optional[str] = None, transaction_time: Optional[datetime] = None,
+                           till_number: Optional[str] = None, raw_data: Any = None) -> bool:
+        """Record a single transaction (used by M-Pesa callbacks); returns True if new"""
+        return self.record_transactions([{
+            'transaction_code': transaction_code,
+            'amount': amount,
+            'source': source,
+            'phone_number': phone_number,
+            'transaction_time': transaction_time,
+            'till_number': till_number,
+            'raw_data': raw_data
+        }]) == 1
+
+    def claim(self, transaction_code: str, reference: str) -> bool:
+        """
+        Atomically mark a code as used by a payment reference.
+
+        Returns False if another reference already used it. Claiming again for
+        the same reference succeeds, so a retried validation is idempotent.
+        """
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                UPDATE till_transactions
+                SET used_by_reference = %s, used_at = NOW()
+                WHERE transaction_code = %s AND used_by_reference IS NULL
+            """, (reference, transaction_code))
+            claimed = cursor.rowcount == 1
+            connection.commit()
+            if not claimed:
+                cursor.execute(
+                    "SELECT used_by_reference FROM till_transactions WHERE transaction_code = %s",
+                    (transaction_code,)
+                )
+                row = cursor.fetchone()
+                claimed = bool(row) and row[0] == reference
+            cursor.close()
+            return claimed
+        finally:
+            connection.close()
+
+    # ----- reads -----
+
+    def lookup(self, transaction_code: str, till_number: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Primary-key lookup of a transaction code, optionally only for payments to one till"""
+        query = """
+            SELECT transaction_code, till_number, amount, phone_number, transaction_time,
+                   source, used_by_reference, used_at
+            FROM till_transactions
+            WHERE transaction_code = %s
+        """
+        params = [transaction_code.strip().upper()]
+        if till_number is not None:
+            query += " AND till_number = %s"
+            params.append(till_number)
+
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            cursor.close()
+        finally:
+            connection.close()
+        if row:
+            row['amount'] = float(row['amount'])
+        return row
+
+    def get_sync_status(self) -> Dict[str, Any]:
+        """Sync state and lag for the metrics endpoint and admin dashboard"""
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM till_ledger_sync WHERE till_number = %s", (self.till_number,))
+            state = cursor.fetchone() or {}
+            cursor.execute("""
+                SELECT COUNT(*) AS total,
+                       SUM(used_by_reference IS NULL) AS unused,
+                       MAX(transaction_time) AS newest_transaction_time
+                FROM till_transactions
+                WHERE till_number = %s
+            """, (self.till_number,))
+            counts = cursor.fetchone() or {}
+            cursor.close()
+        finally:
+            connection.close()
+
+        now = datetime.now()
+        last_success = state.get('last_success_at')
+        newest = counts.get('newest_transaction_time')
+        return {
+            'till_number': self.till_number,
+            'transactions': int(counts.get('total') or 0),
+            'unused_transactions': int(counts.get('unused') or 0),
+            'last_attempt_at': state['last_attempt_at'].isoformat() if state.get('last_attempt_at') else None,
+            'last_success_at': last_success.isoformat() if last_success else None,
+            'last_error': state.get('last_error'),
+            'last_fetched': state.get('last_fetched') or 0,
+            'last_inserted': state.get('last_inserted') or 0,
+            'sync_lag_seconds': round((now - last_success).total_seconds(), 1) if last_success else None,
+            'newest_transaction_age_seconds': round((now - newest).total_seconds(), 1) if newest else None
+        }
+
+    # ----- sync job -----
+
+    def _fetch_remote(self, days_back: int) -> Optional[List[Dict[str, Any]]]:
+        """Pull recent till transactions from Africa's Talking, normalised"""
+        from africas_talking_validator import transaction_validator
+        if not hasattr(transaction_validator, 'fetch_till_transactions'):
+            logger.info("Africa's Talking not configured, skipping till ledger sync")
+            return None
+
+        fetched = transaction_validator.fetch_till_transactions(self.till_number, days_back=days_back)
+        if fetched is None:
+            return None
+
+        normalised = []
+        for trans in fetched:
+            metadata = trans.get('providerMetadata') or trans.get('metadata') or {}
+            normalised.append({
+                'transaction_code': trans.get('transactionId') or trans.get('providerRefId'),
+                'amount': parse_transaction_amount(trans.get('value')),
+                'phone_number': trans.get('sourceAccount') or trans.get('source') or metadata.get('phoneNumber'),
+                'transaction_time': parse_transaction_time(trans.get('transactionDate') or trans.get('creationTime')),
+                'till_number': self.till_number,
+                'source': SOURCE_SYNC,
+                'raw_data': trans
+            })
+        return normalised
+
+    def _record_sync_state(self, error: Optional[str], fetched: int = 0, inserted: int = 0):
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor()
+            now = datetime.now()
+            cursor.execute("""
+                INSERT INTO till_ledger_sync
+                (till_number, last_attempt_at, last_success_at, last_error, last_fetched, last_inserted)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                last_attempt_at = VALUES(last_attempt_at),
+                last_success_at = COALESCE(VALUES(last_success_at), last_success_at),
+                last_error = VALUES(last_error),
+                last_fetched = VALUES(last_fetched),
+                last_inserted = VALUES(last_inserted)
+            """, (self.till_number, now, None if error else now, error, fetched, inserted))
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+
+    def sync(self, days_back: int = SYNC_DAYS_BACK) -> Dict[str, Any]:
+        """Fetch recent till transactions and upsert them into the ledger"""
+        with self._sync_lock:
+            self._last_sync_attempt = time.time()
+            started = time.time()
+            transactions = self._fetch_remote(days_back)
+            self._last_sync_ok = transactions is not None
+            if transactions is None:
+                self._record_sync_state('fetch failed')
+                return {'success': False, 'error': 'fetch failed'}
+
+            inserted = self.record_transactions(transactions)
+            self._record_sync_state(None, fetched=len(transactions), inserted=inserted)
+            logger.info(f"Till ledger sync: {len(transactions)} fetched, {inserted} new")
+            return {
+                'success': True,
+                'fetched': len(transactions),
+                'inserted': inserted,
+                'duration_ms': round((time.time() - started) * 1000, 1)
+            }
+
+    def sync_elected(self, min_interval: float, lock_wait: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Sync unless another worker is syncing (waiting up to lock_wait seconds
+        for it) or any worker attempted a sync within min_interval seconds.
+        Returns None when another worker still holds the lock, and
+        {'success': <outcome of that attempt>, 'skipped': True} after a recent one.
+        """
+        connection = self._get_db_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, lock_wait))
+            if cursor.fetchone()[0] != 1:
+                cursor.close()
+                return None
+            try:
+                cursor.execute("SELECT last_attempt_at, last_error FROM till_ledger_sync WHERE till_number = %s",
+                               (self.till_number,))
+                row = cursor.fetchone()
+                connection.commit()
+                if row and row[0] and (datetime.now() - row[0]).total_seconds() < min_interval:
+                    return {'success': row[1] is None, 'skipped': True}
+                return self.sync()
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                cursor.fetchone()
+                cursor.close()
+        finally:
+            connection.close()
+
+    def sync_if_stale(self, min_interval: int = ON_DEMAND_MIN_INTERVAL) -> Optional[bool]:
+        """
+        On-demand sync for a lookup miss. Returns None if a sync succeeded
+        recently in any worker (the ledger is as current as it is going to get),
+        otherwise whether the sync succeeded; False means Africa's Talking is
+        unreachable.
+        """
+        if time.time() - self._last_sync_attempt < min_interval:
+            return None if self._last_sync_ok else False
+        try:
+            result = self.sync_elected(min_interval, lock_wait=ON_DEMAND_LOCK_WAIT)
+            if result is None or (result.get('skipped') and result['success']):
+                return None
+            return result['success']
+        except LedgerUnavailable:
+            raise
+        except Exception as e:
+            logger.error(f"On-demand till ledger sync failed: {e}")
+            return False
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # Leave a little slack so workers on the same period don't skip every other pass
+                self.sync_elected(self.sync_interval * 0.9)
+            except Exception as e:
+                logger.error(f"Till ledger sync error: {e}")
+            self._stop.wait(self.sync_interval)
+
+    def start_sync_worker(self):
+        """Start the periodic sync thread (once per process; passes are elected via GET_LOCK)"""
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name='till-ledger-sync', daemon=True)
+        self._worker_pid = os.getpid()
+        self._worker.start()
+        logger.info(f"Till ledger sync worker started (every {self.sync_interval}s)")
+
+    def stop_sync_worker(self, timeout: float = 5):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+
+till_ledger = TillLedger()
+
+
+def main(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    command = argv[0] if argv else 'sync'
+
+    if command == 'sync':
+        days = int(argv[1]) if len(argv) > 1 else SYNC_DAYS_BACK
+        result = till_ledger.sync(days_back=days)
+        print(json.dumps(result, indent=2))
+        return 0 if result['success'] else 1
+    if command == 'status':
+        print(json.dumps(till_ledger.get_sync_status(), indent=2))
+        return 0
+    if command == 'worker':
+        till_ledger.start_sync_worker()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            till_ledger.stop_sync_worker()
+        return 0
+
+    print("Usage: python till_ledger.py [sync [days]|status|worker]")
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,251 @@
+"""
+OAuth Token Cache
+Shared cache for provider access tokens (M-Pesa Daraja OAuth and friends).
+
+Tokens are kept in a per-process dict and backed by a small SQLite database so all
+gunicorn workers on a host reuse the same token instead of each requesting its own.
+Tokens are refreshed ahead of expiry, and refreshes are single-flight: one thread
+per process (thread lock) and one process per host (a lease row taken under
+BEGIN IMMEDIATE) calls the provider while everyone else keeps using the current
+token or waits briefly for the new one.
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_DB_PATH = os.getenv('TOKEN_CACHE_DB', os.path.join('data', 'token_cache.db'))
+REFRESH_AHEAD = int(os.getenv('TOKEN_REFRESH_AHEAD', 5 * 60))  # refresh this long before expiry
+REFRESH_LEASE = 30          # seconds one process may hold the refresh lease
+WAIT_INTERVAL = 0.1         # poll interval while another process refreshes
+
+# fetcher() -> (access_token, expires_in_seconds)
+TokenFetcher = Callable[[], Tuple[str, float]]
+
+
+def make_cache_key(provider: str, *parts: Optional[str]) -> str:
+    """Build a cache key that never contains the raw credentials"""
+    digest = hashlib.sha256('|'.join(p or '' for p in parts).encode('utf-8')).hexdigest()[:16]
+    return f"{provider}:{digest}"
+
+
+class TokenCache:
+    """Per-process token cache with cross-worker SQLite backing"""
+
+    def __init__(self, db_path: str = TOKEN_CACHE_DB_PATH, refresh_ahead: int = REFRESH_AHEAD):
+        self.db_path = db_path
+        self.refresh_ahead = refresh_ahead
+        self._memory: Dict[str, Tuple[str, float]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._initialized = False
+        self.stats = {'hits': 0, 'shared_hits': 0, 'refreshes': 0, 'refresh_failures': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self._init_database()
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_database(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS oauth_tokens (
+                    cache_key TEXT PRIMARY KEY,
+                    access_token TEXT,
+                    expires_at REAL NOT NULL DEFAULT 0,
+                    refreshing_until REAL NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        try:
+            os.chmod(self.db_path, 0o600)
+        except OSError:
+            pass
+        self._initialized = True
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _is_fresh(self, expires_at: float) -> bool:
+        return time.time() < expires_at - self.refresh_ahead
+
+    # ----- shared store -----
+
+    def _read_shared(self, key: str) -> Optional[Tuple[str, float]]:
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT access_token, expires_at FROM oauth_tokens WHERE cache_key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Token cache read failed for {key}: {e}")
+            return None
+        if row and row[0]:
+            return row[0], row[1]
+        return None
+
+    def _acquire_lease(self, key: str) -> Tuple[bool, Optional[Tuple[str, float]]]:
+        """
+        Try to become the process that refreshes `key`.
+
+        Returns (acquired, current_entry). If another process already stored a fresh
+        token the lease is not taken and that token is returned instead.
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logger.warning(f"Token cache unavailable, refreshing without lease: {e}")
+            return True, None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT access_token, expires_at, refreshing_until FROM oauth_tokens WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+            entry = (row[0], row[1]) if row and row[0] else None
+
+            if entry and self._is_fresh(entry[1]):
+                conn.execute("COMMIT")
+                return False, entry
+            if row and row[2] > now:
+                conn.execute("COMMIT")
+                return False, entry
+
+            conn.execute("""
+                INSERT INTO oauth_tokens (cache_key, access_token, expires_at, refreshing_until, updated_at)
+                VALUES (?, NULL, 0, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET refreshing_until = excluded.refreshing_until
+            """, (key, now + REFRESH_LEASE, now))
+            conn.execute("COMMIT")
+            return True, entry
+        except sqlite3.Error as e:
+            logger.warning(f"Token cache lease failed for {key}: {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            return True, None
+        finally:
+            conn.close()
+
+    def _store_shared(self, key: str, token: Optional[str], expires_at: float):
+        """Publish a refreshed token (or just release the lease when token is None)"""
+        try:
+            conn = self._connect()
+            try:
+                if token:
+                    conn.execute("""
+                        INSERT INTO oauth_tokens (cache_key, access_token, expires_at, refreshing_until, updated_at)
+                        VALUES (?, ?, ?, 0, ?)
+                        ON CONFLICT(cache_key) DO UPDATE SET
+                            access_token = excluded.access_token,
+                            expires_at = excluded.expires_at,
+                            refreshing_until = 0,
+                            updated_at = excluded.updated_at
+                    """, (key, token, expires_at, time.time()))
+                else:
+                    conn.execute("UPDATE oauth_tokens SET refreshing_until = 0 WHERE cache_key = ?", (key,))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Token cache write failed for {key}: {e}")
+
+    # ----- public API -----
+
+    def get_token(self, key: str, fetcher: TokenFetcher) -> str:
+        """
+        Return a valid access token for `key`, calling `fetcher` only when no fresh
+        token is cached and no other thread or worker is already refreshing it.
+
+        Raises whatever `fetcher` raises if no usable (unexpired) token exists.
+        """
+        entry = self._memory.get(key)
+        if entry and self._is_fresh(entry[1]):
+            self.stats['hits'] += 1
+            return entry[0]
+
+        with self._key_lock(key):
+            entry = self._memory.get(key)
+            if entry and self._is_fresh(entry[1]):
+                self.stats['hits'] += 1
+                return entry[0]
+
+            deadline = time.time() + REFRESH_LEASE
+            while True:
+                shared = self._read_shared(key)
+                if shared and self._is_fresh(shared[1]):
+                    self._memory[key] = shared
+                    self.stats['shared_hits'] += 1
+                    return shared[0]
+
+                acquired, current = self._acquire_lease(key)
+                current = current or shared or entry
+                if acquired:
+                    return self._refresh(key, fetcher, current)
+
+                if current and self._is_fresh(current[1]):
+                    self._memory[key] = current
+                    self.stats['shared_hits'] += 1
+                    return current[0]
+                if current and time.time() < current[1]:
+                    # Another worker is refreshing; the old token is still valid
+                    return current[0]
+                if time.time() >= deadline:
+                    # The lease holder looks stuck - refresh ourselves
+                    return self._refresh(key, fetcher, None)
+                time.sleep(WAIT_INTERVAL)
+
+    def _refresh(self, key: str, fetcher: TokenFetcher, current: Optional[Tuple[str, float]]) -> str:
+        try:
+            token, expires_in = fetcher()
+        except Exception:
+            self.stats['refresh_failures'] += 1
+            self._store_shared(key, None, 0)
+            if current and time.time() < current[1]:
+                logger.warning(f"Token refresh failed for {key}, using current token until it expires")
+                return current[0]
+            raise
+
+        expires_at = time.time() + float(expires_in)
+        self._memory[key] = (token, expires_at)
+        self._store_shared(key, token, expires_at)
+        self.stats['refreshes'] += 1
+        logger.info(f"Refreshed access token for {key}")
+        return token
+
+    def invalidate(self, key: str):
+        """Drop a token the provider rejected so the next call fetches a new one"""
+        self._memory.pop(key, None)
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("UPDATE oauth_tokens SET access_token = NULL, expires_at = 0 WHERE cache_key = ?", (key,))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Token cache invalidate failed for {key}: {e}")
+
+
+token_cache = TokenCache()